@@ -27,7 +27,7 @@ except ImportError:
     print("websockets package required. Install with: pip install websockets")
     sys.exit(1)
 
-from common import get_client
+from common import get_client, AsyncDTaaSClient
 
 DOMAIN = "agriculture"
 HTTP_PORT = 8098
@@ -1324,20 +1324,20 @@ class DashboardHandler(SimpleHTTPRequestHandler):
         pass  # Suppress HTTP logs
 
 
-async def broadcast_data(websocket, collector: AgricultureDataCollector):
+async def broadcast_data(websocket, collector: AgricultureDataCollector, aclient: AsyncDTaaSClient):
     """Broadcast agriculture data to connected clients."""
     try:
         while True:
-            data = collector.collect_data()
+            data = await aclient.run(collector.collect_data)
             await websocket.send(json.dumps(data))
             await asyncio.sleep(5)
     except websockets.exceptions.ConnectionClosed:
         pass
 
 
-async def ws_handler(websocket, collector: AgricultureDataCollector):
+async def ws_handler(websocket, collector: AgricultureDataCollector, aclient: AsyncDTaaSClient):
     """Handle WebSocket connections."""
-    await broadcast_data(websocket, collector)
+    await broadcast_data(websocket, collector, aclient)
 
 
 def run_http_server():
@@ -1356,6 +1356,7 @@ async def main():
     print(f"\n  Press Ctrl+C to stop\n")
 
     collector = AgricultureDataCollector()
+    aclient = AsyncDTaaSClient(collector.client)
 
     # Start HTTP server in background thread
     http_thread = Thread(target=run_http_server, daemon=True)
@@ -1363,7 +1364,7 @@ async def main():
 
     # Start WebSocket server
     async with websockets.serve(
-        lambda ws: ws_handler(ws, collector),
+        lambda ws: ws_handler(ws, collector, aclient),
         "0.0.0.0",
         WS_PORT
     ):
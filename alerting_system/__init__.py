@@ -14,8 +14,13 @@ This proves TesserAI's production readiness for real-time monitoring use cases.
 Modules:
     seed.py - Creates alert rules, thresholds, and notification channels
     monitor.py - Real-time monitoring daemon with alert detection
+    notifications.py - Per-channel notification queues with digests and rate limits
+    rule_engine.py - Compiled threshold tables for rule evaluation
+    cep.py - Threshold-crossing CEP events with hysteresis
+    alert_store.py - Indexed alert state with SQLite persistence
     simulator.py - Generates realistic metric data with anomalies
+    fleet_simulator.py - Vectorized metric simulation for large fleets
     dashboard.py - Live alert dashboard with status overview
 """
 
-__all__ = ["seed", "monitor", "simulator", "dashboard"]
+__all__ = ["seed", "monitor", "notifications", "rule_engine", "cep", "alert_store", "simulator", "fleet_simulator", "dashboard"]
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Real-Time Alerting System - Alert Store
+========================================
+
+Active alerts with indexed lookups, a bounded history of resolved alerts,
+and batched persistence to SQLite:
+
+- Primary index by alert ID; secondary indexes by condition key
+  (``rule:system``), rule, source and severity. Acknowledge and resolve
+  by ID are dictionary lookups
+- Resolved alerts move to a ring buffer of the last ``history_size``
+  alerts
+- Changes are marked dirty and written by ``flush`` in one transaction,
+  so the caller decides how often to hit the disk (the dashboard flushes
+  once per tick, off the event loop)
+- ``load`` restores active alerts and recent history from the database on
+  restart with two indexed queries
+
+Usage:
+    store = AlertStore("alerting_alerts.db")
+    store.load()
+    store.add(alert, key=f"{rule_id}:{system_id}")
+    store.acknowledge(alert_id)
+    store.flush()
+"""
+
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set
+
+from common import logger
+
+DEFAULT_ALERT_DB = "alerting_alerts.db"
+DEFAULT_HISTORY_SIZE = 10000
+ACTIVE_STATUSES = ("open", "acknowledged")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    id TEXT PRIMARY KEY,
+    alert_key TEXT,
+    status TEXT NOT NULL,
+    updated REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS alerts_by_status ON alerts (status, updated);
+"""
+
+
+class AlertStore:
+    """
+    Active alerts plus resolved history, optionally backed by SQLite.
+
+    Alerts are the dashboard's alert dicts (``id``, ``rule``, ``source``,
+    ``severity``, ``status``, ...). Mutate them through the store so the
+    indexes and the dirty set stay in sync; ``flush`` may run on another
+    thread.
+
+    Args:
+        path: SQLite database file (``":memory:"`` for a throwaway store);
+              None keeps alerts in memory only
+        history_size: Resolved alerts kept in memory and in the database
+    """
+
+    def __init__(self, path: Optional[str] = None, history_size: int = DEFAULT_HISTORY_SIZE):
+        self.path = path
+        self.history_size = history_size
+
+        self.alerts: Dict[str, dict] = {}
+        self.keys: Dict[str, str] = {}  # alert ID -> condition key
+        self.by_key: Dict[str, str] = {}  # condition key -> alert ID
+        self.by_rule: Dict[str, Set[str]] = defaultdict(set)
+        self.by_source: Dict[str, Set[str]] = defaultdict(set)
+        self.by_severity: Dict[str, Set[str]] = defaultdict(set)
+        self.history: deque = deque(maxlen=history_size)
+
+        self._sequence = itertools.count(1)
+        self._dirty: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self.flushed = 0
+
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.executescript(_SCHEMA)
+
+    def __len__(self) -> int:
+        return len(self.alerts)
+
+    def __contains__(self, alert_id: str) -> bool:
+        return alert_id in self.alerts
+
+    def values(self) -> Iterator[dict]:
+        return iter(self.alerts.values())
+
+    def new_id(self) -> str:
+        """A fresh alert ID (unique within this process)."""
+        return f"alert-{datetime.now().strftime('%Y%m%d%H%M%S')}-{next(self._sequence)}"
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def get(self, alert_id: str) -> Optional[dict]:
+        return self.alerts.get(alert_id)
+
+    def get_by_key(self, key: str) -> Optional[dict]:
+        alert_id = self.by_key.get(key)
+        return None if alert_id is None else self.alerts[alert_id]
+
+    def for_rule(self, rule_id: str) -> List[dict]:
+        return [self.alerts[i] for i in self.by_rule.get(rule_id, ())]
+
+    def for_source(self, source_id: str) -> List[dict]:
+        return [self.alerts[i] for i in self.by_source.get(source_id, ())]
+
+    def for_severity(self, severity: str) -> List[dict]:
+        return [self.alerts[i] for i in self.by_severity.get(severity, ())]
+
+    def count(self, severity: str) -> int:
+        return len(self.by_severity.get(severity, ()))
+
+    def triggered_rules(self) -> List[str]:
+        """Rules with at least one active alert, sorted."""
+        return sorted(rule_id for rule_id, ids in self.by_rule.items() if ids)
+
+    # -------------------------------------------------------------------------
+    # Mutations
+    # -------------------------------------------------------------------------
+
+    def add(self, alert: dict, key: Optional[str] = None) -> dict:
+        """Add (or replace) an active alert, optionally under a condition key."""
+        with self._lock:
+            alert_id = alert["id"]
+            if alert_id in self.alerts:
+                self._unindex(alert_id)
+            self._index(alert, key)
+            self._dirty[alert_id] = alert
+        return alert
+
+    def acknowledge(self, alert_id: str, at: Optional[str] = None) -> bool:
+        with self._lock:
+            alert = self.alerts.get(alert_id)
+            if alert is None:
+                return False
+            alert["status"] = "acknowledged"
+            alert["acknowledgedAt"] = at or datetime.now().isoformat()
+            self._dirty[alert_id] = alert
+        return True
+
+    def resolve(self, alert_id: str, at: Optional[str] = None) -> Optional[dict]:
+        """Move an active alert to the history; returns it, or None if unknown."""
+        with self._lock:
+            if alert_id not in self.alerts:
+                return None
+            alert = self._unindex(alert_id)
+            alert["status"] = "resolved"
+            alert["resolvedAt"] = at or datetime.now().isoformat()
+            self.history.append(alert)
+            self._dirty[alert_id] = alert
+        return alert
+
+    def resolve_key(self, key: str, at: Optional[str] = None) -> Optional[dict]:
+        alert_id = self.by_key.get(key)
+        return None if alert_id is None else self.resolve(alert_id, at)
+
+    def resolve_all(self, at: Optional[str] = None) -> int:
+        at = at or datetime.now().isoformat()
+        resolved = 0
+        for alert_id in list(self.alerts):
+            if self.resolve(alert_id, at) is not None:
+                resolved += 1
+        return resolved
+
+    def _index(self, alert: dict, key: Optional[str]) -> None:
+        alert_id = alert["id"]
+        self.alerts[alert_id] = alert
+        if key is not None:
+            self.keys[alert_id] = key
+            self.by_key[key] = alert_id
+        self.by_rule[alert.get("rule", "")].add(alert_id)
+        self.by_source[alert.get("source", "")].add(alert_id)
+        self.by_severity[alert.get("severity", "")].add(alert_id)
+
+    def _unindex(self, alert_id: str) -> dict:
+        alert = self.alerts.pop(alert_id)
+        key = self.keys.pop(alert_id, None)
+        if key is not None and self.by_key.get(key) == alert_id:
+            del self.by_key[key]
+        for index, field_name in ((self.by_rule, "rule"), (self.by_source, "source"),
+                                  (self.by_severity, "severity")):
+            ids = index.get(alert.get(field_name, ""))
+            if ids is not None:
+                ids.discard(alert_id)
+                if not ids:
+                    del index[alert.get(field_name, "")]
+        return alert
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def flush(self) -> int:
+        """
+        Write every alert changed since the last flush, in one transaction.
+
+        Returns:
+            Number of alerts written
+        """
+        with self._lock:
+            if not self._dirty:
+                return 0
+            now = time.time()
+            rows = [
+                (alert_id, self.keys.get(alert_id), alert.get("status", "open"), now,
+                 json.dumps(alert, default=str))
+                for alert_id, alert in self._dirty.items()
+            ]
+            self._dirty = {}
+
+        if self._db is None:
+            return 0
+        try:
+            with self._db_lock, self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO alerts (id, alert_key, status, updated, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not persist {len(rows)} alerts: {e}")
+            return 0
+        self.flushed += len(rows)
+        return len(rows)
+
+    def load(self) -> int:
+        """
+        Restore active alerts and recent history from the database.
+
+        Returns:
+            Number of active alerts restored
+        """
+        if self._db is None:
+            return 0
+        with self._db_lock:
+            self._prune()
+            placeholders = ", ".join("?" for _ in ACTIVE_STATUSES)
+            active = self._db.execute(
+                f"SELECT alert_key, data FROM alerts WHERE status IN ({placeholders})",
+                ACTIVE_STATUSES,
+            ).fetchall()
+            resolved = self._db.execute(
+                "SELECT data FROM alerts WHERE status = 'resolved' ORDER BY updated DESC LIMIT ?",
+                (self.history_size,),
+            ).fetchall()
+
+        with self._lock:
+            for key, data in active:
+                self._index(json.loads(data), key)
+            self.history.extend(json.loads(data) for (data,) in reversed(resolved))
+        logger.info(f"Restored {len(active)} active alerts and {len(resolved)} resolved "
+                    f"alerts from {self.path}")
+        return len(active)
+
+    def _prune(self) -> None:
+        """Drop resolved alerts that fell out of the history window."""
+        with self._db:
+            self._db.execute(
+                "DELETE FROM alerts WHERE status = 'resolved' AND id NOT IN ("
+                "SELECT id FROM alerts WHERE status = 'resolved' ORDER BY updated DESC LIMIT ?)",
+                (self.history_size,),
+            )
+
+    def close(self) -> None:
+        """Write pending changes and close the database."""
+        self.flush()
+        if self._db is not None:
+            with self._db_lock:
+                self._prune()
+                self._db.close()
+            self._db = None
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self.alerts),
+            "history": len(self.history),
+            "pending": len(self._dirty),
+            "flushed": self.flushed,
+        }
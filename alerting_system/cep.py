@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Real-Time Alerting System - CEP Event Tracker
+==============================================
+
+Threshold-crossing events for the RSP sequence queries (e.g. CPU high ->
+memory high -> disk full). When a metric crosses its threshold the system
+gets a timestamp property such as ``highCpuEvent``; the property is cleared
+once the metric returns past the clear threshold (hysteresis), so a metric
+hovering around the threshold does not flap.
+
+- Definitions are read from the alerting ontology
+  (``alert:CepEventDefinition`` individuals), with the same values
+  built in as a fallback
+- Event state lives in flat arrays with one slot per (system, event)
+- ``update`` returns transitions only: events that started (timestamp)
+  or cleared (empty string). Still-active events are not rewritten
+
+Usage:
+    tracker = EventTracker(load_event_definitions(client))
+    tracker.restore(system_id, twin_properties)
+    changes = tracker.update(system_id, metric_values)
+"""
+
+import math
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from common import logger
+
+ALERT_NS = "http://tesserai.io/ontology/alerting_system#"
+
+
+@dataclass(frozen=True)
+class EventDefinition:
+    """A CEP event raised when a metric crosses a threshold."""
+    event: str
+    metric: str
+    threshold: float
+    clear_threshold: float
+    operator: str = "gt"
+
+
+# Built-in copy of the alert:CepEventDefinition individuals in the ontology
+DEFAULT_EVENT_DEFINITIONS = [
+    # Resource exhaustion sequence
+    EventDefinition("highCpuEvent", "cpuUsage", 70.0, 60.0),
+    EventDefinition("highMemoryEvent", "memoryUsage", 75.0, 65.0),
+    EventDefinition("highDiskEvent", "diskUsage", 85.0, 75.0),
+
+    # Performance degradation sequence
+    EventDefinition("slowResponseEvent", "responseTimeMs", 500.0, 300.0),
+    EventDefinition("highLatencyEvent", "avgLatencyMs", 200.0, 100.0),
+    EventDefinition("highErrorEvent", "errorRate", 2.0, 1.0),
+
+    # Queue pressure sequence
+    EventDefinition("queueBacklogEvent", "messageCount", 10000.0, 5000.0),
+    EventDefinition("staleMessagesEvent", "oldestMessageAge", 300.0, 120.0),
+    EventDefinition("dlqGrowthEvent", "deadLetterCount", 50.0, 20.0),
+
+    # Database stress sequence
+    EventDefinition("highConnectionsEvent", "connections", 150.0, 100.0),
+    EventDefinition("replicationLagEvent", "replicationLagMs", 1000.0, 500.0),
+    EventDefinition("slowQueriesEvent", "avgQueryTimeMs", 100.0, 50.0),
+]
+
+EVENT_DEFINITIONS_QUERY = f"""
+    PREFIX alert: <{ALERT_NS}>
+    SELECT ?event ?metric ?operator ?threshold ?clear
+    WHERE {{
+        ?definition a alert:CepEventDefinition ;
+                    alert:eventProperty ?event ;
+                    alert:eventMetric ?metric ;
+                    alert:triggerThreshold ?threshold ;
+                    alert:clearThreshold ?clear .
+        OPTIONAL {{ ?definition alert:eventOperator ?operator }}
+    }}
+    ORDER BY ?event
+"""
+
+
+def _value(binding: dict, var_name: str) -> Optional[str]:
+    value = binding.get(var_name)
+    if isinstance(value, dict):
+        return value.get("value")
+    return None if value is None else str(value)
+
+
+def load_event_definitions(client) -> List[EventDefinition]:
+    """
+    Read the CEP event definitions from the alerting ontology.
+
+    Falls back to DEFAULT_EVENT_DEFINITIONS when the ontology is not loaded
+    or the query fails.
+    """
+    try:
+        bindings = client.query.select(EVENT_DEFINITIONS_QUERY).bindings or []
+        definitions = [
+            EventDefinition(
+                event=_value(b, "event"),
+                metric=_value(b, "metric"),
+                threshold=float(_value(b, "threshold")),
+                clear_threshold=float(_value(b, "clear")),
+                operator=_value(b, "operator") or "gt",
+            )
+            for b in bindings
+        ]
+    except Exception as e:
+        logger.warning(f"Could not load CEP event definitions from ontology: {e}")
+        return list(DEFAULT_EVENT_DEFINITIONS)
+
+    if not definitions:
+        logger.info("No CEP event definitions in ontology, using defaults")
+        return list(DEFAULT_EVENT_DEFINITIONS)
+    logger.info(f"Loaded {len(definitions)} CEP event definitions from ontology")
+    return definitions
+
+
+class EventTracker:
+    """
+    Per-system CEP event state with hysteresis.
+
+    Each system owns one row of ``len(definitions)`` slots in two flat
+    arrays: an active flag and the time the event started (epoch seconds).
+    Timestamps are only formatted when an event starts.
+    """
+
+    def __init__(self, definitions: Iterable[EventDefinition] = DEFAULT_EVENT_DEFINITIONS):
+        self.definitions: List[EventDefinition] = list(definitions)
+        self.events: List[str] = [d.event for d in self.definitions]
+
+        # metric -> [(slot, threshold, clear threshold, rising)]
+        self.by_metric: Dict[str, List[Tuple[int, float, float, bool]]] = defaultdict(list)
+        for slot, d in enumerate(self.definitions):
+            self.by_metric[d.metric].append((slot, d.threshold, d.clear_threshold, d.operator != "lt"))
+
+        self.rows: Dict[str, int] = {}
+        self.active = bytearray()
+        self.started = array("d")
+
+        self.started_count = 0
+        self.cleared_count = 0
+
+    def _row(self, system_id: str) -> int:
+        row = self.rows.get(system_id)
+        if row is None:
+            row = len(self.rows)
+            self.rows[system_id] = row
+            self.active.extend(bytes(len(self.events)))
+            self.started.extend([math.nan] * len(self.events))
+        return row
+
+    def update(
+        self,
+        system_id: str,
+        values: Mapping[str, float],
+        now: Optional[datetime] = None,
+    ) -> Dict[str, str]:
+        """
+        Apply new metric values to a system.
+
+        Returns:
+            Transitions only: event -> ISO timestamp when it started,
+            event -> "" when it cleared
+        """
+        base = self._row(system_id) * len(self.events)
+        active, started = self.active, self.started
+        transitions: Dict[str, str] = {}
+        stamp = None
+
+        for metric, value in values.items():
+            checks = self.by_metric.get(metric)
+            if checks is None or value is None:
+                continue
+            for slot, threshold, clear, rising in checks:
+                i = base + slot
+                if active[i]:
+                    if (value < clear) if rising else (value > clear):
+                        active[i] = 0
+                        started[i] = math.nan
+                        transitions[self.events[slot]] = ""  # Empty string clears the property
+                        self.cleared_count += 1
+                elif (value > threshold) if rising else (value < threshold):
+                    if stamp is None:
+                        now = now or datetime.now()
+                        stamp, epoch = now.isoformat(), now.timestamp()
+                    active[i] = 1
+                    started[i] = epoch
+                    transitions[self.events[slot]] = stamp
+                    self.started_count += 1
+        return transitions
+
+    def restore(self, system_id: str, properties: Mapping) -> int:
+        """
+        Take over events already stamped on a twin (e.g. by a previous run).
+
+        Returns:
+            Number of active events restored
+        """
+        base = self._row(system_id) * len(self.events)
+        restored = 0
+        for slot, event in enumerate(self.events):
+            stamp = properties.get(event)
+            if not isinstance(stamp, str) or not stamp:
+                continue
+            try:
+                epoch = datetime.fromisoformat(stamp).timestamp()
+            except ValueError:
+                continue
+            self.active[base + slot] = 1
+            self.started[base + slot] = epoch
+            restored += 1
+        return restored
+
+    def active_events(self, system_id: str) -> Dict[str, str]:
+        """Active events of a system with their start timestamps."""
+        row = self.rows.get(system_id)
+        if row is None:
+            return {}
+        base = row * len(self.events)
+        return {
+            event: datetime.fromtimestamp(self.started[base + slot]).isoformat()
+            for slot, event in enumerate(self.events)
+            if self.active[base + slot]
+        }
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Real-Time Alerting System - Vectorized Fleet Simulator
+=======================================================
+
+Simulates metrics for a whole fleet per tick with NumPy, using the same
+model as ``simulator.SystemSimulator``:
+
+- Base value plus trend, sinusoidal seasonality and Gaussian noise
+- Anomalies (spike, degradation, outage) with per-system start and
+  duration; expired anomalies are cleared during the tick
+- Clamping to each metric's range, rounding to two decimals, then the
+  metric correlations (CPU -> response time -> error rate -> success rate,
+  queue backlog -> consume rate)
+
+Systems are grouped by type. Each group stores its metrics as a structured
+array with one float field per metric and one record per system; every
+step of a tick is an operation on the whole group.
+
+Requires NumPy (``pip install numpy``).
+
+Usage:
+    fleet = FleetSimulator({"web-01": "WebServer", ...}, METRIC_PROFILES)
+    fleet.tick(elapsed_seconds)
+    for system_id, values in fleet.iter_values():
+        ...
+"""
+
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+# Anomaly codes stored per system; names match simulator.AnomalyType values
+ANOMALY_NONE = 0
+ANOMALY_CODES = {"none": 0, "spike": 1, "degradation": 2, "outage": 3, "recovery": 4}
+ANOMALY_NAMES = {code: name for name, code in ANOMALY_CODES.items()}
+
+# Anomaly effects, as applied by SystemSimulator.apply_anomaly
+SPIKE_METRICS = ("cpuUsage", "memoryUsage", "responseTimeMs", "avgLatencyMs")
+DEGRADATION_RATES = {
+    "cpuUsage": 0.5,
+    "memoryUsage": 0.5,
+    "errorRate": 3.0,
+    "responseTimeMs": 2.0,
+    "avgLatencyMs": 2.0,
+}
+OUTAGE_VALUES = {
+    "requestsPerSecond": 0.0,
+    "queriesPerSecond": 0.0,
+    "errorRate": 100.0,
+    "successRate": 0.0,
+    "healthyInstances": 0.0,
+}
+
+
+def _anomaly_code(anomaly_type) -> int:
+    """Code for an AnomalyType member or its value string."""
+    return ANOMALY_CODES[getattr(anomaly_type, "value", anomaly_type)]
+
+
+class MetricGroup:
+    """
+    All systems of one type: metric parameters and the current values.
+
+    ``values`` is a structured array (one float64 field per metric);
+    ``matrix`` is a (systems x metrics) view of the same memory.
+    """
+
+    def __init__(self, system_type: str, system_ids: List[str], simulators: Mapping):
+        self.system_type = system_type
+        self.system_ids = system_ids
+        self.metrics: List[str] = list(simulators)
+        n = len(system_ids)
+
+        def param(attr: str) -> "np.ndarray":
+            return np.array([float(getattr(sim, attr, 0.0)) for sim in simulators.values()])
+
+        self.base = param("base_value")
+        self.noise = param("noise_std")
+        self.low = param("min_value")
+        self.high = param("max_value")
+        self.trend = param("trend")
+        self.amplitude = param("seasonality_amplitude")
+        period = param("seasonality_period")
+        self.seasonal = (self.amplitude > 0) & (period > 0)
+        self.period = np.where(self.seasonal, period, 1.0)
+
+        self.values = np.zeros(n, dtype=[(metric, np.float64) for metric in self.metrics])
+        self.matrix = self.values.view(np.float64).reshape(n, len(self.metrics))
+
+        self.anomaly = np.zeros(n, dtype=np.int8)
+        self.anomaly_start = np.zeros(n)
+        self.anomaly_duration = np.zeros(n)
+
+        column = {metric: j for j, metric in enumerate(self.metrics)}
+        self.spike_columns = np.array([column[m] for m in SPIKE_METRICS if m in column], dtype=np.intp)
+        self.degradation_rates = np.array([DEGRADATION_RATES.get(m, 0.0) for m in self.metrics])
+        outage = [(column[m], v) for m, v in OUTAGE_VALUES.items() if m in column]
+        self.outage_columns = np.array([j for j, _ in outage], dtype=np.intp)
+        self.outage_values = np.array([v for _, v in outage])
+
+    def tick(self, tick_count: int, elapsed: float, rng: "np.random.Generator") -> "np.ndarray":
+        """Simulate one tick in place; returns the rows whose anomaly expired."""
+        n, k = self.matrix.shape
+        center = self.base + self.trend * tick_count
+        phase = (elapsed % self.period) / self.period
+        center = center + np.where(self.seasonal, self.amplitude * np.sin(2 * np.pi * phase), 0.0)
+
+        matrix = self.matrix
+        np.multiply(rng.standard_normal((n, k)), self.noise, out=matrix)
+        matrix += center
+
+        expired = self._apply_anomalies(elapsed, rng)
+
+        np.clip(matrix, self.low, self.high, out=matrix)
+        np.round(matrix, 2, out=matrix)
+        self._apply_correlations()
+        return expired
+
+    def _apply_anomalies(self, elapsed: float, rng: "np.random.Generator") -> "np.ndarray":
+        active = self.anomaly != ANOMALY_NONE
+        if not active.any():
+            return np.empty(0, dtype=np.intp)
+
+        age = elapsed - self.anomaly_start
+        expired = np.flatnonzero(active & (age > self.anomaly_duration))
+        self.anomaly[expired] = ANOMALY_NONE
+
+        matrix = self.matrix
+        rows = np.flatnonzero(self.anomaly == ANOMALY_CODES["spike"])
+        if len(rows) and len(self.spike_columns):
+            cells = np.ix_(rows, self.spike_columns)
+            matrix[cells] *= 1.5 + 0.5 * rng.random((len(rows), len(self.spike_columns)))
+
+        rows = np.flatnonzero(self.anomaly == ANOMALY_CODES["degradation"])
+        if len(rows):
+            progress = age[rows] / np.maximum(self.anomaly_duration[rows], 1e-9)
+            matrix[rows] *= 1 + np.outer(progress, self.degradation_rates)
+
+        rows = np.flatnonzero(self.anomaly == ANOMALY_CODES["outage"])
+        if len(rows) and len(self.outage_columns):
+            matrix[np.ix_(rows, self.outage_columns)] = self.outage_values
+
+        return expired
+
+    def _apply_correlations(self) -> None:
+        values = self.values
+        names = set(self.metrics)
+
+        # High CPU -> Higher response time
+        if {"cpuUsage", "responseTimeMs"} <= names:
+            cpu, response = values["cpuUsage"], values["responseTimeMs"]
+            hot = cpu > 70
+            response[hot] *= 1 + (cpu[hot] - 70) / 30
+
+        # High response time -> Higher error rate
+        if {"responseTimeMs", "errorRate"} <= names:
+            response, errors = values["responseTimeMs"], values["errorRate"]
+            slow = response > 500
+            errors[slow] += (response[slow] - 500) / 100
+
+        # High error rate -> Lower success rate
+        if {"errorRate", "successRate"} <= names:
+            np.maximum(100 - values["errorRate"], 0, out=values["successRate"])
+
+        # Queue depth affects consume rate
+        if {"messageCount", "consumeRate"} <= names:
+            values["consumeRate"][values["messageCount"] > 20000] *= 0.8
+
+
+class FleetSimulator:
+    """
+    Metric simulation for many systems at once.
+
+    Args:
+        systems: system_id -> system type
+        profiles: system type -> {metric: MetricSimulator}; systems of a type
+            without a profile are ignored
+        seed: Seed for the random generator
+    """
+
+    def __init__(
+        self,
+        systems: Mapping[str, str],
+        profiles: Mapping[str, Mapping],
+        seed: Optional[int] = None,
+    ):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("The fleet simulator requires NumPy: pip install numpy")
+
+        by_type: Dict[str, List[str]] = {}
+        for system_id, system_type in systems.items():
+            if system_type in profiles:
+                by_type.setdefault(system_type, []).append(system_id)
+
+        self.groups: Dict[str, MetricGroup] = {
+            system_type: MetricGroup(system_type, ids, profiles[system_type])
+            for system_type, ids in by_type.items()
+        }
+        self.location: Dict[str, Tuple[MetricGroup, int]] = {
+            system_id: (group, row)
+            for group in self.groups.values()
+            for row, system_id in enumerate(group.system_ids)
+        }
+        self.rng = np.random.default_rng(seed)
+        self.tick_count = 0
+        self.elapsed = 0.0
+
+    def __len__(self) -> int:
+        return len(self.location)
+
+    def tick(self, elapsed_seconds: float) -> List[str]:
+        """
+        Simulate one tick for every system.
+
+        Returns:
+            Systems whose anomaly expired during this tick
+        """
+        self.tick_count += 1
+        self.elapsed = elapsed_seconds
+        expired: List[str] = []
+        for group in self.groups.values():
+            rows = group.tick(self.tick_count, elapsed_seconds, self.rng)
+            expired.extend(group.system_ids[row] for row in rows.tolist())
+        return expired
+
+    def iter_values(self) -> Iterator[Tuple[str, Dict[str, float]]]:
+        """(system_id, {metric: value}) for every system, from the last tick."""
+        for group in self.groups.values():
+            metrics = group.metrics
+            for system_id, row in zip(group.system_ids, group.matrix.tolist()):
+                yield system_id, dict(zip(metrics, row))
+
+    def values(self, system_id: str) -> Dict[str, float]:
+        """Metric values of one system from the last tick."""
+        group, row = self.location[system_id]
+        return dict(zip(group.metrics, group.matrix[row].tolist()))
+
+    def inject_anomaly(
+        self,
+        system_ids: Iterable[str],
+        anomaly_type,
+        duration: float,
+        start: Optional[float] = None,
+    ) -> int:
+        """
+        Start an anomaly on systems (AnomalyType member or its value).
+
+        ``start`` is in the same elapsed seconds passed to ``tick`` and
+        defaults to the last tick. Returns the number of systems affected.
+        """
+        code = _anomaly_code(anomaly_type)
+        start = self.elapsed if start is None else start
+        count = 0
+        for system_id in system_ids:
+            located = self.location.get(system_id)
+            if located is None:
+                continue
+            group, row = located
+            group.anomaly[row] = code
+            group.anomaly_start[row] = start
+            group.anomaly_duration[row] = duration
+            count += 1
+        return count
+
+    def clear_anomalies(self) -> None:
+        """End every active anomaly."""
+        for group in self.groups.values():
+            group.anomaly[:] = ANOMALY_NONE
+
+    def anomaly_type(self, system_id: str) -> str:
+        """Current anomaly of a system, as an AnomalyType value."""
+        group, row = self.location[system_id]
+        return ANOMALY_NAMES[int(group.anomaly[row])]
+
+    def active_anomalies(self) -> int:
+        """Systems with an anomaly in progress."""
+        return sum(int(np.count_nonzero(group.anomaly)) for group in self.groups.values())
@@ -4,15 +4,19 @@ Real-Time Alerting System - Monitoring Daemon
 ==============================================
 
 A production-grade monitoring daemon that:
-- Continuously evaluates alert rules against system metrics
+- Continuously evaluates alert rules against system metrics, using
+  compiled threshold tables that only re-check changed metrics
 - Manages alert lifecycle (open, acknowledge, resolve)
-- Sends notifications through configured channels
+- Sends notifications through configured channels from per-channel
+  background queues (digests, rate limits, retries), so slow channels
+  never hold up rule evaluation
 - Handles alert deduplication and aggregation
 - Implements escalation policies
 
 Usage:
     python monitor.py [--base-url URL] [--interval SECONDS]
     python monitor.py --dry-run  # Show what would trigger without updating
+    python monitor.py --full-refresh  # Re-list every twin each cycle
 """
 
 import sys
@@ -22,14 +26,26 @@ import random
 import argparse
 import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
 from enum import Enum
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from common import get_client, create_twin_safe, add_relationship_safe, logger
+from common import get_client, create_twin_safe, add_relationship_safe, logger, fetch_twin_changes, fetch_twin_ids
+from alerting_system.rule_engine import RuleEngine
+from alerting_system.notifications import NotificationDispatcher
+
+
+SYSTEM_TYPES = ["WebServer", "DatabaseServer", "ApplicationService", "MessageQueue"]
+
+# Metric refresh modes: only twins changed since the last poll, or a full
+# re-listing of the domain every cycle
+REFRESH_DELTA = "delta"
+REFRESH_FULL = "full"
+# Seconds between twin-ID diffs in delta mode (the change feed has no deletes)
+MEMBERSHIP_CHECK_INTERVAL = 60.0
 
 
 class AlertStatus(Enum):
@@ -97,25 +113,43 @@ class AlertMonitor:
     Real-time alert monitoring engine.
     """
 
-    def __init__(self, client, check_interval: float = 10.0, dry_run: bool = False):
+    def __init__(self, client, check_interval: float = 10.0, dry_run: bool = False,
+                 refresh_mode: str = REFRESH_DELTA):
         self.client = client
         self.check_interval = check_interval
         self.dry_run = dry_run
+        self.refresh_mode = refresh_mode
+
+        # lastHeartbeat of the newest metric update seen so far
+        self.metrics_cursor: Optional[str] = None
+        # Stamps inside the feed's lookback window, already applied
+        self._feed_stamps: Dict[str, str] = {}
+        self._membership_checked = 0.0
 
         self.rules: Dict[str, AlertRule] = {}
         self.active_alerts: Dict[str, ActiveAlert] = {}
         self.systems: Dict[str, Dict] = {}
         self.channels: Dict[str, Dict] = {}
 
-        # Condition tracking for duration-based alerts
-        self.condition_start: Dict[str, datetime] = {}
+        # Compiled rules and the metric matrix they are evaluated over
+        self.rule_engine = RuleEngine()
+        self._reconcile_alerts = False
+
+        # Condition tracking for duration-based alerts, keyed by
+        # (rule_id, system_id); pending conditions have not alerted yet
+        self.condition_start: Dict[Tuple[str, str], datetime] = {}
+        self.pending: Dict[Tuple[str, str], float] = {}
+
+        # Notifications are queued per channel and delivered in the background
+        self.notifier = NotificationDispatcher(self.send_to_channel)
 
         # Statistics
         self.stats = {
             "checks": 0,
+            "cells_evaluated": 0,
+            "twins_refreshed": 0,
             "alerts_triggered": 0,
             "alerts_resolved": 0,
-            "notifications_sent": 0,
         }
 
     def _normalize_properties(self, properties: Dict) -> Dict:
@@ -172,7 +206,7 @@ class AlertMonitor:
                         "config": props.get("config", {}),
                     }
 
-                elif twin_type in ["WebServer", "DatabaseServer", "ApplicationService", "MessageQueue"]:
+                elif twin_type in SYSTEM_TYPES:
                     self.systems[twin_id] = {
                         "id": twin_id,
                         "name": twin_dict.get("name", twin_id),
@@ -197,6 +231,16 @@ class AlertMonitor:
                         escalation_level=props.get("escalationLevel", 0),
                     )
 
+            # twins.list returns a single page; a snapshot through the change
+            # feed picks up every system and sets the cursor
+            if self.refresh_mode == REFRESH_DELTA:
+                self.apply_twin_changes(since=None)
+
+            self.rule_engine.compile(self.rules.values())
+            for system_id, system in self.systems.items():
+                self.rule_engine.observe(system_id, system["type"], system["properties"])
+            self._reconcile_alerts = True
+
             logger.info(f"Loaded {len(self.rules)} rules, {len(self.systems)} systems, "
                        f"{len(self.channels)} channels, {len(self.active_alerts)} active alerts")
 
@@ -221,7 +265,7 @@ class AlertMonitor:
         return False
 
     def check_rule(self, rule: AlertRule, system_id: str, system: Dict) -> Optional[ActiveAlert]:
-        """Check if a rule triggers for a system."""
+        """Check if a rule triggers for a system (unindexed, for one-off checks)."""
         props = system.get("properties", {})
         metric_value = props.get(rule.metric)
 
@@ -230,52 +274,56 @@ class AlertMonitor:
 
         condition_met = self.evaluate_condition(metric_value, rule.condition, rule.threshold)
 
-        condition_key = f"{rule.rule_id}:{system_id}"
+        condition_key = (rule.rule_id, system_id)
 
         if condition_met:
             # Track condition start time
             if condition_key not in self.condition_start:
                 self.condition_start[condition_key] = datetime.now()
+                self.pending[condition_key] = metric_value
+            return self._check_duration(rule, system_id, metric_value)
 
-            # Check if duration requirement is met
-            elapsed = (datetime.now() - self.condition_start[condition_key]).total_seconds()
-
-            if elapsed >= rule.duration:
-                # Generate alert ID
-                alert_id = f"alert-{rule.rule_id}-{system_id}"
-
-                # Check if alert already exists
-                if alert_id in self.active_alerts:
-                    # Update existing alert
-                    alert = self.active_alerts[alert_id]
-                    alert.current_value = metric_value
-                    return None  # Already active, no new alert
-
-                # Create new alert
-                return ActiveAlert(
-                    alert_id=alert_id,
-                    rule_id=rule.rule_id,
-                    source_id=system_id,
-                    source_name=system.get("name", system_id),
-                    metric=rule.metric,
-                    current_value=metric_value,
-                    threshold=rule.threshold,
-                    severity=rule.severity,
-                    status=AlertStatus.OPEN,
-                    triggered_at=datetime.now(),
-                )
-        else:
-            # Condition no longer met
-            if condition_key in self.condition_start:
-                del self.condition_start[condition_key]
+        self._clear_condition(rule.rule_id, system_id)
+        return None
 
-            # Check if alert should be auto-resolved
-            alert_id = f"alert-{rule.rule_id}-{system_id}"
-            if alert_id in self.active_alerts:
-                alert = self.active_alerts[alert_id]
-                self.resolve_alert(alert, "Condition no longer met")
+    def _check_duration(self, rule: AlertRule, system_id: str,
+                        metric_value: float) -> Optional[ActiveAlert]:
+        """New alert once a condition has held for the rule's duration."""
+        condition_key = (rule.rule_id, system_id)
+        elapsed = (datetime.now() - self.condition_start[condition_key]).total_seconds()
+        if elapsed < rule.duration:
+            return None
+        self.pending.pop(condition_key, None)
 
-        return None
+        alert_id = f"alert-{rule.rule_id}-{system_id}"
+        if alert_id in self.active_alerts:
+            # Already active, just track the latest value
+            self.active_alerts[alert_id].current_value = metric_value
+            return None
+
+        system = self.systems.get(system_id, {})
+        return ActiveAlert(
+            alert_id=alert_id,
+            rule_id=rule.rule_id,
+            source_id=system_id,
+            source_name=system.get("name", system_id),
+            metric=rule.metric,
+            current_value=metric_value,
+            threshold=rule.threshold,
+            severity=rule.severity,
+            status=AlertStatus.OPEN,
+            triggered_at=datetime.now(),
+        )
+
+    def _clear_condition(self, rule_id: str, system_id: str):
+        """Condition no longer met: forget its start and auto-resolve the alert."""
+        condition_key = (rule_id, system_id)
+        self.condition_start.pop(condition_key, None)
+        self.pending.pop(condition_key, None)
+
+        alert = self.active_alerts.get(f"alert-{rule_id}-{system_id}")
+        if alert:
+            self.resolve_alert(alert, "Condition no longer met")
 
     def trigger_alert(self, alert: ActiveAlert, rule: AlertRule):
         """Trigger a new alert."""
@@ -348,27 +396,34 @@ class AlertMonitor:
         del self.active_alerts[alert.alert_id]
 
     def send_notifications(self, alert: ActiveAlert, rule: AlertRule):
-        """Send notifications for an alert."""
+        """Queue notifications for an alert on each of the rule's channels."""
         for channel_id in rule.notification_channels:
             channel = self.channels.get(channel_id)
             if not channel or not channel.get("enabled"):
                 continue
 
-            self.send_to_channel(alert, channel)
-            alert.notification_count += 1
-            self.stats["notifications_sent"] += 1
+            if self.notifier.submit(channel, alert):
+                alert.notification_count += 1
 
         alert.last_notification = datetime.now()
 
-    def send_to_channel(self, alert: ActiveAlert, channel: Dict):
-        """Send notification to a specific channel."""
+    def send_to_channel(self, channel: Dict, alerts: List[ActiveAlert]):
+        """
+        Send one notification (a single alert or a digest) to a channel.
+
+        Called from the channel's dispatcher thread; raising makes the
+        dispatcher retry.
+        """
         channel_type = channel.get("type", "console")
 
         # Format message
-        message = self.format_alert_message(alert)
+        if len(alerts) == 1:
+            message = self.format_alert_message(alerts[0])
+        else:
+            message = self.format_digest(alerts)
 
         if channel_type == "console":
-            self.log_notification(channel, alert)
+            self.log_notification(channel, message)
         elif channel_type == "slack":
             logger.info(f"[SLACK] Would send to {channel['config'].get('channel')}: {message}")
         elif channel_type == "pagerduty":
@@ -386,6 +441,14 @@ class AlertMonitor:
                 f"{alert.metric}={alert.current_value} "
                 f"(threshold: {alert.threshold})")
 
+    def format_digest(self, alerts: List[ActiveAlert]) -> str:
+        """Format several alerts as one notification, critical first."""
+        critical = sum(1 for a in alerts if a.severity == "critical")
+        lines = [f"{len(alerts)} alerts ({critical} critical)"]
+        lines.extend(self.format_alert_message(a)
+                     for a in sorted(alerts, key=lambda a: a.severity != "critical"))
+        return "\n  ".join(lines)
+
     def log_alert(self, alert: ActiveAlert, action: str, detail: str = ""):
         """Log alert action to console."""
         color = {
@@ -402,33 +465,121 @@ class AlertMonitor:
               f"{alert.metric}={alert.current_value:.2f} "
               f"(threshold: {alert.threshold}){detail_str}")
 
-    def log_notification(self, channel: Dict, alert: ActiveAlert):
+    def log_notification(self, channel: Dict, message: str):
         """Log notification to console."""
         timestamp = datetime.now().strftime("%H:%M:%S")
         print(f"{timestamp} {Colors.MAGENTA}[NOTIFY]{Colors.RESET} "
-              f"-> {channel['name']}: {self.format_alert_message(alert)}")
+              f"-> {channel['name']}: {message}")
 
     def check_all_rules(self):
-        """Evaluate all rules against all systems."""
+        """
+        Evaluate all rules against all systems.
+
+        Only metric values that changed since the last check are
+        re-evaluated; conditions that keep holding are tracked in
+        ``condition_start`` until their duration elapses.
+        """
         self.stats["checks"] += 1
+        result = self.rule_engine.evaluate()
+        self.stats["cells_evaluated"] += result.cells_evaluated
 
-        for rule_id, rule in self.rules.items():
-            if not rule.enabled:
-                continue
+        for rule_id, system_id, _ in result.cleared:
+            self._clear_condition(rule_id, system_id)
 
-            for system_id, system in self.systems.items():
-                # Check if rule applies to this system type
-                if rule.target_type and system.get("type") != rule.target_type:
-                    continue
+        now = datetime.now()
+        for rule_id, system_id, value in result.started:
+            self.condition_start[(rule_id, system_id)] = now
+            self.pending[(rule_id, system_id)] = value
+
+        for rule_id, system_id, value in result.held:
+            condition_key = (rule_id, system_id)
+            if condition_key in self.pending:
+                self.pending[condition_key] = value
+            else:
+                alert = self.active_alerts.get(f"alert-{rule_id}-{system_id}")
+                if alert:
+                    alert.current_value = value
+
+        # Alerts loaded from DTaaS whose condition no longer holds
+        if self._reconcile_alerts:
+            self._reconcile_alerts = False
+            for alert in list(self.active_alerts.values()):
+                if self.rule_engine.is_matching(alert.rule_id, alert.source_id) is False:
+                    self._clear_condition(alert.rule_id, alert.source_id)
+
+        # Conditions waiting for their duration to elapse
+        for (rule_id, system_id), value in list(self.pending.items()):
+            rule = self.rules[rule_id]
+            new_alert = self._check_duration(rule, system_id, value)
+            if new_alert:
+                self.trigger_alert(new_alert, rule)
+
+    def apply_twin_changes(self, since: Optional[str]) -> bool:
+        """
+        Patch ``systems`` in place with twins changed since a cursor.
 
-                # Evaluate rule
-                new_alert = self.check_rule(rule, system_id, system)
+        Returns:
+            False if the change feed is unavailable
+        """
+        changes = fetch_twin_changes(self.client, "alerting_system", since=since,
+                                     seen=self._feed_stamps if since is not None else None)
+        if changes is None:
+            return False
+
+        for twin_id, props in changes.properties.items():
+            system = self.systems.get(twin_id)
+            if system is None:
+                twin_type = changes.types.get(twin_id, "")
+                if twin_type not in SYSTEM_TYPES:
+                    continue
+                system = self.systems[twin_id] = {
+                    "id": twin_id,
+                    "name": props.get("label", twin_id),
+                    "type": twin_type,
+                    "properties": {},
+                }
+            system["properties"].update(props)
+            self.rule_engine.observe(twin_id, system["type"], system["properties"])
+
+        self.metrics_cursor = changes.cursor
+        self._feed_stamps = changes.stamps
+        if since is None:
+            self._membership_checked = time.monotonic()
+        self.stats["twins_refreshed"] += len(changes.properties)
+        return True
+
+    def remove_deleted_systems(self) -> bool:
+        """
+        Drop systems whose twins no longer exist, resolving their alerts.
 
-                if new_alert:
-                    self.trigger_alert(new_alert, rule)
+        Returns:
+            False if the twin IDs could not be fetched
+        """
+        twin_ids = fetch_twin_ids(self.client, "alerting_system")
+        if twin_ids is None:
+            return False
+        self._membership_checked = time.monotonic()
+
+        for system_id in [s for s in self.systems if s not in twin_ids]:
+            del self.systems[system_id]
+            self._feed_stamps.pop(system_id, None)
+            self.rule_engine.forget(system_id)
+            rule_ids = {rule_id for rule_id, source_id in self.condition_start if source_id == system_id}
+            rule_ids.update(a.rule_id for a in self.active_alerts.values() if a.source_id == system_id)
+            for rule_id in rule_ids:
+                self._clear_condition(rule_id, system_id)
+            logger.info(f"System {system_id} was deleted")
+        return True
 
     def refresh_system_metrics(self):
         """Refresh system metrics from DTaaS."""
+        if self.refresh_mode == REFRESH_DELTA:
+            if self.apply_twin_changes(since=self.metrics_cursor):
+                if time.monotonic() - self._membership_checked >= MEMBERSHIP_CHECK_INTERVAL:
+                    self.remove_deleted_systems()
+                return
+            logger.warning("Change feed unavailable, re-listing all twins")
+
         try:
             # Use larger page size to get all twins
             twins = self.client.twins.list(domain="alerting_system", page_size=200)
@@ -440,14 +591,17 @@ class AlertMonitor:
                 twin_type = type_val.split("#")[-1] if type_val else ""
                 twin_id = twin_dict["id"]
 
-                if twin_type in ["WebServer", "DatabaseServer", "ApplicationService", "MessageQueue"]:
+                if twin_type in SYSTEM_TYPES:
                     raw_props = twin_dict.get("properties", {})
+                    props = self._normalize_properties(raw_props)
                     self.systems[twin_id] = {
                         "id": twin_id,
                         "name": twin_dict.get("name", twin_id),
                         "type": twin_type,
-                        "properties": self._normalize_properties(raw_props),
+                        "properties": props,
                     }
+                    self.rule_engine.observe(twin_id, twin_type, props)
+            self.stats["twins_refreshed"] += len(twins)
 
         except Exception as e:
             logger.warning(f"Failed to refresh metrics: {e}")
@@ -464,10 +618,12 @@ class AlertMonitor:
         print(Colors.RESET)
 
         print(f"\n Systems: {len(self.systems)} | Rules: {len(self.rules)} | "
-              f"Checks: {self.stats['checks']}")
+              f"Checks: {self.stats['checks']} | Twins refreshed: {self.stats['twins_refreshed']}")
+        notifications = self.notifier.stats()
         print(f" Alerts Triggered: {self.stats['alerts_triggered']} | "
               f"Resolved: {self.stats['alerts_resolved']} | "
-              f"Notifications: {self.stats['notifications_sent']}")
+              f"Notifications: {notifications['sent']} sent, {notifications['pending']} queued, "
+              f"{notifications['dead_lettered']} dead-lettered")
 
         # Active alerts
         print(f"\n{Colors.BOLD} ACTIVE ALERTS ({len(self.active_alerts)}){Colors.RESET}")
@@ -497,6 +653,7 @@ class AlertMonitor:
         """Run the monitoring loop."""
         logger.info("Starting alert monitor...")
         self.load_configuration()
+        self.notifier.start()
 
         try:
             while True:
@@ -515,6 +672,9 @@ class AlertMonitor:
         except KeyboardInterrupt:
             print("\n\nMonitor stopped.")
 
+        self.notifier.close()
+        notifications = self.notifier.stats()
+
         # Final summary
         print("\n" + "=" * 50)
         print(" MONITORING SESSION SUMMARY")
@@ -522,7 +682,8 @@ class AlertMonitor:
         print(f" Total checks:         {self.stats['checks']}")
         print(f" Alerts triggered:     {self.stats['alerts_triggered']}")
         print(f" Alerts resolved:      {self.stats['alerts_resolved']}")
-        print(f" Notifications sent:   {self.stats['notifications_sent']}")
+        print(f" Notifications sent:   {notifications['sent']} "
+              f"({notifications['digests']} deliveries, {notifications['dead_lettered']} dead-lettered)")
         print(f" Active alerts:        {len(self.active_alerts)}")
 
 
@@ -533,10 +694,13 @@ def main():
                        help="Check interval in seconds (default: 10)")
     parser.add_argument("--dry-run", action="store_true",
                        help="Don't persist changes, just show what would happen")
+    parser.add_argument("--full-refresh", action="store_true",
+                       help="Re-list every twin each cycle instead of fetching changes")
     args = parser.parse_args()
 
     client = get_client(args.base_url)
-    monitor = AlertMonitor(client, args.interval, args.dry_run)
+    refresh_mode = REFRESH_FULL if args.full_refresh else REFRESH_DELTA
+    monitor = AlertMonitor(client, args.interval, args.dry_run, refresh_mode)
 
     if args.dry_run:
         print("Running in DRY RUN mode - no changes will be persisted")
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Real-Time Alerting System - Notification Dispatcher
+====================================================
+
+Delivers notifications off the rule-check loop. Each channel has its own
+queue and worker thread, so a slow or failing channel only delays itself:
+
+- Alerts that arrive within ``digest_window`` seconds of each other go out
+  as one digest (up to ``max_digest`` alerts)
+- A token bucket per channel caps deliveries per second; while a channel
+  waits for a token, new alerts join the pending digest, so an alert storm
+  produces fewer, larger notifications instead of a growing backlog
+- Failed deliveries are retried with exponential backoff, then moved to a
+  bounded dead-letter queue. So are alerts that arrive while a channel's
+  queue is full
+
+Usage:
+    dispatcher = NotificationDispatcher(deliver).start()
+    dispatcher.submit(channel, alert)     # returns immediately
+    ...
+    dispatcher.close()
+
+``deliver(channel, alerts)`` is called on the channel's worker thread with
+one or more alerts and raises on failure.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+
+from common import logger
+
+DEFAULT_DIGEST_WINDOW = 1.0
+DEFAULT_MAX_DIGEST = 50
+DEFAULT_MAX_QUEUE = 10000
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_DELAY = 0.5
+DEAD_LETTER_LIMIT = 1000
+
+# Deliveries per second and burst size per channel type; None is unlimited.
+# A channel's config may override them with "ratePerSecond" and "burst".
+DEFAULT_RATE_LIMITS: Dict[str, Optional[Tuple[float, int]]] = {
+    "console": None,
+    "slack": (1.0, 5),
+    "pagerduty": (0.5, 3),
+    "email": (0.1, 2),
+    "webhook": (10.0, 20),
+}
+
+_STOP = object()
+
+
+class TokenBucket:
+    """Token bucket rate limiter: ``rate`` tokens per second, up to ``burst``."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available (0 if one is)."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+@dataclass
+class DeadLetter:
+    """Notifications given up on."""
+    channel_id: str
+    alerts: list
+    error: str
+    failed_at: float = field(default_factory=time.time)
+
+
+class ChannelLane:
+    """Queue, rate limiter, worker thread and counters of one channel."""
+
+    def __init__(self, channel: Dict, max_queue: int):
+        self.channel = channel
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue)
+
+        config = channel.get("config") or {}
+        limit = DEFAULT_RATE_LIMITS.get(channel.get("type", "console"))
+        if "ratePerSecond" in config:
+            limit = (float(config["ratePerSecond"]), int(config.get("burst", 1)))
+        self.bucket = TokenBucket(*limit) if limit and limit[0] > 0 else None
+
+        self.thread: Optional[threading.Thread] = None
+        self.counters = {
+            "queued": 0,
+            "sent": 0,
+            "digests": 0,
+            "retries": 0,
+            "dead_lettered": 0,
+        }
+
+
+class NotificationDispatcher:
+    """
+    Per-channel notification queues with digests, rate limits and retries.
+
+    Args:
+        deliver: ``deliver(channel, alerts)``; raises to signal a failure
+        digest_window: Seconds to wait for more alerts before sending
+        max_digest: Most alerts in one notification
+        max_queue: Alerts waiting per channel before new ones are dead-lettered
+        max_retries: Retries after the first failed attempt
+        retry_delay: Delay before the first retry (doubles each retry)
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[Dict, list], None],
+        digest_window: float = DEFAULT_DIGEST_WINDOW,
+        max_digest: int = DEFAULT_MAX_DIGEST,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+    ):
+        self.deliver = deliver
+        self.digest_window = digest_window
+        self.max_digest = max(1, max_digest)
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self.lanes: Dict[str, ChannelLane] = {}
+        self.dead_letters: deque = deque(maxlen=DEAD_LETTER_LIMIT)
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+
+    def start(self) -> "NotificationDispatcher":
+        """Start delivering; alerts submitted earlier are already queued."""
+        with self._lock:
+            self._started = True
+            for channel_id, lane in self.lanes.items():
+                self._start_lane(channel_id, lane)
+        return self
+
+    def _start_lane(self, channel_id: str, lane: ChannelLane) -> None:
+        if lane.thread is None:
+            lane.thread = threading.Thread(
+                target=self._run, args=(lane,), name=f"notify-{channel_id}", daemon=True
+            )
+            lane.thread.start()
+
+    def submit(self, channel: Dict, alert) -> bool:
+        """
+        Queue an alert for a channel without waiting for delivery.
+
+        Returns:
+            False if the channel's queue is full (the alert is dead-lettered)
+        """
+        channel_id = channel["id"]
+        lane = self.lanes.get(channel_id)
+        if lane is None:
+            with self._lock:
+                lane = self.lanes.get(channel_id)
+                if lane is None:
+                    lane = self.lanes[channel_id] = ChannelLane(channel, self.max_queue)
+                    if self._started and not self._closed:
+                        self._start_lane(channel_id, lane)
+
+        try:
+            lane.queue.put_nowait(alert)
+        except queue.Full:
+            self._dead_letter(lane, [alert], "queue full")
+            return False
+        lane.counters["queued"] += 1
+        return True
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Send what is queued (without digest delays) and stop the workers."""
+        with self._lock:
+            self._closed = True
+            lanes = list(self.lanes.values())
+        for lane in lanes:
+            if lane.thread is not None:
+                lane.queue.put(_STOP)
+        deadline = time.monotonic() + timeout
+        for lane in lanes:
+            if lane.thread is not None:
+                lane.thread.join(max(0.0, deadline - time.monotonic()))
+
+    def _collect(self, lane: ChannelLane, batch: list, until: float) -> bool:
+        """Add queued alerts to ``batch`` until a deadline; False once stopping."""
+        while len(batch) < self.max_digest:
+            timeout = until - time.monotonic()
+            try:
+                item = lane.queue.get(timeout=timeout) if timeout > 0 else lane.queue.get_nowait()
+            except queue.Empty:
+                return True
+            if item is _STOP:
+                return False
+            batch.append(item)
+        return True
+
+    def _run(self, lane: ChannelLane) -> None:
+        running = True
+        while running:
+            item = lane.queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            running = self._collect(lane, batch, time.monotonic() + self.digest_window)
+
+            # Rate limited: keep collecting into this digest while waiting
+            if lane.bucket is not None:
+                wait = lane.bucket.wait_time()
+                while wait > 0:
+                    if running and len(batch) < self.max_digest:
+                        running = self._collect(lane, batch, time.monotonic() + wait)
+                    else:
+                        time.sleep(wait)
+                    wait = lane.bucket.wait_time()
+                lane.bucket.take()
+
+            self._send(lane, batch)
+
+        # Stopping: send the rest immediately
+        rest = []
+        self._collect(lane, rest, 0)
+        while rest:
+            self._send(lane, rest[:self.max_digest])
+            rest = rest[self.max_digest:]
+
+    def _send(self, lane: ChannelLane, alerts: list) -> None:
+        delay = self.retry_delay
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.deliver(lane.channel, alerts)
+            except Exception as e:
+                error = str(e)
+                if attempt < self.max_retries:
+                    lane.counters["retries"] += 1
+                    time.sleep(delay)
+                    delay *= 2
+                continue
+            lane.counters["sent"] += len(alerts)
+            lane.counters["digests"] += 1
+            return
+        logger.warning(f"Notification to {lane.channel.get('name', lane.channel['id'])} failed "
+                       f"after {self.max_retries + 1} attempts: {error}")
+        self._dead_letter(lane, alerts, error)
+
+    def _dead_letter(self, lane: ChannelLane, alerts: list, error: str) -> None:
+        lane.counters["dead_lettered"] += len(alerts)
+        self.dead_letters.append(DeadLetter(lane.channel["id"], alerts, error))
+
+    def pending(self) -> int:
+        """Alerts queued across all channels."""
+        return sum(lane.queue.qsize() for lane in self.lanes.values())
+
+    def stats(self) -> Dict[str, int]:
+        """Counters summed over all channels, plus the current backlog."""
+        totals = {"queued": 0, "sent": 0, "digests": 0, "retries": 0, "dead_lettered": 0}
+        for lane in self.lanes.values():
+            for name, value in lane.counters.items():
+                totals[name] += value
+        totals["pending"] = self.pending()
+        return totals
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Real-Time Alerting System - Indexed Rule Engine
+================================================
+
+Evaluates every alert rule against every system without a rules x systems
+loop:
+
+- Rules are compiled once into threshold tables, one per
+  (targetType, metric). Within a table, rules are sorted by threshold per
+  condition, so the rules a value satisfies are a slice found by binary
+  search (``greater_than`` matches every threshold below the value, and so
+  on)
+- Metric values live in a matrix with one float column per rule metric and
+  one row per system. Only cells whose value changed since the last
+  evaluation are re-evaluated, one column at a time (NumPy
+  ``searchsorted`` when available)
+- Each evaluation reports transitions: conditions that started or cleared,
+  and still-matching conditions whose value changed
+
+Usage:
+    engine = RuleEngine(rules)
+    engine.observe(system_id, system_type, properties)
+    result = engine.evaluate()
+"""
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+# Columns shorter than this are searched with bisect instead of NumPy
+VECTORIZE_MIN_ROWS = 64
+
+NO_MATCHES: FrozenSet[str] = frozenset()
+
+
+def _as_float(value) -> float:
+    """Metric value as a float; NaN for missing or non-numeric values."""
+    if value is None or isinstance(value, bool):
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+@dataclass
+class EvaluationResult:
+    """Condition transitions since the previous evaluation."""
+    started: List[Tuple[str, str, float]] = field(default_factory=list)
+    cleared: List[Tuple[str, str, float]] = field(default_factory=list)
+    held: List[Tuple[str, str, float]] = field(default_factory=list)
+    cells_evaluated: int = 0
+
+
+class ThresholdTable:
+    """Rules on one (targetType, metric), sorted by threshold per condition."""
+
+    def __init__(self, rules: Iterable[Tuple[str, str, float]]):
+        by_condition: Dict[str, List[Tuple[float, str]]] = defaultdict(list)
+        for rule_id, condition, threshold in rules:
+            by_condition[condition].append((threshold, rule_id))
+        for entries in by_condition.values():
+            entries.sort()
+
+        def split(condition: str) -> Tuple[List[float], List[str]]:
+            entries = by_condition.get(condition, [])
+            return [t for t, _ in entries], [r for _, r in entries]
+
+        self.above = split("greater_than")
+        self.at_or_above = split("greater_than_or_equals")
+        self.below = split("less_than")
+        self.at_or_below = split("less_than_or_equals")
+
+        self.equal: Dict[float, List[str]] = defaultdict(list)
+        for threshold, rule_id in by_condition.get("equals", []):
+            self.equal[threshold].append(rule_id)
+        self.not_equal = by_condition.get("not_equals", [])
+
+        self._searched = [
+            (self.above, "left", True),
+            (self.at_or_above, "right", True),
+            (self.below, "right", False),
+            (self.at_or_below, "left", False),
+        ]
+        self._arrays = None
+
+    def match(self, value: float) -> FrozenSet[str]:
+        """Rule IDs whose condition holds for one value."""
+        matched: List[str] = []
+        for (thresholds, rule_ids), side, prefix in self._searched:
+            if not thresholds:
+                continue
+            cut = (bisect_left if side == "left" else bisect_right)(thresholds, value)
+            matched.extend(rule_ids[:cut] if prefix else rule_ids[cut:])
+        self._match_equality(value, matched)
+        return frozenset(matched)
+
+    def match_column(self, values: Sequence[float]) -> List[FrozenSet[str]]:
+        """Rule IDs whose condition holds, for each value of a column."""
+        if not NUMPY_AVAILABLE or len(values) < VECTORIZE_MIN_ROWS:
+            return [self.match(v) for v in values]
+
+        if self._arrays is None:
+            self._arrays = [np.asarray(thresholds, dtype=np.float64)
+                            for (thresholds, _), _, _ in self._searched]
+        column = np.asarray(values, dtype=np.float64)
+        cuts = [
+            np.searchsorted(thresholds, column, side=side).tolist() if len(thresholds) else None
+            for thresholds, (_, side, _) in zip(self._arrays, self._searched)
+        ]
+
+        results = []
+        for i, value in enumerate(values):
+            matched: List[str] = []
+            for cut, ((_, rule_ids), _, prefix) in zip(cuts, self._searched):
+                if cut is not None:
+                    matched.extend(rule_ids[:cut[i]] if prefix else rule_ids[cut[i]:])
+            self._match_equality(value, matched)
+            results.append(frozenset(matched))
+        return results
+
+    def _match_equality(self, value: float, matched: List[str]) -> None:
+        if self.equal:
+            matched.extend(self.equal.get(value, ()))
+        for threshold, rule_id in self.not_equal:
+            if value != threshold:
+                matched.append(rule_id)
+
+
+class RuleEngine:
+    """
+    Compiled alert rules plus the metric matrix they are evaluated over.
+
+    Rules are any objects with ``rule_id``, ``metric``, ``condition``,
+    ``threshold``, ``target_type`` and ``enabled`` attributes (see
+    ``monitor.AlertRule``). A rule without a target type applies to every
+    system. Missing and non-numeric metric values never match, and leave
+    the condition state of that cell unchanged.
+    """
+
+    def __init__(self, rules: Iterable = ()):
+        self.tables: Dict[Tuple[Optional[str], str], ThresholdTable] = {}
+        self.metrics_by_type: Dict[Optional[str], List[str]] = {}
+        self._type_metrics: Dict[str, List[str]] = {}
+        self.rule_metric: Dict[str, str] = {}
+
+        self.rows: Dict[str, int] = {}
+        self.system_ids: List[str] = []
+        self.system_types: List[str] = []
+        self.columns: Dict[str, array] = {}
+        self.matches: Dict[str, List[FrozenSet[str]]] = {}
+        self.dirty: Dict[str, set] = defaultdict(set)
+
+        self.compile(rules)
+
+    def compile(self, rules: Iterable) -> None:
+        """(Re)build the threshold tables; every known cell is re-evaluated."""
+        grouped: Dict[Tuple[Optional[str], str], List[Tuple[str, str, float]]] = defaultdict(list)
+        self.rule_metric = {}
+        for rule in rules:
+            threshold = _as_float(rule.threshold)
+            if not rule.enabled or not rule.metric or math.isnan(threshold):
+                continue
+            grouped[(rule.target_type or None, rule.metric)].append(
+                (rule.rule_id, rule.condition, threshold)
+            )
+            self.rule_metric[rule.rule_id] = rule.metric
+
+        self.tables = {key: ThresholdTable(entries) for key, entries in grouped.items()}
+        metrics_by_type: Dict[Optional[str], set] = defaultdict(set)
+        for target_type, metric in self.tables:
+            metrics_by_type[target_type].add(metric)
+        self.metrics_by_type = {t: sorted(m) for t, m in metrics_by_type.items()}
+        self._type_metrics = {}
+
+        n = len(self.system_ids)
+        for metric in set(self.rule_metric.values()) - self.columns.keys():
+            self.columns[metric] = array("d", [math.nan]) * n
+            self.matches[metric] = [NO_MATCHES] * n
+        for metric, column in self.columns.items():
+            self.dirty[metric].update(i for i in range(n) if not math.isnan(column[i]))
+
+    def _metrics_for(self, system_type: str) -> List[str]:
+        metrics = self._type_metrics.get(system_type)
+        if metrics is None:
+            typed = self.metrics_by_type.get(system_type, [])
+            untyped = self.metrics_by_type.get(None, [])
+            metrics = typed + [m for m in untyped if m not in typed]
+            self._type_metrics[system_type] = metrics
+        return metrics
+
+    def observe(self, system_id: str, system_type: str, properties: Mapping) -> int:
+        """
+        Record a system's current metric values.
+
+        Returns:
+            Number of rule metrics whose value changed
+        """
+        row = self.rows.get(system_id)
+        if row is None:
+            row = len(self.system_ids)
+            self.rows[system_id] = row
+            self.system_ids.append(system_id)
+            self.system_types.append(system_type)
+            for metric, column in self.columns.items():
+                column.append(math.nan)
+                self.matches[metric].append(NO_MATCHES)
+
+        changed = 0
+        for metric in self._metrics_for(system_type):
+            value = _as_float(properties.get(metric))
+            column = self.columns[metric]
+            old = column[row]
+            if value == old or (math.isnan(value) and math.isnan(old)):
+                continue
+            column[row] = value
+            self.dirty[metric].add(row)
+            changed += 1
+        return changed
+
+    def forget(self, system_id: str) -> None:
+        """Drop a system's metric values and matches (its row is reused if it returns)."""
+        row = self.rows.get(system_id)
+        if row is None:
+            return
+        for metric, column in self.columns.items():
+            column[row] = math.nan
+            self.matches[metric][row] = NO_MATCHES
+            self.dirty[metric].discard(row)
+
+    def is_matching(self, rule_id: str, system_id: str) -> Optional[bool]:
+        """Whether a rule's condition holds for a system; None if the metric has no value."""
+        metric = self.rule_metric.get(rule_id)
+        row = self.rows.get(system_id)
+        if metric is None or row is None or math.isnan(self.columns[metric][row]):
+            return None
+        return rule_id in self.matches[metric][row]
+
+    def evaluate(self) -> EvaluationResult:
+        """Re-evaluate changed cells, one metric column at a time."""
+        result = EvaluationResult()
+        for metric, rows in self.dirty.items():
+            if not rows:
+                continue
+            column = self.columns[metric]
+            matches = self.matches[metric]
+
+            # Group the changed rows by the tables that apply to them
+            by_type: Dict[str, List[int]] = defaultdict(list)
+            for row in rows:
+                if not math.isnan(column[row]):
+                    by_type[self.system_types[row]].append(row)
+
+            for system_type, type_rows in by_type.items():
+                values = [column[row] for row in type_rows]
+                found = [NO_MATCHES] * len(type_rows)
+                for key in ((system_type, metric), (None, metric)):
+                    table = self.tables.get(key)
+                    if table is not None:
+                        found = [a | b for a, b in zip(found, table.match_column(values))]
+
+                for row, value, new in zip(type_rows, values, found):
+                    old = matches[row]
+                    matches[row] = new
+                    system_id = self.system_ids[row]
+                    for rule_id in new - old:
+                        result.started.append((rule_id, system_id, value))
+                    for rule_id in old - new:
+                        result.cleared.append((rule_id, system_id, value))
+                    for rule_id in new & old:
+                        result.held.append((rule_id, system_id, value))
+                result.cells_evaluated += len(type_rows)
+            rows.clear()
+        return result
@@ -9,11 +9,14 @@ Generates realistic metric data with:
 - Gradual degradation patterns
 - Correlated metrics (CPU -> Memory -> Response Time)
 - Configurable anomaly injection
+- Write-behind metric writes, coalesced per system and flushed in batches
+- Optional NumPy fleet simulation for load testing (see fleet_simulator.py)
 
 Usage:
     python simulator.py [--base-url URL] [--interval SECONDS]
     python simulator.py --chaos           # Inject random failures
     python simulator.py --scenario spike  # Run specific scenario
+    python simulator.py --vectorized      # NumPy fleet simulation
 """
 
 import sys
@@ -29,7 +32,8 @@ from enum import Enum
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from common import get_client, logger
+from common import get_client, logger, TwinWriteBuffer
+from alerting_system.fleet_simulator import FleetSimulator
 
 
 class AnomalyType(Enum):
@@ -52,6 +56,47 @@ class MetricSimulator:
     seasonality_period: float = 3600  # seconds
 
 
+# Metric simulators per system type
+METRIC_PROFILES: Dict[str, Dict[str, MetricSimulator]] = {
+    "WebServer": {
+        "cpuUsage": MetricSimulator(40, 8, 0, 100, 0, 10, 3600),
+        "memoryUsage": MetricSimulator(55, 5, 0, 100, 0, 5, 7200),
+        "diskUsage": MetricSimulator(45, 2, 0, 100, 0.001, 0, 0),  # Slow growth
+        "requestsPerSecond": MetricSimulator(500, 100, 0, 5000, 0, 200, 3600),
+        "responseTimeMs": MetricSimulator(100, 30, 10, 5000, 0, 20, 1800),
+        "errorRate": MetricSimulator(0.5, 0.3, 0, 100, 0, 0.2, 3600),
+        "activeConnections": MetricSimulator(200, 50, 0, 1000, 0, 50, 1800),
+    },
+    "DatabaseServer": {
+        "cpuUsage": MetricSimulator(30, 10, 0, 100, 0, 15, 3600),
+        "memoryUsage": MetricSimulator(60, 8, 0, 100, 0, 10, 7200),
+        "diskUsage": MetricSimulator(50, 3, 0, 100, 0.002, 0, 0),
+        "connections": MetricSimulator(50, 20, 0, 200, 0, 30, 1800),
+        "queriesPerSecond": MetricSimulator(1000, 300, 0, 10000, 0, 500, 3600),
+        "avgQueryTimeMs": MetricSimulator(10, 5, 0.1, 1000, 0, 5, 1800),
+        "slowQueries": MetricSimulator(2, 2, 0, 100, 0, 1, 3600),
+        "replicationLagMs": MetricSimulator(10, 15, 0, 10000, 0, 10, 600),
+    },
+    "ApplicationService": {
+        "cpuUsage": MetricSimulator(35, 12, 0, 100, 0, 10, 3600),
+        "memoryUsage": MetricSimulator(50, 8, 0, 100, 0.0005, 5, 7200),
+        "requestsPerSecond": MetricSimulator(300, 80, 0, 5000, 0, 100, 1800),
+        "avgLatencyMs": MetricSimulator(50, 15, 1, 5000, 0, 10, 1800),
+        "p99LatencyMs": MetricSimulator(200, 50, 10, 10000, 0, 30, 1800),
+        "errorRate": MetricSimulator(0.3, 0.2, 0, 100, 0, 0.1, 3600),
+        "successRate": MetricSimulator(99.5, 0.3, 0, 100, 0, 0.2, 3600),
+    },
+    "MessageQueue": {
+        "messageCount": MetricSimulator(5000, 2000, 0, 100000, 0, 1000, 1800),
+        "consumerCount": MetricSimulator(5, 2, 1, 20, 0, 0, 0),
+        "publishRate": MetricSimulator(500, 150, 0, 5000, 0, 200, 1800),
+        "consumeRate": MetricSimulator(480, 150, 0, 5000, 0, 200, 1800),
+        "oldestMessageAge": MetricSimulator(30, 20, 0, 3600, 0, 10, 600),
+        "deadLetterCount": MetricSimulator(10, 10, 0, 1000, 0.01, 0, 0),
+    },
+}
+
+
 class SystemSimulator:
     """
     Simulates realistic system metrics with anomalies.
@@ -72,51 +117,7 @@ class SystemSimulator:
 
     def setup_simulators(self):
         """Configure metric simulators based on system type."""
-        self.simulators: Dict[str, MetricSimulator] = {}
-
-        if self.system_type == "WebServer":
-            self.simulators = {
-                "cpuUsage": MetricSimulator(40, 8, 0, 100, 0, 10, 3600),
-                "memoryUsage": MetricSimulator(55, 5, 0, 100, 0, 5, 7200),
-                "diskUsage": MetricSimulator(45, 2, 0, 100, 0.001, 0, 0),  # Slow growth
-                "requestsPerSecond": MetricSimulator(500, 100, 0, 5000, 0, 200, 3600),
-                "responseTimeMs": MetricSimulator(100, 30, 10, 5000, 0, 20, 1800),
-                "errorRate": MetricSimulator(0.5, 0.3, 0, 100, 0, 0.2, 3600),
-                "activeConnections": MetricSimulator(200, 50, 0, 1000, 0, 50, 1800),
-            }
-
-        elif self.system_type == "DatabaseServer":
-            self.simulators = {
-                "cpuUsage": MetricSimulator(30, 10, 0, 100, 0, 15, 3600),
-                "memoryUsage": MetricSimulator(60, 8, 0, 100, 0, 10, 7200),
-                "diskUsage": MetricSimulator(50, 3, 0, 100, 0.002, 0, 0),
-                "connections": MetricSimulator(50, 20, 0, 200, 0, 30, 1800),
-                "queriesPerSecond": MetricSimulator(1000, 300, 0, 10000, 0, 500, 3600),
-                "avgQueryTimeMs": MetricSimulator(10, 5, 0.1, 1000, 0, 5, 1800),
-                "slowQueries": MetricSimulator(2, 2, 0, 100, 0, 1, 3600),
-                "replicationLagMs": MetricSimulator(10, 15, 0, 10000, 0, 10, 600),
-            }
-
-        elif self.system_type == "ApplicationService":
-            self.simulators = {
-                "cpuUsage": MetricSimulator(35, 12, 0, 100, 0, 10, 3600),
-                "memoryUsage": MetricSimulator(50, 8, 0, 100, 0.0005, 5, 7200),
-                "requestsPerSecond": MetricSimulator(300, 80, 0, 5000, 0, 100, 1800),
-                "avgLatencyMs": MetricSimulator(50, 15, 1, 5000, 0, 10, 1800),
-                "p99LatencyMs": MetricSimulator(200, 50, 10, 10000, 0, 30, 1800),
-                "errorRate": MetricSimulator(0.3, 0.2, 0, 100, 0, 0.1, 3600),
-                "successRate": MetricSimulator(99.5, 0.3, 0, 100, 0, 0.2, 3600),
-            }
-
-        elif self.system_type == "MessageQueue":
-            self.simulators = {
-                "messageCount": MetricSimulator(5000, 2000, 0, 100000, 0, 1000, 1800),
-                "consumerCount": MetricSimulator(5, 2, 1, 20, 0, 0, 0),
-                "publishRate": MetricSimulator(500, 150, 0, 5000, 0, 200, 1800),
-                "consumeRate": MetricSimulator(480, 150, 0, 5000, 0, 200, 1800),
-                "oldestMessageAge": MetricSimulator(30, 20, 0, 3600, 0, 10, 600),
-                "deadLetterCount": MetricSimulator(10, 10, 0, 1000, 0.01, 0, 0),
-            }
+        self.simulators: Dict[str, MetricSimulator] = dict(METRIC_PROFILES.get(self.system_type, {}))
 
     def simulate_tick(self, elapsed_seconds: float) -> Dict[str, float]:
         """Simulate one tick of metrics."""
@@ -228,14 +229,23 @@ class MetricSimulatorEngine:
     Engine that simulates metrics for all systems.
     """
 
-    def __init__(self, client, update_interval: float = 5.0, chaos_mode: bool = False):
+    def __init__(self, client, update_interval: float = 5.0, chaos_mode: bool = False,
+                 vectorized: bool = False):
         self.client = client
         self.update_interval = update_interval
         self.chaos_mode = chaos_mode
+        self.vectorized = vectorized
 
         self.systems: Dict[str, SystemSimulator] = {}
+        # With vectorized=True, metrics and anomalies are simulated here
+        # for the whole fleet instead of by each SystemSimulator
+        self.fleet: Optional[FleetSimulator] = None
         self.start_time = datetime.now()
 
+        # Metric writes are queued here and flushed in the background, so a
+        # tick never waits on one HTTP request per system
+        self.write_buffer = TwinWriteBuffer(client, flush_interval=min(1.0, update_interval))
+
     def load_systems(self):
         """Load systems from DTaaS."""
         try:
@@ -255,6 +265,12 @@ class MetricSimulatorEngine:
                         twin_dict.get("properties", {})
                     )
 
+            if self.vectorized:
+                self.fleet = FleetSimulator(
+                    {sys_id: sim.system_type for sys_id, sim in self.systems.items()},
+                    METRIC_PROFILES,
+                )
+
             logger.info(f"Loaded {len(self.systems)} systems for simulation")
 
         except Exception as e:
@@ -265,20 +281,22 @@ class MetricSimulatorEngine:
         """Run one simulation tick for all systems."""
         elapsed = (datetime.now() - self.start_time).total_seconds()
 
-        for system_id, simulator in self.systems.items():
-            # Generate new metric values
-            new_values = simulator.simulate_tick(elapsed)
-
-            # Update in DTaaS
-            try:
-                update_props = {
+        if self.fleet is not None:
+            for system_id in self.fleet.tick(elapsed):
+                self.systems[system_id].anomaly_type = AnomalyType.NONE
+            heartbeat = datetime.now().isoformat()
+            for system_id, new_values in self.fleet.iter_values():
+                self.write_buffer.put(system_id, {"lastHeartbeat": heartbeat, **new_values})
+        else:
+            for system_id, simulator in self.systems.items():
+                # Generate new metric values
+                new_values = simulator.simulate_tick(elapsed)
+
+                # Queue the update; the write buffer batches it into DTaaS
+                self.write_buffer.put(system_id, {
                     "lastHeartbeat": datetime.now().isoformat(),
                     **new_values
-                }
-                self.client.twins.update(system_id, {"properties": update_props})
-
-            except Exception as e:
-                logger.warning(f"Failed to update {system_id}: {e}")
+                })
 
         # Chaos mode: randomly inject anomalies
         if self.chaos_mode and random.random() < 0.05:  # 5% chance per tick
@@ -293,7 +311,14 @@ class MetricSimulatorEngine:
         anomaly_type = random.choice([AnomalyType.SPIKE, AnomalyType.DEGRADATION])
         duration = random.randint(30, 120)
 
+        self.inject_anomaly(system_id, anomaly_type, duration)
+
+    def inject_anomaly(self, system_id: str, anomaly_type: AnomalyType, duration: int = 60):
+        """Inject an anomaly into one system."""
         self.systems[system_id].inject_anomaly(anomaly_type, duration)
+        if self.fleet is not None:
+            elapsed = (datetime.now() - self.start_time).total_seconds()
+            self.fleet.inject_anomaly([system_id], anomaly_type, duration, start=elapsed)
 
     def inject_scenario(self, scenario: str):
         """Inject a predefined scenario."""
@@ -315,14 +340,14 @@ class MetricSimulatorEngine:
         """Sudden spike scenario on web servers."""
         for sys_id, sim in self.systems.items():
             if sim.system_type == "WebServer":
-                sim.inject_anomaly(AnomalyType.SPIKE, 60)
+                self.inject_anomaly(sys_id, AnomalyType.SPIKE, 60)
                 print(f"Injected spike into {sys_id}")
 
     def scenario_degradation(self):
         """Gradual degradation scenario."""
         for sys_id, sim in self.systems.items():
             if sim.system_type == "DatabaseServer":
-                sim.inject_anomaly(AnomalyType.DEGRADATION, 180)
+                self.inject_anomaly(sys_id, AnomalyType.DEGRADATION, 180)
                 print(f"Injected degradation into {sys_id}")
 
     def scenario_cascade(self):
@@ -330,7 +355,7 @@ class MetricSimulatorEngine:
         # Database goes down first
         for sys_id, sim in self.systems.items():
             if "db-primary" in sys_id:
-                sim.inject_anomaly(AnomalyType.OUTAGE, 120)
+                self.inject_anomaly(sys_id, AnomalyType.OUTAGE, 120)
                 print(f"Injected outage into {sys_id}")
                 break
 
@@ -338,12 +363,14 @@ class MetricSimulatorEngine:
         time.sleep(2)
         for sys_id, sim in self.systems.items():
             if sim.system_type == "ApplicationService":
-                sim.inject_anomaly(AnomalyType.DEGRADATION, 90)
+                self.inject_anomaly(sys_id, AnomalyType.DEGRADATION, 90)
 
     def scenario_recovery(self):
         """Clear all anomalies."""
         for sim in self.systems.values():
             sim.anomaly_type = AnomalyType.NONE
+        if self.fleet is not None:
+            self.fleet.clear_anomalies()
         print("All anomalies cleared")
 
     def print_status(self):
@@ -354,11 +381,14 @@ class MetricSimulatorEngine:
                                if s.anomaly_type != AnomalyType.NONE)
 
         elapsed = (datetime.now() - self.start_time).total_seconds()
+        writes = self.write_buffer.stats()
 
         print(f"\r[{datetime.now().strftime('%H:%M:%S')}] "
               f"Simulating {len(self.systems)} systems | "
               f"Elapsed: {elapsed:.0f}s | "
-              f"Active anomalies: {active_anomalies}",
+              f"Active anomalies: {active_anomalies} | "
+              f"Write queue: {writes['queue_depth']} | "
+              f"Flush: {writes['last_flush_ms']:.0f}ms",
               end="", flush=True)
 
     def run(self):
@@ -373,8 +403,10 @@ class MetricSimulatorEngine:
         print(f"\nSimulating {len(self.systems)} systems")
         print(f"Update interval: {self.update_interval}s")
         print(f"Chaos mode: {'ON' if self.chaos_mode else 'OFF'}")
+        print(f"Vectorized: {'ON' if self.fleet is not None else 'OFF'}")
         print("\nPress Ctrl+C to stop\n")
 
+        self.write_buffer.start()
         try:
             while True:
                 self.run_tick()
@@ -383,6 +415,13 @@ class MetricSimulatorEngine:
 
         except KeyboardInterrupt:
             print("\n\nSimulator stopped.")
+        finally:
+            self.write_buffer.close()
+
+        writes = self.write_buffer.stats()
+        print(f"Metric writes: {writes['written']} written, {writes['failed']} failed, "
+              f"{writes['coalesced']} coalesced over {writes['flushes']} flushes "
+              f"(avg {writes['avg_flush_ms']:.0f}ms, p95 {writes['p95_flush_ms']:.0f}ms)")
 
 
 def main():
@@ -392,22 +431,26 @@ def main():
                        help="Update interval in seconds (default: 5)")
     parser.add_argument("--chaos", action="store_true",
                        help="Enable random anomaly injection")
+    parser.add_argument("--vectorized", action="store_true",
+                       help="Simulate the whole fleet per tick with NumPy")
     parser.add_argument("--scenario",
                        choices=["spike", "degradation", "cascade", "recovery"],
                        help="Inject specific scenario and exit")
     args = parser.parse_args()
 
     client = get_client(args.base_url)
-    engine = MetricSimulatorEngine(client, args.interval, args.chaos)
+    engine = MetricSimulatorEngine(client, args.interval, args.chaos, args.vectorized)
 
     engine.load_systems()
 
     if args.scenario:
         engine.inject_scenario(args.scenario)
         # Run a few ticks to apply the scenario
+        engine.write_buffer.start()
         for _ in range(5):
             engine.run_tick()
             time.sleep(1)
+        engine.write_buffer.close()
         print("\nScenario applied.")
     else:
         engine.run()
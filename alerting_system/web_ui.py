@@ -9,11 +9,14 @@ A standalone web-based dashboard for monitoring and managing alerts with:
 - Alert rule management
 - Scenario injection (spike, degradation, cascade, recovery)
 - Notification channel status
-- RSP (RDF Stream Processing) continuous queries
+- RSP (RDF Stream Processing) continuous queries, with alerts pushed as
+  result windows arrive (pushed feed, or adaptive polling)
 - Metric trends visualization
+- Differential websocket updates: a snapshot on connect, then JSON patches
+- Alert state persisted to SQLite and restored on restart
 
 Usage:
-    python web_ui.py [--base-url URL] [--port PORT]
+    python web_ui.py [--base-url URL] [--port PORT] [--rsp-push-url WS_URL] [--alert-db PATH]
 """
 
 import sys
@@ -36,7 +39,12 @@ from websockets.server import serve
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'sdks', 'python'))
 
-from common import get_client, logger
+from common import (
+    get_client, logger, AsyncDTaaSClient, TwinWriteBuffer, VersionedState,
+    RspSubscription, websocket_rsp_feed, rsp_binding_hash,
+)
+from alerting_system.alert_store import AlertStore, DEFAULT_ALERT_DB
+from alerting_system.cep import EventTracker, load_event_definitions
 
 # RSP imports
 try:
@@ -287,29 +295,45 @@ class AlertingDashboard:
     Web-based alerting dashboard with real-time updates.
     """
 
-    def __init__(self, client, http_port: int = 8085, ws_port: int = 8086):
+    def __init__(self, client, http_port: int = 8085, ws_port: int = 8086,
+                 rsp_push_url: Optional[str] = None, alert_db: Optional[str] = None):
         self.client = client
+        # Non-blocking facade used from the asyncio simulation loop
+        self.aclient = AsyncDTaaSClient(client)
+        # Metric writes are coalesced per system and flushed in the background
+        self.write_buffer = TwinWriteBuffer(client)
         self.http_port = http_port
         self.ws_port = ws_port
 
         self.systems: Dict[str, SystemState] = {}
-        self.alerts: Dict[str, Dict] = {}
+        # Active alerts indexed by ID, condition key, rule, source and
+        # severity; resolved alerts go to its bounded history
+        self.alerts = AlertStore(alert_db)
+        # Alerts loaded from Alert twins; status changes are written back
+        self.alert_twins: Set[str] = set()
         self.rules: Dict[str, Dict] = {}
         self.channels: Dict[str, Dict] = {}
         self.policies: Dict[str, Dict] = {}
 
         self.connected_clients: Set = set()
+        # Dashboard state sent as one snapshot per client, then as patches
+        self.dashboard_state = VersionedState()
+        self._rsp_queries_message: Optional[str] = None
         self.running = False
         self.start_time = datetime.now()
 
-        # Alert history for notifications
-        self.alert_history: List[Dict] = []
+        # CEP threshold-crossing events (definitions come from the ontology)
+        self.cep = EventTracker()
 
         # RSP state
         self.rsp_enabled = False
         self.rsp_query_ids: List[str] = []
+        self.rsp_query_defs: Dict[str, Dict] = {}
         self.rsp_source_ids: List[str] = []
         self.rsp_alerts: List[Dict] = []
+        # Pushed RSP windows (websocket feed); polled when not set
+        self.rsp_push_url = rsp_push_url
+        self.rsp_subscription: Optional[RspSubscription] = None
 
     def _normalize_properties(self, properties: dict) -> dict:
         """Normalize property names by stripping domain prefixes."""
@@ -331,6 +355,8 @@ class AlertingDashboard:
             self.rules = {}
             self.channels = {}
             self.policies = {}
+            self.cep = EventTracker(load_event_definitions(self.client))
+            self.alerts.load()
 
             for twin in twins:
                 twin_dict = twin.model_dump() if hasattr(twin, 'model_dump') else twin
@@ -349,11 +375,14 @@ class AlertingDashboard:
                     )
                     self._setup_simulators(state)
                     self.systems[twin_id] = state
+                    self.cep.restore(twin_id, props)
 
                 elif twin_type == "Alert":
                     status = props.get("status", "")
                     if status in ["open", "acknowledged"]:
-                        self.alerts[twin_id] = {
+                        self.alert_twins.add(twin_id)
+                    if status in ["open", "acknowledged"] and twin_id not in self.alerts:
+                        self.alerts.add({
                             "id": twin_id,
                             "rule": props.get("ruleId", ""),
                             "source": props.get("sourceId", ""),
@@ -363,7 +392,7 @@ class AlertingDashboard:
                             "metric": props.get("metric", ""),
                             "value": props.get("currentValue", 0),
                             "threshold": props.get("threshold", 0),
-                        }
+                        })
 
                 elif twin_type == "AlertRule":
                     self.rules[twin_id] = {
@@ -441,9 +470,10 @@ class AlertingDashboard:
                 "deadLetterCount": MetricSimulator(10, 10, 0, 1000),
             }
 
-    def simulate_tick(self):
+    async def simulate_tick(self):
         """Simulate one tick for all systems."""
         elapsed = (datetime.now() - self.start_time).total_seconds()
+        updates: Dict[str, Dict] = {}
 
         for sys_id, state in self.systems.items():
             state.tick_count += 1
@@ -471,16 +501,16 @@ class AlertingDashboard:
             state.properties.update(new_values)
             state.properties["lastHeartbeat"] = datetime.now().isoformat()
 
-            # CEP Event Detection: Track threshold crossings with timestamps
-            # This enables sequence detection (Event A -> Event B -> Event C)
-            event_updates = self._track_threshold_events(state, new_values)
-            new_values.update(event_updates)
+            # CEP Event Detection: Stamp threshold crossings with timestamps
+            # This enables sequence detection (Event A -> Event B -> Event C);
+            # only started and cleared events are written
+            new_values.update(self.cep.update(sys_id, new_values))
+            new_values["lastHeartbeat"] = state.properties["lastHeartbeat"]
+            updates[sys_id] = new_values
 
-            # Update in DTaaS
-            try:
-                self.client.twins.update(sys_id, {"properties": new_values})
-            except Exception as e:
-                logger.warning(f"Failed to update {sys_id}: {e}")
+        # Queue the writes; the buffer flushes them in batches off the event loop
+        for sys_id, values in updates.items():
+            self.write_buffer.put(sys_id, values)
 
         # Check alert rules
         self._check_alert_rules()
@@ -537,69 +567,6 @@ class AlertingDashboard:
 
         return values
 
-    def _track_threshold_events(self, state: SystemState, values: Dict[str, float]) -> Dict[str, str]:
-        """
-        Track threshold crossing events with timestamps for CEP sequence detection.
-
-        When a metric crosses a threshold, we record the timestamp. This enables
-        SPARQL queries to detect temporal sequences like:
-        "CPU high (T1) -> Memory high (T2) -> Disk full (T3)" where T1 < T2 < T3
-
-        Events are cleared when conditions normalize, allowing new sequences to be detected.
-        """
-        # Initialize event tracking state if not present
-        if not hasattr(state, 'active_events'):
-            state.active_events = {}
-
-        event_updates = {}
-        now = datetime.now().isoformat()
-
-        # Define CEP event thresholds
-        # Format: (metric_name, threshold, comparison, event_name, clear_threshold)
-        cep_thresholds = [
-            # Resource exhaustion sequence
-            ("cpuUsage", 70.0, "gt", "highCpuEvent", 60.0),
-            ("memoryUsage", 75.0, "gt", "highMemoryEvent", 65.0),
-            ("diskUsage", 85.0, "gt", "highDiskEvent", 75.0),
-
-            # Performance degradation sequence
-            ("responseTimeMs", 500.0, "gt", "slowResponseEvent", 300.0),
-            ("avgLatencyMs", 200.0, "gt", "highLatencyEvent", 100.0),
-            ("errorRate", 2.0, "gt", "highErrorEvent", 1.0),
-
-            # Queue pressure sequence
-            ("messageCount", 10000.0, "gt", "queueBacklogEvent", 5000.0),
-            ("oldestMessageAge", 300.0, "gt", "staleMessagesEvent", 120.0),
-            ("deadLetterCount", 50.0, "gt", "dlqGrowthEvent", 20.0),
-
-            # Database stress sequence
-            ("connections", 150.0, "gt", "highConnectionsEvent", 100.0),
-            ("replicationLagMs", 1000.0, "gt", "replicationLagEvent", 500.0),
-            ("avgQueryTimeMs", 100.0, "gt", "slowQueriesEvent", 50.0),
-        ]
-
-        for metric, threshold, comparison, event_name, clear_threshold in cep_thresholds:
-            if metric not in values:
-                continue
-
-            value = values[metric]
-            is_crossed = value > threshold if comparison == "gt" else value < threshold
-            is_cleared = value < clear_threshold if comparison == "gt" else value > clear_threshold
-
-            if is_crossed and event_name not in state.active_events:
-                # Threshold just crossed - record timestamp
-                state.active_events[event_name] = now
-                event_updates[event_name] = now
-            elif is_cleared and event_name in state.active_events:
-                # Condition normalized - clear the event
-                del state.active_events[event_name]
-                event_updates[event_name] = ""  # Empty string clears the property
-            elif event_name in state.active_events:
-                # Event still active - keep the original timestamp
-                event_updates[event_name] = state.active_events[event_name]
-
-        return event_updates
-
     def _check_alert_rules(self):
         """Check alert rules and create/update alerts."""
         new_alerts = []
@@ -634,10 +601,10 @@ class AlertingDashboard:
                 alert_key = f"{rule_id}:{sys_id}"
 
                 if triggered:
-                    if alert_key not in self.alerts:
+                    if alert_key not in self.alerts.by_key:
                         # Create new alert
                         alert = {
-                            "id": f"alert-{datetime.now().strftime('%Y%m%d%H%M%S')}-{len(self.alerts)}",
+                            "id": self.alerts.new_id(),
                             "rule": rule_id,
                             "source": sys_id,
                             "severity": severity,
@@ -647,12 +614,11 @@ class AlertingDashboard:
                             "value": value,
                             "threshold": threshold,
                         }
-                        self.alerts[alert_key] = alert
+                        self.alerts.add(alert, key=alert_key)
                         new_alerts.append(alert)
                 else:
                     # Resolve alert if it exists
-                    if alert_key in self.alerts:
-                        del self.alerts[alert_key]
+                    self.alerts.resolve_key(alert_key)
 
         return new_alerts
 
@@ -698,7 +664,7 @@ class AlertingDashboard:
             for state in self.systems.values():
                 state.anomaly_type = AnomalyType.NONE
                 affected.append(state.id)
-            self.alerts.clear()
+            self.alerts.resolve_all()
 
         return {"scenario": scenario, "affected": affected}
 
@@ -760,6 +726,7 @@ class AlertingDashboard:
                     )
                 )
                 self.rsp_query_ids.append(query.id)
+                self.rsp_query_defs[query.id] = query_def
                 logger.info(f"Created RSP query: {query.name}")
                 self.client.rsp.activate_query(query.id)
             except Exception as e:
@@ -769,6 +736,7 @@ class AlertingDashboard:
                     for q in queries.queries:
                         if q.name == query_def["name"]:
                             self.rsp_query_ids.append(q.id)
+                            self.rsp_query_defs[q.id] = query_def
                             break
                 except Exception:
                     pass
@@ -777,61 +745,50 @@ class AlertingDashboard:
         logger.info(f"RSP enabled: {self.rsp_enabled} ({len(self.rsp_query_ids)} queries)")
         return self.rsp_enabled
 
-    def check_rsp_alerts(self) -> List[Dict]:
-        """Check RSP query results and generate alerts."""
-        if not self.rsp_enabled:
-            return []
+    async def on_rsp_window(self, query_id: str, result):
+        """Turn a new RSP result window into alerts and push them to clients."""
+        query_def = self.rsp_query_defs.get(query_id, {})
+        bindings = getattr(result, "bindings", None) or []
+        logger.debug(
+            f"RSP window for '{query_def.get('name', query_id)}': "
+            f"{result.window_start} -> {result.window_end}, "
+            f"{getattr(result, 'event_count', 'N/A')} events, {len(bindings)} bindings"
+        )
+        if not bindings:
+            return
 
+        known = {a["id"] for a in self.rsp_alerts}
         new_alerts = []
-
-        for i, query_id in enumerate(self.rsp_query_ids):
-            query_def = RSP_CONTINUOUS_QUERIES[i] if i < len(RSP_CONTINUOUS_QUERIES) else {}
-
-            try:
-                results = self.client.rsp.get_query_results(query_id, limit=5)
-
-                # Log raw RSP response structure
-                if hasattr(results, 'results') and results.results:
-                    logger.info(f"=== RSP Response for '{query_def.get('name', query_id)}' ===")
-                    logger.info(f"  Total results: {len(results.results)}")
-
-                    for result in results.results:
-                        bindings = result.bindings if hasattr(result, 'bindings') else []
-                        logger.info(f"  Window: {result.window_start} -> {result.window_end}")
-                        logger.info(f"  Event count: {getattr(result, 'event_count', 'N/A')}")
-                        logger.info(f"  Bindings count: {len(bindings)}")
-
-                        if bindings:
-                            # Log first binding as example of raw format
-                            logger.info(f"  Example binding (raw): {json.dumps(bindings[0], default=str)}")
-
-                            for binding in bindings:
-                                binding_hash = hash(str(sorted(binding.items()) if isinstance(binding, dict) else binding))
-                                window_id = result.window_start or datetime.now().isoformat()
-                                alert_id = f"rsp-{query_id}-{window_id}-{binding_hash}"
-
-                                alert = {
-                                    "id": alert_id,
-                                    "type": query_def.get("name", "RSP Alert"),
-                                    "severity": query_def.get("severity", "info"),
-                                    "icon": query_def.get("icon", "📊"),
-                                    "message": self._format_rsp_alert(query_def, binding),
-                                    "timestamp": result.window_end or datetime.now().isoformat(),
-                                    "source": "RSP",
-                                    "data": binding,
-                                }
-
-                                if not any(a["id"] == alert_id for a in self.rsp_alerts):
-                                    new_alerts.append(alert)
-                                    logger.info(f"  RSP Alert: {alert['message']}")
-
-            except Exception as e:
-                logger.warning(f"Error checking RSP query {query_id}: {e}")
+        window_id = result.window_start or datetime.now().isoformat()
+        for binding in bindings:
+            binding_hash = rsp_binding_hash(binding)
+            alert_id = f"rsp-{query_id}-{window_id}-{binding_hash}"
+            if alert_id in known:
+                continue
+            known.add(alert_id)
+
+            alert = {
+                "id": alert_id,
+                "type": query_def.get("name", "RSP Alert"),
+                "severity": query_def.get("severity", "info"),
+                "icon": query_def.get("icon", "📊"),
+                "message": self._format_rsp_alert(query_def, binding),
+                "timestamp": result.window_end or datetime.now().isoformat(),
+                "source": "RSP",
+                "data": binding,
+            }
+            new_alerts.append(alert)
+            logger.info(f"RSP Alert: {alert['message']}")
 
         self.rsp_alerts.extend(new_alerts)
         self.rsp_alerts[:] = self.rsp_alerts[-30:]
 
-        return new_alerts
+        if new_alerts and self.connected_clients:
+            # Broadcast RSP alerts immediately, not on the next tick
+            await self.send_to_clients(json.dumps({
+                "type": "rsp_alerts",
+                "alerts": new_alerts
+            }))
 
     def _parse_sparql_value(self, binding: dict, var_name: str) -> str:
         """Parse a SPARQL binding value from RSP results.
@@ -918,20 +875,25 @@ class AlertingDashboard:
 
     def acknowledge_alert(self, alert_id: str) -> bool:
         """Acknowledge an alert."""
-        for key, alert in self.alerts.items():
-            if alert["id"] == alert_id:
-                alert["status"] = "acknowledged"
-                alert["acknowledgedAt"] = datetime.now().isoformat()
-                return True
-        return False
+        if not self.alerts.acknowledge(alert_id):
+            return False
+        if alert_id in self.alert_twins:
+            alert = self.alerts.get(alert_id)
+            self.write_buffer.put(alert_id, {
+                "status": "acknowledged",
+                "acknowledgedAt": alert["acknowledgedAt"],
+            })
+        return True
 
     def resolve_alert(self, alert_id: str) -> bool:
         """Resolve an alert."""
-        for key, alert in list(self.alerts.items()):
-            if alert["id"] == alert_id:
-                del self.alerts[key]
-                return True
-        return False
+        alert = self.alerts.resolve(alert_id)
+        if alert is None:
+            return False
+        if alert_id in self.alert_twins:
+            self.alert_twins.discard(alert_id)
+            self.write_buffer.put(alert_id, {"status": "resolved", "resolvedAt": alert["resolvedAt"]})
+        return True
 
     def toggle_rule(self, rule_id: str) -> bool:
         """Toggle an alert rule enabled/disabled."""
@@ -940,13 +902,18 @@ class AlertingDashboard:
             return True
         return False
 
-    def get_dashboard_data(self) -> Dict:
-        """Get current dashboard state."""
+    def get_dashboard_state(self) -> Dict:
+        """
+        Get current dashboard state.
+
+        Systems, alerts, rules and channels are keyed by ID so that patches
+        between ticks stay small; the browser does the sorting.
+        """
         # System stats
         total_systems = len(self.systems)
         healthy = degraded = unhealthy = 0
 
-        systems_data = []
+        systems_data = {}
         for sys_id, state in self.systems.items():
             cpu = state.properties.get("cpuUsage", 0)
             error_rate = state.properties.get("errorRate", 0)
@@ -961,7 +928,7 @@ class AlertingDashboard:
                 status = "healthy"
                 healthy += 1
 
-            systems_data.append({
+            systems_data[sys_id] = {
                 "id": sys_id,
                 "name": state.name,
                 "type": state.type,
@@ -975,22 +942,15 @@ class AlertingDashboard:
                     "responseTime": state.properties.get("responseTimeMs") or state.properties.get("avgLatencyMs", 0),
                     "requests": state.properties.get("requestsPerSecond") or state.properties.get("queriesPerSecond", 0),
                 }
-            })
-
-        # Sort systems by status (critical first)
-        status_order = {"critical": 0, "warning": 1, "healthy": 2}
-        systems_data.sort(key=lambda s: status_order.get(s["status"], 3))
-
-        # Alert stats
-        alerts_data = list(self.alerts.values())
-        alerts_data.sort(key=lambda a: (a["severity"] != "critical", a["triggeredAt"]))
+            }
 
-        critical_count = sum(1 for a in alerts_data if a["severity"] == "critical")
-        warning_count = sum(1 for a in alerts_data if a["severity"] == "warning")
+        # Alert stats (copies: alerts and rules are mutated in place)
+        alerts_data = {alert["id"]: dict(alert) for alert in self.alerts.values()}
+        critical_count = self.alerts.count("critical")
+        warning_count = self.alerts.count("warning")
 
         # Rules data
-        rules_data = list(self.rules.values())
-        triggered_rules = set(a["rule"] for a in alerts_data)
+        triggered_rules = self.alerts.triggered_rules()
 
         return {
             "timestamp": datetime.now().isoformat(),
@@ -1014,43 +974,64 @@ class AlertingDashboard:
             },
             "systems": systems_data,
             "alerts": alerts_data,
-            "rules": rules_data,
-            "triggeredRules": list(triggered_rules),
-            "channels": list(self.channels.values()),
+            "rules": {rule_id: dict(rule) for rule_id, rule in self.rules.items()},
+            "triggeredRules": triggered_rules,
+            "channels": {channel_id: dict(channel) for channel_id, channel in self.channels.items()},
+            "writeBehind": self.write_buffer.stats(),
             "rspEnabled": self.rsp_enabled,
             "rspAlerts": self.rsp_alerts[-15:],
             "rspQueryCount": len(self.rsp_query_ids),
-            "rspQueries": [
-                {
-                    "name": q["name"],
-                    "description": q["description"],
-                    "icon": q["icon"],
-                    "severity": q["severity"],
-                    "window": f"{q['window_duration']}s window / {q['window_slide']}s slide",
-                    "sparql": textwrap.dedent(q["sparql"]).strip(),
-                }
-                for q in RSP_CONTINUOUS_QUERIES
-            ],
         }
 
+    def get_rsp_queries_message(self) -> str:
+        """Serialized RSP query catalog; static, so built once."""
+        if self._rsp_queries_message is None:
+            self._rsp_queries_message = json.dumps({
+                "type": "rsp_queries",
+                "data": [
+                    {
+                        "name": q["name"],
+                        "description": q["description"],
+                        "icon": q["icon"],
+                        "severity": q["severity"],
+                        "window": f"{q['window_duration']}s window / {q['window_slide']}s slide",
+                        "sparql": textwrap.dedent(q["sparql"]).strip(),
+                    }
+                    for q in RSP_CONTINUOUS_QUERIES
+                ],
+            })
+        return self._rsp_queries_message
+
+    async def send_to_clients(self, message: str, clients=None):
+        """Send one serialized message to several clients."""
+        clients = self.connected_clients if clients is None else clients
+        if clients:
+            await asyncio.gather(
+                *[client.send(message) for client in list(clients)],
+                return_exceptions=True
+            )
+
     async def handle_websocket(self, websocket):
         """Handle WebSocket connections."""
-        self.connected_clients.add(websocket)
-        logger.info(f"Client connected. Total clients: {len(self.connected_clients)}")
-
         try:
-            # Send initial state
-            await websocket.send(json.dumps({
-                "type": "init",
-                "data": self.get_dashboard_data()
-            }))
+            # Send static content, then a snapshot of the latest state. The
+            # client only joins the broadcast afterwards; if a patch went out
+            # meanwhile it sees the version gap and asks for a resync.
+            await websocket.send(self.get_rsp_queries_message())
+            await self.publish_state()
+            await websocket.send(self.dashboard_state.snapshot())
+            self.connected_clients.add(websocket)
+            logger.info(f"Client connected. Total clients: {len(self.connected_clients)}")
 
             async for message in websocket:
                 try:
                     data = json.loads(message)
                     msg_type = data.get("type")
 
-                    if msg_type == "inject_scenario":
+                    if msg_type == "resync":
+                        await websocket.send(self.dashboard_state.snapshot())
+
+                    elif msg_type == "inject_scenario":
                         scenario = data.get("scenario", "")
                         result = self.inject_scenario(scenario)
                         await websocket.send(json.dumps({
@@ -1091,38 +1072,23 @@ class AlertingDashboard:
             self.connected_clients.discard(websocket)
             logger.info(f"Client disconnected. Total clients: {len(self.connected_clients)}")
 
+    async def publish_state(self):
+        """Publish the current state; connected clients get the patch."""
+        message = self.dashboard_state.publish(self.get_dashboard_state())
+        if message is not None:
+            await self.send_to_clients(message)
+
     async def broadcast_update(self):
         """Broadcast updates to all connected clients."""
         if not self.connected_clients:
             return
-
-        message = json.dumps({
-            "type": "update",
-            "data": self.get_dashboard_data()
-        })
-
-        await asyncio.gather(
-            *[client.send(message) for client in self.connected_clients],
-            return_exceptions=True
-        )
+        await self.publish_state()
 
     async def simulation_loop(self):
         """Main simulation loop."""
         while self.running:
-            self.simulate_tick()
-
-            # Check RSP for streaming alerts
-            rsp_alerts = self.check_rsp_alerts()
-            if rsp_alerts:
-                # Broadcast RSP alerts immediately
-                await asyncio.gather(
-                    *[client.send(json.dumps({
-                        "type": "rsp_alerts",
-                        "alerts": rsp_alerts
-                    })) for client in self.connected_clients],
-                    return_exceptions=True
-                )
-
+            await self.simulate_tick()
+            await asyncio.to_thread(self.alerts.flush)
             await self.broadcast_update()
             await asyncio.sleep(2)
 
@@ -1134,10 +1100,25 @@ class AlertingDashboard:
         http_thread = threading.Thread(target=self._run_http_server, daemon=True)
         http_thread.start()
 
-        # Start WebSocket server
-        async with serve(self.handle_websocket, "localhost", self.ws_port):
-            logger.info(f"WebSocket server running on ws://localhost:{self.ws_port}")
-            await self.simulation_loop()
+        self.write_buffer.start()
+
+        # RSP windows are delivered as they arrive, independently of the tick
+        rsp_task = None
+        if self.rsp_enabled:
+            push_source = websocket_rsp_feed(self.rsp_push_url) if self.rsp_push_url else None
+            self.rsp_subscription = RspSubscription(self.aclient, self.rsp_query_ids, push_source)
+            rsp_task = asyncio.create_task(self.rsp_subscription.run(self.on_rsp_window))
+
+        try:
+            # Start WebSocket server
+            async with serve(self.handle_websocket, "localhost", self.ws_port):
+                logger.info(f"WebSocket server running on ws://localhost:{self.ws_port}")
+                await self.simulation_loop()
+        finally:
+            if rsp_task is not None:
+                rsp_task.cancel()
+            await asyncio.to_thread(self.write_buffer.close)
+            await asyncio.to_thread(self.alerts.close)
 
     def _run_http_server(self):
         """Run the HTTP server for serving the dashboard."""
@@ -2182,6 +2163,10 @@ def get_dashboard_html(ws_port: int) -> str:
     <script>
         let ws = null;
         let dashboardData = null;
+        // Keyed state as sent by the server, its version, and the static query catalog
+        let dashboardState = null;
+        let stateVersion = 0;
+        let rspQueries = [];
 
         function escapeHtml(text) {{
             const div = document.createElement('div');
@@ -2220,9 +2205,25 @@ def get_dashboard_html(ws_port: int) -> str:
 
             ws.onmessage = (event) => {{
                 const message = JSON.parse(event.data);
-                if (message.type === 'init' || message.type === 'update') {{
-                    dashboardData = message.data;
+                if (message.type === 'snapshot') {{
+                    dashboardState = message.data;
+                    stateVersion = message.version;
+                    dashboardData = toView(dashboardState);
                     updateDashboard();
+                }} else if (message.type === 'patch') {{
+                    if (dashboardState === null || message.version !== stateVersion + 1) {{
+                        // Missed a patch: start over from a fresh snapshot
+                        dashboardState = null;
+                        ws.send(JSON.stringify({{type: 'resync'}}));
+                        return;
+                    }}
+                    applyPatch(dashboardState, message.ops);
+                    stateVersion = message.version;
+                    dashboardData = toView(dashboardState);
+                    updateDashboard();
+                }} else if (message.type === 'rsp_queries') {{
+                    rspQueries = message.data;
+                    renderRspQueries();
                 }} else if (message.type === 'scenario_injected') {{
                     console.log('Scenario injected:', message.data);
                 }} else if (message.type === 'rsp_alerts') {{
@@ -2231,6 +2232,37 @@ def get_dashboard_html(ws_port: int) -> str:
             }};
         }}
 
+        function applyPatch(doc, ops) {{
+            // JSON-patch add/replace/remove; the root ("") is never patched
+            ops.forEach(op => {{
+                const keys = op.path.split('/').slice(1)
+                    .map(k => k.replace(/~1/g, '/').replace(/~0/g, '~'));
+                const last = keys.pop();
+                const parent = keys.reduce((node, key) => node[key], doc);
+                if (op.op === 'remove') {{
+                    delete parent[last];
+                }} else {{
+                    parent[last] = op.value;
+                }}
+            }});
+        }}
+
+        const statusOrder = {{'critical': 0, 'warning': 1, 'healthy': 2}};
+
+        function toView(state) {{
+            // Keyed collections -> the sorted lists the panels render
+            return {{
+                ...state,
+                systems: Object.values(state.systems)
+                    .sort((a, b) => (statusOrder[a.status] ?? 3) - (statusOrder[b.status] ?? 3)),
+                alerts: Object.values(state.alerts)
+                    .sort((a, b) => ((a.severity !== 'critical') - (b.severity !== 'critical'))
+                        || String(a.triggeredAt).localeCompare(String(b.triggeredAt))),
+                rules: Object.values(state.rules),
+                channels: Object.values(state.channels),
+            }};
+        }}
+
         function updateDashboard() {{
             if (!dashboardData) return;
 
@@ -2442,13 +2474,11 @@ def get_dashboard_html(ws_port: int) -> str:
                 badge.className = 'rsp-badge inactive';
             }}
 
-            // Render continuous queries
-            renderRspQueries();
         }}
 
         function renderRspQueries() {{
             const container = document.getElementById('rsp-queries-container');
-            const queries = dashboardData.rspQueries || [];
+            const queries = rspQueries;
 
             if (queries.length === 0) {{
                 container.innerHTML = '<div style="color: #666; font-size: 0.85em;">No queries configured</div>';
@@ -2469,7 +2499,7 @@ def get_dashboard_html(ws_port: int) -> str:
         }}
 
         function showSparqlModal(queryIndex) {{
-            const queries = dashboardData.rspQueries || [];
+            const queries = rspQueries;
             const q = queries[queryIndex];
             if (!q) return;
 
@@ -2673,10 +2703,15 @@ def main():
     parser.add_argument("--base-url", help="DTaaS server URL")
     parser.add_argument("--port", type=int, default=8085, help="HTTP port (default: 8085)")
     parser.add_argument("--ws-port", type=int, default=8086, help="WebSocket port (default: 8086)")
+    parser.add_argument("--rsp-push-url",
+                        help="Websocket feed of pushed RSP results (default: poll the RSP API)")
+    parser.add_argument("--alert-db", default=DEFAULT_ALERT_DB,
+                        help=f"SQLite file alerts are persisted to (default: {DEFAULT_ALERT_DB}; "
+                             f"':memory:' to keep them in memory only)")
     args = parser.parse_args()
 
     client = get_client(args.base_url)
-    dashboard = AlertingDashboard(client, args.port, args.ws_port)
+    dashboard = AlertingDashboard(client, args.port, args.ws_port, args.rsp_push_url, args.alert_db)
 
     print("Loading data from DTaaS...")
     dashboard.load_data()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: degradation simulation for a large equipment fleet.
+
+Compares the per-asset ``predictive_maintenance.simulation.DegradationSimulator``
+path (``update_equipment_state`` with scalar ``math`` and ``random`` calls)
+against ``predictive_maintenance.fleet_engine.FleetDegradationEngine``. The
+legacy path is timed on a sample of assets and extrapolated.
+
+Usage:
+    python benchmarks/bench_degradation_engine.py [--assets 1000000] [--ticks 5]
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from predictive_maintenance.simulation import (
+    DEFAULT_WEIBULL_PARAMS, WEIBULL_PARAMS, DegradationSimulator,
+)
+from predictive_maintenance.fleet_engine import FleetDegradationEngine
+
+EQUIPMENT_TYPES = list(WEIBULL_PARAMS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fleet degradation engine benchmark")
+    parser.add_argument("--assets", type=int, default=1_000_000)
+    parser.add_argument("--ticks", type=int, default=5)
+    parser.add_argument("--sample", type=int, default=20000,
+                        help="Assets timed on the per-asset path")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    fleet = []
+    for i in range(args.assets):
+        fleet.append((f"eq-{i}", EQUIPMENT_TYPES[i % len(EQUIPMENT_TYPES)], {
+            "healthScore": rng.uniform(40, 100),
+            "operatingHours": rng.uniform(0, 40000),
+            "currentVibration": rng.uniform(1.5, 3.5),
+            "currentTemperature": rng.uniform(45, 65),
+        }))
+    print(f"Fleet: {args.assets} assets, {len(EQUIPMENT_TYPES)} equipment types, "
+          f"{args.ticks} ticks")
+
+    sample = fleet[:min(args.sample, args.assets)]
+    simulator = DegradationSimulator(client=None)
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        for equipment_id, equipment_type, props in sample:
+            simulator.update_equipment_state(equipment_id, equipment_type, props, 1.0)
+    legacy_s = (time.perf_counter() - start) / args.ticks * args.assets / len(sample)
+
+    engine = FleetDegradationEngine(WEIBULL_PARAMS, DEFAULT_WEIBULL_PARAMS, seed=1)
+    start = time.perf_counter()
+    for equipment_id, equipment_type, props in fleet:
+        engine.add(equipment_id, equipment_type, props)
+    load_s = time.perf_counter() - start
+
+    failures = 0
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        failures += len(engine.tick(1.0))
+    engine_s = (time.perf_counter() - start) / args.ticks
+
+    start = time.perf_counter()
+    written = sum(1 for _ in engine.iter_updates())
+    updates_s = time.perf_counter() - start
+
+    print(f"  update_equipment_state (est.) : {legacy_s:8.3f} s per tick "
+          f"({args.assets / legacy_s / 1e6:6.2f} M assets/s)")
+    print(f"  FleetDegradationEngine.tick   : {engine_s:8.3f} s per tick "
+          f"({args.assets / engine_s / 1e6:6.2f} M assets/s)")
+    print(f"  speedup                       : {legacy_s / engine_s:8.1f}x")
+    print(f"  roster load                   : {load_s:8.3f} s")
+    print(f"  to twin property dicts        : {updates_s:8.3f} s for {written} assets")
+    print(f"  failures simulated            : {failures}")
+
+
+if __name__ == "__main__":
+    main()
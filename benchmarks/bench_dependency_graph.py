@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: blast radius / downstream-critical counts for every component.
+
+Compares the original VulnerabilityAnalyzer approach (a fresh BFS with
+``list.pop(0)`` per query, run three times per component by the vulnerability
+report) against ``cascading_failure.dependency_graph.DependencyGraph``.
+The legacy path is timed on a sample of components and extrapolated.
+
+Usage:
+    python benchmarks/bench_dependency_graph.py [--components 50000] [--sample 200]
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cascading_failure.dependency_graph import DependencyGraph
+
+
+def build_model(n: int, seed: int = 42):
+    """Layered data-center style model: power -> cooling -> racks -> hosts -> apps."""
+    rng = random.Random(seed)
+    layers = [0.01, 0.04, 0.15, 0.40, 0.40]
+    ids, layer_of = [], []
+    for layer, share in enumerate(layers):
+        for _ in range(max(1, int(n * share))):
+            layer_of.append(layer)
+            ids.append(f"c{len(ids)}")
+
+    by_layer = defaultdict(list)
+    for cid, layer in zip(ids, layer_of):
+        by_layer[layer].append(cid)
+
+    components = {}
+    reverse_deps = defaultdict(list)
+    for cid, layer in zip(ids, layer_of):
+        crit = rng.choice(["critical", "high", "medium", "low"])
+        components[cid] = {"id": cid, "properties": {"criticality": crit}}
+        if layer == 0:
+            continue
+        # Each component depends on 1-3 providers in the layer above
+        for provider in rng.sample(by_layer[layer - 1], k=min(3, rng.randint(1, 3))):
+            reverse_deps[provider].append((cid, "feeds"))
+
+    # A few peer links create cycles (e.g. clustered hosts)
+    hosts = by_layer[3]
+    for _ in range(len(hosts) // 50):
+        a, b = rng.sample(hosts, 2)
+        reverse_deps[a].append((b, "replicates"))
+        reverse_deps[b].append((a, "replicates"))
+
+    return components, reverse_deps
+
+
+def legacy_blast_radius(components, reverse_deps, component_id):
+    """The BFS previously in VulnerabilityAnalyzer.calculate_blast_radius."""
+    affected = set()
+    queue = [component_id]
+    affected_list = []
+    while queue:
+        current = queue.pop(0)
+        for dependent, _ in reverse_deps.get(current, []):
+            if dependent not in affected and dependent in components:
+                affected.add(dependent)
+                affected_list.append(dependent)
+                queue.append(dependent)
+    return len(affected), affected_list
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dependency graph benchmark")
+    parser.add_argument("--components", type=int, default=50000)
+    parser.add_argument("--sample", type=int, default=200)
+    args = parser.parse_args()
+
+    components, reverse_deps = build_model(args.components)
+    critical = [cid for cid, c in components.items()
+                if c["properties"]["criticality"] == "critical"]
+    print(f"Model: {len(components)} components, "
+          f"{sum(len(v) for v in reverse_deps.values())} edges")
+
+    # Legacy: blast radius + downstream critical + risk score = 3 BFS per component
+    sample = random.Random(1).sample(list(components), min(args.sample, len(components)))
+    start = time.perf_counter()
+    legacy = {}
+    for cid in sample:
+        for _ in range(3):
+            size, affected = legacy_blast_radius(components, reverse_deps, cid)
+        crit = sum(1 for a in affected if components[a]["properties"]["criticality"] == "critical")
+        legacy[cid] = (size, crit)
+    legacy_s = (time.perf_counter() - start) * len(components) / len(sample)
+
+    start = time.perf_counter()
+    graph = DependencyGraph(components, reverse_deps)
+    critical_mask = graph.mask(critical)
+    results = {
+        cid: (graph.reach_count(cid), graph.count_reachable(cid, critical_mask))
+        for cid in components
+    }
+    graph_s = time.perf_counter() - start
+
+    mismatches = sum(1 for cid in sample if legacy[cid] != results[cid])
+    print(f"  legacy BFS (extrapolated) : {legacy_s:10.1f} s")
+    print(f"  DependencyGraph           : {graph_s:10.2f} s")
+    print(f"  speedup                   : {legacy_s / graph_s:10.0f}x")
+    print(f"  sampled mismatches        : {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
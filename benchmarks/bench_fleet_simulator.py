@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: synthetic metric generation for a large fleet.
+
+Compares the per-system ``alerting_system.simulator.SystemSimulator`` loop
+(``random.gauss`` and dict lookups per metric per system) against
+``alerting_system.fleet_simulator.FleetSimulator``, with a share of the
+fleet in an anomaly. The legacy path is timed on a sample of systems and
+extrapolated.
+
+Usage:
+    python benchmarks/bench_fleet_simulator.py [--systems 100000] [--ticks 10] [--anomalies 0.05]
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alerting_system.simulator import METRIC_PROFILES, AnomalyType, SystemSimulator
+from alerting_system.fleet_simulator import FleetSimulator
+
+# Ten metrics per system, covering the CPU -> latency -> error correlations
+LOAD_TEST_TYPE = "LoadTestServer"
+LOAD_TEST_PROFILE = {
+    **METRIC_PROFILES["WebServer"],
+    "connections": METRIC_PROFILES["DatabaseServer"]["connections"],
+    "queriesPerSecond": METRIC_PROFILES["DatabaseServer"]["queriesPerSecond"],
+    "successRate": METRIC_PROFILES["ApplicationService"]["successRate"],
+}
+ANOMALIES = [AnomalyType.SPIKE, AnomalyType.DEGRADATION, AnomalyType.OUTAGE]
+
+
+class LoadTestSimulator(SystemSimulator):
+    def setup_simulators(self):
+        self.simulators = dict(LOAD_TEST_PROFILE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fleet simulator benchmark")
+    parser.add_argument("--systems", type=int, default=100_000)
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--sample", type=int, default=5000,
+                        help="Systems timed on the per-system path")
+    parser.add_argument("--anomalies", type=float, default=0.05,
+                        help="Share of systems with an active anomaly")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    system_ids = [f"sys-{i}" for i in range(args.systems)]
+    anomalous = [sid for sid in system_ids if rng.random() < args.anomalies]
+    n_metrics = len(LOAD_TEST_PROFILE)
+    print(f"Fleet: {args.systems} systems x {n_metrics} metrics, "
+          f"{len(anomalous)} in an anomaly, {args.ticks} ticks")
+
+    sample = system_ids[:min(args.sample, args.systems)]
+    legacy = {sid: LoadTestSimulator(sid, LOAD_TEST_TYPE, {}) for sid in sample}
+    for i, sid in enumerate(anomalous):
+        if sid in legacy:
+            legacy[sid].anomaly_type = ANOMALIES[i % len(ANOMALIES)]
+            legacy[sid].anomaly_start = datetime.now()
+            legacy[sid].anomaly_duration = 3600
+
+    start = time.perf_counter()
+    for tick in range(args.ticks):
+        for simulator in legacy.values():
+            simulator.simulate_tick(tick * 5.0)
+    legacy_s = (time.perf_counter() - start) / args.ticks * args.systems / len(sample)
+
+    fleet = FleetSimulator({sid: LOAD_TEST_TYPE for sid in system_ids},
+                           {LOAD_TEST_TYPE: LOAD_TEST_PROFILE}, seed=1)
+    for anomaly_type in ANOMALIES:
+        fleet.inject_anomaly(anomalous[ANOMALIES.index(anomaly_type)::len(ANOMALIES)],
+                             anomaly_type, 3600, start=0.0)
+
+    start = time.perf_counter()
+    for tick in range(args.ticks):
+        fleet.tick(tick * 5.0)
+    fleet_s = (time.perf_counter() - start) / args.ticks
+
+    start = time.perf_counter()
+    written = sum(1 for _ in fleet.iter_values())
+    dicts_s = time.perf_counter() - start
+
+    cells = args.systems * n_metrics
+    print(f"  SystemSimulator loop (est.) : {legacy_s:8.3f} s per tick "
+          f"({cells / legacy_s / 1e6:6.2f} M values/s)")
+    print(f"  FleetSimulator.tick         : {fleet_s:8.3f} s per tick "
+          f"({cells / fleet_s / 1e6:6.2f} M values/s)")
+    print(f"  speedup                     : {legacy_s / fleet_s:8.1f}x")
+    print(f"  to per-system dicts         : {dicts_s:8.3f} s for {written} systems")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: twin RDF serialization for bulk seeding.
+
+Compares the original per-twin Turtle builder from ``bulk_create_twins``
+(line lists with a repeated ``@prefix`` header and chained ``str.replace``
+escaping) against ``rdf_serializer``.
+
+Usage:
+    python benchmarks/bench_serializer.py [--twins 100000] [--repeat 3]
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rdf_serializer import serialize_twin, write_twins, NTRIPLES
+
+
+def legacy_twin_turtle(twin_data: dict) -> str:
+    """The Turtle builder previously inlined in common.bulk_create_twins."""
+    twin_id = twin_data.get("id")
+    properties = twin_data.get("properties", {})
+    twin_type = twin_data.get("type", "")
+    name = twin_data.get("name", "")
+    description = twin_data.get("description", "")
+    domain = twin_data.get("domain", "")
+
+    turtle_lines = [
+        '@prefix dtaas: <http://tesserai.io/ontology/core#> .',
+        '@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .',
+        '@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .',
+        '',
+        f'<urn:tesserai:twin:{twin_id}> a <{twin_type}> .' if twin_type else '',
+    ]
+
+    if name:
+        escaped_name = name.replace('\\', '\\\\').replace('"', '\\"')
+        turtle_lines.append(f'<urn:tesserai:twin:{twin_id}> rdfs:label "{escaped_name}" .')
+
+    if description:
+        escaped_desc = description.replace('\\', '\\\\').replace('"', '\\"')
+        turtle_lines.append(f'<urn:tesserai:twin:{twin_id}> rdfs:comment "{escaped_desc}" .')
+
+    if domain:
+        turtle_lines.append(f'<urn:tesserai:twin:{twin_id}> dtaas:domain "{domain}" .')
+
+    for key, value in properties.items():
+        if isinstance(value, bool):
+            turtle_lines.append(f'<urn:tesserai:twin:{twin_id}> dtaas:{key} {str(value).lower()} .')
+        elif isinstance(value, (int, float)):
+            turtle_lines.append(f'<urn:tesserai:twin:{twin_id}> dtaas:{key} {value} .')
+        elif isinstance(value, str):
+            escaped_val = value.replace('\\', '\\\\').replace('"', '\\"')
+            turtle_lines.append(f'<urn:tesserai:twin:{twin_id}> dtaas:{key} "{escaped_val}" .')
+        elif isinstance(value, dict):
+            json_str = json.dumps(value).replace('\\', '\\\\').replace('"', '\\"')
+            turtle_lines.append(f'<urn:tesserai:twin:{twin_id}> dtaas:{key} "{json_str}" .')
+
+    return '\n'.join(line for line in turtle_lines if line)
+
+
+def make_twins(count: int) -> list[dict]:
+    """Generate twins shaped like the predictive_maintenance seed data."""
+    rng = random.Random(42)
+    statuses = ["operational", "degraded", "maintenance"]
+    twins = []
+    for i in range(count):
+        twins.append({
+            "id": f"pump-{i:06d}",
+            "type": "http://tesserai.io/ontology/predictive_maintenance#CentrifugalPump",
+            "name": f"Pump {i} \"Line {i % 40}\"",
+            "description": f"Centrifugal pump on cooling loop {i % 12}",
+            "domain": "predictive_maintenance",
+            "properties": {
+                "status": rng.choice(statuses),
+                "healthScore": round(rng.uniform(40, 100), 1),
+                "operatingHours": rng.randint(0, 50000),
+                "vibration": round(rng.uniform(0.5, 8.0), 3),
+                "temperature": round(rng.uniform(30, 95), 2),
+                "critical": rng.random() < 0.1,
+                "location": {"site": f"site-{i % 8}", "bay": i % 30},
+            },
+        })
+    return twins
+
+
+def bench(label: str, fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    print(f"  {label:38} {best * 1000:9.1f} ms")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark twin RDF serialization")
+    parser.add_argument("--twins", type=int, default=100_000, help="Number of twins (default: 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions, best is reported (default: 3)")
+    args = parser.parse_args()
+
+    twins = make_twins(args.twins)
+    print(f"\nSerializing {len(twins)} twins (best of {args.repeat})")
+    print("-" * 60)
+
+    legacy = bench("legacy per-twin Turtle", lambda: [legacy_twin_turtle(t) for t in twins], args.repeat)
+    per_twin = bench("rdf_serializer per-twin Turtle", lambda: [serialize_twin(t) for t in twins], args.repeat)
+    stream = bench("rdf_serializer streamed Turtle", lambda: write_twins(io.StringIO(), twins), args.repeat)
+    ntriples = bench("rdf_serializer streamed N-Triples", lambda: write_twins(io.StringIO(), twins, fmt=NTRIPLES), args.repeat)
+
+    # Batch payloads are JSON-encoded into the request body, so payload size
+    # costs client CPU a second time
+    legacy_e2e = bench("legacy + JSON request encoding", lambda: json.dumps(
+        [{"id": t["id"], "data": legacy_twin_turtle(t)} for t in twins]), args.repeat)
+    e2e = bench("rdf_serializer + JSON request encoding", lambda: json.dumps(
+        [{"id": t["id"], "data": serialize_twin(t)} for t in twins]), args.repeat)
+
+    legacy_bytes = sum(len(legacy_twin_turtle(t)) for t in twins)
+    per_twin_bytes = sum(len(serialize_twin(t)) for t in twins)
+
+    print("-" * 60)
+    print(f"  per-twin speedup:           {legacy / per_twin:5.2f}x")
+    print(f"  streamed Turtle speedup:    {legacy / stream:5.2f}x")
+    print(f"  streamed N-Triples speedup: {legacy / ntriples:5.2f}x")
+    print(f"  with request encoding:      {legacy_e2e / e2e:5.2f}x")
+    print(f"  batch payload size:         legacy {legacy_bytes / 1e6:.1f} MB, "
+          f"rdf_serializer {per_twin_bytes / 1e6:.1f} MB\n")
+
+
+if __name__ == "__main__":
+    main()
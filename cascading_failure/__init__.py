@@ -16,8 +16,11 @@ enables true cascading failure prediction.
 Modules:
     seed.py - Creates interconnected infrastructure digital twins
     simulation.py - Failure propagation simulation engine
+    monte_carlo.py - Vectorized Monte Carlo cascades (NumPy)
     analysis.py - Impact analysis and vulnerability detection
+    dependency_graph.py - CSR dependency graph with memoized reachability
+    critical_paths.py - Incremental critical-path dynamic programming
     visualize.py - ASCII-based dependency visualization
 """
 
-__all__ = ["seed", "simulation", "analysis", "visualize"]
+__all__ = ["seed", "simulation", "analysis", "dependency_graph", "critical_paths", "monte_carlo", "visualize"]
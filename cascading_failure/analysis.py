@@ -4,7 +4,8 @@ Cascading Failure Analysis - Vulnerability & Impact Analysis
 =============================================================
 
 Advanced analytics for infrastructure vulnerability assessment:
-- Single Point of Failure (SPOF) detection
+- Single Point of Failure (SPOF) detection, by redundancy properties or by
+  graph structure (dominator trees, articulation points, bridges)
 - Critical path analysis
 - Blast radius estimation
 - Risk scoring and prioritization
@@ -13,6 +14,7 @@ Advanced analytics for infrastructure vulnerability assessment:
 
 Usage:
     python analysis.py [--base-url URL] [--spof]           # Find single points of failure
+    python analysis.py --spof --structural                 # Dominator-based SPOFs
     python analysis.py --blast-radius COMPONENT            # Estimate impact
     python analysis.py --critical-paths                    # Identify critical paths
     python analysis.py --vulnerability-report              # Full vulnerability report
@@ -27,7 +29,9 @@ from collections import defaultdict
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from common import get_client, logger, NAMESPACE_PREFIXES
+from common import get_client, logger, load_relationship_graph, NAMESPACE_PREFIXES
+from cascading_failure.dependency_graph import DependencyGraph, supply_edges
+from cascading_failure.critical_paths import CriticalPath, CriticalPathEngine
 
 
 @dataclass
@@ -47,13 +51,20 @@ class VulnerabilityScore:
 
 
 @dataclass
-class CriticalPath:
-    """A critical dependency path through the infrastructure."""
-    path: List[str]
-    total_business_impact: float
-    weakest_link: str
-    weakest_link_reliability: float
-    path_reliability: float
+class StructuralSpof:
+    """A component every supply path to some critical component must cross."""
+    component_id: str
+    component_name: str
+    component_type: str
+    protects: List[str]
+    is_articulation_point: bool
+    bridges: List[Tuple[str, str]] = field(default_factory=list)
+
+
+# SPOF detection modes: redundancy properties plus a downstream check, or
+# graph structure (dominators from the supply roots)
+SPOF_MODE_PROPERTIES = "properties"
+SPOF_MODE_STRUCTURAL = "structural"
 
 
 class VulnerabilityAnalyzer:
@@ -61,11 +72,46 @@ class VulnerabilityAnalyzer:
     Infrastructure vulnerability analysis engine.
     """
 
-    def __init__(self, client):
+    def __init__(self, client, spof_mode: str = SPOF_MODE_PROPERTIES):
         self.client = client
+        self.spof_mode = spof_mode
         self.components: Dict[str, Dict] = {}
         self.forward_deps: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
         self.reverse_deps: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        self._graph: Optional[DependencyGraph] = None
+        self._supply_graph: Optional[DependencyGraph] = None
+        self._critical_paths: Optional[CriticalPathEngine] = None
+        self._critical_mask = 0
+        self._idom: Optional[List[int]] = None
+        self._structural_spofs: Optional[Dict[str, StructuralSpof]] = None
+
+    @property
+    def graph(self) -> DependencyGraph:
+        """CSR dependency graph, built on first use after (re)loading."""
+        if self._graph is None:
+            self._graph = DependencyGraph(self.components, self.reverse_deps)
+            self._critical_mask = self._critical_component_mask(self._graph)
+        return self._graph
+
+    def _critical_component_mask(self, graph: DependencyGraph) -> int:
+        return graph.mask(
+            comp_id for comp_id, comp in self.components.items()
+            if comp.get("properties", {}).get("criticality") == "critical"
+        )
+
+    @property
+    def supply_graph(self) -> DependencyGraph:
+        """Provider -> consumer graph with one edge per component pair."""
+        if self._supply_graph is None:
+            self._supply_graph = DependencyGraph(self.components, supply_edges(self.forward_deps))
+        return self._supply_graph
+
+    @property
+    def critical_path_engine(self) -> CriticalPathEngine:
+        """Best upstream paths for every component, built on first use."""
+        if self._critical_paths is None:
+            self._critical_paths = CriticalPathEngine(self.components, supply_edges(self.forward_deps))
+        return self._critical_paths
 
     def _normalize_properties(self, properties: Dict) -> Dict:
         """
@@ -115,28 +161,22 @@ class VulnerabilityAnalyzer:
 
             logger.info(f"Loaded {len(self.components)} components")
 
-            # Load relationships separately for each component
+            # Load every edge in one export instead of a request per component
             print("Loading infrastructure graph...")
-            for component_id in self.components:
-                try:
-                    relationships = self.client.twins.get_relationships(component_id)
-                    for rel in relationships:
-                        rel_type = self._normalize_rel_type(rel.get("type", ""))
-                        # Relationships use 'twin' field for the other end
-                        other_twin = rel.get("twin", rel.get("target", ""))
-                        direction = rel.get("direction", "outgoing")
-
-                        if other_twin and other_twin in self.components:
-                            if direction == "outgoing":
-                                # This component -> other_twin
-                                self.forward_deps[component_id].append((other_twin, rel_type))
-                                self.reverse_deps[other_twin].append((component_id, rel_type))
-                            else:
-                                # other_twin -> this component (incoming)
-                                self.forward_deps[other_twin].append((component_id, rel_type))
-                                self.reverse_deps[component_id].append((other_twin, rel_type))
-                except Exception as e:
-                    logger.debug(f"No relationships for {component_id}: {e}")
+            graph = load_relationship_graph(
+                self.client, domains=["cascading_failure"], twin_ids=self.components
+            )
+            for source_id, rel_type, target_id in graph.edges:
+                if source_id in self.components and target_id in self.components:
+                    rel_type = self._normalize_rel_type(rel_type)
+                    self.forward_deps[source_id].append((target_id, rel_type))
+                    self.reverse_deps[target_id].append((source_id, rel_type))
+
+            self._graph = None
+            self._supply_graph = None
+            self._critical_paths = None
+            self._idom = None
+            self._structural_spofs = None
 
         except Exception as e:
             logger.error(f"Failed to load infrastructure: {e}")
@@ -150,39 +190,82 @@ class VulnerabilityAnalyzer:
         if component_id not in self.components:
             return 0, []
 
-        affected = set()
-        queue = [component_id]
-        affected_list = []
-
-        while queue:
-            current = queue.pop(0)
+        affected_list = self.graph.reachable(component_id)
+        return len(affected_list), affected_list
 
-            # Traverse reverse_deps - components that depend on the current one
-            for dependent, dep_type in self.reverse_deps.get(current, []):
-                if dependent not in affected and dependent in self.components:
-                    affected.add(dependent)
-                    affected_list.append(dependent)
-                    queue.append(dependent)
-
-        return len(affected), affected_list
+    def blast_radius_size(self, component_id: str) -> int:
+        """Blast radius without listing the affected components (memoized)."""
+        return self.graph.reach_count(component_id)
 
     def count_downstream_critical(self, component_id: str) -> int:
         """Count critical components in the downstream dependency chain."""
-        blast_radius, affected = self.calculate_blast_radius(component_id)
+        # Building the graph also builds the critical-component mask
+        graph = self.graph
+        return graph.count_reachable(component_id, self._critical_mask)
 
-        critical_count = 0
-        for comp_id in affected:
-            comp = self.components.get(comp_id, {})
-            if comp.get("properties", {}).get("criticality") == "critical":
-                critical_count += 1
+    def unavoidable_dependencies(self, component_id: str) -> List[str]:
+        """
+        Components on every supply path to this one, nearest first.
 
-        return critical_count
+        Computed from the dominator tree of the supply graph, rooted at the
+        components that depend on nothing (power plants, uplinks, ...).
+        """
+        graph = self.supply_graph
+        i = graph.index.get(component_id)
+        if i is None:
+            return []
+        if self._idom is None:
+            self._idom = graph.immediate_dominators()
+        return [graph.ids[d] for d in graph.dominators_of(i, self._idom)]
+
+    def find_structural_spofs(self) -> List[StructuralSpof]:
+        """
+        Find components that are structurally unavoidable for at least one
+        critical component, regardless of redundancy properties.
+        """
+        if self._structural_spofs is None:
+            graph = self.supply_graph
+            cut_points, bridges = graph.articulation_points_and_bridges()
+            cut_set = set(cut_points)
+            bridges_by_node: Dict[int, List[Tuple[str, str]]] = defaultdict(list)
+            for u, v in bridges:
+                edge = (graph.ids[u], graph.ids[v])
+                bridges_by_node[u].append(edge)
+                bridges_by_node[v].append(edge)
+
+            protects: Dict[str, List[str]] = defaultdict(list)
+            for critical_id in self.graph.ids_in(self._critical_mask):
+                for dominator_id in self.unavoidable_dependencies(critical_id):
+                    protects[dominator_id].append(critical_id)
+
+            spofs = {}
+            for comp_id, critical_ids in protects.items():
+                comp = self.components[comp_id]
+                i = graph.index[comp_id]
+                spofs[comp_id] = StructuralSpof(
+                    component_id=comp_id,
+                    component_name=comp.get("name", comp_id),
+                    component_type=comp.get("type", "Unknown"),
+                    protects=critical_ids,
+                    is_articulation_point=i in cut_set,
+                    bridges=bridges_by_node.get(i, []),
+                )
+            self._structural_spofs = spofs
+
+        return sorted(self._structural_spofs.values(), key=lambda s: -len(s.protects))
 
     def is_single_point_of_failure(self, component_id: str) -> bool:
         """
         Determine if a component is a single point of failure.
         A SPOF is a component with no redundancy that critical systems depend on.
+        In structural mode, it is one every supply path to a critical component
+        must cross.
         """
+        if self.spof_mode == SPOF_MODE_STRUCTURAL:
+            if self._structural_spofs is None:
+                self.find_structural_spofs()
+            return component_id in self._structural_spofs
+
         comp = self.components.get(component_id, {})
         props = comp.get("properties", {})
 
@@ -211,7 +294,7 @@ class VulnerabilityAnalyzer:
         comp = self.components.get(component_id, {})
         props = comp.get("properties", {})
 
-        blast_radius, _ = self.calculate_blast_radius(component_id)
+        blast_radius = self.blast_radius_size(component_id)
         downstream_critical = self.count_downstream_critical(component_id)
 
         # Factors
@@ -271,7 +354,7 @@ class VulnerabilityAnalyzer:
 
         for comp_id, comp in self.components.items():
             if self.is_single_point_of_failure(comp_id):
-                blast_radius, _ = self.calculate_blast_radius(comp_id)
+                blast_radius = self.blast_radius_size(comp_id)
                 downstream_critical = self.count_downstream_critical(comp_id)
                 risk_score = self.calculate_risk_score(comp_id)
                 props = comp.get("properties", {})
@@ -297,69 +380,34 @@ class VulnerabilityAnalyzer:
         """
         Find critical dependency paths - paths where failure would have
         maximum business impact.
+
+        Each leaf (application, production line, manufacturing equipment)
+        gets its highest-impact upstream supply chain from one topological
+        pass over the supply graph.
         """
-        # Find leaf nodes (applications, end systems)
-        leaves = []
-        for comp_id, comp in self.components.items():
-            if comp.get("type") in ["Application", "ProductionLine", "ManufacturingEquipment"]:
-                leaves.append(comp_id)
-
-        critical_paths = []
-
-        for leaf_id in leaves:
-            # Trace back to root dependencies
-            path = [leaf_id]
-            current = leaf_id
-            visited = {leaf_id}
-            total_impact = self.components[leaf_id].get("properties", {}).get("businessImpact", 5)
-            min_reliability = 1.0
-
-            while True:
-                # Find upstream dependencies
-                upstream = self.reverse_deps.get(current, [])
-                if not upstream:
-                    break
-
-                # Pick highest impact upstream
-                best_upstream = None
-                best_impact = 0
-
-                for up_id, rel_type in upstream:
-                    if up_id not in visited and up_id in self.components:
-                        impact = self.components[up_id].get("properties", {}).get("businessImpact", 0)
-                        if impact > best_impact:
-                            best_impact = impact
-                            best_upstream = up_id
-
-                if not best_upstream:
-                    break
-
-                visited.add(best_upstream)
-                path.insert(0, best_upstream)
-                current = best_upstream
-                total_impact += best_impact
-
-                reliability = self.components[best_upstream].get("properties", {}).get("reliability", 0.99)
-                if reliability < min_reliability:
-                    min_reliability = reliability
-                    weakest = best_upstream
-
-            if len(path) > 2:
-                # Calculate path reliability (product of individual reliabilities)
-                path_reliability = 1.0
-                for comp_id in path:
-                    rel = self.components[comp_id].get("properties", {}).get("reliability", 0.99)
-                    path_reliability *= rel
-
-                critical_paths.append(CriticalPath(
-                    path=path,
-                    total_business_impact=total_impact,
-                    weakest_link=weakest if 'weakest' in dir() else path[0],
-                    weakest_link_reliability=min_reliability,
-                    path_reliability=path_reliability,
-                ))
-
-        return sorted(critical_paths, key=lambda x: -x.total_business_impact)[:max_paths]
+        return self.critical_path_engine.critical_paths(max_paths)
+
+    def update_component(self, component_id: str, properties: Dict) -> List[str]:
+        """
+        Merge changed properties into a loaded component.
+
+        Critical paths are patched incrementally; other cached analyses are
+        only invalidated when criticality changes.
+
+        Returns:
+            Components whose best upstream path changed
+        """
+        comp = self.components.get(component_id)
+        if comp is None:
+            return []
+        changes = self._normalize_properties(properties)
+        comp["properties"].update(changes)
+        if "criticality" in changes and self._graph is not None:
+            self._critical_mask = self._critical_component_mask(self._graph)
+            self._structural_spofs = None
+        if self._critical_paths is None:
+            return []
+        return self._critical_paths.update_component(component_id, comp["properties"])
 
     def analyze_component(self, component_id: str) -> Optional[VulnerabilityScore]:
         """Perform full vulnerability analysis on a single component."""
@@ -369,7 +417,7 @@ class VulnerabilityAnalyzer:
         comp = self.components[component_id]
         props = comp.get("properties", {})
 
-        blast_radius, _ = self.calculate_blast_radius(component_id)
+        blast_radius = self.blast_radius_size(component_id)
         downstream_critical = self.count_downstream_critical(component_id)
         risk_score = self.calculate_risk_score(component_id)
 
@@ -420,6 +468,40 @@ def print_spof_report(spofs: List[VulnerabilityScore]):
             print(f"    - {rec}")
 
 
+def print_structural_spof_report(analyzer: VulnerabilityAnalyzer):
+    """Print dominator / articulation-point based SPOF report."""
+    spofs = analyzer.find_structural_spofs()
+
+    print("\n" + "=" * 90)
+    print(" STRUCTURAL SINGLE POINTS OF FAILURE")
+    print("=" * 90)
+
+    if not spofs:
+        print("\n Every critical component has an alternate supply path.")
+        return
+
+    print(f"\n Found {len(spofs)} components on every supply path to a critical component:")
+    print("-" * 90)
+    print(f" {'Component':<30} {'Type':<18} {'Protects':<9} {'Cut':<5} {'Bridges':>7}")
+    print("-" * 90)
+
+    for spof in spofs[:15]:
+        cut_str = "Yes" if spof.is_articulation_point else "No"
+        print(f" {spof.component_id[:30]:<30} {spof.component_type[:18]:<18} "
+              f"{len(spof.protects):<9} {cut_str:<5} {len(spof.bridges):>7}")
+
+    print("\n UNAVOIDABLE DEPENDENCIES PER CRITICAL COMPONENT:")
+    print("-" * 90)
+
+    protected = sorted({c for spof in spofs for c in spof.protects})
+    for comp_id in protected[:10]:
+        chain = analyzer.unavoidable_dependencies(comp_id)
+        print(f"\n {analyzer.components[comp_id].get('name', comp_id)}")
+        print("    " + " <- ".join(c[:20] for c in chain[:6]))
+        if len(chain) > 6:
+            print(f"    ... ({len(chain) - 6} more)")
+
+
 def print_critical_paths_report(paths: List[CriticalPath]):
     """Print critical paths report."""
     print("\n" + "=" * 90)
@@ -551,6 +633,9 @@ def main():
     parser.add_argument("--base-url", help="DTaaS server URL")
     parser.add_argument("--spof", action="store_true",
                        help="Find single points of failure")
+    parser.add_argument("--structural", action="store_true",
+                       help="Detect SPOFs from graph structure (dominators, "
+                            "articulation points) instead of redundancy properties")
     parser.add_argument("--blast-radius", help="Calculate blast radius for component")
     parser.add_argument("--critical-paths", action="store_true",
                        help="Find critical dependency paths")
@@ -560,7 +645,8 @@ def main():
     args = parser.parse_args()
 
     client = get_client(args.base_url)
-    analyzer = VulnerabilityAnalyzer(client)
+    spof_mode = SPOF_MODE_STRUCTURAL if args.structural else SPOF_MODE_PROPERTIES
+    analyzer = VulnerabilityAnalyzer(client, spof_mode=spof_mode)
 
     print("Loading infrastructure graph...")
     analyzer.load_infrastructure()
@@ -569,7 +655,10 @@ def main():
         print("No components found. Run seed.py first.")
         return
 
-    if args.spof:
+    if args.spof and args.structural:
+        print_structural_spof_report(analyzer)
+
+    elif args.spof:
         spofs = analyzer.find_single_points_of_failure()
         print_spof_report(spofs)
 
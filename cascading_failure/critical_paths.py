@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Cascading Failure Analysis - Incremental Critical Paths
+=======================================================
+
+Dynamic programming over the supply graph (provider -> consumer), visited
+in topological order so every provider is finished before its consumers:
+
+- Max-impact path: the upstream chain ending at a component whose summed
+  ``businessImpact`` is largest, with its weakest link and overall
+  reliability (product of ``reliability`` along the chain)
+- Least-reliable path: the upstream chain with the lowest product of
+  reliabilities
+
+One pass answers every leaf at once. Cycles (redundant switch pairs,
+clustered hosts) are collapsed into strongly connected components, and
+links inside a cycle are not used as supply chains.
+
+Changing one component's properties or one link only recomputes the
+components downstream of it, and stops as soon as their values are
+unchanged, so callers such as the web UI can keep the paths live.
+
+Usage:
+    engine = CriticalPathEngine(components, supply_edges(forward_deps))
+    engine.critical_paths(max_paths=10)
+    engine.update_component(component_id, {"reliability": 0.9})
+    engine.add_edge(provider_id, consumer_id)
+"""
+
+import heapq
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from cascading_failure.dependency_graph import DependencyGraph
+
+# Component types a critical path ends at
+LEAF_TYPES = ("Application", "ProductionLine", "ManufacturingEquipment")
+
+DEFAULT_BUSINESS_IMPACT = 0
+DEFAULT_LEAF_BUSINESS_IMPACT = 5
+DEFAULT_RELIABILITY = 0.99
+
+# A path must cross at least one intermediate component to be reported
+MIN_PATH_LENGTH = 3
+
+
+@dataclass
+class CriticalPath:
+    """A critical dependency path through the infrastructure."""
+    path: List[str]
+    total_business_impact: float
+    weakest_link: str
+    weakest_link_reliability: float
+    path_reliability: float
+
+
+def _as_float(value, default: float) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class CriticalPathEngine:
+    """
+    Best upstream paths for every component, maintained incrementally.
+
+    Args:
+        components: component_id -> {"type", "properties", ...}
+        supply: provider_id -> [(consumer_id, rel_type), ...], already
+            oriented (see ``dependency_graph.supply_edges``)
+        leaf_types: Component types reported by ``critical_paths``
+    """
+
+    def __init__(
+        self,
+        components: Mapping[str, Dict],
+        supply: Mapping[str, Sequence[Tuple[str, str]]],
+        leaf_types: Iterable[str] = LEAF_TYPES,
+    ):
+        graph = DependencyGraph(components, supply)
+        self.ids: List[str] = graph.ids
+        self.index: Dict[str, int] = graph.index
+        n = len(self.ids)
+
+        self.consumers: List[Set[int]] = [set(graph.successors(v)) for v in range(n)]
+        self.providers: List[Set[int]] = [set() for _ in range(n)]
+        for v in range(n):
+            self.consumers[v].discard(v)
+            for w in self.consumers[v]:
+                self.providers[w].add(v)
+
+        leaf_types = set(leaf_types)
+        self.leaves: List[int] = [
+            self.index[cid] for cid, comp in components.items()
+            if comp.get("type") in leaf_types
+        ]
+        self._leaf_set = set(self.leaves)
+        self.impact = [0.0] * n
+        self.reliability = [0.0] * n
+        for cid, comp in components.items():
+            self._set_properties(self.index[cid], comp.get("properties", {}))
+
+        # Per node: max-impact chain (sum, predecessor, weakest node, product)
+        # and least-reliable chain (product, predecessor)
+        self.best_impact = [0.0] * n
+        self.best_prev = [-1] * n
+        self.weakest = [0] * n
+        self.path_reliability = [1.0] * n
+        self.low_reliability = [1.0] * n
+        self.low_prev = [-1] * n
+
+        self._order(graph)
+        for v in self._topological:
+            self._recompute(v)
+
+    # -------------------------------------------------------------------------
+    # Dynamic programming
+    # -------------------------------------------------------------------------
+
+    def _set_properties(self, v: int, properties: Mapping) -> bool:
+        default = DEFAULT_LEAF_BUSINESS_IMPACT if v in self._leaf_set else DEFAULT_BUSINESS_IMPACT
+        impact = _as_float(properties.get("businessImpact"), default)
+        reliability = _as_float(properties.get("reliability"), DEFAULT_RELIABILITY)
+        changed = impact != self.impact[v] or reliability != self.reliability[v]
+        self.impact[v] = impact
+        self.reliability[v] = reliability
+        return changed
+
+    def _order(self, graph: DependencyGraph) -> None:
+        """SCCs and a topological rank per node (providers rank lower)."""
+        scc_of, sccs = graph.strongly_connected_components()
+        last = len(sccs) - 1
+        self.scc_of = scc_of
+        self.rank = [last - c for c in scc_of]
+        self._topological = [v for members in reversed(sccs) for v in members]
+
+    def _recompute(self, v: int) -> bool:
+        """Recompute one node from its providers; True if anything changed."""
+        scc = self.scc_of[v]
+        best_prev, best_value = -1, 0.0
+        low_prev, low_value = -1, 1.0
+        for p in self.providers[v]:
+            if self.scc_of[p] == scc:
+                continue
+            value = self.best_impact[p]
+            if best_prev == -1 or value > best_value or (value == best_value and p < best_prev):
+                best_prev, best_value = p, value
+            value = self.low_reliability[p]
+            if low_prev == -1 or value < low_value or (value == low_value and p < low_prev):
+                low_prev, low_value = p, value
+
+        reliability = self.reliability[v]
+        if best_prev == -1:
+            weakest, path_reliability = v, reliability
+        else:
+            # Ties go to the link nearest the consumer
+            weakest = self.weakest[best_prev]
+            if reliability <= self.reliability[weakest]:
+                weakest = v
+            path_reliability = self.path_reliability[best_prev] * reliability
+
+        state = (self.impact[v] + best_value, best_prev, weakest, path_reliability,
+                 low_value * reliability, low_prev)
+        if state == (self.best_impact[v], self.best_prev[v], self.weakest[v],
+                     self.path_reliability[v], self.low_reliability[v], self.low_prev[v]):
+            return False
+        (self.best_impact[v], self.best_prev[v], self.weakest[v],
+         self.path_reliability[v], self.low_reliability[v], self.low_prev[v]) = state
+        return True
+
+    def _propagate(self, dirty: Iterable[int]) -> List[str]:
+        """Recompute dirty nodes and their descendants, providers first."""
+        heap = [(self.rank[v], v) for v in set(dirty)]
+        heapq.heapify(heap)
+        queued = {v for _, v in heap}
+        changed = []
+        while heap:
+            _, v = heapq.heappop(heap)
+            queued.discard(v)
+            if not self._recompute(v):
+                continue
+            changed.append(self.ids[v])
+            for w in self.consumers[v]:
+                if w not in queued and self.scc_of[w] != self.scc_of[v]:
+                    queued.add(w)
+                    heapq.heappush(heap, (self.rank[w], w))
+        return changed
+
+    def _rebuild(self) -> List[str]:
+        """Re-rank after a change to the cycle structure, then recompute all."""
+        supply = {
+            self.ids[v]: [(self.ids[w], "") for w in self.consumers[v]]
+            for v in range(len(self.ids)) if self.consumers[v]
+        }
+        self._order(DependencyGraph(self.ids, supply))
+        return [self.ids[v] for v in self._topological if self._recompute(v)]
+
+    # -------------------------------------------------------------------------
+    # Incremental updates
+    # -------------------------------------------------------------------------
+
+    def update_component(self, component_id: str, properties: Mapping) -> List[str]:
+        """
+        Apply new properties (businessImpact, reliability) to one component.
+
+        Returns:
+            Components whose best paths changed
+        """
+        v = self.index.get(component_id)
+        if v is None or not self._set_properties(v, properties):
+            return []
+        return self._propagate([v])
+
+    def add_edge(self, provider_id: str, consumer_id: str) -> List[str]:
+        """Add a supply link; returns components whose best paths changed."""
+        u, v = self.index.get(provider_id), self.index.get(consumer_id)
+        if u is None or v is None or u == v or v in self.consumers[u]:
+            return []
+        self.consumers[u].add(v)
+        self.providers[v].add(u)
+        if self.scc_of[u] == self.scc_of[v]:
+            return []
+        if self.rank[u] < self.rank[v]:
+            return self._propagate([v])
+        # The link may close a cycle, or at least breaks the current order
+        return self._rebuild()
+
+    def remove_edge(self, provider_id: str, consumer_id: str) -> List[str]:
+        """Remove a supply link; returns components whose best paths changed."""
+        u, v = self.index.get(provider_id), self.index.get(consumer_id)
+        if u is None or v is None or v not in self.consumers[u]:
+            return []
+        self.consumers[u].discard(v)
+        self.providers[v].discard(u)
+        if self.scc_of[u] == self.scc_of[v]:
+            # The cycle may have split into separate components
+            return self._rebuild()
+        return self._propagate([v])
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def _chain(self, v: int, prev: List[int]) -> List[str]:
+        chain = []
+        while v != -1:
+            chain.append(self.ids[v])
+            v = prev[v]
+        chain.reverse()
+        return chain
+
+    def path_to(self, component_id: str) -> Optional[CriticalPath]:
+        """Max-impact upstream path ending at a component."""
+        v = self.index.get(component_id)
+        if v is None:
+            return None
+        # The weakest link is upstream of the component itself
+        prev = self.best_prev[v]
+        weakest = v if prev == -1 else self.weakest[prev]
+        return CriticalPath(
+            path=self._chain(v, self.best_prev),
+            total_business_impact=self.best_impact[v],
+            weakest_link=self.ids[weakest],
+            weakest_link_reliability=self.reliability[weakest],
+            path_reliability=self.path_reliability[v],
+        )
+
+    def least_reliable_path(self, component_id: str) -> Tuple[List[str], float]:
+        """Upstream path with the lowest product of reliabilities, and that product."""
+        v = self.index.get(component_id)
+        if v is None:
+            return [], 1.0
+        return self._chain(v, self.low_prev), self.low_reliability[v]
+
+    def _path_length(self, v: int) -> int:
+        length = 0
+        while v != -1 and length < MIN_PATH_LENGTH:
+            length += 1
+            v = self.best_prev[v]
+        return length
+
+    def critical_paths(self, max_paths: int = 10) -> List[CriticalPath]:
+        """Highest-impact paths over all leaves (at least MIN_PATH_LENGTH long)."""
+        candidates = (v for v in self.leaves if self._path_length(v) >= MIN_PATH_LENGTH)
+        top = heapq.nlargest(max_paths, candidates, key=lambda v: (self.best_impact[v], -v))
+        return [self.path_to(self.ids[v]) for v in top]
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Cascading Failure Analysis - Dependency Graph Engine
+====================================================
+
+Integer-indexed, compressed-sparse-row (CSR) view of the component
+dependency graph, shared by the analysis methods:
+
+- Components are numbered 0..n-1; each node's dependents are a contiguous
+  slice of one flat ``array`` instead of a list of tuples
+- Reachability ("blast radius") is computed once for every node by
+  collapsing cycles into strongly connected components and unioning
+  bitsets (Python ints) over the resulting DAG, sinks first
+- Counts such as "critical components downstream" become a mask AND
+  plus a popcount
+
+Usage:
+    graph = DependencyGraph(components, reverse_deps)
+    graph.reach_count(component_id)
+    graph.count_reachable(component_id, graph.mask(critical_ids))
+"""
+
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# Relationship types that point from consumer to provider; every other type
+# points from provider to consumer (powerSupply, cooling, hosts, ...)
+CONSUMER_TO_PROVIDER_TYPES = {"dependsOn", "data", "control"}
+
+
+def orient_edge(source_id: str, rel_type: str, target_id: str) -> Tuple[str, str]:
+    """(provider, consumer) for a stored relationship, by its type."""
+    if rel_type in CONSUMER_TO_PROVIDER_TYPES:
+        return target_id, source_id
+    return source_id, target_id
+
+
+def supply_edges(forward_deps: Mapping[str, Sequence[Tuple[str, str]]]
+                 ) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    Provider -> [(consumer, rel_type)] with one edge per component pair.
+
+    The seed stores most links in both directions (powerSupply plus
+    dependsOn), which makes the raw graph cyclic; orienting each link by its
+    type recovers the supply hierarchy.
+    """
+    consumers: Dict[str, Dict[str, str]] = {}
+    for source_id, deps in forward_deps.items():
+        for target_id, rel_type in deps:
+            provider, consumer = orient_edge(source_id, rel_type, target_id)
+            consumers.setdefault(provider, {}).setdefault(consumer, rel_type)
+    return {provider: list(deps.items()) for provider, deps in consumers.items()}
+
+
+class DependencyGraph:
+    """
+    Immutable CSR graph over "dependents" edges (u -> v means v depends on u,
+    so v is affected when u fails).
+
+    Edges to IDs outside ``component_ids`` are dropped, matching the
+    ``dependent in self.components`` checks of the original BFS.
+    """
+
+    def __init__(self, component_ids: Iterable[str],
+                 dependents: Mapping[str, Sequence[Tuple[str, str]]]):
+        self.ids: List[str] = list(component_ids)
+        self.index: Dict[str, int] = {cid: i for i, cid in enumerate(self.ids)}
+
+        offsets = array("l", [0])
+        targets = array("l")
+        for cid in self.ids:
+            for dependent, _ in dependents.get(cid, ()):
+                j = self.index.get(dependent)
+                if j is not None:
+                    targets.append(j)
+            offsets.append(len(targets))
+
+        self.offsets = offsets
+        self.targets = targets
+        self._reach: Optional[List[int]] = None
+        self._reach_counts: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def successors(self, node: int) -> Sequence[int]:
+        """Dependents of a node, by index."""
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def mask(self, component_ids: Iterable[str]) -> int:
+        """Bitset of the given components (unknown IDs are ignored)."""
+        bits = 0
+        for cid in component_ids:
+            i = self.index.get(cid)
+            if i is not None:
+                bits |= 1 << i
+        return bits
+
+    def ids_in(self, bits: int) -> List[str]:
+        """Component IDs set in a bitset, in index order."""
+        result = []
+        while bits:
+            low = bits & -bits
+            result.append(self.ids[low.bit_length() - 1])
+            bits ^= low
+        return result
+
+    # -------------------------------------------------------------------------
+    # Strongly connected components
+    # -------------------------------------------------------------------------
+
+    def strongly_connected_components(self) -> Tuple[List[int], List[List[int]]]:
+        """
+        Iterative Tarjan's algorithm.
+
+        Returns:
+            (scc_of, sccs): the SCC number of every node, and the members of
+            each SCC. SCCs are numbered in reverse topological order, so every
+            edge between different SCCs goes from a higher to a lower number.
+        """
+        n = len(self.ids)
+        offsets, targets = self.offsets, self.targets
+        order = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        stack: List[int] = []
+        scc_of = [-1] * n
+        sccs: List[List[int]] = []
+        counter = 0
+
+        for root in range(n):
+            if order[root] != -1:
+                continue
+
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, offsets[root])]
+
+            while work:
+                v, pos = work[-1]
+                if pos < offsets[v + 1]:
+                    work[-1] = (v, pos + 1)
+                    w = targets[pos]
+                    if order[w] == -1:
+                        order[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append((w, offsets[w]))
+                    elif on_stack[w] and order[w] < low[v]:
+                        low[v] = order[w]
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+
+                if low[v] == order[v]:
+                    scc_id = len(sccs)
+                    members = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        scc_of[w] = scc_id
+                        members.append(w)
+                        if w == v:
+                            break
+                    sccs.append(members)
+
+        return scc_of, sccs
+
+    # -------------------------------------------------------------------------
+    # Reachability
+    # -------------------------------------------------------------------------
+
+    def _compute_reachability(self) -> None:
+        """Reachable-set bitset for every node, via the condensation DAG."""
+        scc_of, sccs = self.strongly_connected_components()
+        member_bits = [0] * len(sccs)
+        scc_reach = [0] * len(sccs)
+
+        # Sinks come first, so successor SCCs are always finished
+        for c, members in enumerate(sccs):
+            bits = 0
+            for v in members:
+                member_bits[c] |= 1 << v
+
+            cyclic = len(members) > 1
+            for v in members:
+                for w in self.successors(v):
+                    d = scc_of[w]
+                    if d != c:
+                        bits |= member_bits[d] | scc_reach[d]
+                    else:
+                        cyclic = True
+
+            # Nodes on a cycle can reach themselves and their SCC
+            if cyclic:
+                bits |= member_bits[c]
+            scc_reach[c] = bits
+
+        # Nodes in the same SCC share one int object
+        self._reach = [scc_reach[scc_of[v]] for v in range(len(self.ids))]
+        counts = [bits.bit_count() for bits in scc_reach]
+        self._reach_counts = [counts[scc_of[v]] for v in range(len(self.ids))]
+
+    def reachable_mask(self, component_id: str) -> int:
+        """Bitset of every component affected if this one fails."""
+        i = self.index.get(component_id)
+        if i is None:
+            return 0
+        if self._reach is None:
+            self._compute_reachability()
+        return self._reach[i]
+
+    def reach_count(self, component_id: str) -> int:
+        """Number of components affected if this one fails (memoized)."""
+        i = self.index.get(component_id)
+        if i is None:
+            return 0
+        if self._reach_counts is None:
+            self._compute_reachability()
+        return self._reach_counts[i]
+
+    def count_reachable(self, component_id: str, bits: int) -> int:
+        """Number of affected components that are also set in ``bits``."""
+        return (self.reachable_mask(component_id) & bits).bit_count()
+
+    def reachable(self, component_id: str) -> List[str]:
+        """
+        Affected components in breadth-first order.
+
+        The start component is only included if it lies on a cycle, as in
+        the original BFS.
+        """
+        start = self.index.get(component_id)
+        if start is None:
+            return []
+
+        offsets, targets = self.offsets, self.targets
+        seen = bytearray(len(self.ids))
+        order: List[str] = []
+        queue = deque([start])
+
+        while queue:
+            v = queue.popleft()
+            for pos in range(offsets[v], offsets[v + 1]):
+                w = targets[pos]
+                if not seen[w]:
+                    seen[w] = 1
+                    order.append(self.ids[w])
+                    queue.append(w)
+
+        return order
+
+    # -------------------------------------------------------------------------
+    # Structural single points of failure
+    # -------------------------------------------------------------------------
+
+    def sources(self) -> List[int]:
+        """Nodes that depend on nothing (power feeds, network uplinks, ...)."""
+        has_provider = bytearray(len(self.ids))
+        for w in self.targets:
+            has_provider[w] = 1
+        return [v for v in range(len(self.ids)) if not has_provider[v]]
+
+    def _predecessors(self) -> List[List[int]]:
+        preds: List[List[int]] = [[] for _ in range(len(self.ids))]
+        for v in range(len(self.ids)):
+            for w in self.successors(v):
+                preds[w].append(v)
+        return preds
+
+    def immediate_dominators(self, roots: Optional[Iterable[int]] = None) -> List[int]:
+        """
+        Dominator tree over the dependency edges (Lengauer-Tarjan).
+
+        A virtual root feeds every node in ``roots`` (default: ``sources()``),
+        so ``d`` dominates ``v`` when every supply path from any root to ``v``
+        passes through ``d``.
+
+        Returns:
+            Immediate dominator of every node; -1 for nodes whose only
+            dominator is the virtual root, and for nodes no root reaches.
+        """
+        n = len(self.ids)
+        virtual = n
+        roots = self.sources() if roots is None else list(roots)
+
+        # Iterative DFS from the virtual root, numbering nodes in preorder
+        number = [-1] * (n + 1)
+        parent = [-1] * (n + 1)
+        vertex: List[int] = []
+        stack = [(virtual, -1)]
+        while stack:
+            v, p = stack.pop()
+            if number[v] != -1:
+                continue
+            number[v] = len(vertex)
+            vertex.append(v)
+            parent[v] = p
+            children = roots if v == virtual else self.successors(v)
+            for w in reversed(children):
+                if number[w] == -1:
+                    stack.append((w, v))
+
+        preds = self._predecessors()
+        root_set = set(roots)
+        semi = number[:]
+        label = list(range(n + 1))
+        ancestor = [-1] * (n + 1)
+        idom = [-1] * (n + 1)
+        bucket: List[List[int]] = [[] for _ in range(n + 1)]
+
+        def evaluate(v: int) -> int:
+            if ancestor[v] == -1:
+                return v
+            path = []
+            u = v
+            while ancestor[ancestor[u]] != -1:
+                path.append(u)
+                u = ancestor[u]
+            for x in reversed(path):
+                a = ancestor[x]
+                if semi[label[a]] < semi[label[x]]:
+                    label[x] = label[a]
+                ancestor[x] = ancestor[a]
+            return label[v]
+
+        for i in range(len(vertex) - 1, 0, -1):
+            w = vertex[i]
+            incoming = preds[w] + [virtual] if w in root_set else preds[w]
+            for v in incoming:
+                if number[v] == -1:
+                    continue
+                u = evaluate(v)
+                if semi[u] < semi[w]:
+                    semi[w] = semi[u]
+            bucket[vertex[semi[w]]].append(w)
+            p = parent[w]
+            ancestor[w] = p
+            for v in bucket[p]:
+                u = evaluate(v)
+                idom[v] = u if semi[u] < semi[v] else p
+            bucket[p] = []
+
+        for i in range(1, len(vertex)):
+            w = vertex[i]
+            if idom[w] != vertex[semi[w]]:
+                idom[w] = idom[idom[w]]
+
+        return [-1 if d == virtual else d for d in idom[:n]]
+
+    def dominators_of(self, node: int, idom: Sequence[int]) -> List[int]:
+        """Strict dominators of a node, nearest first."""
+        chain = []
+        d = idom[node]
+        while d != -1:
+            chain.append(d)
+            d = idom[d]
+        return chain
+
+    def articulation_points_and_bridges(self) -> Tuple[List[int], List[Tuple[int, int]]]:
+        """
+        Cut vertices and bridges of the undirected view (Hopcroft-Tarjan).
+
+        Linear in nodes + edges. Parallel or opposite edges between the same
+        pair count as redundant links, so they never form a bridge.
+
+        Returns:
+            (articulation_points, bridges) with bridges as (provider, dependent)
+        """
+        n = len(self.ids)
+        sources = array("l", [0]) * len(self.targets)
+        adjacency: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+        for v in range(n):
+            for e in range(self.offsets[v], self.offsets[v + 1]):
+                w = self.targets[e]
+                sources[e] = v
+                if w != v:
+                    adjacency[v].append((w, e))
+                    adjacency[w].append((v, e))
+
+        disc = [-1] * n
+        low = [0] * n
+        is_cut = bytearray(n)
+        bridges: List[Tuple[int, int]] = []
+        counter = 0
+
+        for root in range(n):
+            if disc[root] != -1:
+                continue
+            disc[root] = low[root] = counter
+            counter += 1
+            root_children = 0
+            stack = [(root, -1, iter(adjacency[root]))]
+
+            while stack:
+                v, parent_edge, neighbors = stack[-1]
+                descended = False
+                for w, e in neighbors:
+                    if e == parent_edge:
+                        continue
+                    if disc[w] == -1:
+                        disc[w] = low[w] = counter
+                        counter += 1
+                        stack.append((w, e, iter(adjacency[w])))
+                        descended = True
+                        break
+                    if disc[w] < low[v]:
+                        low[v] = disc[w]
+                if descended:
+                    continue
+
+                stack.pop()
+                if not stack:
+                    continue
+                p = stack[-1][0]
+                if low[v] < low[p]:
+                    low[p] = low[v]
+                if low[v] > disc[p]:
+                    bridges.append((sources[parent_edge], self.targets[parent_edge]))
+                if p == root:
+                    root_children += 1
+                elif low[v] >= disc[p]:
+                    is_cut[p] = 1
+
+            if root_children > 1:
+                is_cut[root] = 1
+
+        return [v for v in range(n) if is_cut[v]], bridges
@@ -16,6 +16,10 @@ Usage:
     python simulation.py --trigger sub-trans-001 --watch    # Watch cascade
     python simulation.py --scenario power-outage            # Pre-defined scenario
     python simulation.py --random-failure                   # Random failure
+    python simulation.py --trigger sub-trans-001 --monte-carlo 10000  # Failure distribution
+    python simulation.py --monte-carlo 1000                 # Rank every component
+    python simulation.py --sweep --output sweep.csv         # What-if sweep, ranked table
+    python simulation.py --sweep --types Substation --output sweep.parquet
 
 Scenarios:
     power-outage - Major substation failure
@@ -26,9 +30,12 @@ Scenarios:
 
 import sys
 import os
+import csv
 import time
 import random
 import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
@@ -38,7 +45,8 @@ import heapq
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from common import get_client, logger
+from common import get_client, logger, load_relationship_graph
+from cascading_failure.monte_carlo import MonteCarloCascade, MonteCarloResult, NUMPY_AVAILABLE
 
 
 class ComponentStatus(Enum):
@@ -145,6 +153,24 @@ class CascadeSimulator:
         },
     }
 
+    # Used for dependency types missing from DEPENDENCY_CONFIG
+    DEFAULT_DEPENDENCY_CONFIG = {
+        "delay_seconds": 10,
+        "probability": 0.5,
+        "severity": 0.5,
+    }
+
+    # Recovery hours by component type (default 2)
+    MTTR_BY_TYPE = {
+        "PowerPlant": 24,
+        "Substation": 8,
+        "ServerRack": 2,
+        "Application": 1,
+        "NetworkSwitch": 1,
+        "CoolingUnit": 4,
+        "ProductionLine": 6,
+    }
+
     def __init__(self, client, time_acceleration: float = 1.0):
         self.client = client
         self.time_acceleration = time_acceleration
@@ -153,6 +179,7 @@ class CascadeSimulator:
         self.reverse_deps: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
         self.status: Dict[str, ComponentStatus] = {}
         self.metrics: Optional[CascadeMetrics] = None
+        self._monte_carlo: Optional[MonteCarloCascade] = None
 
     def _normalize_rel_type(self, rel_type: str) -> str:
         """Normalize relationship type by stripping domain prefixes."""
@@ -182,24 +209,17 @@ class CascadeSimulator:
                 }
                 self.status[component_id] = ComponentStatus.OPERATIONAL
 
-            # Load relationships separately (SDK list() doesn't include them)
-            for component_id in self.components:
-                try:
-                    relationships = self.client.twins.get_relationships(component_id)
-                    for rel in relationships:
-                        rel_type = self._normalize_rel_type(rel.get("type", ""))
-                        other_twin = rel.get("twin", rel.get("target", ""))
-                        direction = rel.get("direction", "outgoing")
-
-                        if other_twin and other_twin in self.components:
-                            if direction == "outgoing":
-                                self.dependencies[component_id].append((other_twin, rel_type))
-                                self.reverse_deps[other_twin].append((component_id, rel_type))
-                            else:
-                                self.dependencies[other_twin].append((component_id, rel_type))
-                                self.reverse_deps[component_id].append((other_twin, rel_type))
-                except Exception as e:
-                    logger.debug(f"No relationships for {component_id}: {e}")
+            # Load relationships in one export (SDK list() doesn't include them)
+            graph = load_relationship_graph(
+                self.client, domains=["cascading_failure"], twin_ids=self.components
+            )
+            for source_id, rel_type, target_id in graph.edges:
+                if source_id in self.components and target_id in self.components:
+                    rel_type = self._normalize_rel_type(rel_type)
+                    self.dependencies[source_id].append((target_id, rel_type))
+                    self.reverse_deps[target_id].append((source_id, rel_type))
+
+            self._monte_carlo = None
 
             logger.info(f"Loaded {len(self.components)} components with "
                        f"{sum(len(d) for d in self.dependencies.values())} dependencies")
@@ -265,11 +285,7 @@ class CascadeSimulator:
         # Queue initial propagation events
         for target_id, dep_type in self.get_downstream_components(component_id):
             if target_id not in processed and target_id in self.components:
-                config = self.DEPENDENCY_CONFIG.get(dep_type, {
-                    "delay_seconds": 10,
-                    "probability": 0.5,
-                    "severity": 0.5,
-                })
+                config = self.DEPENDENCY_CONFIG.get(dep_type, self.DEFAULT_DEPENDENCY_CONFIG)
 
                 heapq.heappush(event_queue, PropagationEvent(
                     timestamp=config["delay_seconds"],
@@ -343,11 +359,7 @@ class CascadeSimulator:
             # Queue further propagation
             for next_target, dep_type in self.get_downstream_components(event.target_id):
                 if next_target not in processed and next_target in self.components:
-                    config = self.DEPENDENCY_CONFIG.get(dep_type, {
-                        "delay_seconds": 10,
-                        "probability": 0.5,
-                        "severity": 0.5,
-                    })
+                    config = self.DEPENDENCY_CONFIG.get(dep_type, self.DEFAULT_DEPENDENCY_CONFIG)
 
                     # Cascade severity diminishes
                     cascaded_severity = event.severity * config["severity"]
@@ -364,26 +376,43 @@ class CascadeSimulator:
             cascade_level += 1
 
         # Estimate MTTR based on affected components
-        mttr_by_type = {
-            "PowerPlant": 24,
-            "Substation": 8,
-            "ServerRack": 2,
-            "Application": 1,
-            "NetworkSwitch": 1,
-            "CoolingUnit": 4,
-            "ProductionLine": 6,
-        }
-
         total_mttr = 0
         for comp_id, status in self.status.items():
             if status in [ComponentStatus.FAILED, ComponentStatus.IMPACTED]:
                 comp_type = self.components[comp_id]["type"]
-                total_mttr = max(total_mttr, mttr_by_type.get(comp_type, 2))
+                total_mttr = max(total_mttr, self.MTTR_BY_TYPE.get(comp_type, 2))
 
         self.metrics.estimated_mttr = total_mttr
 
         return self.metrics
 
+    def monte_carlo(self, component_id: str, trials: int = 1000,
+                    seed: Optional[int] = None) -> MonteCarloResult:
+        """
+        Run many stochastic cascades from one trigger in a single batch.
+
+        Does not touch ``self.status``; see cascading_failure/monte_carlo.py.
+        """
+        component_id = self._resolve_component_id(component_id)
+        if self._monte_carlo is None:
+            self._monte_carlo = MonteCarloCascade(
+                self.components,
+                self.dependencies,
+                self.DEPENDENCY_CONFIG,
+                self.DEFAULT_DEPENDENCY_CONFIG,
+                self.MTTR_BY_TYPE,
+            )
+        return self._monte_carlo.run(component_id, trials, seed=seed)
+
+    def monte_carlo_all(self, trials: int = 1000,
+                        seed: Optional[int] = None) -> List[MonteCarloResult]:
+        """Monte Carlo cascades for every component, highest expected impact first."""
+        results = [
+            self.monte_carlo(comp_id, trials, seed=None if seed is None else seed + i)
+            for i, comp_id in enumerate(self.components)
+        ]
+        return sorted(results, key=lambda r: -r.expected_business_impact)
+
     def get_affected_components(self) -> List[Dict]:
         """Get list of all affected components with their status."""
         affected = []
@@ -405,6 +434,61 @@ class CascadeSimulator:
             self.status[comp_id] = ComponentStatus.OPERATIONAL
         self.metrics = None
 
+    def snapshot(self) -> Dict:
+        """Plain-data copy of the loaded graph, for worker processes."""
+        return {
+            "components": self.components,
+            "dependencies": {k: list(v) for k, v in self.dependencies.items()},
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict) -> "CascadeSimulator":
+        """Offline simulator over a snapshot (no client)."""
+        simulator = cls(client=None)
+        simulator.components = snapshot["components"]
+        for source_id, deps in snapshot["dependencies"].items():
+            for target_id, rel_type in deps:
+                simulator.dependencies[source_id].append((target_id, rel_type))
+                simulator.reverse_deps[target_id].append((source_id, rel_type))
+        simulator.status = {comp_id: ComponentStatus.OPERATIONAL for comp_id in simulator.components}
+        return simulator
+
+    def sweep(self, triggers: Optional[List[str]] = None, workers: Optional[int] = None,
+              seed: Optional[int] = None, trials: Optional[int] = None) -> List[Dict]:
+        """
+        Evaluate every component (or ``triggers``) as a failure trigger.
+
+        Runs in a process pool; each worker builds its own simulator from one
+        snapshot of the graph, so ``self.status`` is never touched. With
+        ``trials``, each trigger is scored by Monte Carlo instead of a single
+        cascade.
+
+        Returns:
+            One row per trigger (see SWEEP_COLUMNS), highest business impact first
+        """
+        triggers = list(self.components) if triggers is None else \
+            [self._resolve_component_id(t) for t in triggers]
+        tasks = [(i, trigger, seed, trials) for i, trigger in enumerate(triggers)]
+        workers = workers or os.cpu_count() or 1
+
+        if workers == 1 or len(tasks) < 2:
+            _init_sweep_worker(self.snapshot())
+            rows = [_sweep_one(task) for task in tasks]
+        else:
+            # fork shares the snapshot copy-on-write instead of pickling it per worker
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("fork" if "fork" in methods else None)
+            chunksize = max(1, len(tasks) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                     initializer=_init_sweep_worker,
+                                     initargs=(self.snapshot(),)) as executor:
+                rows = list(executor.map(_sweep_one, tasks, chunksize=chunksize))
+
+        rows.sort(key=lambda r: -r["business_impact"])
+        for rank, row in enumerate(rows, 1):
+            row["rank"] = rank
+        return rows
+
 
 def print_cascade_report(metrics: CascadeMetrics, affected: List[Dict]):
     """Print detailed cascade report."""
@@ -462,6 +546,51 @@ def print_cascade_report(metrics: CascadeMetrics, affected: List[Dict]):
               f"{comp['status']:<10} Impact: {comp['business_impact']}")
 
 
+def print_monte_carlo_report(simulator: CascadeSimulator, result: MonteCarloResult):
+    """Print failure-probability distribution for one trigger."""
+    print("\n" + "=" * 80)
+    print(" MONTE CARLO CASCADE ANALYSIS")
+    print(f" Trigger: {result.trigger_component}   Trials: {result.trials}")
+    print("=" * 80)
+
+    print(f"\n Expected Components Affected: {result.expected_affected:.1f}")
+    print(f" Expected Business Impact:     {result.expected_business_impact:.1f}")
+    print(" Business Impact Percentiles:  " + ", ".join(
+        f"P{p}={v:.1f}" for p, v in result.impact_percentiles.items()))
+    print(" Recovery Time Percentiles:    " + ", ".join(
+        f"P{p}={v:.0f}h" for p, v in result.mttr_percentiles.items()))
+
+    print("\n MOST LIKELY AFFECTED COMPONENTS:")
+    print("-" * 80)
+    print(f" {'Component':<35} {'Type':<18} {'P(affected)':>11} {'P(failed)':>10}")
+    print("-" * 80)
+
+    ranked = sorted(result.affected_probability.items(), key=lambda x: -x[1])
+    for comp_id, probability in ranked[:15]:
+        comp = simulator.components[comp_id]
+        print(f" {comp_id[:35]:<35} {comp['type'][:18]:<18} "
+              f"{probability:>11.1%} {result.failure_probability.get(comp_id, 0.0):>10.1%}")
+
+    if len(ranked) > 15:
+        print(f"   ... and {len(ranked) - 15} more components")
+
+
+def print_monte_carlo_ranking(results: List[MonteCarloResult]):
+    """Print triggers ranked by expected business impact."""
+    print("\n" + "=" * 80)
+    print(" MONTE CARLO RISK RANKING (all components)")
+    print("=" * 80)
+    print(f" {'Trigger':<35} {'E[affected]':>11} {'E[impact]':>10} "
+          f"{'MTTR P50':>9} {'MTTR P90':>9}")
+    print("-" * 80)
+
+    for result in results[:20]:
+        print(f" {result.trigger_component[:35]:<35} {result.expected_affected:>11.1f} "
+              f"{result.expected_business_impact:>10.1f} "
+              f"{result.mttr_percentiles.get(50, 0):>8.0f}h "
+              f"{result.mttr_percentiles.get(90, 0):>8.0f}h")
+
+
 def run_watch_mode(simulator: CascadeSimulator, metrics: CascadeMetrics):
     """Run interactive watch mode showing cascade in real-time."""
     print("\n" + "=" * 60)
@@ -496,36 +625,136 @@ def run_watch_mode(simulator: CascadeSimulator, metrics: CascadeMetrics):
     print("=" * 60)
 
 
-def run_scenario(simulator: CascadeSimulator, scenario: str) -> CascadeMetrics:
-    """Run a pre-defined failure scenario."""
-    scenarios = {
-        "power-outage": {
-            "trigger": "sub-trans-001",
-            "description": "Major substation failure causing widespread power outage",
-        },
-        "datacenter-power": {
-            "trigger": "dc-power-feed-a",
-            "description": "Data center power feed A failure",
-        },
-        "cooling-failure": {
-            "trigger": "dc-chiller-plant",
-            "description": "Central chiller plant failure causing thermal cascade",
-        },
-        "network-partition": {
-            "trigger": "dc-core-sw-001",
-            "description": "Core network switch failure causing network partition",
-        },
-        "generator-failure": {
-            "trigger": "dc-gen-001",
-            "description": "Backup generator failure during power event",
-        },
+# =============================================================================
+# What-if sweep
+# =============================================================================
+
+# With Monte Carlo scoring, counts and impact are expectations and
+# mttr_hours is the 90th percentile
+SWEEP_COLUMNS = [
+    "rank", "trigger", "name", "type", "criticality",
+    "total_affected", "cascade_depth", "max_severity",
+    "business_impact", "mttr_hours", "affected_applications",
+]
+
+# Per-process simulator built once from the snapshot by the pool initializer
+_sweep_simulator: Optional[CascadeSimulator] = None
+
+
+def _init_sweep_worker(snapshot: Dict):
+    global _sweep_simulator
+    _sweep_simulator = CascadeSimulator.from_snapshot(snapshot)
+
+
+def _sweep_one(task: Tuple[int, str, Optional[int], Optional[int]]) -> Dict:
+    """Score one trigger in the current worker."""
+    index, trigger, seed, trials = task
+    simulator = _sweep_simulator
+    comp = simulator.components[trigger]
+    row = {
+        "rank": 0,
+        "trigger": trigger,
+        "name": comp["name"],
+        "type": comp["type"],
+        "criticality": comp["properties"].get("criticality", "unknown"),
     }
 
-    if scenario not in scenarios:
-        available = ", ".join(scenarios.keys())
+    if trials:
+        result = simulator.monte_carlo(trigger, trials,
+                                       seed=None if seed is None else seed + index)
+        row.update({
+            "total_affected": round(result.expected_affected, 2),
+            "cascade_depth": None,
+            "max_severity": None,
+            "business_impact": round(result.expected_business_impact, 2),
+            "mttr_hours": result.mttr_percentiles.get(90),
+            "affected_applications": round(sum(
+                probability for comp_id, probability in result.affected_probability.items()
+                if simulator.components[comp_id]["type"] == "Application"
+            ), 2),
+        })
+        return row
+
+    if seed is not None:
+        random.seed(seed + index)
+    simulator.reset()
+    metrics = simulator.inject_failure(trigger)
+    row.update({
+        "total_affected": metrics.total_affected,
+        "cascade_depth": metrics.cascade_depth,
+        "max_severity": round(metrics.max_severity, 3),
+        "business_impact": round(metrics.total_business_impact, 2),
+        "mttr_hours": metrics.estimated_mttr,
+        "affected_applications": len(metrics.affected_applications),
+    })
+    return row
+
+
+def write_sweep_table(rows: List[Dict], path: str):
+    """Write sweep rows as Parquet (needs pandas + pyarrow) or CSV."""
+    if path.endswith(".parquet"):
+        try:
+            import pandas as pd
+        except ImportError:
+            raise RuntimeError("Parquet output requires pandas and pyarrow: "
+                               "pip install pandas pyarrow")
+        pd.DataFrame(rows, columns=SWEEP_COLUMNS).to_parquet(path, index=False)
+        return
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SWEEP_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_sweep_report(rows: List[Dict], limit: int = 20):
+    """Print the top of the ranked sweep table."""
+    print("\n" + "=" * 100)
+    print(f" WHAT-IF SWEEP: {len(rows)} triggers ranked by business impact")
+    print("=" * 100)
+    print(f" {'#':<4} {'Trigger':<32} {'Type':<18} {'Affected':>9} "
+          f"{'Depth':>6} {'Impact':>9} {'MTTR':>6} {'Apps':>5}")
+    print("-" * 100)
+
+    for row in rows[:limit]:
+        depth = "-" if row["cascade_depth"] is None else row["cascade_depth"]
+        print(f" {row['rank']:<4} {row['trigger'][:32]:<32} {row['type'][:18]:<18} "
+              f"{row['total_affected']:>9} {depth:>6} {row['business_impact']:>9.1f} "
+              f"{row['mttr_hours']:>5}h {row['affected_applications']:>5}")
+
+
+# Pre-defined failure scenarios
+SCENARIOS = {
+    "power-outage": {
+        "trigger": "sub-trans-001",
+        "description": "Major substation failure causing widespread power outage",
+    },
+    "datacenter-power": {
+        "trigger": "dc-power-feed-a",
+        "description": "Data center power feed A failure",
+    },
+    "cooling-failure": {
+        "trigger": "dc-chiller-plant",
+        "description": "Central chiller plant failure causing thermal cascade",
+    },
+    "network-partition": {
+        "trigger": "dc-core-sw-001",
+        "description": "Core network switch failure causing network partition",
+    },
+    "generator-failure": {
+        "trigger": "dc-gen-001",
+        "description": "Backup generator failure during power event",
+    },
+}
+
+
+def run_scenario(simulator: CascadeSimulator, scenario: str) -> CascadeMetrics:
+    """Run a pre-defined failure scenario."""
+    if scenario not in SCENARIOS:
+        available = ", ".join(SCENARIOS.keys())
         raise ValueError(f"Unknown scenario: {scenario}. Available: {available}")
 
-    config = scenarios[scenario]
+    config = SCENARIOS[scenario]
     print(f"\n Running Scenario: {scenario}")
     print(f" Description: {config['description']}")
     print(f" Trigger: {config['trigger']}")
@@ -544,8 +773,22 @@ def main():
                        help="Watch cascade in real-time")
     parser.add_argument("--list-components", action="store_true",
                        help="List available components")
+    parser.add_argument("--monte-carlo", type=int, metavar="TRIALS",
+                       help="Run TRIALS stochastic cascades per trigger (all components "
+                            "if no --trigger/--scenario is given)")
+    parser.add_argument("--seed", type=int, help="Random seed for --monte-carlo / --sweep")
+    parser.add_argument("--sweep", action="store_true",
+                       help="Run every component as a trigger and rank by impact")
+    parser.add_argument("--types", help="Sweep only these component types (comma-separated)")
+    parser.add_argument("--criticality", help="Sweep only these criticality levels (comma-separated)")
+    parser.add_argument("--workers", type=int, help="Sweep worker processes (default: CPU count)")
+    parser.add_argument("--output", help="Write the sweep table to a .csv or .parquet file")
     args = parser.parse_args()
 
+    if args.monte_carlo and not NUMPY_AVAILABLE:
+        print("Monte Carlo mode requires NumPy. Install with: pip install numpy")
+        return
+
     client = get_client(args.base_url)
     simulator = CascadeSimulator(client)
 
@@ -560,6 +803,39 @@ def main():
             print(f"  {comp_id:<35} {comp['type']:<20} [{criticality}]")
         return
 
+    if args.sweep:
+        types = set(args.types.split(",")) if args.types else None
+        levels = set(args.criticality.split(",")) if args.criticality else None
+        triggers = [
+            comp_id for comp_id, comp in simulator.components.items()
+            if (types is None or comp["type"] in types)
+            and (levels is None or comp["properties"].get("criticality") in levels)
+        ]
+
+        start = time.time()
+        rows = simulator.sweep(triggers, workers=args.workers, seed=args.seed,
+                               trials=args.monte_carlo)
+        print_sweep_report(rows)
+        print(f"\n Swept {len(rows)} triggers in {time.time() - start:.1f}s")
+
+        if args.output:
+            write_sweep_table(rows, args.output)
+            print(f" Wrote {args.output}")
+        return
+
+    if args.monte_carlo:
+        trigger = args.trigger or SCENARIOS.get(args.scenario, {}).get("trigger")
+        if trigger:
+            result = simulator.monte_carlo(trigger, args.monte_carlo, seed=args.seed)
+            print_monte_carlo_report(simulator, result)
+        else:
+            start = time.time()
+            results = simulator.monte_carlo_all(args.monte_carlo, seed=args.seed)
+            print_monte_carlo_ranking(results)
+            print(f"\n {len(results)} triggers x {args.monte_carlo} trials "
+                  f"in {time.time() - start:.1f}s")
+        return
+
     if args.random_failure:
         # Select random critical component
         critical = [c for c, data in simulator.components.items()
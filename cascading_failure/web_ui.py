@@ -12,9 +12,10 @@ Features:
 - Multiple failure scenarios
 - Blast radius analysis
 - Single point of failure detection
+- Live critical paths, patched incrementally as twins change
 
 Usage:
-    python web_ui.py [--port 8108]
+    python web_ui.py [--port 8108] [--refresh-interval 10]
 
 Then open http://localhost:8108 in your browser.
 
@@ -42,16 +43,25 @@ except ImportError:
     sys.exit(1)
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from common import get_client, logger
+from common import get_client, logger, load_relationship_graph, AsyncDTaaSClient
+from cascading_failure.dependency_graph import DependencyGraph, orient_edge, supply_edges
+from cascading_failure.critical_paths import CriticalPathEngine
 
 # Global state
 client = None
+async_client: Optional[AsyncDTaaSClient] = None
 components: Dict[str, dict] = {}
 forward_deps: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
 reverse_deps: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+dependency_graph: Optional[DependencyGraph] = None
+critical_path_engine: Optional[CriticalPathEngine] = None
+# Properties as last read from DTaaS, and what-if edits layered over them
+polled_properties: Dict[str, dict] = {}
+component_overrides: Dict[str, dict] = defaultdict(dict)
 connected_clients: Set = set()
 simulation_running = False
 ws_port = 8091
+refresh_interval = 10.0
 
 
 class ComponentStatus(Enum):
@@ -85,51 +95,55 @@ def _normalize_rel_type(rel_type: str) -> str:
     return rel_type
 
 
-def load_infrastructure():
+async def load_infrastructure():
     """Load infrastructure data from DTaaS."""
-    global components, forward_deps, reverse_deps, component_status
+    global components, forward_deps, reverse_deps, component_status, dependency_graph
+    global critical_path_engine, polled_properties
 
-    components = {}
-    forward_deps = defaultdict(list)
-    reverse_deps = defaultdict(list)
-    component_status = {}
+    # Build into locals and swap at the end so websocket handlers never see
+    # a half-loaded graph while requests are in flight
+    new_components = {}
+    new_forward = defaultdict(list)
+    new_reverse = defaultdict(list)
+    new_status = {}
+    new_polled = {}
 
     try:
-        twins = client.twins.list(domain="cascading_failure", page_size=200)
+        twins = await async_client.twins.list(domain="cascading_failure", page_size=200)
 
         for twin in twins:
             twin_dict = twin.model_dump() if hasattr(twin, 'model_dump') else twin
             component_id = twin_dict["id"]
 
             type_val = twin_dict.get("type_uri") or twin_dict.get("type") or ""
-            raw_props = twin_dict.get("properties", {})
+            props = _normalize_properties(twin_dict.get("properties", {}))
 
-            components[component_id] = {
+            new_polled[component_id] = props
+            new_components[component_id] = {
                 "id": component_id,
                 "name": twin_dict.get("name", component_id),
                 "type": type_val.split("#")[-1] if type_val else "",
-                "properties": _normalize_properties(raw_props),
+                "properties": {**props, **component_overrides.get(component_id, {})},
             }
-            component_status[component_id] = ComponentStatus.OPERATIONAL
-
-        # Load relationships
-        for component_id in components:
-            try:
-                relationships = client.twins.get_relationships(component_id)
-                for rel in relationships:
-                    rel_type = _normalize_rel_type(rel.get("type", ""))
-                    other_twin = rel.get("twin", rel.get("target", ""))
-                    direction = rel.get("direction", "outgoing")
-
-                    if other_twin and other_twin in components:
-                        if direction == "outgoing":
-                            forward_deps[component_id].append((other_twin, rel_type))
-                            reverse_deps[other_twin].append((component_id, rel_type))
-                        else:
-                            forward_deps[other_twin].append((component_id, rel_type))
-                            reverse_deps[component_id].append((other_twin, rel_type))
-            except Exception:
-                pass
+            new_status[component_id] = ComponentStatus.OPERATIONAL
+
+        # Load every edge in one export instead of a request per component
+        graph = await async_client.run(
+            load_relationship_graph, client, domains=["cascading_failure"], twin_ids=new_components
+        )
+        for source_id, rel_type, target_id in graph.edges:
+            if source_id in new_components and target_id in new_components:
+                rel_type = _normalize_rel_type(rel_type)
+                new_forward[source_id].append((target_id, rel_type))
+                new_reverse[target_id].append((source_id, rel_type))
+
+        components = new_components
+        forward_deps = new_forward
+        reverse_deps = new_reverse
+        component_status = new_status
+        polled_properties = new_polled
+        dependency_graph = DependencyGraph(components, reverse_deps)
+        critical_path_engine = CriticalPathEngine(components, supply_edges(forward_deps))
 
         logger.info(f"Loaded {len(components)} components with "
                    f"{sum(len(d) for d in forward_deps.values())} dependencies")
@@ -195,20 +209,22 @@ def get_graph_data() -> dict:
 
 
 def calculate_blast_radius(component_id: str) -> Tuple[int, List[str]]:
-    """Calculate blast radius for a component."""
-    affected = set([component_id])
+    """Calculate blast radius for a component (including the component itself)."""
+    if dependency_graph is None or component_id not in components:
+        return 1, [component_id]
+
     affected_list = [component_id]
-    queue = [component_id]
+    affected_list.extend(c for c in dependency_graph.reachable(component_id) if c != component_id)
+    return len(affected_list), affected_list
 
-    while queue:
-        current = queue.pop(0)
-        for dependent, _ in reverse_deps.get(current, []):
-            if dependent not in affected and dependent in components:
-                affected.add(dependent)
-                affected_list.append(dependent)
-                queue.append(dependent)
 
-    return len(affected), affected_list
+def blast_radius_size(component_id: str) -> int:
+    """Blast radius size from the memoized reachability sets."""
+    if dependency_graph is None or component_id not in components:
+        return 1
+    reach = dependency_graph.reachable_mask(component_id)
+    own_bit = 1 << dependency_graph.index[component_id]
+    return (reach | own_bit).bit_count()
 
 
 async def simulate_cascade(trigger_id: str):
@@ -322,7 +338,7 @@ def find_single_points_of_failure() -> List[dict]:
     spofs = []
 
     for comp_id in components:
-        blast_size, affected = calculate_blast_radius(comp_id)
+        blast_size = blast_radius_size(comp_id)
         props = components[comp_id].get("properties", {})
 
         if blast_size > 3 and props.get("redundancyLevel", 0) == 0:
@@ -337,6 +353,133 @@ def find_single_points_of_failure() -> List[dict]:
     return sorted(spofs, key=lambda x: -x["blastRadius"])[:20]
 
 
+def get_critical_paths(max_paths: int = 10) -> List[dict]:
+    """Highest-impact supply chains ending at applications and production."""
+    if critical_path_engine is None:
+        return []
+    return [
+        {
+            "path": p.path,
+            "impact": p.total_business_impact,
+            "weakestLink": p.weakest_link,
+            "weakestReliability": p.weakest_link_reliability,
+            "pathReliability": round(p.path_reliability, 4),
+        }
+        for p in critical_path_engine.critical_paths(max_paths)
+    ]
+
+
+def get_init_state() -> dict:
+    return {
+        "type": "init",
+        "graph": get_graph_data(),
+        "spofs": find_single_points_of_failure(),
+        "scenarios": get_scenarios(),
+        "criticalPaths": get_critical_paths(),
+    }
+
+
+def _refresh_component(component_id: str) -> List[str]:
+    """Rebuild a component's properties from the polled values and its what-if edits."""
+    properties = components[component_id]["properties"]
+    properties.clear()
+    properties.update(polled_properties.get(component_id, {}))
+    properties.update(component_overrides.get(component_id, {}))
+    if critical_path_engine is None:
+        return []
+    return critical_path_engine.update_component(component_id, properties)
+
+
+def apply_component_update(component_id: str, properties: dict) -> List[str]:
+    """Apply a what-if edit; returns components whose critical path changed."""
+    if component_id not in components:
+        return []
+    component_overrides[component_id].update(_normalize_properties(properties))
+    return _refresh_component(component_id)
+
+
+def apply_polled_properties(component_id: str, properties: dict) -> List[str]:
+    """Record properties read from DTaaS; what-if edits still take precedence."""
+    if component_id not in components or properties == polled_properties.get(component_id):
+        return []
+    polled_properties[component_id] = properties
+    return _refresh_component(component_id)
+
+
+def apply_dependency_change(source_id: str, rel_type: str, target_id: str,
+                            added: bool) -> List[str]:
+    """Add or remove one relationship; returns components whose critical path changed."""
+    global dependency_graph
+
+    if source_id not in components or target_id not in components:
+        return []
+    rel_type = _normalize_rel_type(rel_type)
+    edge = (target_id, rel_type)
+    if added == (edge in forward_deps[source_id]):
+        return []
+
+    if added:
+        forward_deps[source_id].append(edge)
+        reverse_deps[target_id].append((source_id, rel_type))
+    else:
+        forward_deps[source_id].remove(edge)
+        reverse_deps[target_id].remove((source_id, rel_type))
+    dependency_graph = DependencyGraph(components, reverse_deps)
+    if critical_path_engine is None:
+        return []
+
+    provider, consumer = orient_edge(source_id, rel_type, target_id)
+    if added:
+        return critical_path_engine.add_edge(provider, consumer)
+
+    # Paired links (powerSupply plus dependsOn) keep the supply edge alive
+    for src, other in ((provider, consumer), (consumer, provider)):
+        for dst, other_type in forward_deps.get(src, []):
+            if dst == other and orient_edge(src, other_type, dst) == (provider, consumer):
+                return []
+    return critical_path_engine.remove_edge(provider, consumer)
+
+
+async def broadcast_critical_paths(changed: List[str]):
+    if changed:
+        await broadcast({
+            "type": "critical_paths",
+            "criticalPaths": get_critical_paths(),
+            "changed": changed,
+        })
+
+
+async def watch_components():
+    """Poll twin properties and keep the critical paths live."""
+    while True:
+        await asyncio.sleep(refresh_interval)
+        if simulation_running:
+            continue
+        try:
+            twins = await async_client.twins.list(domain="cascading_failure", page_size=200)
+        except Exception as e:
+            logger.warning(f"Component refresh failed: {e}")
+            continue
+
+        seen = set()
+        changed: Set[str] = set()
+        for twin in twins:
+            twin_dict = twin.model_dump() if hasattr(twin, 'model_dump') else twin
+            component_id = twin_dict["id"]
+            seen.add(component_id)
+            if component_id not in components:
+                continue
+            props = _normalize_properties(twin_dict.get("properties", {}))
+            changed.update(apply_polled_properties(component_id, props))
+
+        # Components were added or removed: relationships need a full reload
+        if seen != components.keys():
+            await load_infrastructure()
+            await broadcast(get_init_state())
+            continue
+        await broadcast_critical_paths(sorted(changed))
+
+
 async def broadcast(message: dict):
     """Broadcast message to all connected clients."""
     if connected_clients:
@@ -353,12 +496,7 @@ async def handle_websocket(websocket):
 
     try:
         # Send initial state
-        await websocket.send(json.dumps({
-            "type": "init",
-            "graph": get_graph_data(),
-            "spofs": find_single_points_of_failure(),
-            "scenarios": get_scenarios(),
-        }))
+        await websocket.send(json.dumps(get_init_state()))
 
         async for message in websocket:
             data = json.loads(message)
@@ -381,13 +519,29 @@ async def handle_websocket(websocket):
             elif data.get("type") == "reload":
                 simulation_running = False
                 await asyncio.sleep(0.2)
-                load_infrastructure()
-                await websocket.send(json.dumps({
-                    "type": "init",
-                    "graph": get_graph_data(),
-                    "spofs": find_single_points_of_failure(),
-                    "scenarios": get_scenarios(),
-                }))
+                component_overrides.clear()
+                await load_infrastructure()
+                await websocket.send(json.dumps(get_init_state()))
+
+            elif data.get("type") == "update_component":
+                comp_id = data.get("component")
+                if comp_id:
+                    if comp_id not in components:
+                        comp_id = f"urn:tesserai:twin:{comp_id}"
+                    changed = apply_component_update(comp_id, data.get("properties", {}))
+                    await broadcast_critical_paths(changed)
+
+            elif data.get("type") in ("add_dependency", "remove_dependency"):
+                source_id, target_id = data.get("source", ""), data.get("target", "")
+                if source_id not in components:
+                    source_id = f"urn:tesserai:twin:{source_id}"
+                if target_id not in components:
+                    target_id = f"urn:tesserai:twin:{target_id}"
+                changed = apply_dependency_change(
+                    source_id, data.get("relType", "dependsOn"), target_id,
+                    added=data["type"] == "add_dependency",
+                )
+                await broadcast_critical_paths(changed)
 
             elif data.get("type") == "blast_radius":
                 comp_id = data.get("component")
@@ -566,6 +720,15 @@ HTML_CONTENT = '''<!DOCTYPE html>
             font-size: 0.7rem;
         }
         .spof-item .type { color: #888; }
+        .spof-item .chain {
+            color: #aaa;
+            font-size: 0.65rem;
+            margin-top: 4px;
+            word-break: break-word;
+        }
+        .spof-item.changed {
+            border-color: #f39c12;
+        }
         .spof-item .blast {
             color: #e74c3c;
             font-weight: 500;
@@ -739,6 +902,11 @@ HTML_CONTENT = '''<!DOCTYPE html>
             </div>
             <div class="spof-list" id="spofList"></div>
 
+            <div class="panel-section">
+                <h3>Critical Paths</h3>
+            </div>
+            <div class="spof-list" id="pathList"></div>
+
             <div id="summaryPanel" class="summary-panel hidden">
                 <h3 style="font-size: 0.75rem; color: #888; margin-bottom: 10px;">CASCADE SUMMARY</h3>
                 <div class="summary-grid">
@@ -1034,6 +1202,32 @@ HTML_CONTENT = '''<!DOCTYPE html>
             });
         }
 
+        function updateCriticalPaths(paths, changed) {
+            const list = document.getElementById('pathList');
+            const touched = new Set(changed || []);
+            list.innerHTML = '';
+
+            paths.forEach(p => {
+                const short = p.path.map(id => id.replace('urn:tesserai:twin:', ''));
+                const item = document.createElement('div');
+                item.className = p.path.some(id => touched.has(id)) ? 'spof-item changed' : 'spof-item';
+                item.innerHTML = `
+                    <div class="name">${short[short.length - 1]}</div>
+                    <div class="meta">
+                        <span class="type">Weakest: ${p.weakestLink.replace('urn:tesserai:twin:', '')} (${p.weakestReliability})</span>
+                        <span class="blast">Impact: ${p.impact}</span>
+                    </div>
+                    <div class="chain">${short.join(' &rarr; ')}</div>
+                `;
+                item.onclick = () => {
+                    if (!isSimulating) {
+                        ws.send(JSON.stringify({type: 'simulate', trigger: p.weakestLink}));
+                    }
+                };
+                list.appendChild(item);
+            });
+        }
+
         function updateGraph(graphData) {
             nodes = graphData.nodes;
             edges = graphData.edges;
@@ -1072,6 +1266,7 @@ HTML_CONTENT = '''<!DOCTYPE html>
                     nodePositions = {};
                     updateGraph(data.graph);
                     if (data.spofs) updateSpofs(data.spofs);
+                    if (data.criticalPaths) updateCriticalPaths(data.criticalPaths);
                     if (data.scenarios) updateScenarios(data.scenarios);
                     document.getElementById('summaryPanel').classList.add('hidden');
                     document.getElementById('status').className = 'status-indicator idle';
@@ -1107,6 +1302,10 @@ HTML_CONTENT = '''<!DOCTYPE html>
                     document.getElementById('status').textContent = 'Complete';
                     logEvent(`CASCADE COMPLETE: ${s.totalAffected} affected (${s.failed} failed, ${s.degraded} degraded)`, 'info');
                 }
+                else if (data.type === 'critical_paths') {
+                    updateCriticalPaths(data.criticalPaths, data.changed);
+                    logEvent(`Critical paths updated (${data.changed.length} components changed)`, 'info');
+                }
                 else if (data.type === 'error') {
                     logEvent(`ERROR: ${data.message}`, 'failed');
                 }
@@ -1212,14 +1411,16 @@ class WebHandler(SimpleHTTPRequestHandler):
         pass  # Suppress logging
 
 
-async def main(port: int):
-    global client, ws_port
+async def main(port: int, interval: float):
+    global client, async_client, ws_port, refresh_interval
 
     ws_port = port + 1
+    refresh_interval = interval
 
     # Initialize client and load data
     client = get_client()
-    load_infrastructure()
+    async_client = AsyncDTaaSClient(client)
+    await load_infrastructure()
 
     # Start HTTP server
     http_server = HTTPServer(('', port), WebHandler)
@@ -1235,6 +1436,9 @@ async def main(port: int):
     print(f"  Dependencies: {sum(len(d) for d in forward_deps.values())}")
     print(f"{'='*60}\n")
 
+    if refresh_interval > 0:
+        asyncio.create_task(watch_components())
+
     # Start WebSocket server
     async with websockets.serve(handle_websocket, "", ws_port):
         await asyncio.Future()  # Run forever
@@ -1243,9 +1447,11 @@ async def main(port: int):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Cascading Failure Web UI")
     parser.add_argument("--port", type=int, default=8108, help="HTTP port (default: 8108)")
+    parser.add_argument("--refresh-interval", type=float, default=10.0,
+                        help="Seconds between twin refreshes for live critical paths (0 disables)")
     args = parser.parse_args()
 
     try:
-        asyncio.run(main(args.port))
+        asyncio.run(main(args.port, args.refresh_interval))
     except KeyboardInterrupt:
         print("\nShutdown requested")
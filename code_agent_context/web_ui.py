@@ -25,7 +25,7 @@ import sys
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 import threading
 from datetime import datetime
-from typing import Dict, Set
+from typing import Dict, Optional, Set
 import html
 
 try:
@@ -35,7 +35,7 @@ except ImportError:
     sys.exit(1)
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from common import get_client, logger
+from common import get_client, logger, AsyncDTaaSClient
 
 # Configuration
 AGENT_ID = "code-agent-vscode"
@@ -44,18 +44,19 @@ WS_PORT = 8121
 
 # Global state
 client = None
+async_client: Optional[AsyncDTaaSClient] = None
 connected_clients: Set = set()
 memories_cache: Dict = {}
 sessions_cache: Dict = {}
 
 
-def load_memories():
+async def load_memories():
     """Load memories from TesseraiDB."""
     global memories_cache, sessions_cache
 
     try:
         # Query all memories for the agent
-        result = client.memory.query(
+        result = await async_client.memory.query(
             agent_id=AGENT_ID,
             query={"limit": 500}
         )
@@ -163,10 +164,10 @@ def get_dashboard_data() -> dict:
     }
 
 
-def search_memories(query: str) -> list:
+async def search_memories(query: str) -> list:
     """Search memories using semantic search."""
     try:
-        result = client.memory.query(
+        result = await async_client.memory.query(
             agent_id=AGENT_ID,
             query={
                 "query": query,
@@ -212,7 +213,7 @@ async def websocket_handler(websocket):
 
                 if msg_type == "search":
                     query = msg.get("query", "")
-                    results = search_memories(query)
+                    results = await search_memories(query)
                     await websocket.send(json.dumps({
                         "type": "search_results",
                         "query": query,
@@ -228,7 +229,7 @@ async def websocket_handler(websocket):
                     }))
 
                 elif msg_type == "refresh":
-                    load_memories()
+                    await load_memories()
                     await websocket.send(json.dumps({
                         "type": "init",
                         "data": get_dashboard_data()
@@ -813,14 +814,15 @@ def run_http_server(port: int):
 
 async def main(http_port: int, ws_port: int):
     """Main entry point."""
-    global client, HTTP_PORT, WS_PORT
+    global client, async_client, HTTP_PORT, WS_PORT
 
     HTTP_PORT = http_port
     WS_PORT = ws_port
 
     # Initialize client
     client = get_client()
-    load_memories()
+    async_client = AsyncDTaaSClient(client)
+    await load_memories()
 
     # Start HTTP server in thread
     http_thread = threading.Thread(target=run_http_server, args=(http_port,), daemon=True)
@@ -33,8 +33,19 @@ Configuration:
 
 import sys
 import os
+import time
+import asyncio
+import functools
+import hashlib
+import json
 import logging
-from typing import Optional
+import random
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Optional
 
 import httpx
 
@@ -47,6 +58,8 @@ from dtaas import DTaaSClient
 from dtaas.exceptions import ConflictError, NotFoundError
 from dtaas.models import BatchOperation, BatchOperationType, BatchConfig, BatchRequest, BatchResponse
 
+from rdf_serializer import serialize_twin, serialize_relationships
+
 # Default configuration - uses TesseraiDB Cloud API
 DEFAULT_BASE_URL = "https://api.tesserai.io"
 
@@ -160,6 +173,119 @@ def get_client(
     return DTaaSClient(url, token=token)
 
 
+# =============================================================================
+# Async Client (for asyncio-based web UIs)
+# =============================================================================
+
+DEFAULT_ASYNC_CONCURRENCY = 16
+DEFAULT_REQUEST_TIMEOUT = 30.0
+
+
+class _AsyncNamespace:
+    """Awaitable view of one SDK namespace (``twins``, ``rsp``, ``memory``, ...)."""
+
+    def __init__(self, owner: "AsyncDTaaSClient", namespace):
+        self._owner = owner
+        self._namespace = namespace
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._namespace, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            return await self._owner.run(attr, *args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+
+class AsyncDTaaSClient:
+    """
+    Asyncio facade over DTaaSClient.
+
+    Every SDK namespace is exposed with awaitable methods, so event loops
+    (websocket dashboards, simulation loops) never block on HTTP:
+
+        aclient = AsyncDTaaSClient(get_client())
+        twins = await aclient.twins.list(domain="energy_grid")
+        await asyncio.gather(*[
+            aclient.twins.update(twin_id, {"properties": props})
+            for twin_id, props in updates.items()
+        ])
+
+    SDK calls run on a bounded worker pool. There is no separate async
+    HTTP pool: requests reuse the wrapped client's keep-alive connections.
+    At most ``max_concurrency`` requests are in flight. A caller stops
+    waiting after ``timeout`` seconds, but the request keeps its worker
+    slot until the SDK call returns, so a hung endpoint can't push more
+    than ``max_concurrency`` calls onto the pool.
+
+    Args:
+        client: The synchronous DTaaS client to wrap
+        max_concurrency: Maximum number of concurrent requests
+        timeout: Default per-request timeout in seconds
+    """
+
+    def __init__(
+        self,
+        client: DTaaSClient,
+        max_concurrency: int = DEFAULT_ASYNC_CONCURRENCY,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    ):
+        self.client = client
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="dtaas-async",
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def __getattr__(self, name: str) -> _AsyncNamespace:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _AsyncNamespace(self, getattr(self.client, name))
+
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        """
+        Run a blocking callable on the worker pool and await its result.
+
+        Waits for a free worker slot first; ``timeout`` starts once the call
+        is running, so queueing behind slow calls doesn't eat into it.
+
+        Args:
+            func: The blocking function (usually an SDK method)
+            timeout: Per-request timeout override in seconds (0 = don't wait)
+
+        Returns:
+            The callable's return value
+
+        Raises:
+            asyncio.TimeoutError: If the call does not finish in time (the
+                call itself keeps its worker slot until it returns)
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        semaphore = self._semaphore
+
+        def release(future: asyncio.Future) -> None:
+            semaphore.release()
+            if not future.cancelled():
+                future.exception()  # retrieved here if the caller timed out
+
+        loop = asyncio.get_running_loop()
+        await semaphore.acquire()
+        try:
+            future = loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+        except BaseException:
+            semaphore.release()
+            raise
+        # The slot is freed when the worker finishes, not when the caller gives up
+        future.add_done_callback(release)
+        return await asyncio.wait_for(asyncio.shield(future), self.timeout if timeout is None else timeout)
+
+
 def create_twin_safe(client: DTaaSClient, twin_data: dict, upsert: bool = True) -> Optional[dict]:
     """
     Create or update a twin safely.
@@ -456,152 +582,552 @@ def print_domain_summary(client: DTaaSClient) -> None:
 # Bulk Operations (Performance Optimization)
 # =============================================================================
 
-def bulk_create_twins(client: DTaaSClient, twins_data: list[dict], upsert: bool = True) -> tuple[int, int]:
+# Pipelining defaults: how many batch requests may be outstanding at once, and
+# the bounds within which the executor resizes chunks based on server timings.
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_BATCH_SIZE = 100
+MIN_BATCH_SIZE = 25
+MAX_BATCH_SIZE = 1000
+TARGET_BATCH_MS = 1000.0
+
+
+@dataclass
+class BatchChunkStats:
+    """Timing and outcome of one chunk processed by a BatchExecutor."""
+    index: int
+    items: int
+    operations: int
+    succeeded: int
+    failed: int
+    server_ms: int
+    wall_ms: float
+
+    @property
+    def throughput(self) -> float:
+        """Items completed per second of wall-clock time for this chunk."""
+        if self.wall_ms <= 0:
+            return 0.0
+        return self.items * 1000.0 / self.wall_ms
+
+
+class BatchExecutor:
     """
-    Create multiple twins in a single batch request.
+    Pipelined executor for batch API requests.
 
-    This is significantly faster than creating twins one at a time, especially
-    when connecting to a remote API.
+    Splits a list of items into chunks and keeps up to ``max_in_flight`` chunks
+    outstanding at once, so large seeds are bounded by server throughput
+    rather than round-trip latency. Each chunk runs an optional ``prepare``
+    phase (e.g. deleting twins before an upsert) followed by the ``build``
+    phase whose results are counted; phases of different chunks overlap.
+
+    The chunk size adapts to the ``total_duration_ms`` reported by the server,
+    aiming for batches that take roughly ``target_batch_ms`` each.
+
+    Example:
+        executor = BatchExecutor(client, label="twins")
+        succeeded, failed = executor.run(
+            twins,
+            build=lambda chunk: [make_create_op(t) for t in chunk],
+        )
+        for stats in executor.chunk_stats:
+            print(stats.index, stats.throughput)
+    """
+
+    def __init__(
+        self,
+        client: DTaaSClient,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        min_batch_size: int = MIN_BATCH_SIZE,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        target_batch_ms: float = TARGET_BATCH_MS,
+        label: str = "operations",
+        verbose: bool = True,
+    ):
+        self.client = client
+        self.max_in_flight = max(1, max_in_flight)
+        self.min_batch_size = max(1, min(min_batch_size, batch_size))
+        self.max_batch_size = max(batch_size, max_batch_size)
+        self.batch_size = batch_size
+        self.target_batch_ms = target_batch_ms
+        self.label = label
+        self.verbose = verbose
+        self.chunk_stats: list[BatchChunkStats] = []
+
+    def _send(self, operations: list[BatchOperation]) -> BatchResponse:
+        request = BatchRequest(
+            operations=operations,
+            config=BatchConfig(stop_on_error=False, parallel=True)
+        )
+        return self.client.batch.process(request)
+
+    def _run_chunk(
+        self,
+        index: int,
+        chunk: list,
+        build: Callable[[list], list[BatchOperation]],
+        prepare: Optional[Callable[[list], list[BatchOperation]]],
+        weights: Optional[dict[str, int]],
+    ) -> BatchChunkStats:
+        started = time.perf_counter()
+
+        if prepare is not None:
+            prepare_ops = prepare(chunk)
+            if prepare_ops:
+                try:
+                    self._send(prepare_ops)
+                except Exception as e:
+                    logger.debug(f"Prepare batch {index} failed (continuing): {e}")
+
+        operations = build(chunk)
+        succeeded = 0
+        failed = 0
+        server_ms = 0
+
+        if operations:
+            try:
+                response = self._send(operations)
+                server_ms = response.total_duration_ms
+                for result in response.results:
+                    weight = weights.get(result.id, 1) if weights else 1
+                    if result.success:
+                        succeeded += weight
+                    else:
+                        failed += weight
+                        logger.warning(f"Batch operation failed: {result.id} - {result.error}")
+            except Exception as e:
+                logger.error(f"Batch request failed: {e}")
+                for op in operations:
+                    failed += weights.get(op.id, 1) if weights else 1
+
+        return BatchChunkStats(
+            index=index,
+            items=len(chunk),
+            operations=len(operations),
+            succeeded=succeeded,
+            failed=failed,
+            server_ms=server_ms,
+            wall_ms=(time.perf_counter() - started) * 1000.0,
+        )
+
+    def _adapt(self, stats: BatchChunkStats) -> None:
+        """Resize future chunks towards the target per-batch server duration."""
+        if stats.operations == 0:
+            return
+        if stats.server_ms <= 0:
+            ideal = self.batch_size * 2
+        else:
+            ideal = stats.operations * self.target_batch_ms / stats.server_ms
+        # Smooth the adjustment so a single slow batch doesn't collapse the size
+        resized = int((self.batch_size + ideal) / 2)
+        self.batch_size = max(self.min_batch_size, min(self.max_batch_size, resized))
+
+    def run(
+        self,
+        items: list,
+        build: Callable[[list], list[BatchOperation]],
+        prepare: Optional[Callable[[list], list[BatchOperation]]] = None,
+        weights: Optional[dict[str, int]] = None,
+    ) -> tuple[int, int]:
+        """
+        Execute batch operations for all items with pipelining.
+
+        Args:
+            items: Items to process (twin dicts, prebuilt operations, ...)
+            build: Maps a chunk of items to the operations whose results count
+            prepare: Optional map from a chunk to operations sent before
+                     ``build`` for the same chunk; failures are ignored
+            weights: Optional operation ID -> number of logical items it
+                     carries, used when counting successes and failures
+
+        Returns:
+            tuple: (successful_count, failed_count)
+        """
+        self.chunk_stats = []
+        if not items:
+            return 0, 0
+
+        total_succeeded = 0
+        total_failed = 0
+        position = 0
+        next_index = 1
+        started = time.perf_counter()
+        log = logger.info if self.verbose else logger.debug
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            pending = set()
+            while position < len(items) or pending:
+                while position < len(items) and len(pending) < self.max_in_flight:
+                    chunk = items[position:position + self.batch_size]
+                    position += len(chunk)
+                    pending.add(pool.submit(
+                        self._run_chunk, next_index, chunk, build, prepare, weights
+                    ))
+                    next_index += 1
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stats = future.result()
+                    self.chunk_stats.append(stats)
+                    total_succeeded += stats.succeeded
+                    total_failed += stats.failed
+                    log(
+                        f"Batch {stats.index}: {stats.succeeded}/{stats.operations} {self.label} "
+                        f"in {stats.server_ms}ms server / {stats.wall_ms:.0f}ms wall "
+                        f"({stats.throughput:.0f} {self.label}/s)"
+                    )
+                    self._adapt(stats)
+
+        elapsed = time.perf_counter() - started
+        rate = len(items) / elapsed if elapsed > 0 else 0.0
+        log(
+            f"Processed {len(items)} {self.label} in {len(self.chunk_stats)} batches "
+            f"over {elapsed:.2f}s ({rate:.0f} {self.label}/s, {self.max_in_flight} in flight)"
+        )
+        return total_succeeded, total_failed
+
+
+# Upsert modes for bulk_create_twins
+UPSERT_DIFF = "diff"
+UPSERT_REPLACE = "replace"
+
+# Property stamped on bulk-created twins so later upserts can detect changes
+CONTENT_HASH_PROPERTY = "contentHash"
+HASH_QUERY_PAGE_SIZE = 10000
+# Twins looked up per query when checking for twins stored in another domain
+TWIN_ID_LOOKUP_CHUNK = 500
 
-    Note: The batch API's CreateTwin operation does NOT support upsert directly.
-    When upsert=True, this function first deletes existing twins, then creates
-    new ones with fresh data (following the pattern documented in batch.rs).
+
+def twin_content_hash(twin_data: dict) -> str:
+    """
+    Compute a stable hash of a twin's desired state.
+
+    Covers type, name, description, domain and properties (excluding any
+    previously stamped content hash), independent of dict ordering.
+
+    Args:
+        twin_data: Twin data dictionary
+
+    Returns:
+        str: Hex digest identifying the twin's content
+    """
+    import hashlib
+    import json
+
+    properties = {
+        k: v for k, v in (twin_data.get("properties") or {}).items()
+        if k != CONTENT_HASH_PROPERTY
+    }
+    canonical = json.dumps(
+        [
+            twin_data.get("type", ""),
+            twin_data.get("name", ""),
+            twin_data.get("description", ""),
+            twin_data.get("domain", ""),
+            properties,
+        ],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def _with_content_hash(twin_data: dict, content_hash: str) -> dict:
+    """Return a copy of twin_data with the content hash stamped as a property."""
+    properties = {**(twin_data.get("properties") or {}), CONTENT_HASH_PROPERTY: content_hash}
+    return {**twin_data, "properties": properties}
+
+
+def _binding_value(binding: dict, var_name: str) -> Optional[str]:
+    """Read a SPARQL binding value in either plain or SPARQL-JSON form."""
+    value = binding.get(var_name)
+    if isinstance(value, dict):
+        return value.get("value")
+    return None if value is None else str(value)
+
+
+@dataclass
+class StoredTwin:
+    """What the upsert diff compares for an existing twin."""
+    content_hash: Optional[str] = None
+    types: set[str] = field(default_factory=set)
+    domains: set[str] = field(default_factory=set)
+
+
+def _stored_twins_query(selector: str, offset: int) -> str:
+    """Build one page of the stored-twins query for a VALUES selector."""
+    return f"""
+PREFIX dtaas: <{DTAAS_CORE_NS}>
+SELECT ?twin ?domain ?hash ?type WHERE {{
+    {selector}
+    ?twin dtaas:domain ?domain .
+    OPTIONAL {{ ?twin dtaas:{CONTENT_HASH_PROPERTY} ?hash }}
+    OPTIONAL {{ ?twin a ?type }}
+}}
+ORDER BY ?twin
+LIMIT {HASH_QUERY_PAGE_SIZE} OFFSET {offset}
+"""
+
+
+def _fetch_stored_twins(client: DTaaSClient, selector: str, stored: dict[str, StoredTwin]) -> bool:
+    """Page through one stored-twins query into ``stored``; False if it failed."""
+    offset = 0
+    while True:
+        try:
+            result = client.query.select(_stored_twins_query(selector, offset))
+        except Exception as e:
+            logger.warning(f"Could not fetch existing twin hashes: {e}")
+            return False
+
+        bindings = result.bindings or []
+        for binding in bindings:
+            twin_uri = _binding_value(binding, "twin")
+            if not twin_uri:
+                continue
+            twin_id = twin_uri[len(TWIN_URN_PREFIX):] if twin_uri.startswith(TWIN_URN_PREFIX) else twin_uri
+            twin = stored.setdefault(twin_id, StoredTwin())
+            twin.content_hash = _binding_value(binding, "hash") or twin.content_hash
+            for var_name, values in (("type", twin.types), ("domain", twin.domains)):
+                value = _binding_value(binding, var_name)
+                if value:
+                    values.add(value)
+
+        if len(bindings) < HASH_QUERY_PAGE_SIZE:
+            return True
+        offset += HASH_QUERY_PAGE_SIZE
+
+
+def fetch_stored_twins(
+    client: DTaaSClient,
+    domains: set[str],
+    twin_ids: Iterable[str] = (),
+) -> Optional[dict[str, StoredTwin]]:
+    """
+    Fetch the content hash, types and domains of existing twins.
+
+    Uses one paged SPARQL SELECT over the given domains instead of reading
+    each twin. ``twin_ids`` not found there are looked up by ID
+    (``TWIN_ID_LOOKUP_CHUNK`` per query), which finds twins stored under
+    another domain.
 
     Args:
         client: The DTaaS client
-        twins_data: List of twin data dictionaries, each containing at minimum 'id'
-        upsert: If True (default), delete existing twins before creating new ones
+        domains: Domains to scan
+        twin_ids: Twins that must be found even outside ``domains``
+
+    Returns:
+        dict: twin_id -> StoredTwin (content_hash None for twins created
+              without one), or None if the lookup failed
+    """
+    stored: dict[str, StoredTwin] = {}
+    if domains:
+        values = " ".join(f'"{d}"' for d in sorted(domains))
+        if not _fetch_stored_twins(client, f"VALUES ?domain {{ {values} }}", stored):
+            return None
+
+    missing = [twin_id for twin_id in twin_ids if twin_id not in stored]
+    for i in range(0, len(missing), TWIN_ID_LOOKUP_CHUNK):
+        values = " ".join(f"<{TWIN_URN_PREFIX}{twin_id}>" for twin_id in missing[i:i + TWIN_ID_LOOKUP_CHUNK])
+        if not _fetch_stored_twins(client, f"VALUES ?twin {{ {values} }}", stored):
+            return None
+    return stored
+
+
+def _patch_twins(
+    client: DTaaSClient,
+    twins_data: list[dict],
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+) -> tuple[int, int]:
+    """
+    Patch name, description and properties of existing twins concurrently.
+
+    Args:
+        client: The DTaaS client
+        twins_data: Twin data (already stamped with content hashes)
+        max_in_flight: Maximum number of concurrent update requests
 
     Returns:
         tuple: (successful_count, failed_count)
     """
+    def patch_one(twin_data: dict) -> bool:
+        update = {"properties": twin_data.get("properties") or {}}
+        for key in ("name", "description"):
+            if twin_data.get(key):
+                update[key] = twin_data[key]
+        try:
+            client.twins.update(twin_data["id"], update)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to patch twin {twin_data['id']}: {e}")
+            return False
+
+    succeeded = 0
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, max_in_flight)) as executor:
+        for ok in executor.map(patch_one, twins_data):
+            if ok:
+                succeeded += 1
+            else:
+                failed += 1
+    return succeeded, failed
+
+
+def _twin_create_operation(twin_data: dict) -> BatchOperation:
+    """Build a CREATE_TWIN batch operation carrying the twin as compact Turtle."""
+    twin_id = twin_data["id"]
+    # The batch API expects: { "id": "twin-id", "data": "RDF data" }
+    return BatchOperation(
+        id=f"create-{twin_id}",
+        operation=BatchOperationType.CREATE_TWIN,
+        payload={"id": twin_id, "data": serialize_twin(twin_data)}
+    )
+
+
+def _delete_twin_operations(chunk: list[dict]) -> list[BatchOperation]:
+    """Build DELETE_TWIN batch operations for a chunk of twins."""
+    return [
+        BatchOperation(
+            id=f"delete-{twin['id']}",
+            operation=BatchOperationType.DELETE_TWIN,
+            resource_id=twin["id"],
+            payload={}
+        )
+        for twin in chunk
+    ]
+
+
+def _create_twin_operations(chunk: list[dict]) -> list[BatchOperation]:
+    """Build CREATE_TWIN batch operations for a chunk of twins."""
+    return [_twin_create_operation(twin) for twin in chunk]
+
+
+def bulk_create_twins(
+    client: DTaaSClient,
+    twins_data: list[dict],
+    upsert: bool = True,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    upsert_mode: str = UPSERT_DIFF,
+) -> tuple[int, int]:
+    """
+    Create multiple twins using pipelined batch requests.
+
+    This is significantly faster than creating twins one at a time, especially
+    when connecting to a remote API. Up to ``max_in_flight`` batches are sent
+    concurrently and the batch size adapts to server response times.
+
+    Every twin is stamped with a ``contentHash`` property describing its
+    desired state. With upsert=True the behaviour depends on ``upsert_mode``:
+
+    - ``"diff"`` (default): fetch the stored hashes, types and domains of
+      the affected twins (``fetch_stored_twins``), create only missing
+      twins, patch name, description and properties of changed twins, and
+      skip unchanged twins entirely. Twins whose type or domain changed,
+      twins without a domain, and all twins if the lookup fails, use the
+      replace path.
+    - ``"replace"``: the batch API's CreateTwin operation does NOT support
+      upsert directly, so each chunk first deletes its existing twins and
+      then creates them with fresh data (following the pattern documented
+      in batch.rs). Use this when properties must be removed.
+
+    Args:
+        client: The DTaaS client
+        twins_data: List of twin data dictionaries, each containing at minimum 'id'
+        upsert: If True (default), update existing twins instead of failing
+        max_in_flight: Maximum number of concurrent batch requests
+        batch_size: Initial number of twins per batch
+        upsert_mode: UPSERT_DIFF or UPSERT_REPLACE
+
+    Returns:
+        tuple: (successful_count, failed_count); unchanged twins count as
+               successful
+    """
     if not twins_data:
         return 0, 0
 
-    # Collect twin IDs for upsert (delete-then-create pattern)
-    twin_ids = []
+    if upsert_mode not in (UPSERT_DIFF, UPSERT_REPLACE):
+        raise ValueError(f"Unknown upsert_mode: {upsert_mode}. Valid modes: {UPSERT_DIFF}, {UPSERT_REPLACE}")
+
+    valid_twins = []
+    hashes = {}
     for i, twin_data in enumerate(twins_data):
         twin_id = twin_data.get("id")
         if not twin_id:
             logger.warning(f"Skipping twin at index {i}: missing 'id'")
             continue
-        twin_ids.append(twin_id)
-
-    # Step 1: If upsert=True, delete existing twins first
-    if upsert and twin_ids:
-        delete_operations = [
-            BatchOperation(
-                id=f"delete-{twin_id}",
-                operation=BatchOperationType.DELETE_TWIN,
-                resource_id=twin_id,
-                payload={}
-            )
-            for twin_id in twin_ids
-        ]
-
-        # Process deletes in batches
-        batch_size = 100
-        for i in range(0, len(delete_operations), batch_size):
-            batch_ops = delete_operations[i:i + batch_size]
-            request = BatchRequest(
-                operations=batch_ops,
-                config=BatchConfig(stop_on_error=False, parallel=True)
-            )
-            try:
-                client.batch.process(request)
-                # Don't log delete failures - twins may not exist yet
-            except Exception as e:
-                logger.debug(f"Delete batch request (expected if twins don't exist): {e}")
+        content_hash = twin_content_hash(twin_data)
+        hashes[twin_id] = content_hash
+        valid_twins.append(_with_content_hash(twin_data, content_hash))
 
-    # Step 2: Build create operations
-    operations = []
-    for i, twin_data in enumerate(twins_data):
-        twin_id = twin_data.get("id")
-        if not twin_id:
-            continue  # Already warned above
-
-        # Convert twin data to RDF-compatible format for the batch API
-        # The batch API expects: { "id": "twin-id", "data": "RDF data" }
-        # We'll use JSON-LD style embedding
-        properties = twin_data.get("properties", {})
-        twin_type = twin_data.get("type", "")
-        name = twin_data.get("name", "")
-        description = twin_data.get("description", "")
-        domain = twin_data.get("domain", "")
-
-        # Build a simple Turtle representation
-        turtle_lines = [
-            f'@prefix dtaas: <http://tesserai.io/ontology/core#> .',
-            f'@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .',
-            f'@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .',
-            f'',
-            f'<urn:tesserai:twin:{twin_id}> a <{twin_type}> .' if twin_type else '',
-        ]
-
-        if name:
-            # Escape quotes in name
-            escaped_name = name.replace('\\', '\\\\').replace('"', '\\"')
-            turtle_lines.append(f'<urn:tesserai:twin:{twin_id}> rdfs:label "{escaped_name}" .')
-
-        if description:
-            escaped_desc = description.replace('\\', '\\\\').replace('"', '\\"')
-            turtle_lines.append(f'<urn:tesserai:twin:{twin_id}> rdfs:comment "{escaped_desc}" .')
-
-        if domain:
-            turtle_lines.append(f'<urn:tesserai:twin:{twin_id}> dtaas:domain "{domain}" .')
-
-        # Add properties
-        for key, value in properties.items():
-            if isinstance(value, bool):
-                turtle_lines.append(f'<urn:tesserai:twin:{twin_id}> dtaas:{key} {str(value).lower()} .')
-            elif isinstance(value, (int, float)):
-                turtle_lines.append(f'<urn:tesserai:twin:{twin_id}> dtaas:{key} {value} .')
-            elif isinstance(value, str):
-                escaped_val = value.replace('\\', '\\\\').replace('"', '\\"')
-                turtle_lines.append(f'<urn:tesserai:twin:{twin_id}> dtaas:{key} "{escaped_val}" .')
-            elif isinstance(value, dict):
-                # Store complex objects as JSON strings
-                import json
-                json_str = json.dumps(value).replace('\\', '\\\\').replace('"', '\\"')
-                turtle_lines.append(f'<urn:tesserai:twin:{twin_id}> dtaas:{key} "{json_str}" .')
-
-        turtle_data = '\n'.join(line for line in turtle_lines if line)
-
-        operations.append(BatchOperation(
-            id=f"create-{twin_id}",
-            operation=BatchOperationType.CREATE_TWIN,
-            payload={"id": twin_id, "data": turtle_data}
-        ))
-
-    if not operations:
+    if not valid_twins:
         return 0, 0
 
-    # Process in batches of 100 to avoid overwhelming the server
-    batch_size = 100
-    total_succeeded = 0
+    executor = BatchExecutor(
+        client,
+        max_in_flight=max_in_flight,
+        batch_size=batch_size,
+        label="twins",
+    )
+
+    if not upsert:
+        return executor.run(valid_twins, build=_create_twin_operations)
+
+    to_create, to_patch, to_replace = [], [], []
+    unchanged = 0
+
+    if upsert_mode == UPSERT_DIFF:
+        with_domain = [t for t in valid_twins if t.get("domain")]
+        domains = {t["domain"] for t in with_domain}
+        existing = fetch_stored_twins(client, domains, [t["id"] for t in with_domain]) if domains else {}
+        if existing is None:
+            logger.warning("Falling back to delete-then-create upsert")
+            to_replace = valid_twins
+        else:
+            for twin in valid_twins:
+                stored = existing.get(twin["id"])
+                if not twin.get("domain"):
+                    to_replace.append(twin)
+                elif stored is None:
+                    to_create.append(twin)
+                elif stored.domains != {twin["domain"]} or (
+                        twin.get("type") and twin["type"] not in stored.types):
+                    # A patch can't move a twin or drop its old rdf:type
+                    to_replace.append(twin)
+                elif stored.content_hash == hashes[twin["id"]]:
+                    unchanged += 1
+                else:
+                    to_patch.append(twin)
+            logger.info(
+                f"Upsert diff: {len(to_create)} new, {len(to_patch)} changed, "
+                f"{unchanged} unchanged, {len(to_replace)} replaced (type/domain changed or no domain)"
+            )
+    else:
+        to_replace = valid_twins
+
+    total_succeeded = unchanged
     total_failed = 0
 
-    for i in range(0, len(operations), batch_size):
-        batch_ops = operations[i:i + batch_size]
-        request = BatchRequest(
-            operations=batch_ops,
-            config=BatchConfig(stop_on_error=False, parallel=True)
+    if to_create:
+        succeeded, failed = executor.run(to_create, build=_create_twin_operations)
+        total_succeeded += succeeded
+        total_failed += failed
+
+    if to_replace:
+        # Don't log delete failures - twins may not exist yet
+        succeeded, failed = executor.run(
+            to_replace,
+            build=_create_twin_operations,
+            prepare=_delete_twin_operations,
         )
+        total_succeeded += succeeded
+        total_failed += failed
 
-        try:
-            response: BatchResponse = client.batch.process(request)
-            total_succeeded += response.succeeded
-            total_failed += response.failed
-
-            # Log failures
-            for result in response.results:
-                if not result.success:
-                    logger.warning(f"Failed to create twin: {result.id} - {result.error}")
-
-            logger.info(f"Batch {i // batch_size + 1}: {response.succeeded}/{len(batch_ops)} twins created in {response.total_duration_ms}ms")
-        except Exception as e:
-            logger.error(f"Batch request failed: {e}")
-            total_failed += len(batch_ops)
+    if to_patch:
+        succeeded, failed = _patch_twins(client, to_patch, max_in_flight)
+        logger.info(f"Patched {succeeded}/{len(to_patch)} changed twins")
+        total_succeeded += succeeded
+        total_failed += failed
 
     return total_succeeded, total_failed
 
@@ -649,18 +1175,20 @@ def create_twins_with_lineage(
 def bulk_add_relationships(
     client: DTaaSClient,
     relationships: list[tuple[str, str, str, Optional[dict]]],
-    batch_size: int = 100
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
 ) -> tuple[int, int]:
     """
     Add multiple relationships using the batch API with ADD_TRIPLES operations.
 
     Groups relationships by source twin and creates batch operations to minimize
-    HTTP round-trips.
+    HTTP round-trips. Batches are pipelined through a BatchExecutor.
 
     Args:
         client: The DTaaS client
         relationships: List of (source_id, rel_type, target_id, properties) tuples
-        batch_size: Number of operations per batch request (default 100)
+        batch_size: Initial number of operations per batch request (default 100)
+        max_in_flight: Maximum number of concurrent batch requests
 
     Returns:
         tuple: (successful_count, failed_count)
@@ -680,35 +1208,11 @@ def bulk_add_relationships(
     relationship_counts = {}  # Track how many relationships per operation
 
     for source_id, rels in by_source.items():
-        # Generate Turtle RDF for all relationships from this source
-        turtle_lines = []
-        for rel_type, target_id, properties in rels:
-            # Expand relationship type to full URI if needed
-            if "://" not in rel_type:
-                rel_uri = f"http://tesserai.io/ontology/core#{rel_type}"
-            else:
-                rel_uri = rel_type
-
-            # Target URI
-            if "://" not in target_id:
-                target_uri = f"urn:tesserai:twin:{target_id}"
-            else:
-                target_uri = target_id
-
-            turtle_lines.append(f'<urn:tesserai:twin:{source_id}> <{rel_uri}> <{target_uri}> .')
-
-            # Add relationship properties if any
-            if properties:
-                for key, value in properties.items():
-                    if isinstance(value, str):
-                        escaped_val = value.replace('\\', '\\\\').replace('"', '\\"')
-                        turtle_lines.append(f'<urn:tesserai:twin:{source_id}> <http://tesserai.io/ontology/core#{key}> "{escaped_val}" .')
-                    elif isinstance(value, bool):
-                        turtle_lines.append(f'<urn:tesserai:twin:{source_id}> <http://tesserai.io/ontology/core#{key}> {str(value).lower()} .')
-                    elif isinstance(value, (int, float)):
-                        turtle_lines.append(f'<urn:tesserai:twin:{source_id}> <http://tesserai.io/ontology/core#{key}> {value} .')
-
-        turtle_data = "\n".join(turtle_lines)
+        # Serialize all relationships from this source as one Turtle document
+        turtle_data = serialize_relationships(
+            (source_id, rel_type, target_id, properties)
+            for rel_type, target_id, properties in rels
+        )
         op_id = f"rel-{source_id}"
 
         operations.append(BatchOperation(
@@ -719,34 +1223,17 @@ def bulk_add_relationships(
         ))
         relationship_counts[op_id] = len(rels)
 
-    # Execute in batches
-    total_succeeded = 0
-    total_failed = 0
-
-    for i in range(0, len(operations), batch_size):
-        batch_ops = operations[i:i + batch_size]
-
-        try:
-            request = BatchRequest(
-                operations=batch_ops,
-                config=BatchConfig(stop_on_error=False, parallel=True)
-            )
-            response = client.batch.process(request)
-
-            for result in response.results:
-                rel_count = relationship_counts.get(result.id, 1)
-                if result.success:
-                    total_succeeded += rel_count
-                else:
-                    total_failed += rel_count
-                    logger.warning(f"Failed to add relationships for {result.id}: {result.error}")
-
-            logger.info(f"Batch {i // batch_size + 1}: {response.succeeded}/{len(batch_ops)} operations in {response.total_duration_ms}ms")
-        except Exception as e:
-            logger.error(f"Batch request failed: {e}")
-            # Count failed relationships
-            for op in batch_ops:
-                total_failed += relationship_counts.get(op.id, 1)
+    executor = BatchExecutor(
+        client,
+        max_in_flight=max_in_flight,
+        batch_size=batch_size,
+        label="operations",
+    )
+    total_succeeded, total_failed = executor.run(
+        operations,
+        build=lambda chunk: chunk,
+        weights=relationship_counts,
+    )
 
     logger.info(f"Added {total_succeeded}/{len(relationships)} relationships")
     return total_succeeded, total_failed
@@ -823,3 +1310,912 @@ def bulk_upload_ontologies(
 
     logger.info(f"Loaded {succeeded}/{len(ontologies)} ontologies")
     return succeeded, failed
+
+
+# =============================================================================
+# Graph Loading
+# =============================================================================
+
+TWIN_URN_PREFIX = "urn:tesserai:twin:"
+EDGE_QUERY_PAGE_SIZE = 10000
+RELATIONSHIP_FALLBACK_WORKERS = 16
+
+
+@dataclass
+class RelationshipGraph:
+    """
+    Relationship edges between twins, indexed for adjacency lookups.
+
+    ``outgoing[source]`` and ``incoming[target]`` hold ``(other_id, rel_type)``
+    tuples. ``rel_type`` is the raw predicate (e.g. a full IRI); callers strip
+    namespaces the same way they did for ``get_relationships`` results.
+    """
+    edges: list[tuple[str, str, str]] = field(default_factory=list)
+    outgoing: dict[str, list[tuple[str, str]]] = field(default_factory=lambda: defaultdict(list))
+    incoming: dict[str, list[tuple[str, str]]] = field(default_factory=lambda: defaultdict(list))
+    _seen: set[tuple[str, str, str]] = field(default_factory=set, init=False, repr=False)
+
+    def add_edge(self, source_id: str, rel_type: str, target_id: str) -> bool:
+        """Add an edge unless it is already present. Returns True if added."""
+        edge = (source_id, rel_type, target_id)
+        if edge in self._seen:
+            return False
+        self._seen.add(edge)
+        self.edges.append(edge)
+        self.outgoing[source_id].append((target_id, rel_type))
+        self.incoming[target_id].append((source_id, rel_type))
+        return True
+
+    def __len__(self) -> int:
+        return len(self.edges)
+
+
+def _resolve_twin_id(iri: str, twin_ids: Optional[set[str]]) -> str:
+    """Map a twin IRI back to the ID form used by ``twins.list``."""
+    if twin_ids is None or iri in twin_ids:
+        return iri
+    if iri.startswith(TWIN_URN_PREFIX):
+        short_id = iri[len(TWIN_URN_PREFIX):]
+        if short_id in twin_ids:
+            return short_id
+    return iri
+
+
+def _edge_query(domains: Optional[Iterable[str]], offset: int) -> str:
+    """Build one page of the edge export query."""
+    values = ""
+    if domains:
+        values = "VALUES ?domain { " + " ".join(f'"{d}"' for d in sorted(domains)) + " }"
+
+    # Edges touching the scope from either end, so incoming relationships
+    # from other domains are not lost
+    return f"""
+PREFIX dtaas: <{DTAAS_CORE_NS}>
+SELECT DISTINCT ?source ?type ?target WHERE {{
+    {values}
+    {{ ?source dtaas:domain ?domain . ?source ?type ?target . }}
+    UNION
+    {{ ?target dtaas:domain ?domain . ?source ?type ?target . }}
+    FILTER(isIRI(?target) && STRSTARTS(STR(?target), "{TWIN_URN_PREFIX}"))
+}}
+ORDER BY ?source ?type ?target
+LIMIT {EDGE_QUERY_PAGE_SIZE} OFFSET {offset}
+"""
+
+
+def _fetch_edges(
+    client: DTaaSClient,
+    domains: Optional[Iterable[str]],
+    twin_ids: Optional[set[str]],
+) -> Optional[RelationshipGraph]:
+    """Export all edges in scope with a paged SPARQL SELECT, or None on failure."""
+    graph = RelationshipGraph()
+    offset = 0
+
+    while True:
+        try:
+            result = client.query.select(_edge_query(domains, offset))
+        except Exception as e:
+            logger.warning(f"Edge export query failed: {e}")
+            return None
+
+        bindings = result.bindings or []
+        for binding in bindings:
+            source = _binding_value(binding, "source")
+            rel_type = _binding_value(binding, "type")
+            target = _binding_value(binding, "target")
+            if source and rel_type and target:
+                graph.add_edge(
+                    _resolve_twin_id(source, twin_ids),
+                    rel_type,
+                    _resolve_twin_id(target, twin_ids),
+                )
+
+        if len(bindings) < EDGE_QUERY_PAGE_SIZE:
+            return graph
+        offset += EDGE_QUERY_PAGE_SIZE
+
+
+def _fetch_edges_per_twin(client: DTaaSClient, twin_ids: set[str]) -> RelationshipGraph:
+    """Fallback: call ``get_relationships`` for every twin, concurrently."""
+    graph = RelationshipGraph()
+
+    def fetch(twin_id: str) -> list:
+        try:
+            return client.twins.get_relationships(twin_id)
+        except Exception as e:
+            logger.debug(f"No relationships for {twin_id}: {e}")
+            return []
+
+    with ThreadPoolExecutor(max_workers=RELATIONSHIP_FALLBACK_WORKERS) as executor:
+        for twin_id, relationships in zip(twin_ids, executor.map(fetch, twin_ids)):
+            for rel in relationships:
+                other_twin = rel.get("twin", rel.get("target", ""))
+                if not other_twin:
+                    continue
+                rel_type = rel.get("type", "")
+                if rel.get("direction", "outgoing") == "outgoing":
+                    graph.add_edge(twin_id, rel_type, other_twin)
+                else:
+                    graph.add_edge(other_twin, rel_type, twin_id)
+
+    return graph
+
+
+def load_relationship_graph(
+    client: DTaaSClient,
+    domains: Optional[Iterable[str]] = None,
+    twin_ids: Optional[Iterable[str]] = None,
+) -> RelationshipGraph:
+    """
+    Load every relationship touching a set of domains in one streamed export.
+
+    Replaces per-twin ``get_relationships`` loops: edges are pulled with a
+    paged SPARQL query and indexed once. If the query endpoint is unavailable,
+    falls back to concurrent ``get_relationships`` calls for ``twin_ids``.
+
+    Args:
+        client: The DTaaS client
+        domains: Domains to scan (None for every twin with a domain)
+        twin_ids: IDs as returned by ``twins.list``; edge endpoints are mapped
+                  to this form and it is required for the fallback path
+
+    Returns:
+        RelationshipGraph: Deduplicated edges with adjacency indexes
+    """
+    start = time.perf_counter()
+    domains = sorted(set(domains)) if domains else None
+    id_set = set(twin_ids) if twin_ids is not None else None
+
+    graph = _fetch_edges(client, domains, id_set)
+    if graph is None:
+        if not id_set:
+            logger.error("Cannot load relationships: edge export failed and no twin IDs given")
+            return RelationshipGraph()
+        logger.warning(f"Falling back to per-twin relationship lookups for {len(id_set)} twins")
+        graph = _fetch_edges_per_twin(client, id_set)
+
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+    logger.info(f"Loaded {len(graph)} relationships in {elapsed_ms:.0f}ms")
+    return graph
+
+
+# =============================================================================
+# Change Feeds
+# =============================================================================
+
+TWIN_FEED_PAGE_SIZE = 10000
+# Timestamp property writers stamp on every metric update (ISO 8601)
+DEFAULT_CURSOR_PROPERTY = "lastHeartbeat"
+# Seconds re-read behind the cursor on every poll. Writers stamp before the
+# write lands, and the write-behind buffer flushes batches concurrently, so
+# an update can become visible after newer stamps were already polled
+CHANGE_FEED_LOOKBACK = 30.0
+
+_RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+_XSD_NS = "http://www.w3.org/2001/XMLSchema#"
+_XSD_INTEGER_TYPES = {"integer", "int", "long", "short", "nonNegativeInteger", "positiveInteger"}
+_XSD_FLOAT_TYPES = {"decimal", "double", "float"}
+
+
+@dataclass
+class TwinChanges:
+    """
+    Twins whose cursor property advanced since the previous poll.
+
+    ``properties`` holds literal properties with domain prefixes stripped
+    (``alerting_system#cpuUsage`` -> ``cpuUsage``); ``types`` holds the local
+    name of each twin's type. ``cursor`` is the value to pass as ``since``
+    on the next poll, and ``stamps`` (twin -> stamp, for twins inside the
+    next poll's lookback window) the value to pass as ``seen``.
+    """
+    properties: dict[str, dict] = field(default_factory=dict)
+    types: dict[str, str] = field(default_factory=dict)
+    cursor: Optional[str] = None
+    stamps: dict[str, str] = field(default_factory=dict)
+    rows: int = 0
+
+
+def _binding_literal(binding: dict, var_name: str):
+    """Read a SPARQL literal binding as a Python value, using its datatype."""
+    value = binding.get(var_name)
+    if not isinstance(value, dict):
+        return value
+    text = value.get("value")
+    datatype = value.get("datatype", "")
+    if not datatype.startswith(_XSD_NS):
+        return text
+    local = datatype[len(_XSD_NS):]
+    try:
+        if local in _XSD_INTEGER_TYPES:
+            return int(text)
+        if local in _XSD_FLOAT_TYPES:
+            return float(text)
+    except (TypeError, ValueError):
+        return text
+    if local == "boolean":
+        return text in ("true", "1")
+    return text
+
+
+def _stamp_floor(stamp: str, lookback: float) -> str:
+    """The stamp ``lookback`` seconds before ``stamp`` (unchanged if not ISO 8601)."""
+    try:
+        return (datetime.fromisoformat(stamp) - timedelta(seconds=lookback)).isoformat()
+    except ValueError:
+        return stamp
+
+
+def _twin_changes_query(domain: str, since: Optional[str], cursor_property: str,
+                        offset: int) -> str:
+    """Build one page of the changed-twins query (stamps at or after ``since``)."""
+    cursor_match = f"""?twin ?cursorProp ?stamp .
+    FILTER(STRENDS(STR(?cursorProp), "#{cursor_property}"))"""
+    if since is None:
+        cursor_match = f"OPTIONAL {{ {cursor_match} }}"
+    else:
+        escaped = since.replace("\\", "\\\\").replace('"', '\\"')
+        cursor_match += f'\n    FILTER(STR(?stamp) >= "{escaped}")'
+
+    return f"""
+PREFIX dtaas: <{DTAAS_CORE_NS}>
+SELECT ?twin ?prop ?value ?stamp WHERE {{
+    ?twin dtaas:domain "{domain}" .
+    {cursor_match}
+    ?twin ?prop ?value .
+    FILTER(isLiteral(?value) || ?prop = <{_RDF_TYPE}>)
+}}
+ORDER BY ?twin ?prop
+LIMIT {TWIN_FEED_PAGE_SIZE} OFFSET {offset}
+"""
+
+
+def fetch_twin_changes(
+    client: DTaaSClient,
+    domain: str,
+    since: Optional[str] = None,
+    cursor_property: str = DEFAULT_CURSOR_PROPERTY,
+    seen: Optional[dict[str, str]] = None,
+    lookback: float = CHANGE_FEED_LOOKBACK,
+) -> Optional[TwinChanges]:
+    """
+    Fetch the properties of twins changed since a cursor, in one paged query.
+
+    A ``modified_since`` feed for writers that stamp ``cursor_property`` on
+    every update (the metric simulators stamp ``lastHeartbeat``): the server
+    filters on the stamp, so the cost of a poll scales with the number of
+    changed twins instead of the domain size. Pages through arbitrarily
+    large results, unlike a single ``twins.list`` page.
+
+    Writes become visible out of stamp order, so each poll re-reads
+    ``lookback`` seconds before the cursor and drops twins whose
+    (twin, stamp) pair is in ``seen``. Deleted twins never appear in the
+    feed; callers diff membership with ``fetch_twin_ids``.
+
+    Args:
+        client: The DTaaS client
+        domain: Domain to scan
+        since: Cursor from the previous poll; None returns every twin in the
+               domain (a snapshot) together with the current cursor
+        cursor_property: Timestamp property compared against ``since``
+        seen: ``stamps`` of the previous poll's result
+        lookback: Seconds re-read before ``since``
+
+    Returns:
+        TwinChanges for the changed twins, or None if the query failed
+    """
+    changes = TwinChanges(cursor=since)
+    floor = None if since is None else _stamp_floor(since, lookback)
+    offset = 0
+
+    while True:
+        try:
+            result = client.query.select(_twin_changes_query(domain, floor, cursor_property, offset))
+        except Exception as e:
+            logger.warning(f"Twin change query failed: {e}")
+            return None
+
+        bindings = result.bindings or []
+        for binding in bindings:
+            twin_uri = _binding_value(binding, "twin")
+            prop = _binding_value(binding, "prop")
+            if not twin_uri or not prop:
+                continue
+            twin_id = twin_uri[len(TWIN_URN_PREFIX):] if twin_uri.startswith(TWIN_URN_PREFIX) else twin_uri
+
+            properties = changes.properties.setdefault(twin_id, {})
+            if prop == _RDF_TYPE:
+                changes.types[twin_id] = (_binding_value(binding, "value") or "").split("#")[-1]
+            else:
+                properties[prop.split("#")[-1].split("/")[-1]] = _binding_literal(binding, "value")
+
+            stamp = _binding_value(binding, "stamp")
+            if stamp:
+                changes.stamps[twin_id] = stamp
+                if changes.cursor is None or stamp > changes.cursor:
+                    changes.cursor = stamp
+
+        changes.rows += len(bindings)
+        if len(bindings) < TWIN_FEED_PAGE_SIZE:
+            break
+        offset += TWIN_FEED_PAGE_SIZE
+
+    if seen:
+        for twin_id, stamp in changes.stamps.items():
+            if seen.get(twin_id) == stamp:
+                changes.properties.pop(twin_id, None)
+                changes.types.pop(twin_id, None)
+    if changes.cursor is not None:
+        next_floor = _stamp_floor(changes.cursor, lookback)
+        changes.stamps = {t: stamp for t, stamp in changes.stamps.items() if stamp >= next_floor}
+    return changes
+
+
+def fetch_twin_ids(client: DTaaSClient, domain: str) -> Optional[set[str]]:
+    """
+    Fetch the IDs of every twin in a domain, in one paged query.
+
+    Returns:
+        Twin IDs, or None if the query failed
+    """
+    twin_ids: set[str] = set()
+    offset = 0
+    while True:
+        query = f"""
+PREFIX dtaas: <{DTAAS_CORE_NS}>
+SELECT DISTINCT ?twin WHERE {{
+    ?twin dtaas:domain "{domain}" .
+}}
+ORDER BY ?twin
+LIMIT {TWIN_FEED_PAGE_SIZE} OFFSET {offset}
+"""
+        try:
+            result = client.query.select(query)
+        except Exception as e:
+            logger.warning(f"Twin ID query failed: {e}")
+            return None
+
+        bindings = result.bindings or []
+        for binding in bindings:
+            twin_uri = _binding_value(binding, "twin")
+            if twin_uri:
+                twin_ids.add(twin_uri[len(TWIN_URN_PREFIX):] if twin_uri.startswith(TWIN_URN_PREFIX) else twin_uri)
+        if len(bindings) < TWIN_FEED_PAGE_SIZE:
+            return twin_ids
+        offset += TWIN_FEED_PAGE_SIZE
+
+
+def fetch_twin_version(
+    client: DTaaSClient,
+    domain: str,
+    cursor_property: str = DEFAULT_CURSOR_PROPERTY,
+) -> Optional[tuple[int, Optional[str]]]:
+    """
+    Fetch the version of a domain: its twin count and latest cursor stamp.
+
+    One aggregate row, so caches of a domain can revalidate cheaply: an
+    unchanged version means nothing was added, removed or stamped since;
+    a newer stamp means ``fetch_twin_changes(since=...)`` has updates.
+    Late writes stamped before the latest stamp leave it unchanged, so
+    callers keep polling the feed for ``CHANGE_FEED_LOOKBACK`` seconds after
+    the stamp last advanced.
+
+    Returns:
+        (twin count, latest stamp or None), or None if the query failed
+    """
+    query = f"""
+PREFIX dtaas: <{DTAAS_CORE_NS}>
+SELECT (COUNT(DISTINCT ?twin) AS ?twins) (MAX(STR(?stamp)) AS ?latest) WHERE {{
+    ?twin dtaas:domain "{domain}" .
+    OPTIONAL {{
+        ?twin ?cursorProp ?stamp .
+        FILTER(STRENDS(STR(?cursorProp), "#{cursor_property}"))
+    }}
+}}
+"""
+    try:
+        result = client.query.select(query)
+    except Exception as e:
+        logger.warning(f"Twin version query failed: {e}")
+        return None
+
+    binding = (result.bindings or [{}])[0]
+    try:
+        count = int(_binding_literal(binding, "twins") or 0)
+    except (TypeError, ValueError):
+        return None
+    return count, _binding_value(binding, "latest")
+
+
+# =============================================================================
+# Write-Behind Buffer
+# =============================================================================
+
+DEFAULT_FLUSH_INTERVAL = 1.0
+WRITE_BEHIND_FALLBACK_WORKERS = 16
+FLUSH_LATENCY_WINDOW = 100
+
+# Batch operation for property patches, on SDK versions that provide one
+_BATCH_UPDATE_TWIN = getattr(BatchOperationType, "UPDATE_TWIN", None)
+
+
+class TwinWriteBuffer:
+    """
+    Write-behind buffer for twin property updates.
+
+    ``put`` only records the update: updates to the same twin are merged
+    (later values win) until the next flush, so each twin is written at most
+    once per flush window however often it changes. A background thread
+    flushes every ``flush_interval`` seconds, or as soon as ``max_pending``
+    twins are waiting. A flush goes out as batch requests through
+    ``BatchExecutor`` when the SDK has a twin-update batch operation, and
+    otherwise as concurrent ``twins.update`` calls.
+
+    Failed writes are counted and dropped; the next update for that twin
+    carries newer values anyway.
+
+    Example:
+        buffer = TwinWriteBuffer(client).start()
+        buffer.put("web-01", {"cpuUsage": 42.0})
+        print(buffer.stats())
+        buffer.close()
+    """
+
+    def __init__(
+        self,
+        client: DTaaSClient,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_pending: int = 5000,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        use_batch: Optional[bool] = None,
+    ):
+        self.client = client
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.use_batch = _BATCH_UPDATE_TWIN is not None if use_batch is None else use_batch
+        self.executor = BatchExecutor(
+            client, max_in_flight=max_in_flight, label="twin updates", verbose=False
+        )
+        self._update_pool = ThreadPoolExecutor(max_workers=WRITE_BEHIND_FALLBACK_WORKERS)
+
+        self._pending: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._latencies: deque = deque(maxlen=FLUSH_LATENCY_WINDOW)
+        self._counters = {
+            "puts": 0,
+            "coalesced": 0,
+            "flushes": 0,
+            "written": 0,
+            "failed": 0,
+            "max_queue_depth": 0,
+        }
+
+    def start(self) -> "TwinWriteBuffer":
+        """Start the background flush thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="twin-write-buffer", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """Stop the flush thread and write whatever is still pending."""
+        self._closed.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        self._update_pool.shutdown(wait=True)
+
+    def put(self, twin_id: str, properties: dict) -> None:
+        """Queue a property update, merging it into any pending one."""
+        with self._lock:
+            pending = self._pending.get(twin_id)
+            if pending is None:
+                self._pending[twin_id] = dict(properties)
+            else:
+                pending.update(properties)
+                self._counters["coalesced"] += 1
+            self._counters["puts"] += 1
+            depth = len(self._pending)
+            if depth > self._counters["max_queue_depth"]:
+                self._counters["max_queue_depth"] = depth
+        if depth >= self.max_pending:
+            self._wake.set()
+
+    @property
+    def queue_depth(self) -> int:
+        """Twins with updates waiting for the next flush."""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> tuple[int, int]:
+        """
+        Write all pending updates now.
+
+        Returns:
+            tuple: (successful_count, failed_count)
+        """
+        with self._flush_lock:
+            with self._lock:
+                updates, self._pending = self._pending, {}
+            if not updates:
+                return 0, 0
+
+            started = time.perf_counter()
+            if self.use_batch:
+                succeeded, failed = self.executor.run(
+                    list(updates.items()),
+                    build=lambda chunk: [
+                        BatchOperation(
+                            id=f"update-{twin_id}",
+                            operation=_BATCH_UPDATE_TWIN,
+                            resource_id=twin_id,
+                            payload={"properties": properties},
+                        )
+                        for twin_id, properties in chunk
+                    ],
+                )
+            else:
+                succeeded, failed = self._update_each(updates)
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+
+            with self._lock:
+                self._latencies.append(elapsed_ms)
+                self._counters["flushes"] += 1
+                self._counters["written"] += succeeded
+                self._counters["failed"] += failed
+            return succeeded, failed
+
+    def _update_each(self, updates: dict[str, dict]) -> tuple[int, int]:
+        """Fallback: one ``twins.update`` per twin, run concurrently."""
+        def update_one(item: tuple[str, dict]) -> bool:
+            twin_id, properties = item
+            try:
+                self.client.twins.update(twin_id, {"properties": properties})
+                return True
+            except Exception as e:
+                logger.warning(f"Failed to update {twin_id}: {e}")
+                return False
+
+        results = list(self._update_pool.map(update_one, updates.items()))
+        succeeded = sum(results)
+        return succeeded, len(results) - succeeded
+
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Write-behind flush failed: {e}")
+
+    def stats(self) -> dict:
+        """Queue depth, throughput counters and flush latency (ms)."""
+        with self._lock:
+            last = self._latencies[-1] if self._latencies else 0.0
+            latencies = sorted(self._latencies)
+            stats = {**self._counters, "queue_depth": len(self._pending)}
+        if latencies:
+            stats["last_flush_ms"] = round(last, 1)
+            stats["avg_flush_ms"] = round(sum(latencies) / len(latencies), 1)
+            stats["p95_flush_ms"] = round(latencies[int(0.95 * (len(latencies) - 1))], 1)
+        else:
+            stats["last_flush_ms"] = stats["avg_flush_ms"] = stats["p95_flush_ms"] = 0.0
+        return stats
+
+
+# =============================================================================
+# Differential State Updates (for websocket dashboards)
+# =============================================================================
+
+def _json_pointer_token(key) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def json_patch(old, new, path: str = "") -> list[dict]:
+    """
+    JSON-patch (RFC 6902) operations that turn ``old`` into ``new``.
+
+    Objects are compared key by key; lists and scalars that differ are
+    replaced whole, so keep large collections as objects keyed by ID. A
+    nested object with more than half of its keys changed is replaced in
+    one operation, which is smaller than one operation per key.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        changed = 0
+        for key, value in new.items():
+            pointer = f"{path}/{_json_pointer_token(key)}"
+            if key in old:
+                child_ops = json_patch(old[key], value, pointer)
+                if child_ops:
+                    ops.extend(child_ops)
+                    changed += 1
+            else:
+                ops.append({"op": "add", "path": pointer, "value": value})
+                changed += 1
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_json_pointer_token(key)}"})
+                changed += 1
+        if path and changed * 2 > max(len(new), 1):
+            return [{"op": "replace", "path": path, "value": new}]
+        return ops
+    if type(old) is type(new) and old == new:
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+class VersionedState:
+    """
+    A JSON document sent to websocket clients as one snapshot plus deltas.
+
+    Each ``publish`` bumps the version and returns a single serialized
+    patch message for all clients. The snapshot message is serialized at
+    most once per version. Clients apply patches in version order and ask
+    for a new snapshot when they see a gap.
+
+    Example:
+        state = VersionedState()
+        await websocket.send(state.snapshot())    # on connect
+        message = state.publish(build_state())    # every tick
+        if message:
+            await asyncio.gather(*[ws.send(message) for ws in clients])
+    """
+
+    def __init__(self, snapshot_type: str = "snapshot", patch_type: str = "patch"):
+        self.snapshot_type = snapshot_type
+        self.patch_type = patch_type
+        self.version = 0
+        self.state: Optional[dict] = None
+        self._snapshot: Optional[str] = None
+
+    def publish(self, state: dict) -> Optional[str]:
+        """
+        Replace the current state.
+
+        Returns:
+            Serialized patch message, or None if nothing changed (or this is
+            the first state, which clients only receive as a snapshot)
+        """
+        if self.state is None:
+            ops = None
+        else:
+            ops = json_patch(self.state, state)
+            if not ops:
+                return None
+
+        self.version += 1
+        self.state = state
+        self._snapshot = None
+        if ops is None:
+            return None
+        return json.dumps({"type": self.patch_type, "version": self.version, "ops": ops})
+
+    def snapshot(self) -> str:
+        """Serialized full-state message for the current version."""
+        if self._snapshot is None:
+            self._snapshot = json.dumps({
+                "type": self.snapshot_type,
+                "version": self.version,
+                "data": self.state,
+            })
+        return self._snapshot
+
+
+# =============================================================================
+# RSP Result Subscriptions
+# =============================================================================
+
+RSP_RESULT_LIMIT = 5
+RSP_MIN_POLL_INTERVAL = 1.0
+RSP_MAX_POLL_INTERVAL = 8.0
+# Windows remembered per query for deduplication
+RSP_SEEN_WINDOWS = 256
+
+
+def rsp_binding_hash(bindings) -> str:
+    """Stable short hash of RSP result bindings (one binding or a window's list)."""
+    canonical = json.dumps(bindings, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class RspWindow:
+    """
+    One window of continuous-query results delivered by a push feed.
+
+    Has the same attributes as the SDK's query result objects, so handlers
+    treat pushed and polled windows alike.
+    """
+    window_start: Optional[str] = None
+    window_end: Optional[str] = None
+    bindings: list = field(default_factory=list)
+    event_count: Optional[int] = None
+
+
+class LocalRspFeed:
+    """
+    In-process stand-in for a pushed RSP result feed (tests and demos).
+
+    Producers ``publish`` windows; every ``stream`` iterator receives them
+    in order:
+
+        feed = LocalRspFeed()
+        subscription = RspSubscription(aclient, query_ids, push_source=feed.stream())
+        feed.publish(query_id, RspWindow("t0", "t1", [binding]))
+    """
+
+    def __init__(self):
+        self._queues: list[asyncio.Queue] = []
+
+    def publish(self, query_id: str, result) -> None:
+        for queue in self._queues:
+            queue.put_nowait((query_id, result))
+
+    async def stream(self):
+        queue: asyncio.Queue = asyncio.Queue()
+        self._queues.append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._queues.remove(queue)
+
+
+async def websocket_rsp_feed(url: str, **connect_kwargs):
+    """
+    Pushed RSP results from a websocket (e.g. an event-bus bridge).
+
+    Each message is one window as a JSON object with ``query_id``,
+    ``window_start``, ``window_end``, ``bindings`` and optionally
+    ``event_count``. Requires the ``websockets`` package.
+    """
+    import websockets
+
+    async with websockets.connect(url, **connect_kwargs) as ws:
+        async for message in ws:
+            data = json.loads(message)
+            yield data["query_id"], RspWindow(
+                window_start=data.get("window_start"),
+                window_end=data.get("window_end"),
+                bindings=data.get("bindings") or [],
+                event_count=data.get("event_count"),
+            )
+
+
+class RspSubscription:
+    """
+    Delivers each new RSP result window once, as soon as it is available.
+
+    Windows come from ``push_source`` (an async iterable of
+    ``(query_id, result)``) when given. Without one, or once the push feed
+    fails or ends, every query is polled on its own schedule: the interval
+    resets to ``min_interval`` when a poll yields a new window and backs off
+    (doubling, up to ``max_interval``) while a query is quiet or failing.
+    Windows are deduplicated by (query, window bounds, hash of the
+    bindings), so the overlapping results of consecutive polls are
+    delivered once, including results without window bounds.
+
+    Example:
+        subscription = RspSubscription(aclient, query_ids)
+        task = asyncio.create_task(subscription.run(on_window))
+        ...
+        task.cancel()
+
+    Args:
+        aclient: Async client used for polling
+        query_ids: Continuous queries to follow
+        push_source: Optional async iterable of pushed windows
+        min_interval: Poll interval while windows keep arriving (seconds)
+        max_interval: Longest poll interval for a quiet query (seconds)
+        limit: Windows fetched per poll
+    """
+
+    def __init__(
+        self,
+        aclient: AsyncDTaaSClient,
+        query_ids: Iterable[str],
+        push_source=None,
+        min_interval: float = RSP_MIN_POLL_INTERVAL,
+        max_interval: float = RSP_MAX_POLL_INTERVAL,
+        limit: int = RSP_RESULT_LIMIT,
+    ):
+        self.aclient = aclient
+        self.query_ids = list(query_ids)
+        self.push_source = push_source
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.limit = limit
+        self.mode = "push" if push_source is not None else "poll"
+
+        self._seen: dict[str, tuple[set, deque]] = {}
+        self.delivered = 0
+        self.duplicates = 0
+        self.polls = 0
+        self.errors = 0
+
+    def is_new(self, query_id: str, result) -> bool:
+        """Record a window; False if it was already delivered."""
+        window = (
+            getattr(result, "window_start", None),
+            getattr(result, "window_end", None),
+            rsp_binding_hash(getattr(result, "bindings", None) or []),
+        )
+        seen, order = self._seen.setdefault(query_id, (set(), deque()))
+        if window in seen:
+            self.duplicates += 1
+            return False
+        seen.add(window)
+        order.append(window)
+        if len(order) > RSP_SEEN_WINDOWS:
+            seen.discard(order.popleft())
+        return True
+
+    async def _deliver(self, query_id: str, result, handler) -> bool:
+        if not self.is_new(query_id, result):
+            return False
+        self.delivered += 1
+        try:
+            await handler(query_id, result)
+        except Exception as e:
+            logger.warning(f"RSP result handler failed for {query_id}: {e}")
+        return True
+
+    async def run(self, handler: Callable) -> None:
+        """
+        Deliver new windows to ``await handler(query_id, result)`` until cancelled.
+        """
+        if self.push_source is not None:
+            try:
+                async for query_id, result in self.push_source:
+                    await self._deliver(query_id, result, handler)
+                logger.warning("RSP push feed ended, polling instead")
+            except Exception as e:
+                logger.warning(f"RSP push feed failed ({e}), polling instead")
+            self.mode = "poll"
+
+        await asyncio.gather(*[self._poll(query_id, handler) for query_id in self.query_ids])
+
+    async def _poll(self, query_id: str, handler) -> None:
+        interval = self.min_interval
+        while True:
+            try:
+                response = await self.aclient.rsp.get_query_results(query_id, limit=self.limit)
+                self.polls += 1
+                fresh = 0
+                # Oldest first, so handlers see windows in order
+                results = sorted(
+                    getattr(response, "results", None) or [],
+                    key=lambda r: str(getattr(r, "window_end", None) or ""),
+                )
+                for result in results:
+                    if await self._deliver(query_id, result, handler):
+                        fresh += 1
+                logger.debug(f"RSP poll {query_id}: {len(results)} windows, {fresh} new")
+                interval = self.min_interval if fresh else min(interval * 2, self.max_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.debug(f"RSP poll {query_id} failed: {e}")
+                interval = min(interval * 2, self.max_interval)
+            await asyncio.sleep(interval * random.uniform(0.9, 1.1))
+
+    def stats(self) -> dict:
+        """Counters for dashboards and logs."""
+        return {
+            "mode": self.mode,
+            "queries": len(self.query_ids),
+            "delivered": self.delivered,
+            "duplicates": self.duplicates,
+            "polls": self.polls,
+            "errors": self.errors,
+        }
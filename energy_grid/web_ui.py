@@ -16,7 +16,7 @@ Features:
 - RSP (RDF Stream Processing) real-time alerts
 
 Usage:
-    python web_ui.py [--port 8080]
+    python web_ui.py [--port 8080] [--rsp-push-url ws://...]
 
 Then open http://localhost:8080 in your browser.
 
@@ -44,7 +44,10 @@ except ImportError:
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'sdks', 'python'))
 
-from common import get_client, logger
+from common import (
+    get_client, logger, load_relationship_graph, AsyncDTaaSClient,
+    RspSubscription, websocket_rsp_feed, rsp_binding_hash,
+)
 
 # RSP imports
 try:
@@ -61,6 +64,7 @@ except ImportError:
 
 # Global state
 client = None
+async_client: Optional[AsyncDTaaSClient] = None
 grid_data: Dict[str, dict] = {}
 generators: Dict[str, dict] = {}
 substations: Dict[str, dict] = {}
@@ -73,8 +77,10 @@ ws_port = 8081
 # RSP state
 rsp_enabled = False
 rsp_query_ids: List[str] = []
+rsp_query_defs: Dict[str, dict] = {}
 rsp_source_ids: List[str] = []
 rsp_alerts: List[dict] = []  # Recent alerts from RSP queries
+rsp_subscription: Optional[RspSubscription] = None
 
 # RSP Configuration - Continuous queries for grid monitoring
 RSP_STREAM_CONFIG = {
@@ -180,23 +186,27 @@ def _normalize_properties(properties: dict) -> dict:
     return normalized
 
 
-def load_grid_data():
+async def load_grid_data():
     """Load energy grid data from DTaaS."""
     global grid_data, generators, substations, transmission_lines, storage_systems, relationships
 
-    grid_data = {}
-    generators = {}
-    substations = {}
-    transmission_lines = {}
-    storage_systems = {}
-    relationships = defaultdict(list)
+    # Build into locals and swap at the end so websocket handlers never see
+    # partially loaded state while requests are in flight
+    new_grid_data = {}
+    new_generators = {}
+    new_substations = {}
+    new_lines = {}
+    new_storage = {}
+    new_relationships = defaultdict(list)
+    twin_ids = []
 
     try:
-        twins = client.twins.list(domain="energy_grid", page_size=500)
+        twins = await async_client.twins.list(domain="energy_grid", page_size=500)
 
         for twin in twins:
             twin_dict = twin.model_dump() if hasattr(twin, 'model_dump') else twin
             twin_id = twin_dict["id"]
+            twin_ids.append(twin_id)
 
             type_val = twin_dict.get("type_uri") or twin_dict.get("type") or ""
             twin_type = type_val.split("#")[-1] if type_val else ""
@@ -211,33 +221,38 @@ def load_grid_data():
 
             # Categorize by type
             if twin_type == "PowerGrid":
-                grid_data[twin_id] = item
+                new_grid_data[twin_id] = item
             elif "PowerPlant" in twin_type or twin_type in ["SolarFarm", "WindFarm"]:
-                generators[twin_id] = item
+                new_generators[twin_id] = item
             elif "Substation" in twin_type:
-                substations[twin_id] = item
+                new_substations[twin_id] = item
             elif twin_type == "TransmissionLine":
-                transmission_lines[twin_id] = item
+                new_lines[twin_id] = item
             elif twin_type == "BatteryStorage":
-                storage_systems[twin_id] = item
+                new_storage[twin_id] = item
 
-        # Load relationships for transmission lines
-        for line_id in transmission_lines:
-            try:
-                rels = client.twins.get_relationships(line_id)
-                for rel in rels:
-                    rel_type = rel.get("type", "").split("#")[-1]
+        # Load every edge in one export, then keep the ones touching lines
+        graph = await async_client.run(
+            load_relationship_graph, client, domains=["energy_grid"], twin_ids=twin_ids
+        )
+        for line_id in new_lines:
+            for direction, index in (("outgoing", graph.outgoing), ("incoming", graph.incoming)):
+                for target, rel_type in index.get(line_id, []):
+                    rel_type = rel_type.split("#")[-1]
                     if rel_type.startswith("rel/"):
                         rel_type = rel_type[4:]
-                    target = rel.get("twin", rel.get("target", ""))
-                    direction = rel.get("direction", "outgoing")
-                    relationships[line_id].append({
+                    new_relationships[line_id].append({
                         "type": rel_type,
                         "target": target,
                         "direction": direction
                     })
-            except Exception:
-                pass
+
+        grid_data = new_grid_data
+        generators = new_generators
+        substations = new_substations
+        transmission_lines = new_lines
+        storage_systems = new_storage
+        relationships = new_relationships
 
         logger.info(f"Loaded grid data: {len(generators)} generators, "
                    f"{len(substations)} substations, {len(transmission_lines)} lines")
@@ -499,6 +514,7 @@ def setup_rsp() -> bool:
                 )
             )
             rsp_query_ids.append(query.id)
+            rsp_query_defs[query.id] = query_def
             logger.info(f"Created RSP query: {query.name}")
 
             # Activate the query
@@ -511,6 +527,7 @@ def setup_rsp() -> bool:
                 for q in queries.queries:
                     if q.name == query_def["name"]:
                         rsp_query_ids.append(q.id)
+                        rsp_query_defs[q.id] = query_def
                         logger.info(f"Using existing query: {q.name}")
                         break
             except Exception:
@@ -521,46 +538,41 @@ def setup_rsp() -> bool:
     return rsp_enabled
 
 
-def check_rsp_alerts() -> List[dict]:
-    """Check RSP query results and generate alerts."""
-    global rsp_alerts
-
-    if not rsp_enabled:
-        return []
+async def on_rsp_window(query_id: str, result):
+    """Turn a new RSP result window into alerts and push them to clients."""
+    if not result.bindings:
+        return
 
+    query_def = rsp_query_defs.get(query_id, {})
+    known = {a["id"] for a in rsp_alerts}
+    window_id = result.window_start or result.window_end or datetime.utcnow().isoformat()
     new_alerts = []
-
-    for i, query_id in enumerate(rsp_query_ids):
-        query_def = RSP_CONTINUOUS_QUERIES[i] if i < len(RSP_CONTINUOUS_QUERIES) else {}
-
-        try:
-            results = client.rsp.get_query_results(query_id, limit=5)
-
-            for result in results.results:
-                if result.bindings:
-                    for binding in result.bindings:
-                        alert = {
-                            "id": f"{query_id}-{result.window_start}",
-                            "type": query_def.get("name", "Alert"),
-                            "severity": query_def.get("severity", "info"),
-                            "icon": query_def.get("icon", "⚠️"),
-                            "message": format_alert_message(query_def, binding),
-                            "timestamp": result.window_end or datetime.utcnow().isoformat(),
-                            "data": binding,
-                        }
-
-                        # Avoid duplicate alerts
-                        if not any(a["id"] == alert["id"] for a in rsp_alerts):
-                            new_alerts.append(alert)
-
-        except Exception as e:
-            logger.debug(f"Error checking query {query_id}: {e}")
+    for binding in result.bindings:
+        # One alert per binding; a window can hold several (one per line, ...)
+        alert_id = f"{query_id}-{window_id}-{rsp_binding_hash(binding)}"
+        if alert_id in known:
+            continue
+        known.add(alert_id)
+        new_alerts.append({
+            "id": alert_id,
+            "type": query_def.get("name", "Alert"),
+            "severity": query_def.get("severity", "info"),
+            "icon": query_def.get("icon", "⚠️"),
+            "message": format_alert_message(query_def, binding),
+            "timestamp": result.window_end or datetime.utcnow().isoformat(),
+            "data": binding,
+        })
+    if not new_alerts:
+        return
 
     # Add new alerts and keep last 50
     rsp_alerts.extend(new_alerts)
     rsp_alerts[:] = rsp_alerts[-50:]
 
-    return new_alerts
+    await broadcast({
+        "type": "alerts",
+        "alerts": new_alerts,
+    })
 
 
 def format_alert_message(query_def: dict, binding: dict) -> str:
@@ -630,7 +642,7 @@ async def handle_websocket(websocket):
             data = json.loads(message)
 
             if data.get("type") == "refresh":
-                load_grid_data()
+                await load_grid_data()
                 await websocket.send(json.dumps({
                     "type": "update",
                     **get_full_state()
@@ -649,16 +661,7 @@ async def periodic_update():
         await asyncio.sleep(5)
         if connected_clients:
             try:
-                load_grid_data()
-
-                # Check for new RSP alerts
-                new_alerts = check_rsp_alerts()
-                if new_alerts:
-                    await broadcast({
-                        "type": "alerts",
-                        "alerts": new_alerts,
-                    })
-
+                await load_grid_data()
                 await broadcast({
                     "type": "update",
                     **get_full_state()
@@ -1567,14 +1570,15 @@ class WebHandler(SimpleHTTPRequestHandler):
         pass
 
 
-async def main(port: int):
-    global client, ws_port
+async def main(port: int, rsp_push_url: Optional[str] = None):
+    global client, async_client, ws_port, rsp_subscription
 
     ws_port = port + 1
 
     # Initialize client and load data
     client = get_client()
-    load_grid_data()
+    async_client = AsyncDTaaSClient(client)
+    await load_grid_data()
 
     # Initialize RSP for real-time alerts
     rsp_status = setup_rsp()
@@ -1597,19 +1601,32 @@ async def main(port: int):
     print(f"{'='*60}\n")
 
     # Start periodic update task
-    asyncio.create_task(periodic_update())
+    # Keep the task handles: the event loop only holds weak references
+    tasks = [asyncio.create_task(periodic_update())]
+
+    # RSP alerts are pushed to clients as windows arrive, not every update
+    if rsp_enabled:
+        push_source = websocket_rsp_feed(rsp_push_url) if rsp_push_url else None
+        rsp_subscription = RspSubscription(async_client, rsp_query_ids, push_source)
+        tasks.append(asyncio.create_task(rsp_subscription.run(on_rsp_window)))
 
     # Start WebSocket server
-    async with websockets.serve(handle_websocket, "", ws_port):
-        await asyncio.Future()
+    try:
+        async with websockets.serve(handle_websocket, "", ws_port):
+            await asyncio.Future()
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Energy Grid Web UI")
     parser.add_argument("--port", type=int, default=8080, help="HTTP port (default: 8080)")
+    parser.add_argument("--rsp-push-url",
+                        help="Websocket feed of pushed RSP results (default: poll the RSP API)")
     args = parser.parse_args()
 
     try:
-        asyncio.run(main(args.port))
+        asyncio.run(main(args.port, args.rsp_push_url))
     except KeyboardInterrupt:
         print("\nShutdown requested")
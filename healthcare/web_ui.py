@@ -27,7 +27,7 @@ import threading
 import websockets
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from common import get_client, logger
+from common import get_client, logger, AsyncDTaaSClient
 
 # Domain
 DOMAIN = "healthcare"
@@ -922,12 +922,12 @@ class DashboardHandler(SimpleHTTPRequestHandler):
         pass  # Suppress logging
 
 
-async def websocket_handler(websocket, collector):
+async def websocket_handler(websocket, collector, aclient: AsyncDTaaSClient):
     """Handle WebSocket connections."""
     logger.info(f"Client connected: {websocket.remote_address}")
     try:
         while True:
-            data = collector.collect_data()
+            data = await aclient.run(collector.collect_data)
             await websocket.send(json.dumps(data))
             await asyncio.sleep(5)
     except websockets.exceptions.ConnectionClosed:
@@ -936,8 +936,10 @@ async def websocket_handler(websocket, collector):
 
 async def start_websocket_server(port: int, collector: HealthcareDataCollector):
     """Start the WebSocket server."""
+    aclient = AsyncDTaaSClient(collector.client)
+
     async with websockets.serve(
-        lambda ws: websocket_handler(ws, collector),
+        lambda ws: websocket_handler(ws, collector, aclient),
         "0.0.0.0",
         port
     ):
@@ -44,7 +44,7 @@ except ImportError:
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'sdks', 'python'))
 
-from common import get_client, logger
+from common import get_client, logger, AsyncDTaaSClient
 
 # RSP imports
 try:
@@ -61,6 +61,7 @@ except ImportError:
 
 # Global state
 client = None
+async_client: Optional[AsyncDTaaSClient] = None
 factory: Dict = {}
 production_lines: Dict[str, dict] = {}
 cnc_machines: Dict[str, dict] = {}
@@ -196,21 +197,23 @@ def _normalize_properties(properties: dict) -> dict:
     return normalized
 
 
-def load_manufacturing_data():
+async def load_manufacturing_data():
     """Load manufacturing data from DTaaS."""
     global factory, production_lines, cnc_machines, robots, conveyors, qc_equipment, maintenance, energy_data
 
-    factory = {}
-    production_lines = {}
-    cnc_machines = {}
-    robots = {}
-    conveyors = {}
-    qc_equipment = {}
-    maintenance = {}
-    energy_data = {}
-
     try:
-        twins = client.twins.list(domain="manufacturing", page_size=500)
+        twins = await async_client.twins.list(domain="manufacturing", page_size=500)
+
+        # Reset only after the fetch completes so websocket handlers never
+        # see partially loaded state
+        factory = {}
+        production_lines = {}
+        cnc_machines = {}
+        robots = {}
+        conveyors = {}
+        qc_equipment = {}
+        maintenance = {}
+        energy_data = {}
 
         for twin in twins:
             twin_dict = twin.model_dump() if hasattr(twin, 'model_dump') else twin
@@ -528,7 +531,7 @@ def setup_rsp() -> bool:
     return rsp_enabled
 
 
-def check_rsp_alerts() -> List[dict]:
+async def check_rsp_alerts() -> List[dict]:
     """Check RSP query results and generate alerts."""
     global rsp_alerts
 
@@ -537,30 +540,33 @@ def check_rsp_alerts() -> List[dict]:
 
     new_alerts = []
 
-    for i, query_id in enumerate(rsp_query_ids):
-        query_def = RSP_CONTINUOUS_QUERIES[i] if i < len(RSP_CONTINUOUS_QUERIES) else {}
+    all_results = await asyncio.gather(
+        *[async_client.rsp.get_query_results(query_id, limit=5) for query_id in rsp_query_ids],
+        return_exceptions=True
+    )
 
-        try:
-            results = client.rsp.get_query_results(query_id, limit=5)
-
-            for result in results.results:
-                if result.bindings:
-                    for binding in result.bindings:
-                        alert = {
-                            "id": f"{query_id}-{result.window_start}",
-                            "type": query_def.get("name", "Alert"),
-                            "severity": query_def.get("severity", "info"),
-                            "icon": query_def.get("icon", "⚠️"),
-                            "message": format_alert_message(query_def, binding),
-                            "timestamp": result.window_end or datetime.utcnow().isoformat(),
-                            "data": binding,
-                        }
-
-                        if not any(a["id"] == alert["id"] for a in rsp_alerts):
-                            new_alerts.append(alert)
+    for i, (query_id, results) in enumerate(zip(rsp_query_ids, all_results)):
+        query_def = RSP_CONTINUOUS_QUERIES[i] if i < len(RSP_CONTINUOUS_QUERIES) else {}
 
-        except Exception as e:
-            logger.debug(f"Error checking query {query_id}: {e}")
+        if isinstance(results, Exception):
+            logger.debug(f"Error checking query {query_id}: {results}")
+            continue
+
+        for result in results.results:
+            if result.bindings:
+                for binding in result.bindings:
+                    alert = {
+                        "id": f"{query_id}-{result.window_start}",
+                        "type": query_def.get("name", "Alert"),
+                        "severity": query_def.get("severity", "info"),
+                        "icon": query_def.get("icon", "⚠️"),
+                        "message": format_alert_message(query_def, binding),
+                        "timestamp": result.window_end or datetime.utcnow().isoformat(),
+                        "data": binding,
+                    }
+
+                    if not any(a["id"] == alert["id"] for a in rsp_alerts):
+                        new_alerts.append(alert)
 
     rsp_alerts.extend(new_alerts)
     rsp_alerts[:] = rsp_alerts[-50:]
@@ -617,7 +623,7 @@ async def handle_websocket(websocket):
         async for message in websocket:
             data = json.loads(message)
             if data.get("type") == "refresh":
-                load_manufacturing_data()
+                await load_manufacturing_data()
                 await websocket.send(json.dumps({
                     "type": "update",
                     **get_full_state()
@@ -636,10 +642,10 @@ async def periodic_update():
         await asyncio.sleep(5)
         if connected_clients:
             try:
-                load_manufacturing_data()
+                await load_manufacturing_data()
 
                 # Check for new RSP alerts
-                new_alerts = check_rsp_alerts()
+                new_alerts = await check_rsp_alerts()
                 if new_alerts:
                     await broadcast({
                         "type": "alerts",
@@ -1332,12 +1338,13 @@ class WebHandler(SimpleHTTPRequestHandler):
 
 
 async def main(port: int):
-    global client, ws_port
+    global client, async_client, ws_port
 
     ws_port = port + 1
 
     client = get_client()
-    load_manufacturing_data()
+    async_client = AsyncDTaaSClient(client)
+    await load_manufacturing_data()
 
     # Initialize RSP for real-time alerts
     rsp_status = setup_rsp()
@@ -24,7 +24,7 @@ import os
 import sys
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 import threading
-from typing import Dict, Set
+from typing import Dict, Optional, Set
 
 try:
     import websockets
@@ -33,7 +33,7 @@ except ImportError:
     sys.exit(1)
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from common import get_client, logger
+from common import get_client, logger, AsyncDTaaSClient
 
 # Configuration
 AGENT_ID = "assistant-user-alex"
@@ -42,16 +42,17 @@ WS_PORT = 8123
 
 # Global state
 client = None
+async_client: Optional[AsyncDTaaSClient] = None
 connected_clients: Set = set()
 memories_cache: Dict = {}
 
 
-def load_memories():
+async def load_memories():
     """Load memories from TesseraiDB."""
     global memories_cache
 
     try:
-        result = client.memory.query(
+        result = await async_client.memory.query(
             agent_id=AGENT_ID,
             query={"limit": 500}
         )
@@ -132,10 +133,10 @@ def get_dashboard_data() -> dict:
     }
 
 
-def search_by_context(context: str) -> list:
+async def search_by_context(context: str) -> list:
     """Search memories relevant to a context."""
     try:
-        result = client.memory.query(
+        result = await async_client.memory.query(
             agent_id=AGENT_ID,
             query={
                 "query": f"relevant to {context}",
@@ -167,7 +168,7 @@ async def websocket_handler(websocket):
 
                 if msg_type == "context_search":
                     context = msg.get("context", "")
-                    results = search_by_context(context)
+                    results = await search_by_context(context)
                     await websocket.send(json.dumps({
                         "type": "context_results",
                         "context": context,
@@ -175,7 +176,7 @@ async def websocket_handler(websocket):
                     }))
 
                 elif msg_type == "refresh":
-                    load_memories()
+                    await load_memories()
                     await websocket.send(json.dumps({
                         "type": "init",
                         "data": get_dashboard_data()
@@ -679,13 +680,14 @@ def run_http_server(port: int):
 
 
 async def main(http_port: int, ws_port: int):
-    global client, HTTP_PORT, WS_PORT
+    global client, async_client, HTTP_PORT, WS_PORT
 
     HTTP_PORT = http_port
     WS_PORT = ws_port
 
     client = get_client()
-    load_memories()
+    async_client = AsyncDTaaSClient(client)
+    await load_memories()
 
     http_thread = threading.Thread(target=run_http_server, args=(http_port,), daemon=True)
     http_thread.start()
@@ -7,9 +7,16 @@ sensor data simulation, and ML-inspired failure prediction.
 
 Modules:
     seed.py - Creates industrial equipment digital twins with realistic specifications
+    roster.py - Shared twin roster cache, revalidated by version, with optional disk snapshot
     simulation.py - Real-time degradation simulation with physics-based models
+    fleet_engine.py - Vectorized (NumPy) degradation engine for large fleets
+    sensor_history.py - Columnar sensor history with 1-minute and 1-hour downsampling
+    anomaly_detectors.py - Streaming EWMA, CUSUM, rolling z-score and seasonal anomaly detectors
     analysis.py - Failure prediction algorithms and remaining useful life estimation
+    fleet_analytics.py - Vectorized (NumPy) fleet risk analytics and forecasts
+    scheduler.py - Crew-capacity-aware maintenance scheduling
     dashboard.py - Terminal-based monitoring dashboard
 """
 
-__all__ = ["seed", "simulation", "analysis", "dashboard"]
+__all__ = ["seed", "roster", "simulation", "fleet_engine", "sensor_history", "anomaly_detectors",
+           "analysis", "fleet_analytics", "scheduler", "dashboard"]
@@ -13,10 +13,21 @@ Advanced analytics for predicting equipment failures using:
 This module provides enterprise-grade predictive analytics that can be
 integrated with machine learning pipelines.
 
+With ``--vectorized`` the whole fleet is analyzed in one NumPy pass
+(see fleet_analytics.py), for fleets of hundreds of thousands of assets.
+
+The anomaly score of an asset is the highest of the simulator's threshold
+score (``anomalyScore``), its streaming detector score
+(``statisticalAnomalyScore``) and this analyzer's own streaming detectors
+on the current vibration and temperature (see anomaly_detectors.py), which
+learn each asset's normal behavior across repeated analyses.
+
 Usage:
     python analysis.py [--base-url URL] [--report] [--equipment-id ID]
     python analysis.py --risk-matrix       # Generate risk priority matrix
     python analysis.py --forecast HOURS    # Forecast equipment health
+    python analysis.py --vectorized --risk-matrix
+    python analysis.py --schedule 90 --crew-hours 40 --site-hours unit-utilities=16
 """
 
 import sys
@@ -25,13 +36,32 @@ import math
 import random
 import argparse
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from common import get_client, logger, NAMESPACE_PREFIXES
+from predictive_maintenance.scheduler import (
+    DEFAULT_DAILY_HOURS, MaintenanceJob, MaintenanceScheduler, SchedulePlan,
+)
+from predictive_maintenance.anomaly_detectors import (
+    NUMPY_AVAILABLE as DETECTORS_AVAILABLE, SENSOR_CHANNELS, StreamingAnomalyDetector,
+)
+from predictive_maintenance.roster import shared_roster
+from predictive_maintenance.fleet_analytics import (
+    FleetAnalysis, FleetForecast, analyze_fleet,
+    URGENCY_LEVELS, URGENCY_ACTIONS, RISK_LEVELS, RISK_MITIGATIONS, TREND_LEVELS,
+)
+
+# Maintenance planning: work is due this many days before the predicted
+# failure and may start up to MAINTENANCE_WINDOW_DAYS earlier
+MAINTENANCE_LEAD_DAYS = 7
+MAINTENANCE_WINDOW_DAYS = 14
+# Crew hours per job and weight of each day late, by urgency
+JOB_HOURS = {"immediate": 12.0, "urgent": 8.0, "planned": 6.0, "monitor": 2.0}
+URGENCY_WEIGHT = {"immediate": 4.0, "urgent": 2.0, "planned": 1.0, "monitor": 0.5}
 
 
 # =============================================================================
@@ -55,6 +85,7 @@ class EquipmentHealthProfile:
     recommended_action: str
     estimated_failure_date: Optional[datetime]
     confidence_interval: Tuple[float, float]
+    site: str = ""  # site or process unit, for crew capacity
 
 
 @dataclass
@@ -90,9 +121,20 @@ class PredictiveAnalyzer:
     Predictive maintenance analysis engine.
     """
 
-    def __init__(self, client):
+    def __init__(self, client, vectorized: bool = False):
         self.client = client
+        self.vectorized = vectorized
+        self.roster = shared_roster(client)
+        self.schedule_plan: Optional[SchedulePlan] = None
         self.equipment_profiles: Dict[str, EquipmentHealthProfile] = {}
+        # Columnar result of the last vectorized analysis
+        self.fleet: Optional[FleetAnalysis] = None
+        # Streaming detectors on current readings (None without NumPy), and
+        # the lastSimulationUpdate stamp of each asset's last scored reading
+        self.detector: Optional[StreamingAnomalyDetector] = (
+            StreamingAnomalyDetector(SENSOR_CHANNELS) if DETECTORS_AVAILABLE else None
+        )
+        self._scored_stamps: Dict[str, object] = {}
 
     def _normalize_properties(self, properties: Dict) -> Dict:
         """
@@ -212,6 +254,21 @@ class PredictiveAnalyzer:
 
         return (lower, upper)
 
+    def score_readings(self, equipment_id: str, properties: Dict) -> float:
+        """
+        Streaming detector score of the twin's current sensor readings.
+
+        A reading is scored once (by its lastSimulationUpdate stamp); the
+        asset's latest score is returned until a new reading arrives.
+        """
+        if self.detector is None or all(properties.get(name) is None for name in SENSOR_CHANNELS):
+            return 0.0
+        stamp = properties.get("lastSimulationUpdate")
+        if stamp is not None and self._scored_stamps.get(equipment_id) == stamp:
+            return self.detector.score(equipment_id)
+        self._scored_stamps[equipment_id] = stamp
+        return self.detector.update_one(equipment_id, properties)
+
     def analyze_equipment(self, twin_data: Dict) -> Optional[EquipmentHealthProfile]:
         """
         Perform comprehensive analysis on single equipment.
@@ -231,7 +288,11 @@ class PredictiveAnalyzer:
         operating_hours = properties.get("operatingHours", 10000)
         mtbf = properties.get("mtbf", 15000)
         criticality = properties.get("criticality", "medium")
-        anomaly_score = properties.get("anomalyScore", 0.0)
+        anomaly_score = max(
+            properties.get("anomalyScore", 0.0),
+            properties.get("statisticalAnomalyScore", 0.0),
+            self.score_readings(equipment_id, properties),
+        )
 
         # Get failure mode info
         severity = properties.get("failureModeSeverity", 5)
@@ -274,24 +335,120 @@ class PredictiveAnalyzer:
             recommended_action=action,
             estimated_failure_date=failure_date,
             confidence_interval=confidence,
+            site=properties.get("site") or properties.get("processUnit") or "",
         )
 
         self.equipment_profiles[equipment_id] = profile
         return profile
 
+    def _list_twins(self) -> Optional[List[Dict]]:
+        """Every twin in the domain, from the revalidated roster (None if never loaded)."""
+        self.roster.refresh()
+        if not self.roster.loaded:
+            return None
+        return self.roster.twins()
+
+    def analyze_fleet(self, twins: Optional[List[Dict]] = None) -> Optional[FleetAnalysis]:
+        """
+        Analyze all equipment in one vectorized pass (columnar result).
+
+        Args:
+            twins: Twin dicts to analyze; listed from the domain if None
+        """
+        if twins is None:
+            twins = self._list_twins()
+            if twins is None:
+                return None
+        if self.detector is None:
+            self.fleet = analyze_fleet(twins)
+        else:
+            self.fleet = analyze_fleet(twins, sensor_channels=SENSOR_CHANNELS)
+            self.fleet.apply_detector(self.detector, self._scored_stamps)
+        return self.fleet
+
+    def fleet_profiles(self, rows=None) -> List[EquipmentHealthProfile]:
+        """
+        EquipmentHealthProfiles from the last fleet analysis.
+
+        Args:
+            rows: Row indexes to convert, in order (all rows if None)
+        """
+        fleet = self.fleet
+        if rows is None:
+            rows = range(len(fleet))
+        rows = list(rows)
+
+        def pick(values: list) -> list:
+            return [values[i] for i in rows]
+
+        now = datetime.now()
+        columns = zip(
+            pick(fleet.equipment_ids), pick(fleet.equipment_types), pick(fleet.names),
+            fleet.health[rows].tolist(), fleet.rul[rows].tolist(),
+            fleet.failure_probability[rows].tolist(), fleet.anomaly[rows].tolist(),
+            pick(fleet.criticality_labels), pick(fleet.sites), fleet.operating_hours[rows].tolist(),
+            fleet.rpn[rows].tolist(), fleet.urgency[rows].tolist(),
+            fleet.hours_to_failure[rows].tolist(), fleet.ci_lower[rows].tolist(),
+            fleet.ci_upper[rows].tolist(),
+        )
+        return [
+            EquipmentHealthProfile(
+                equipment_id=eq_id,
+                equipment_type=eq_type,
+                name=name,
+                health_score=health,
+                remaining_useful_life=rul,
+                failure_probability=probability,
+                anomaly_score=anomaly,
+                criticality=criticality,
+                site=site,
+                operating_hours=hours,
+                risk_priority_number=rpn,
+                maintenance_urgency=URGENCY_LEVELS[urgency],
+                recommended_action=URGENCY_ACTIONS[urgency],
+                estimated_failure_date=now + timedelta(hours=to_failure),
+                confidence_interval=(lower, upper),
+            )
+            for (eq_id, eq_type, name, health, rul, probability, anomaly, criticality, site, hours,
+                 rpn, urgency, to_failure, lower, upper) in columns
+        ]
+
+    def fleet_risks(self, rows) -> List[RiskMatrix]:
+        """RiskMatrix entries for rows of the last fleet analysis, in order."""
+        fleet = self.fleet
+        rows = list(rows)
+        ids = fleet.equipment_ids
+        return [
+            RiskMatrix(
+                equipment_id=ids[i],
+                likelihood=likelihood,
+                consequence=consequence,
+                risk_score=score,
+                risk_level=RISK_LEVELS[level],
+                mitigation=RISK_MITIGATIONS[level],
+            )
+            for i, likelihood, consequence, score, level in zip(
+                rows, fleet.likelihood[rows].tolist(), fleet.consequence[rows].tolist(),
+                fleet.risk_score[rows].tolist(), fleet.risk_level[rows].tolist(),
+            )
+        ]
+
     def analyze_all_equipment(self) -> List[EquipmentHealthProfile]:
         """
         Analyze all equipment in the predictive maintenance domain.
         """
-        try:
-            twins = self.client.twins.list(domain="predictive_maintenance")
-        except Exception as e:
-            logger.error(f"Failed to list twins: {e}")
+        twins = self._list_twins()
+        if twins is None:
             return []
 
+        if self.vectorized:
+            fleet = self.analyze_fleet(twins)
+            by_row = self.fleet_profiles()
+            self.equipment_profiles.update((p.equipment_id, p) for p in by_row)
+            return [by_row[i] for i in fleet.order_by_rpn().tolist()]
+
         profiles = []
-        for twin in twins:
-            twin_dict = twin.model_dump() if hasattr(twin, 'model_dump') else twin
+        for twin_dict in twins:
             profile = self.analyze_equipment(twin_dict)
             if profile:
                 profiles.append(profile)
@@ -307,6 +464,9 @@ class PredictiveAnalyzer:
         if not self.equipment_profiles:
             self.analyze_all_equipment()
 
+        if self.fleet is not None:
+            return self.fleet_risks(self.fleet.order_by_risk())
+
         risk_entries = []
 
         for eq_id, profile in self.equipment_profiles.items():
@@ -359,8 +519,16 @@ class PredictiveAnalyzer:
         Forecast equipment health at a future point in time.
         Uses exponential degradation model.
         """
-        if equipment_id not in self.equipment_profiles:
+        if not self.equipment_profiles:
             self.analyze_all_equipment()
+        elif equipment_id not in self.equipment_profiles:
+            # Analyze just this twin instead of re-analyzing the fleet
+            try:
+                twin = self.client.twins.get(equipment_id)
+            except Exception as e:
+                logger.error(f"Failed to get twin {equipment_id}: {e}")
+                return None
+            self.analyze_equipment(twin.model_dump() if hasattr(twin, 'model_dump') else twin)
 
         if equipment_id not in self.equipment_profiles:
             return None
@@ -422,52 +590,98 @@ class PredictiveAnalyzer:
             trend=trend,
         )
 
-    def generate_maintenance_schedule(self, planning_horizon_days: int = 90) -> List[Dict]:
+    def forecast_fleet(self, hours_ahead: Sequence[float]) -> Optional[FleetForecast]:
+        """
+        Forecast health for all equipment at several horizons in one pass
+        (same model as forecast_health).
+        """
+        if self.fleet is None and self.analyze_fleet() is None:
+            return None
+        return self.fleet.forecast(hours_ahead)
+
+    def forecast_results(self, forecast: FleetForecast, horizon: int = 0,
+                         limit: Optional[int] = None) -> List[ForecastResult]:
+        """ForecastResults for one horizon of a fleet forecast, lowest predicted health first."""
+        fleet = self.fleet
+        predicted = forecast.predicted_health[:, horizon]
+        order = predicted.argsort(kind="stable")[:limit].tolist()
+        return [
+            ForecastResult(
+                equipment_id=fleet.equipment_ids[i],
+                current_health=float(fleet.health[i]),
+                forecast_hours=float(forecast.hours[horizon]),
+                predicted_health=float(predicted[i]),
+                predicted_rul=float(forecast.predicted_rul[i, horizon]),
+                confidence_lower=float(forecast.lower[i, horizon]),
+                confidence_upper=float(forecast.upper[i, horizon]),
+                trend=TREND_LEVELS[forecast.trend[i, horizon]],
+            )
+            for i in order
+        ]
+
+    def generate_maintenance_schedule(self, planning_horizon_days: int = 90,
+                                      crew_hours: float = DEFAULT_DAILY_HOURS,
+                                      site_crew_hours: Optional[Dict[str, float]] = None) -> List[Dict]:
         """
         Generate optimized maintenance schedule based on predictions.
+
+        Equipment predicted to fail within the horizon gets a job due
+        MAINTENANCE_LEAD_DAYS before the failure. Jobs are placed under the
+        crew hours per day (overall and per site) by MaintenanceScheduler;
+        the full plan, with unscheduled jobs and stats, is kept in
+        ``self.schedule_plan``.
         """
         if not self.equipment_profiles:
             self.analyze_all_equipment()
 
-        schedule = []
         current_date = datetime.now()
         horizon_end = current_date + timedelta(days=planning_horizon_days)
+        today = current_date.date()
 
-        # Group equipment by urgency
-        by_urgency = defaultdict(list)
-        for eq_id, profile in self.equipment_profiles.items():
-            by_urgency[profile.maintenance_urgency].append(profile)
-
-        # Schedule immediate and urgent items first
-        scheduled_dates = []
-
-        for urgency in ["immediate", "urgent", "planned", "monitor"]:
-            for profile in by_urgency[urgency]:
-                if profile.estimated_failure_date and profile.estimated_failure_date < horizon_end:
-                    # Schedule before predicted failure
-                    schedule_date = profile.estimated_failure_date - timedelta(days=7)
-                    if schedule_date < current_date:
-                        schedule_date = current_date + timedelta(days=1)
-
-                    # Avoid scheduling conflicts
-                    while schedule_date.date() in scheduled_dates:
-                        schedule_date += timedelta(days=1)
-
-                    scheduled_dates.append(schedule_date.date())
-
-                    schedule.append({
-                        "equipment_id": profile.equipment_id,
-                        "equipment_name": profile.name,
-                        "scheduled_date": schedule_date.strftime("%Y-%m-%d"),
-                        "urgency": profile.maintenance_urgency,
-                        "recommended_action": profile.recommended_action,
-                        "estimated_rul": profile.remaining_useful_life,
-                        "health_score": profile.health_score,
-                        "risk_priority": profile.risk_priority_number,
-                    })
-
-        # Sort by scheduled date
-        schedule.sort(key=lambda x: x["scheduled_date"])
+        jobs = []
+        profiles = []
+        for profile in self.equipment_profiles.values():
+            urgency = profile.maintenance_urgency
+            if urgency not in JOB_HOURS:
+                continue
+            if not profile.estimated_failure_date or profile.estimated_failure_date >= horizon_end:
+                continue
+            # Schedule before predicted failure, tomorrow at the earliest
+            target = profile.estimated_failure_date - timedelta(days=MAINTENANCE_LEAD_DAYS)
+            due_day = max(1, (target.date() - today).days)
+            jobs.append(MaintenanceJob(
+                equipment_id=profile.equipment_id,
+                site=profile.site,
+                duration_hours=JOB_HOURS[urgency],
+                release_day=max(1, due_day - MAINTENANCE_WINDOW_DAYS),
+                due_day=due_day,
+                priority=URGENCY_WEIGHT[urgency] * max(1.0, profile.risk_priority_number),
+            ))
+            profiles.append(profile)
+
+        scheduler = MaintenanceScheduler(planning_horizon_days, crew_hours, site_crew_hours)
+        plan = self.schedule_plan = scheduler.schedule(jobs)
+        if plan.unscheduled:
+            logger.warning(f"{len(plan.unscheduled)} maintenance jobs do not fit in the "
+                           f"{planning_horizon_days}-day horizon with the available crew hours")
+
+        schedule = []
+        for i, day in sorted(plan.days.items(), key=lambda item: item[1]):
+            job, profile = jobs[i], profiles[i]
+            schedule.append({
+                "equipment_id": profile.equipment_id,
+                "equipment_name": profile.name,
+                "scheduled_date": (today + timedelta(days=day)).strftime("%Y-%m-%d"),
+                "urgency": profile.maintenance_urgency,
+                "recommended_action": profile.recommended_action,
+                "estimated_rul": profile.remaining_useful_life,
+                "health_score": profile.health_score,
+                "risk_priority": profile.risk_priority_number,
+                "site": job.site,
+                "duration_hours": job.duration_hours,
+                "due_date": (today + timedelta(days=job.due_day)).strftime("%Y-%m-%d"),
+                "days_late": plan.lateness(i),
+            })
         return schedule
 
 
@@ -475,19 +689,31 @@ class PredictiveAnalyzer:
 # REPORTING
 # =============================================================================
 
-def print_health_report(profiles: List[EquipmentHealthProfile]):
-    """Print formatted health report."""
+def print_health_report(profiles: List[EquipmentHealthProfile],
+                        summary: Optional[Dict[str, int]] = None):
+    """
+    Print formatted health report.
+
+    ``summary`` (total and per-band counts) is computed from ``profiles``
+    unless given, so a large fleet can pass only the profiles it lists.
+    """
     print("\n" + "=" * 100)
     print(" PREDICTIVE MAINTENANCE HEALTH REPORT")
     print(" Generated: " + datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
     print("=" * 100)
 
     # Summary statistics
-    total = len(profiles)
-    critical = sum(1 for p in profiles if p.health_score < 20)
-    warning = sum(1 for p in profiles if 20 <= p.health_score < 50)
-    degraded = sum(1 for p in profiles if 50 <= p.health_score < 75)
-    healthy = sum(1 for p in profiles if p.health_score >= 75)
+    if summary is None:
+        summary = {
+            "total": len(profiles),
+            "critical": sum(1 for p in profiles if p.health_score < 20),
+            "warning": sum(1 for p in profiles if 20 <= p.health_score < 50),
+            "degraded": sum(1 for p in profiles if 50 <= p.health_score < 75),
+            "healthy": sum(1 for p in profiles if p.health_score >= 75),
+        }
+    total = summary["total"]
+    critical, warning = summary["critical"], summary["warning"]
+    degraded, healthy = summary["degraded"], summary["healthy"]
 
     print(f"\nFleet Summary: {total} equipment assets")
     print(f"  Healthy (>75%):     {healthy:3d} ({healthy/total*100:.1f}%)")
@@ -537,8 +763,15 @@ def print_health_report(profiles: List[EquipmentHealthProfile]):
             print(f"  - {p.equipment_id}: {p.recommended_action}")
 
 
-def print_risk_matrix(risks: List[RiskMatrix]):
-    """Print risk assessment matrix."""
+def print_risk_matrix(risks: List[RiskMatrix], cell_counts: Optional[List[List[int]]] = None,
+                      level_counts: Optional[Dict[str, int]] = None):
+    """
+    Print risk assessment matrix.
+
+    ``cell_counts`` ([likelihood - 1][consequence - 1]) and ``level_counts``
+    are computed from ``risks`` unless given; with them, ``risks`` only
+    needs the entries listed per level.
+    """
     print("\n" + "=" * 80)
     print(" RISK ASSESSMENT MATRIX")
     print("=" * 80)
@@ -549,14 +782,15 @@ def print_risk_matrix(risks: List[RiskMatrix]):
     print("         +-----+-----+-----+-----+-----+")
 
     # Count equipment in each cell
-    matrix = defaultdict(list)
-    for r in risks:
-        matrix[(r.likelihood, r.consequence)].append(r.equipment_id)
+    if cell_counts is None:
+        cell_counts = [[0] * 5 for _ in range(5)]
+        for r in risks:
+            cell_counts[r.likelihood - 1][r.consequence - 1] += 1
 
     for likelihood in range(5, 0, -1):
         row = f"   L={likelihood}  |"
         for consequence in range(1, 6):
-            count = len(matrix[(likelihood, consequence)])
+            count = cell_counts[likelihood - 1][consequence - 1]
             if count > 0:
                 row += f" {count:3d} |"
             else:
@@ -577,7 +811,8 @@ def print_risk_matrix(risks: List[RiskMatrix]):
 
     for level in ["critical", "high", "medium", "low"]:
         items = by_level[level]
-        print(f"\n{level.upper()} RISK ({len(items)} items):")
+        count = len(items) if level_counts is None else level_counts[level]
+        print(f"\n{level.upper()} RISK ({count} items):")
         for r in items[:3]:
             print(f"  - {r.equipment_id}: L={r.likelihood}, C={r.consequence}, "
                   f"Score={r.risk_score}")
@@ -608,6 +843,59 @@ def print_forecast(forecasts: List[ForecastResult], hours: float):
               f"{icon} {f.trend:<12}")
 
 
+def print_fleet_reports(analyzer: PredictiveAnalyzer, args):
+    """
+    The reports of main() from one vectorized fleet analysis. Only the
+    rows that get printed are turned into profile and risk objects.
+    """
+    fleet = analyzer.analyze_fleet()
+    if not fleet:
+        print("No equipment found. Run seed.py first to create equipment twins.")
+        return
+
+    if args.report or (not args.risk_matrix and not args.forecast and not args.schedule):
+        profiles = analyzer.fleet_profiles(fleet.report_rows(top=15, urgent=5))
+        print_health_report(profiles, fleet.health_summary())
+
+    if args.risk_matrix:
+        risks = analyzer.fleet_risks(fleet.risk_report_rows(per_level=3))
+        print_risk_matrix(risks, fleet.risk_counts().tolist(), fleet.risk_level_counts())
+
+    if args.forecast:
+        forecast = analyzer.forecast_fleet([args.forecast])
+        print_forecast(analyzer.forecast_results(forecast, limit=20), args.forecast)
+
+    if args.schedule:
+        schedule = analyzer.generate_maintenance_schedule(args.schedule, args.crew_hours,
+                                                          parse_site_hours(args.site_hours))
+        print_schedule(schedule, args.schedule, analyzer.schedule_plan)
+
+
+def print_schedule(schedule: List[Dict], days: int, plan: Optional[SchedulePlan] = None):
+    """Print maintenance schedule."""
+    print("\n" + "=" * 80)
+    print(f" MAINTENANCE SCHEDULE - NEXT {days} DAYS")
+    print("=" * 80)
+    if plan is not None:
+        stats = plan.stats
+        print(f"\n{stats['scheduled']} jobs scheduled, {stats['late']} late, "
+              f"{stats['unscheduled']} unscheduled, crew utilization {stats['utilization']*100:.1f}%")
+    print(f"\n{'Date':<12} {'Equipment':<35} {'Urgency':<12} {'Action':<30}")
+    print("-" * 90)
+    for item in schedule[:20]:
+        print(f"{item['scheduled_date']:<12} {item['equipment_id'][:35]:<35} "
+              f"{item['urgency']:<12} {item['recommended_action'][:30]:<30}")
+
+
+def parse_site_hours(values: Optional[List[str]]) -> Dict[str, float]:
+    """SITE=HOURS arguments -> {site: crew hours per day}."""
+    site_hours = {}
+    for value in values or []:
+        site, _, hours = value.rpartition("=")
+        site_hours[site] = float(hours)
+    return site_hours
+
+
 def main():
     parser = argparse.ArgumentParser(description="Predictive Maintenance Analysis")
     parser.add_argument("--base-url", help="DTaaS server URL")
@@ -616,10 +904,16 @@ def main():
     parser.add_argument("--forecast", type=float, help="Forecast health N hours ahead")
     parser.add_argument("--equipment-id", help="Analyze specific equipment")
     parser.add_argument("--schedule", type=int, help="Generate maintenance schedule for N days")
+    parser.add_argument("--crew-hours", type=float, default=DEFAULT_DAILY_HOURS,
+                        help="Crew hours per day for the maintenance schedule")
+    parser.add_argument("--site-hours", nargs="*", metavar="SITE=HOURS",
+                        help="Crew hours per day for specific sites")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="Analyze the whole fleet in one NumPy pass")
     args = parser.parse_args()
 
     client = get_client(args.base_url)
-    analyzer = PredictiveAnalyzer(client)
+    analyzer = PredictiveAnalyzer(client, vectorized=args.vectorized)
 
     if args.equipment_id:
         # Analyze specific equipment
@@ -645,6 +939,10 @@ def main():
             print(f"Error: {e}")
         return
 
+    if args.vectorized:
+        print_fleet_reports(analyzer, args)
+        return
+
     # Analyze all equipment
     profiles = analyzer.analyze_all_equipment()
 
@@ -669,15 +967,9 @@ def main():
         print_forecast(forecasts[:20], args.forecast)
 
     if args.schedule:
-        schedule = analyzer.generate_maintenance_schedule(args.schedule)
-        print("\n" + "=" * 80)
-        print(f" MAINTENANCE SCHEDULE - NEXT {args.schedule} DAYS")
-        print("=" * 80)
-        print(f"\n{'Date':<12} {'Equipment':<35} {'Urgency':<12} {'Action':<30}")
-        print("-" * 90)
-        for item in schedule[:20]:
-            print(f"{item['scheduled_date']:<12} {item['equipment_id'][:35]:<35} "
-                  f"{item['urgency']:<12} {item['recommended_action'][:30]:<30}")
+        schedule = analyzer.generate_maintenance_schedule(args.schedule, args.crew_hours,
+                                                          parse_site_hours(args.site_hours))
+        print_schedule(schedule, args.schedule, analyzer.schedule_plan)
 
 
 if __name__ == "__main__":
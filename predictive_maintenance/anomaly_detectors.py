@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Predictive Maintenance - Streaming Anomaly Detectors
+=====================================================
+
+Online statistical anomaly detection for sensor streams (one stream per
+asset, one column per channel such as vibration and temperature). Every
+detector keeps a fixed amount of state per stream and updates in O(1)
+per sample, so no raw history is stored:
+
+- EWMA: exponentially weighted mean and variance; scores the deviation of
+  a new sample from the running mean, in standard deviations
+- CUSUM: two-sided cumulative sum of the EWMA-standardized residuals;
+  catches small persistent shifts (slow drift) that single samples don't
+- Rolling z-score: mean and variance over the last ``window`` samples,
+  from running sums over a small per-stream ring
+- Seasonal baseline: one EWMA baseline per hour of day (``seasonal_bins``
+  bins over ``season_seconds``), so daily load cycles are not anomalies
+
+Updates take an array of stream rows and an (n, channels) array of
+samples, so a whole fleet is scored in one call; ``update_one`` is the
+per-asset form. Scores are in [0, 1]: the strongest detector on the
+strongest channel, zero until a stream has ``warmup`` samples.
+
+Requires NumPy (``pip install numpy``).
+
+Usage:
+    detector = StreamingAnomalyDetector(SENSOR_CHANNELS)
+    score = detector.update_one(equipment_id, {"currentVibration": 3.1, "currentTemperature": 61.0})
+    scores = detector.update(detector.rows(ids), samples)
+"""
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+# Twin properties scored by default
+SENSOR_CHANNELS = ("currentVibration", "currentTemperature")
+
+
+@dataclass
+class DetectorConfig:
+    """Detector parameters shared by all streams."""
+    ewma_alpha: float = 0.1        # EWMA smoothing (higher = faster adaptation)
+    cusum_k: float = 0.5           # CUSUM slack, in standard deviations
+    cusum_h: float = 5.0           # CUSUM decision threshold (score 0 at h, 1 at 2h)
+    window: int = 32               # Rolling z-score window (samples)
+    seasonal_bins: int = 24        # Seasonal baseline bins per season
+    season_seconds: float = 86400.0
+    seasonal_alpha: float = 0.05
+    seasonal_warmup: int = 3       # Samples per bin before it is scored
+    z_warn: float = 3.0            # |z| where the score starts rising
+    z_max: float = 6.0             # |z| scored as 1.0
+    min_std: float = 1e-3          # Floor for standard deviations
+    warmup: int = 10               # Samples before a stream is scored
+
+
+class StreamingAnomalyDetector:
+    """
+    EWMA, CUSUM, rolling z-score and seasonal detectors for many streams.
+
+    Streams are rows of preallocated arrays; ``rows`` registers new
+    stream IDs. After ``update``, ``scores[row]`` is the stream's latest
+    combined score and ``state(stream_id)`` its per-detector readings.
+
+    Args:
+        channels: Channel names, in column order of the samples
+        config: Detector parameters
+        capacity: Initial number of stream slots (grows by doubling)
+    """
+
+    def __init__(self, channels: Sequence[str] = SENSOR_CHANNELS,
+                 config: Optional[DetectorConfig] = None, capacity: int = 64):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("Streaming anomaly detectors require NumPy: pip install numpy")
+
+        self.channels = tuple(channels)
+        self.config = config or DetectorConfig()
+        self.index: Dict[str, int] = {}
+        self._capacity = max(1, capacity)
+
+        c, cfg = len(self.channels), self.config
+        # name -> shape after the stream axis
+        self._shapes = {
+            "count": (),
+            "scores": (),
+            "ewma_mean": (c,),
+            "ewma_var": (c,),
+            "cusum_hi": (c,),
+            "cusum_lo": (c,),
+            "window_values": (c, cfg.window),
+            "window_sum": (c,),
+            "window_sumsq": (c,),
+            "window_pos": (),
+            "seasonal_mean": (c, cfg.seasonal_bins),
+            "seasonal_count": (cfg.seasonal_bins,),
+            "seasonal_var": (c,),
+        }
+        self.arrays = {name: np.zeros((self._capacity,) + shape) for name, shape in self._shapes.items()}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, stream_id: str) -> bool:
+        return stream_id in self.index
+
+    def __getattr__(self, name: str) -> "np.ndarray":
+        arrays = self.__dict__.get("arrays")
+        if arrays is None or name not in arrays:
+            raise AttributeError(name)
+        return arrays[name]
+
+    @property
+    def nbytes_per_stream(self) -> int:
+        return sum(array[0].nbytes for array in self.arrays.values())
+
+    def rows(self, stream_ids: Iterable[str]) -> "np.ndarray":
+        """Rows of the given streams, registering new ones."""
+        index = self.index
+        rows = []
+        for stream_id in stream_ids:
+            row = index.get(stream_id)
+            if row is None:
+                row = index[stream_id] = len(index)
+            rows.append(row)
+        if len(index) > self._capacity:
+            self._grow(len(index))
+        return np.asarray(rows, dtype=np.intp)
+
+    def _grow(self, needed: int) -> None:
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        for name, array in self.arrays.items():
+            grown = np.zeros((capacity,) + self._shapes[name])
+            grown[:self._capacity] = array
+            self.arrays[name] = grown
+        self._capacity = capacity
+
+    def _score(self, z: "np.ndarray") -> "np.ndarray":
+        cfg = self.config
+        return np.clip((np.abs(z) - cfg.z_warn) / (cfg.z_max - cfg.z_warn), 0.0, 1.0)
+
+    def update(self, rows: "np.ndarray", samples, timestamps=None) -> "np.ndarray":
+        """
+        Add one sample to each of the given streams (rows must be unique).
+
+        Args:
+            rows: Stream rows, from ``rows``
+            samples: (len(rows), channels) array; NaN repeats the EWMA mean
+            timestamps: Epoch seconds, scalar or per row (default: now)
+
+        Returns:
+            Combined anomaly score per row, in [0, 1]
+        """
+        cfg, a = self.config, self.arrays
+        x = np.asarray(samples, dtype=float).reshape(len(rows), len(self.channels))
+        count = a["count"][rows]
+        first = (count == 0)[:, None]
+
+        # EWMA mean/variance; z-score against the state before this sample.
+        # The variance starts at zero, so it is bias-corrected by the
+        # weight of the updates seen so far
+        mean, var = a["ewma_mean"][rows], a["ewma_var"][rows]
+        missing = np.isnan(x)
+        if missing.any():
+            x = np.where(missing, mean, x)
+        weight = -np.expm1(np.maximum(count - 1, 1) * np.log1p(-cfg.ewma_alpha))[:, None]
+        std = np.maximum(np.sqrt(var / weight), cfg.min_std)
+        z_ewma = np.where(first, 0.0, (x - mean) / std)
+        diff = np.where(first, 0.0, x - mean)
+        a["ewma_mean"][rows] = np.where(first, x, mean + cfg.ewma_alpha * diff)
+        a["ewma_var"][rows] = (1 - cfg.ewma_alpha) * (var + cfg.ewma_alpha * diff ** 2)
+
+        # Two-sided CUSUM of the standardized residuals (bounded at 2h),
+        # held at zero until the EWMA has warmed up
+        z_clipped = np.where((count < cfg.warmup)[:, None], 0.0, np.clip(z_ewma, -cfg.z_max, cfg.z_max))
+        hi = np.clip(a["cusum_hi"][rows] + z_clipped - cfg.cusum_k, 0.0, 2 * cfg.cusum_h)
+        lo = np.clip(a["cusum_lo"][rows] - z_clipped - cfg.cusum_k, 0.0, 2 * cfg.cusum_h)
+        a["cusum_hi"][rows], a["cusum_lo"][rows] = hi, lo
+        cusum_score = np.clip(np.maximum(hi, lo) / cfg.cusum_h - 1.0, 0.0, 1.0)
+
+        # Rolling z-score from running sums; the ring starts zeroed, so
+        # subtracting the evicted slot is correct before it fills
+        n_window = np.minimum(count, cfg.window)[:, None]
+        w_sum, w_sumsq = a["window_sum"][rows], a["window_sumsq"][rows]
+        w_n = np.maximum(n_window, 1)
+        w_mean = w_sum / w_n
+        w_std = np.maximum(np.sqrt(np.maximum(w_sumsq / w_n - w_mean ** 2, 0.0)), cfg.min_std)
+        z_window = np.where(n_window > 1, (x - w_mean) / w_std, 0.0)
+        pos = a["window_pos"][rows].astype(np.intp)
+        evicted = a["window_values"][rows, :, pos]
+        a["window_values"][rows, :, pos] = x
+        a["window_sum"][rows] = w_sum - evicted + x
+        a["window_sumsq"][rows] = w_sumsq - evicted ** 2 + x ** 2
+        a["window_pos"][rows] = (pos + 1) % cfg.window
+
+        # Seasonal baseline: EWMA per time-of-season bin
+        if timestamps is None:
+            timestamps = time.time()
+        t = np.broadcast_to(np.asarray(timestamps, dtype=float), (len(rows),))
+        bins = ((t % cfg.season_seconds) / cfg.season_seconds * cfg.seasonal_bins).astype(np.intp)
+        bins = np.minimum(bins, cfg.seasonal_bins - 1)
+        bin_count = a["seasonal_count"][rows, bins]
+        baseline = a["seasonal_mean"][rows, :, bins]
+        s_var = a["seasonal_var"][rows]
+        residual = np.where((bin_count == 0)[:, None], 0.0, x - baseline)
+        seasoned = (bin_count >= cfg.seasonal_warmup)[:, None]
+        z_season = np.where(seasoned, residual / np.maximum(np.sqrt(s_var), cfg.min_std), 0.0)
+        a["seasonal_mean"][rows, :, bins] = np.where(
+            (bin_count == 0)[:, None], x, baseline + cfg.seasonal_alpha * residual)
+        a["seasonal_var"][rows] = np.where(
+            (bin_count == 0)[:, None], s_var, (1 - cfg.seasonal_alpha) * s_var + cfg.seasonal_alpha * residual ** 2)
+        a["seasonal_count"][rows, bins] = bin_count + 1
+
+        # Strongest detector on the strongest channel
+        combined = np.maximum.reduce([
+            self._score(z_ewma), cusum_score, self._score(z_window), self._score(z_season),
+        ]).max(axis=1)
+        count += 1
+        a["count"][rows] = count
+        scores = np.where(count > cfg.warmup, combined, 0.0)
+        a["scores"][rows] = scores
+        return scores
+
+    def update_one(self, stream_id: str, values: Mapping[str, float],
+                   timestamp: Optional[float] = None) -> float:
+        """
+        Add one sample to one stream; channels missing from ``values`` repeat the EWMA mean.
+
+        Same arithmetic as ``update``, in plain Python floats: for a single
+        row, NumPy's per-call overhead costs more than the math.
+        """
+        row = self.index.get(stream_id)
+        if row is None:
+            row = int(self.rows((stream_id,))[0])
+        cfg, a = self.config, self.arrays
+        alpha, sa, min_std = cfg.ewma_alpha, cfg.seasonal_alpha, cfg.min_std
+
+        count = int(a["count"][row])
+        first = count == 0
+        scored = count >= cfg.warmup
+        weight = -math.expm1(max(count - 1, 1) * math.log1p(-alpha))
+        n_window = min(count, cfg.window)
+        w_n = max(n_window, 1)
+        pos = int(a["window_pos"][row])
+        if timestamp is None:
+            timestamp = time.time()
+        b = min(int((timestamp % cfg.season_seconds) / cfg.season_seconds * cfg.seasonal_bins),
+                cfg.seasonal_bins - 1)
+        bin_count = int(a["seasonal_count"][row, b])
+
+        mean, var = a["ewma_mean"][row].tolist(), a["ewma_var"][row].tolist()
+        hi, lo = a["cusum_hi"][row].tolist(), a["cusum_lo"][row].tolist()
+        w_sum, w_sumsq = a["window_sum"][row].tolist(), a["window_sumsq"][row].tolist()
+        window_values = a["window_values"][row]
+        evicted = window_values[:, pos].tolist()
+        seasonal_mean = a["seasonal_mean"][row]
+        baseline = seasonal_mean[:, b].tolist()
+        s_var = a["seasonal_var"][row].tolist()
+        cusum_cap, z_span = 2 * cfg.cusum_h, cfg.z_max - cfg.z_warn
+
+        combined = 0.0
+        x_all = []
+        for k, name in enumerate(self.channels):
+            value = values.get(name)
+            x = mean[k] if value is None or value != value else float(value)
+            x_all.append(x)
+            m = mean[k]
+
+            # EWMA
+            z_ewma = 0.0 if first else (x - m) / max(math.sqrt(var[k] / weight), min_std)
+            diff = 0.0 if first else x - m
+            mean[k] = x if first else m + alpha * diff
+            var[k] = (1 - alpha) * (var[k] + alpha * diff * diff)
+
+            # CUSUM
+            z_clipped = min(max(z_ewma, -cfg.z_max), cfg.z_max) if scored else 0.0
+            hi[k] = min(max(hi[k] + z_clipped - cfg.cusum_k, 0.0), cusum_cap)
+            lo[k] = min(max(lo[k] - z_clipped - cfg.cusum_k, 0.0), cusum_cap)
+            best = min(max(max(hi[k], lo[k]) / cfg.cusum_h - 1.0, 0.0), 1.0)
+
+            # Rolling z-score
+            z_window = 0.0
+            if n_window > 1:
+                w_mean = w_sum[k] / w_n
+                w_std = max(math.sqrt(max(w_sumsq[k] / w_n - w_mean * w_mean, 0.0)), min_std)
+                z_window = (x - w_mean) / w_std
+            w_sum[k] = w_sum[k] - evicted[k] + x
+            w_sumsq[k] = w_sumsq[k] - evicted[k] * evicted[k] + x * x
+
+            # Seasonal baseline
+            z_season = 0.0
+            if bin_count == 0:
+                baseline[k] = x
+            else:
+                residual = x - baseline[k]
+                if bin_count >= cfg.seasonal_warmup:
+                    z_season = residual / max(math.sqrt(s_var[k]), min_std)
+                baseline[k] += sa * residual
+                s_var[k] = (1 - sa) * s_var[k] + sa * residual * residual
+
+            for z in (z_ewma, z_window, z_season):
+                best = max(best, min(max((abs(z) - cfg.z_warn) / z_span, 0.0), 1.0))
+            combined = max(combined, best)
+
+        a["ewma_mean"][row], a["ewma_var"][row] = mean, var
+        a["cusum_hi"][row], a["cusum_lo"][row] = hi, lo
+        window_values[:, pos] = x_all
+        a["window_sum"][row], a["window_sumsq"][row] = w_sum, w_sumsq
+        a["window_pos"][row] = (pos + 1) % cfg.window
+        seasonal_mean[:, b] = baseline
+        a["seasonal_var"][row] = s_var
+        a["seasonal_count"][row, b] = bin_count + 1
+        count += 1
+        a["count"][row] = count
+        score = combined if count > cfg.warmup else 0.0
+        a["scores"][row] = score
+        return score
+
+    def score(self, stream_id: str) -> float:
+        """Latest combined score of a stream (0 if unknown)."""
+        row = self.index.get(stream_id)
+        return 0.0 if row is None else float(self.arrays["scores"][row])
+
+    def state(self, stream_id: str) -> Dict[str, Dict[str, float]]:
+        """Per-channel detector state of one stream."""
+        row = self.index[stream_id]
+        a, cfg = self.arrays, self.config
+        count = int(a["count"][row])
+        n = max(1, min(count, cfg.window))
+        weight = -math.expm1(max(count - 1, 1) * math.log1p(-cfg.ewma_alpha))
+        result = {}
+        for k, channel in enumerate(self.channels):
+            result[channel] = {
+                "ewma_mean": float(a["ewma_mean"][row, k]),
+                "ewma_std": float(np.sqrt(a["ewma_var"][row, k] / weight)),
+                "cusum_high": float(a["cusum_hi"][row, k]),
+                "cusum_low": float(a["cusum_lo"][row, k]),
+                "window_mean": float(a["window_sum"][row, k] / n),
+            }
+        return result
+
+    def top(self, limit: int) -> List[str]:
+        """Stream IDs with the highest latest scores."""
+        ids = list(self.index)
+        scores = self.arrays["scores"][:len(ids)]
+        order = np.argsort(-scores, kind="stable")[:limit]
+        return [ids[i] for i in order.tolist()]
@@ -24,6 +24,7 @@ from collections import deque
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from common import get_client, logger
+from predictive_maintenance.roster import shared_roster
 
 
 # ANSI color codes for terminal
@@ -114,6 +115,7 @@ class Dashboard:
 
     def __init__(self, client, refresh_interval: float = 5.0):
         self.client = client
+        self.roster = shared_roster(client)
         self.refresh_interval = refresh_interval
         self.health_history: Dict[str, deque] = {}
         self.alerts: deque = deque(maxlen=10)
@@ -133,11 +135,10 @@ class Dashboard:
     def get_equipment_data(self) -> List[Dict]:
         """Fetch current equipment data."""
         try:
-            twins = self.client.twins.list(domain="predictive_maintenance", page_size=200)
+            self.roster.refresh()
             equipment = []
 
-            for twin in twins:
-                twin_dict = twin.model_dump() if hasattr(twin, 'model_dump') else twin
+            for twin_dict in self.roster.twins():
                 raw_props = twin_dict.get("properties", {})
                 props = self._normalize_properties(raw_props)
 
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Predictive Maintenance - Vectorized Fleet Analytics
+====================================================
+
+The ``PredictiveAnalyzer`` models applied to a whole fleet in one pass
+with NumPy:
+
+- 30-day failure probability, FMEA risk priority number (RPN), maintenance
+  urgency, hours to failure and the 90% RUL confidence interval
+- Likelihood x consequence risk matrix
+- Health forecasts for any number of horizons at once
+- Optionally, streaming anomaly detector scores for the current sensor
+  readings (see anomaly_detectors.py), folded into the anomaly score
+
+Twin properties are read once into columns; every model step is an array
+operation over all assets. Results come back as a ``FleetAnalysis``, a set
+of columns indexed by row, which ``analysis.PredictiveAnalyzer`` converts
+to its dataclasses where needed.
+
+Requires NumPy (``pip install numpy``).
+
+Usage:
+    fleet = analyze_fleet(twin_dicts)
+    top = fleet.order_by_rpn()[:15]
+    forecast = fleet.forecast([24, 168, 720])
+"""
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+# Same defaults as PredictiveAnalyzer.analyze_equipment
+PROPERTY_DEFAULTS = {
+    "healthScore": 85.0,
+    "remainingUsefulLife": 5000.0,
+    "operatingHours": 10000.0,
+    "mtbf": 15000.0,
+    "anomalyScore": 0.0,
+    "statisticalAnomalyScore": 0.0,
+    "failureModeSeverity": 5.0,
+    "degradationRate": 0.01,
+}
+
+PREDICTION_WINDOW_HOURS = 720  # 30 days
+
+# Criticality codes index these lists; unrecognized values get the last
+# slot (urgency factor 1.0, consequence 2), as in PredictiveAnalyzer
+CRITICALITY_LEVELS = ["critical", "high", "medium", "low"]
+CRITICALITY_FACTOR = [1.5, 1.2, 1.0, 0.8, 1.0]
+CONSEQUENCE = [5, 4, 3, 2, 2]
+DEFAULT_CRITICALITY = "medium"
+
+URGENCY_LEVELS = ["immediate", "urgent", "planned", "monitor", "normal"]
+URGENCY_ACTIONS = [
+    "Schedule immediate corrective maintenance",
+    "Schedule maintenance within 48 hours",
+    "Schedule maintenance within 2 weeks",
+    "Increase monitoring frequency",
+    "Continue routine maintenance schedule",
+]
+
+RISK_LEVELS = ["critical", "high", "medium", "low"]
+RISK_MITIGATIONS = [
+    "Immediate shutdown and repair required",
+    "Schedule urgent maintenance within 48 hours",
+    "Plan maintenance in next scheduled window",
+    "Monitor and maintain per schedule",
+]
+
+TREND_LEVELS = ["stable", "degrading", "rapid_degradation", "failed"]
+
+
+def _normalize_key(key: str) -> str:
+    return key.split("#", 1)[1] if "#" in key else key
+
+
+def _number(value, default: float) -> float:
+    if value is None or isinstance(value, bool):
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _column(values: list, default: float) -> "np.ndarray":
+    """Raw property values as floats; missing (None) or non-numeric values get the default."""
+    try:
+        column = np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        return np.asarray([_number(v, default) for v in values], dtype=float)
+    column[np.isnan(column)] = default
+    return column
+
+
+class FleetForecast:
+    """
+    Health forecasts, one column per horizon.
+
+    ``predicted_health``, ``predicted_rul``, ``lower``, ``upper`` and
+    ``trend`` (index into TREND_LEVELS) have shape (assets, horizons).
+    """
+
+    def __init__(self, hours: "np.ndarray", predicted_health, predicted_rul, lower, upper, trend):
+        self.hours = hours
+        self.predicted_health = predicted_health
+        self.predicted_rul = predicted_rul
+        self.lower = lower
+        self.upper = upper
+        self.trend = trend
+
+
+class FleetAnalysis:
+    """
+    Columnar analysis result; row ``i`` of every column is one asset.
+
+    Inputs: ``equipment_ids``, ``equipment_types``, ``names``,
+    ``criticality_labels`` (lists) and ``criticality`` (index into
+    CRITICALITY_FACTOR / CONSEQUENCE), ``health``, ``rul``,
+    ``operating_hours``, ``mtbf``, ``anomaly``, ``severity``,
+    ``degradation_rate`` (arrays), plus optional ``sites`` (site or process
+    unit per asset). ``evaluate`` fills in the rest.
+    """
+
+    def __init__(self, equipment_ids: List[str], equipment_types: List[str], names: List[str],
+                 criticality_labels: List[str], criticality, health, rul, operating_hours,
+                 mtbf, anomaly, severity, degradation_rate, sites: Optional[List[str]] = None):
+        self.equipment_ids = equipment_ids
+        self.equipment_types = equipment_types
+        self.names = names
+        self.criticality_labels = criticality_labels
+        self.criticality = criticality
+        self.health = health
+        self.rul = rul
+        self.operating_hours = operating_hours
+        self.mtbf = mtbf
+        self.anomaly = anomaly
+        self.severity = severity
+        self.degradation_rate = degradation_rate
+        self.sites = sites if sites is not None else [""] * len(equipment_ids)
+        # Raw sensor readings (NaN if missing) and their lastSimulationUpdate
+        # stamps, for apply_detector; filled by analyze_fleet on request
+        self.sensors: Dict[str, "np.ndarray"] = {}
+        self.sample_stamps: List = []
+
+    def __len__(self) -> int:
+        return len(self.equipment_ids)
+
+    def evaluate(self) -> "FleetAnalysis":
+        """Compute every per-asset metric."""
+        health, rul, hours, mtbf = self.health, self.rul, self.operating_hours, self.mtbf
+        has_mtbf = mtbf > 0
+        safe_mtbf = np.where(has_mtbf, mtbf, 1.0)
+        safe_rul = np.where(rul > 0, rul, 1.0)
+
+        # 30-day failure probability
+        window = PREDICTION_WINDOW_HOURS
+        base_prob = np.where(rul < window, 1 - rul / window, window / safe_rul * 0.1)
+        health_factor = (100 - health) / 100
+        utilization = np.where(has_mtbf, hours / safe_mtbf, 1.0)
+        age_factor = np.minimum(1.0, np.maximum(utilization, 0.0) ** 1.5)
+        combined = base_prob * 0.4 + health_factor * 0.3 + age_factor * 0.3
+        self.failure_probability = np.where(rul <= 0, 0.99, np.clip(combined, 0.01, 0.99))
+
+        # FMEA risk priority number
+        self.detection = 10 - np.trunc(health / 15)
+        self.occurrence = np.minimum(10, np.trunc(utilization * 10) + 1)
+        self.rpn = self.severity * self.occurrence * self.detection
+
+        # Maintenance urgency, thresholds scaled by criticality
+        crit_mult = np.asarray(CRITICALITY_FACTOR)[self.criticality]
+        self.urgency = np.select(
+            [(health < 20) | (rul < 200 * crit_mult),
+             (health < 40) | (rul < 500 * crit_mult),
+             (health < 60) | (rul < 1500 * crit_mult),
+             health < 80],
+            [0, 1, 2, 3], default=4,
+        ).astype(np.int8)
+
+        # Hours until failure, faster degradation = sooner failure
+        rate = self.degradation_rate
+        adjusted = np.where(rate > 0, rul / (1 + np.maximum(rate, 0) * 10), rul)
+        self.hours_to_failure = np.where(rul <= 0, 0.0, adjusted)
+
+        # 90% RUL confidence interval
+        uncertainty = (0.2 + (100 - health) / 200) * np.where(rul < 500, 1.5, np.where(rul < 2000, 1.2, 1.0))
+        self.ci_lower = np.maximum(0, rul * (1 - uncertainty))
+        self.ci_upper = rul * (1 + uncertainty)
+
+        # Risk matrix
+        fp = self.failure_probability
+        self.likelihood = (1 + (fp > 0.2).astype(np.int8) + (fp > 0.4) + (fp > 0.6) + (fp > 0.8)).astype(np.int8)
+        self.consequence = np.asarray(CONSEQUENCE, dtype=np.int8)[self.criticality]
+        self.risk_score = self.likelihood * self.consequence
+        self.risk_level = np.select(
+            [self.risk_score >= 20, self.risk_score >= 12, self.risk_score >= 6], [0, 1, 2], default=3,
+        ).astype(np.int8)
+        return self
+
+    def apply_detector(self, detector, scored: Dict[str, object]) -> int:
+        """
+        Score new sensor readings with a StreamingAnomalyDetector and raise
+        ``anomaly`` to each asset's latest detector score where it is higher.
+
+        Args:
+            detector: Detector whose channels are columns of ``sensors``
+            scored: equipment ID -> stamp of the last reading scored; rows
+                with an unchanged stamp are not scored again. Updated in place
+
+        Returns:
+            Number of rows scored
+        """
+        samples = np.column_stack([self.sensors[name] for name in detector.channels])
+        with_reading = np.flatnonzero(~np.isnan(samples).all(axis=1))
+        ids, stamps = self.equipment_ids, self.sample_stamps
+        fresh = [i for i in with_reading.tolist() if stamps[i] is None or scored.get(ids[i]) != stamps[i]]
+        if fresh:
+            detector.update(detector.rows(ids[i] for i in fresh), samples[fresh])
+            scored.update((ids[i], stamps[i]) for i in fresh)
+
+        # Unchanged readings keep their latest score
+        rows = detector.rows(ids[i] for i in with_reading.tolist())
+        self.anomaly[with_reading] = np.maximum(self.anomaly[with_reading], detector.scores[rows])
+        return len(fresh)
+
+    def order_by_rpn(self) -> "np.ndarray":
+        """Rows by risk priority number, highest first (stable for ties)."""
+        return np.argsort(-self.rpn, kind="stable")
+
+    def order_by_risk(self) -> "np.ndarray":
+        """Rows by risk score, highest first (stable for ties)."""
+        return np.argsort(-self.risk_score, kind="stable")
+
+    def report_rows(self, top: int, urgent: int) -> List[int]:
+        """
+        Rows a health report lists, in RPN order: the ``top`` highest RPNs,
+        every immediate item and the first ``urgent`` urgent items.
+        """
+        order = self.order_by_rpn()
+        urgency = self.urgency[order]
+        listed = urgency == URGENCY_LEVELS.index("immediate")
+        listed[:top] = True
+        listed[np.flatnonzero(urgency == URGENCY_LEVELS.index("urgent"))[:urgent]] = True
+        return order[listed].tolist()
+
+    def risk_report_rows(self, per_level: int) -> List[int]:
+        """The first ``per_level`` rows of each risk level, in risk order."""
+        order = self.order_by_risk()
+        levels = self.risk_level[order]
+        # Risk level falls as the score falls, so levels follow risk order
+        return np.concatenate([
+            order[levels == level][:per_level] for level in range(len(RISK_LEVELS))
+        ]).tolist()
+
+    def risk_counts(self) -> "np.ndarray":
+        """5x5 asset counts indexed by [likelihood - 1, consequence - 1]."""
+        cells = (self.likelihood.astype(np.intp) - 1) * 5 + (self.consequence - 1)
+        return np.bincount(cells, minlength=25).reshape(5, 5)
+
+    def risk_level_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.risk_level, minlength=len(RISK_LEVELS)).tolist()
+        return dict(zip(RISK_LEVELS, counts))
+
+    def health_summary(self) -> Dict[str, int]:
+        """Assets per health band (critical < 20 <= warning < 50 <= degraded < 75 <= healthy)."""
+        bands = np.searchsorted([20.0, 50.0, 75.0], self.health, side="right")
+        counts = np.bincount(bands, minlength=4).tolist()
+        return {"total": len(self), **dict(zip(["critical", "warning", "degraded", "healthy"], counts))}
+
+    def urgency_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.urgency, minlength=len(URGENCY_LEVELS)).tolist()
+        return dict(zip(URGENCY_LEVELS, counts))
+
+    def forecast(self, hours_ahead: Sequence[float]) -> FleetForecast:
+        """
+        Forecast health for every asset at each horizon (exponential decay,
+        reaching 10% health at the end of the RUL).
+        """
+        hours = np.atleast_1d(np.asarray(hours_ahead, dtype=float))
+        health = self.health[:, None]
+        rul = self.rul[:, None]
+        failed = rul <= 0
+
+        safe_rul = np.where(failed, 1.0, rul)
+        lambda_rate = np.where(health > 10, np.log(np.maximum(health, 10) / 10) / safe_rul, 0.001)
+        predicted = np.clip(health * np.exp(-lambda_rate * hours), 0, 100)
+        predicted_rul = np.maximum(0, rul - hours)
+
+        spread = 0.15 * (1 + (hours / 1000) * 0.2)
+        lower = predicted * (1 - spread)
+        upper = predicted * (1 + spread)
+
+        drop = health - predicted
+        trend = np.select([drop > 30, drop > 10], [2, 1], default=0).astype(np.int8)
+        return FleetForecast(
+            hours,
+            np.where(failed, 0.0, predicted),
+            np.where(failed, 0.0, predicted_rul),
+            np.where(failed, 0.0, lower),
+            np.where(failed, 0.0, upper),
+            np.where(failed, 3, trend).astype(np.int8),
+        )
+
+
+def analyze_fleet(twins: Iterable[Mapping], sensor_channels: Sequence[str] = ()) -> FleetAnalysis:
+    """
+    Analyze every equipment twin (twins with a ``healthScore``) in one pass.
+
+    Args:
+        twins: Twin dicts as returned by ``client.twins.list`` (``model_dump``)
+        sensor_channels: Properties to keep as raw ``sensors`` columns, for
+            ``FleetAnalysis.apply_detector``
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("Vectorized fleet analytics requires NumPy: pip install numpy")
+
+    crit_index = {level: k for k, level in enumerate(CRITICALITY_LEVELS)}
+    other_crit = len(CRITICALITY_LEVELS)
+    numeric = list(PROPERTY_DEFAULTS)
+
+    ids: List[str] = []
+    types: List[str] = []
+    names: List[str] = []
+    labels: List[str] = []
+    sites: List[str] = []
+    criticality: List[int] = []
+    columns: List[list] = [[] for _ in numeric]
+    sensor_columns: List[list] = [[] for _ in sensor_channels]
+    stamps: list = []
+
+    for twin in twins:
+        raw = twin.get("properties") or {}
+        props = {_normalize_key(key): value for key, value in raw.items()}
+        if "healthScore" not in props:
+            continue
+
+        equipment_id = twin.get("id")
+        type_val = twin.get("type_uri") or twin.get("type") or ""
+        ids.append(equipment_id)
+        types.append(type_val.split("#")[-1] if type_val else "")
+        names.append(twin.get("name", equipment_id))
+        label = props.get("criticality", DEFAULT_CRITICALITY)
+        labels.append(label)
+        sites.append(props.get("site") or props.get("processUnit") or "")
+        criticality.append(crit_index.get(label, other_crit))
+        for column, name in zip(columns, numeric):
+            column.append(props.get(name))
+        if sensor_channels:
+            for column, name in zip(sensor_columns, sensor_channels):
+                column.append(props.get(name))
+            stamps.append(props.get("lastSimulationUpdate"))
+
+    arrays = {name: _column(column, PROPERTY_DEFAULTS[name]) for column, name in zip(columns, numeric)}
+    fleet = FleetAnalysis(
+        equipment_ids=ids,
+        equipment_types=types,
+        names=names,
+        criticality_labels=labels,
+        sites=sites,
+        criticality=np.asarray(criticality, dtype=np.intp),
+        health=arrays["healthScore"],
+        rul=arrays["remainingUsefulLife"],
+        operating_hours=arrays["operatingHours"],
+        mtbf=arrays["mtbf"],
+        anomaly=np.maximum(arrays["anomalyScore"], arrays["statisticalAnomalyScore"]),
+        severity=arrays["failureModeSeverity"],
+        degradation_rate=arrays["degradationRate"],
+    )
+    fleet.sensors = {name: _column(column, np.nan) for column, name in zip(sensor_columns, sensor_channels)}
+    fleet.sample_stamps = stamps
+    return fleet.evaluate()
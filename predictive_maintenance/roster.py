@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Predictive Maintenance - Shared Twin Roster Cache
+==================================================
+
+One local copy of the ``predictive_maintenance`` twins, shared by the
+simulator, the analyzer and both dashboards instead of each of them
+re-listing the domain:
+
+- Loaded with the paged change-feed query (``common.fetch_twin_changes``),
+  so every twin is included; a single ``twins.list`` page stops at the
+  page size
+- Revalidated with one aggregate query for the roster version
+  (``common.fetch_twin_version``: twin count and latest
+  ``lastSimulationUpdate`` stamp). An unchanged version means the cache is
+  current, like a 304 Not Modified; if only the stamp advanced, just the
+  twins updated since the cached stamp are fetched; if the count changed,
+  the roster is reloaded. Writes can land after newer stamps, so the feed
+  is also polled for ``CHANGE_FEED_LOOKBACK`` seconds after the stamp
+  last advanced
+- Reloaded in full at most every ``max_age`` seconds, which catches
+  membership changes that leave the count unchanged
+- Optionally saved to a JSON snapshot (``snapshot_path``, or the
+  TESSERAI_ROSTER_SNAPSHOT environment variable for ``shared_roster``), so
+  a new process starts from the snapshot and revalidates it instead of
+  loading the whole domain
+
+Twins are dicts shaped like ``twins.list`` results: ``id``, ``type``,
+``name`` and ``properties`` (domain prefixes stripped). They are shared
+by every reader and must not be modified.
+
+Usage:
+    roster = shared_roster(client)
+    roster.refresh()                   # revalidate, fetching changed twins
+    for twin in roster.twins(): ...
+    roster.refresh(properties=False)   # membership only (simulators)
+"""
+
+import sys
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import CHANGE_FEED_LOOKBACK, fetch_twin_changes, fetch_twin_version, logger
+
+DOMAIN = "predictive_maintenance"
+# Stamped by DegradationSimulator on every twin update
+CURSOR_PROPERTY = "lastSimulationUpdate"
+DEFAULT_MAX_AGE = 600.0           # seconds between full reloads
+SNAPSHOT_INTERVAL = 60.0          # seconds between snapshot writes
+ROSTER_SNAPSHOT_ENV = "TESSERAI_ROSTER_SNAPSHOT"
+SNAPSHOT_FORMAT = 1
+
+
+def _local_name(key: str) -> str:
+    return key.split("#", 1)[1] if "#" in key else key
+
+
+class TwinRoster:
+    """
+    Cached twins of one domain, revalidated by version.
+
+    Args:
+        client: The DTaaS client
+        domain: Domain to cache
+        cursor_property: Timestamp property that writers stamp on every update
+        snapshot_path: JSON file to start from and save to (None = memory only)
+        max_age: Seconds after which ``refresh`` reloads the whole roster
+    """
+
+    def __init__(self, client, domain: str = DOMAIN, cursor_property: str = CURSOR_PROPERTY,
+                 snapshot_path: Optional[str] = None, max_age: float = DEFAULT_MAX_AGE):
+        self.client = client
+        self.domain = domain
+        self.cursor_property = cursor_property
+        self.snapshot_path = snapshot_path
+        self.max_age = max_age
+
+        self._twins: Dict[str, Dict] = {}
+        self.cursor: Optional[str] = None
+        self._stamps: Dict[str, str] = {}   # change-feed stamps already applied
+        self._advanced_at = 0.0             # monotonic time the stamp last advanced
+        self.loaded_at: Optional[float] = None   # epoch seconds of the last full load
+        self._saved_at = 0.0
+        self._snapshot_checked = False
+        self._listed = False   # loaded from a twins.list page (no change feed)
+        self._lock = threading.Lock()
+        self._stats = {"reloads": 0, "deltas": 0, "not_modified": 0, "twins_fetched": 0, "errors": 0}
+
+    def __len__(self) -> int:
+        return len(self._twins)
+
+    def __contains__(self, twin_id: str) -> bool:
+        return twin_id in self._twins
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    @property
+    def complete(self) -> bool:
+        """Loaded with every twin of the domain (not the one-page ``twins.list`` fallback)."""
+        return self.loaded and not self._listed
+
+    def twins(self) -> List[Dict]:
+        """Every cached twin (shared dicts; do not modify)."""
+        with self._lock:
+            return list(self._twins.values())
+
+    def get(self, twin_id: str) -> Optional[Dict]:
+        return self._twins.get(twin_id)
+
+    def refresh(self, properties: bool = True) -> bool:
+        """
+        Bring the cache up to date.
+
+        Args:
+            properties: Also fetch twins whose properties changed; with False
+                only membership (the twin count) is checked
+
+        Returns:
+            True if twins were added, removed or updated
+        """
+        with self._lock:
+            if not self._snapshot_checked:
+                self._snapshot_checked = True
+                self._load_snapshot()
+            if not self.loaded or time.time() - self.loaded_at > self.max_age:
+                return self._reload()
+
+            version = fetch_twin_version(self.client, self.domain, self.cursor_property)
+            if version is None:
+                self._stats["errors"] += 1
+                if self._listed and properties:
+                    return self._reload()  # nothing to revalidate against; re-list as before
+                return False  # keep serving the cache
+            count, latest = version
+            if count != len(self._twins):
+                return self._reload()
+            settled = time.monotonic() - self._advanced_at > CHANGE_FEED_LOOKBACK
+            if not properties or latest is None or (
+                    self.cursor is not None and latest <= self.cursor and settled):
+                self._stats["not_modified"] += 1
+                return False
+            return self._apply_changes()
+
+    def invalidate(self) -> None:
+        """Force a full reload on the next refresh."""
+        self.loaded_at = None
+
+    # -------------------------------------------------------------------------
+    # Loading
+    # -------------------------------------------------------------------------
+
+    def _reload(self) -> bool:
+        """Replace the cache with every twin in the domain."""
+        changes = fetch_twin_changes(self.client, self.domain, since=None,
+                                     cursor_property=self.cursor_property)
+        if changes is not None:
+            twins = {}
+            for twin_id, props in changes.properties.items():
+                twins[twin_id] = {
+                    "id": twin_id,
+                    "type": changes.types.get(twin_id, ""),
+                    "name": props.get("label", twin_id),
+                    "properties": props,
+                }
+            cursor, stamps = changes.cursor, changes.stamps
+            self._listed = False
+            self._stats["twins_fetched"] += len(twins)
+        else:
+            # No query endpoint: fall back to one twins.list page, as before
+            logger.warning("Change feed unavailable, listing one page of twins")
+            try:
+                listed = self.client.twins.list(domain=self.domain)
+            except Exception as e:
+                logger.error(f"Failed to list twins: {e}")
+                self._stats["errors"] += 1
+                return False
+            twins, cursor, stamps = {}, None, {}
+            for twin in listed:
+                twin_dict = twin.model_dump() if hasattr(twin, 'model_dump') else twin
+                props = {_local_name(k): v for k, v in (twin_dict.get("properties") or {}).items()}
+                twin_id = twin_dict["id"]
+                twins[twin_id] = {
+                    "id": twin_id,
+                    "type": twin_dict.get("type_uri") or twin_dict.get("type") or "",
+                    "name": twin_dict.get("name", twin_id),
+                    "properties": props,
+                }
+                stamp = props.get(self.cursor_property)
+                if isinstance(stamp, str) and (cursor is None or stamp > cursor):
+                    cursor = stamp
+            self._listed = True
+
+        self._twins, self.cursor, self._stamps = twins, cursor, stamps
+        self.loaded_at = time.time()
+        self._advanced_at = time.monotonic()
+        self._stats["reloads"] += 1
+        logger.info(f"Roster: loaded {len(twins)} {self.domain} twins")
+        self._save_snapshot(force=True)
+        return True
+
+    def _apply_changes(self) -> bool:
+        """Merge twins updated since the cursor (and within the feed's lookback)."""
+        # With no stamp cached yet, every stamped twin is new ("" sorts first)
+        changes = fetch_twin_changes(self.client, self.domain, since=self.cursor or "",
+                                     cursor_property=self.cursor_property, seen=self._stamps)
+        if changes is None:
+            self._stats["errors"] += 1
+            return False
+        for twin_id, props in changes.properties.items():
+            twin = self._twins.get(twin_id)
+            if twin is None:
+                self._twins[twin_id] = {
+                    "id": twin_id,
+                    "type": changes.types.get(twin_id, ""),
+                    "name": props.get("label", twin_id),
+                    "properties": props,
+                }
+            else:
+                twin["properties"].update(props)
+        if changes.cursor != self.cursor:
+            self._advanced_at = time.monotonic()
+        self.cursor, self._stamps = changes.cursor, changes.stamps
+        self._stats["deltas"] += 1
+        self._stats["twins_fetched"] += len(changes.properties)
+        self._save_snapshot()
+        return bool(changes.properties)
+
+    # -------------------------------------------------------------------------
+    # Snapshot
+    # -------------------------------------------------------------------------
+
+    def _load_snapshot(self) -> None:
+        path = self.snapshot_path
+        if not path or not os.path.exists(path):
+            return
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring roster snapshot {path}: {e}")
+            return
+        if data.get("format") != SNAPSHOT_FORMAT or data.get("domain") != self.domain:
+            return
+        self._twins = data.get("twins", {})
+        self.cursor = data.get("cursor")
+        self.loaded_at = data.get("loaded_at")
+        self._saved_at = time.time()
+        self._advanced_at = time.monotonic()   # writes may have landed since the save
+        logger.info(f"Roster: {len(self._twins)} twins from snapshot {path}")
+
+    def _save_snapshot(self, force: bool = False) -> None:
+        path = self.snapshot_path
+        if not path or (not force and time.time() - self._saved_at < SNAPSHOT_INTERVAL):
+            return
+        data = {
+            "format": SNAPSHOT_FORMAT,
+            "domain": self.domain,
+            "cursor": self.cursor,
+            "loaded_at": self.loaded_at,
+            "twins": self._twins,
+        }
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, default=str)
+            os.replace(tmp_path, path)
+            self._saved_at = time.time()
+        except OSError as e:
+            logger.warning(f"Could not save roster snapshot {path}: {e}")
+
+    def save(self) -> None:
+        """Write the snapshot now (no-op without ``snapshot_path``)."""
+        with self._lock:
+            self._save_snapshot(force=True)
+
+    def stats(self) -> dict:
+        """Counters: reloads, deltas, not_modified, twins_fetched, errors, twins."""
+        return {**self._stats, "twins": len(self._twins), "cursor": self.cursor}
+
+
+_shared: Dict[Tuple[int, str], TwinRoster] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_roster(client, domain: str = DOMAIN) -> TwinRoster:
+    """
+    The process-wide roster of a domain for this client, created on first use.
+
+    The snapshot path comes from the TESSERAI_ROSTER_SNAPSHOT environment
+    variable (unset = memory only).
+    """
+    key = (id(client), domain)
+    with _shared_lock:
+        roster = _shared.get(key)
+        if roster is None:
+            roster = _shared[key] = TwinRoster(
+                client, domain, snapshot_path=os.environ.get(ROSTER_SNAPSHOT_ENV) or None,
+            )
+        return roster
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Predictive Maintenance - Capacity-Aware Maintenance Scheduler
+==============================================================
+
+Plans maintenance jobs over a horizon of days with limited crew hours:
+
+- Each job has a site, a duration in crew hours, a window of days
+  [release, due] (due is the last day before the predicted failure minus
+  the lead time) and a priority (risk)
+- Crew hours are limited per day across all sites and per site per day
+- Greedy pass: days are swept in order; released jobs wait in one heap
+  per site ordered by due day, then priority, and sites are served in
+  order of their most urgent job (earliest deadline first)
+- Local search: late and unscheduled jobs, highest priority first, are
+  moved to earlier days with spare hours, or swapped with lower-priority
+  jobs, as long as the priority-weighted lateness goes down. A per-site
+  skip index (union-find over days) jumps over days with no hours left
+
+The cost of a plan is the sum of priority x days late; jobs that do not
+fit in the horizon are returned as unscheduled.
+
+Usage:
+    scheduler = MaintenanceScheduler(horizon_days=90, daily_hours=80,
+                                     site_hours={"unit-utilities": 16})
+    plan = scheduler.schedule(jobs)
+    for job, day in plan.assignments(): ...
+"""
+
+import heapq
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_DAILY_HOURS = 40.0        # e.g. five technicians on 8-hour shifts
+DEFAULT_SEARCH_SECONDS = 1.0
+
+
+@dataclass
+class MaintenanceJob:
+    """A maintenance job to place on one day of the horizon."""
+    equipment_id: str
+    site: str
+    duration_hours: float
+    release_day: int  # first allowed day (0 = today)
+    due_day: int      # last day before it is late
+    priority: float   # weight of each day late
+
+
+@dataclass
+class SchedulePlan:
+    """Result of MaintenanceScheduler.schedule."""
+    jobs: List[MaintenanceJob]
+    days: Dict[int, int]            # job index -> day
+    unscheduled: List[int]          # job indexes that did not fit
+    daily_used: List[float]
+    site_used: Dict[str, List[float]]
+    stats: Dict[str, float] = field(default_factory=dict)
+
+    def assignments(self) -> List[Tuple[MaintenanceJob, int]]:
+        """(job, day) pairs, by day."""
+        return sorted(((self.jobs[i], day) for i, day in self.days.items()), key=lambda x: x[1])
+
+    def lateness(self, i: int) -> int:
+        return max(0, self.days[i] - self.jobs[i].due_day)
+
+    def cost(self) -> float:
+        return sum(self.jobs[i].priority * self.lateness(i) for i in self.days)
+
+
+class DaySkipIndex:
+    """
+    Next day at or after ``d`` that is not marked full, with path
+    compression (union-find over days), so full days are skipped in
+    near-constant time.
+    """
+
+    def __init__(self, days: int):
+        self.parent = list(range(days + 1))  # days = sentinel "none"
+
+    def find(self, d: int) -> int:
+        parent = self.parent
+        root = d
+        while parent[root] != root:
+            root = parent[root]
+        while parent[d] != root:
+            parent[d], d = root, parent[d]
+        return root
+
+    def mark_full(self, d: int) -> None:
+        self.parent[d] = d + 1
+
+
+class MaintenanceScheduler:
+    """
+    Greedy earliest-deadline-first scheduling under crew capacity, then
+    local search on priority-weighted lateness.
+
+    Args:
+        horizon_days: Days to plan (day 0 is today)
+        daily_hours: Crew hours per day across all sites
+        site_hours: Crew hours per day for specific sites
+        default_site_hours: Crew hours per day for other sites (None = only
+            the daily limit applies)
+        search_seconds: Time budget for the local search
+    """
+
+    def __init__(self, horizon_days: int, daily_hours: float = DEFAULT_DAILY_HOURS,
+                 site_hours: Optional[Dict[str, float]] = None,
+                 default_site_hours: Optional[float] = None,
+                 search_seconds: float = DEFAULT_SEARCH_SECONDS):
+        self.horizon_days = max(1, horizon_days)
+        self.daily_hours = daily_hours
+        self.site_hours = dict(site_hours or {})
+        self.default_site_hours = default_site_hours
+        self.search_seconds = search_seconds
+
+    def site_capacity(self, site: str) -> float:
+        hours = self.site_hours.get(site, self.default_site_hours)
+        return self.daily_hours if hours is None else hours
+
+    def schedule(self, jobs: Iterable[MaintenanceJob]) -> SchedulePlan:
+        started = time.perf_counter()
+        plan = self._greedy(list(jobs))
+        greedy_cost = plan.cost()
+        moves = self._improve(plan)
+        plan.stats = {
+            "jobs": len(plan.jobs),
+            "scheduled": len(plan.days),
+            "unscheduled": len(plan.unscheduled),
+            "late": sum(1 for i in plan.days if plan.lateness(i) > 0),
+            "greedy_cost": greedy_cost,
+            "cost": plan.cost(),
+            "moves": moves,
+            "utilization": sum(plan.daily_used) / (self.daily_hours * self.horizon_days)
+            if self.daily_hours > 0 else 0.0,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        return plan
+
+    # -------------------------------------------------------------------------
+    # Greedy pass
+    # -------------------------------------------------------------------------
+
+    def _greedy(self, jobs: List[MaintenanceJob]) -> SchedulePlan:
+        horizon = self.horizon_days
+        daily_used = [0.0] * horizon
+        site_used: Dict[str, List[float]] = defaultdict(lambda: [0.0] * horizon)
+        days: Dict[int, int] = {}
+        unscheduled: List[int] = []
+
+        # Jobs by release day; jobs released after the horizon or longer
+        # than a day's capacity never fit
+        releases: Dict[int, List[int]] = defaultdict(list)
+        for i, job in enumerate(jobs):
+            if (job.release_day >= horizon
+                    or job.duration_hours > min(self.daily_hours, self.site_capacity(job.site))):
+                unscheduled.append(i)
+            else:
+                releases[max(job.release_day, 0)].append(i)
+
+        waiting: Dict[str, list] = defaultdict(list)  # site -> heap of (due, -priority, i)
+        for day in range(horizon):
+            for i in releases.get(day, ()):
+                job = jobs[i]
+                heapq.heappush(waiting[job.site], (job.due_day, -job.priority, i))
+
+            # Serve sites in order of their most urgent waiting job
+            sites = [(heap[0], site) for site, heap in waiting.items() if heap]
+            heapq.heapify(sites)
+            while sites and daily_used[day] < self.daily_hours:
+                _, site = heapq.heappop(sites)
+                heap = waiting[site]
+                capacity = self.site_capacity(site)
+                used = site_used[site]
+                job = jobs[heap[0][2]]
+                if (used[day] + job.duration_hours > capacity
+                        or daily_used[day] + job.duration_hours > self.daily_hours):
+                    continue  # this site waits for tomorrow
+                i = heapq.heappop(heap)[2]
+                days[i] = day
+                used[day] += job.duration_hours
+                daily_used[day] += job.duration_hours
+                if heap:
+                    heapq.heappush(sites, (heap[0], site))
+
+        for heap in waiting.values():
+            unscheduled.extend(i for _, _, i in heap)
+        return SchedulePlan(jobs, days, unscheduled, daily_used, dict(site_used))
+
+    # -------------------------------------------------------------------------
+    # Local search
+    # -------------------------------------------------------------------------
+
+    def _fits(self, plan: SchedulePlan, site: str, day: int, extra: float) -> bool:
+        return (plan.daily_used[day] + extra <= self.daily_hours + 1e-9
+                and plan.site_used[site][day] + extra <= self.site_capacity(site) + 1e-9)
+
+    def _place(self, plan: SchedulePlan, i: int, day: Optional[int]) -> None:
+        job = plan.jobs[i]
+        old = plan.days.get(i)
+        if old is not None:
+            plan.daily_used[old] -= job.duration_hours
+            plan.site_used[job.site][old] -= job.duration_hours
+        if day is None:
+            plan.days.pop(i, None)
+            return
+        plan.days[i] = day
+        plan.daily_used[day] += job.duration_hours
+        plan.site_used.setdefault(job.site, [0.0] * self.horizon_days)[day] += job.duration_hours
+
+    def _improve(self, plan: SchedulePlan) -> int:
+        """Move or swap late (and unscheduled) jobs earlier; returns moves made."""
+        deadline = time.perf_counter() + self.search_seconds
+        jobs = plan.jobs
+        on_day: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+        for i, day in plan.days.items():
+            on_day[(jobs[i].site, day)].append(i)
+
+        # Per-site skip index over days with no site hours left
+        skip: Dict[str, DaySkipIndex] = {}
+        for site, used in plan.site_used.items():
+            index = skip[site] = DaySkipIndex(self.horizon_days)
+            capacity = self.site_capacity(site)
+            for day, hours in enumerate(used):
+                if hours >= capacity - 1e-9:
+                    index.mark_full(day)
+
+        candidates = [i for i in plan.days if plan.lateness(i) > 0]
+        candidates += [i for i in plan.unscheduled if jobs[i].duration_hours <= min(
+            self.daily_hours, self.site_capacity(jobs[i].site))]
+        candidates.sort(key=lambda i: -jobs[i].priority)
+        moves = 0
+        for i in candidates:
+            if time.perf_counter() > deadline:
+                break
+            job = jobs[i]
+            current = plan.days.get(i, self.horizon_days)
+            index = skip.get(job.site)
+            first = min(max(job.release_day, 0), self.horizon_days)
+            day = index.find(first) if index else first
+            while day < current:
+                # Spare hours on an earlier day
+                if self._fits(plan, job.site, day, job.duration_hours):
+                    self._move(plan, on_day, i, day)
+                    moves += 1
+                    break
+                # Swap with a lower-priority job that may take our current day
+                if current < self.horizon_days and self._swap(plan, on_day, i, day, current):
+                    moves += 1
+                    break
+                day = index.find(day + 1) if index else day + 1
+
+            # Days only become full here; days freed by a swap stay skipped
+            if index:
+                for d in (plan.days.get(i), current):
+                    if d is not None and d < self.horizon_days and \
+                            plan.site_used[job.site][d] >= self.site_capacity(job.site) - 1e-9:
+                        index.mark_full(d)
+
+        plan.unscheduled = [i for i in plan.unscheduled if i not in plan.days]
+        return moves
+
+    def _move(self, plan, on_day, i: int, day: int) -> None:
+        job = plan.jobs[i]
+        old = plan.days.get(i)
+        if old is not None:
+            on_day[(job.site, old)].remove(i)
+        self._place(plan, i, day)
+        on_day[(job.site, day)].append(i)
+
+    def _swap(self, plan, on_day, i: int, day: int, current: int) -> bool:
+        jobs = plan.jobs
+        job = jobs[i]
+        cost_i = job.priority * (max(0, current - job.due_day) - max(0, day - job.due_day))
+        for k in on_day[(job.site, day)]:
+            other = jobs[k]
+            if other.priority >= job.priority or other.release_day > current:
+                continue
+            gain = cost_i - other.priority * (max(0, current - other.due_day) - max(0, day - other.due_day))
+            if gain <= 0:
+                continue
+            delta = job.duration_hours - other.duration_hours
+            if not (self._fits(plan, job.site, day, delta) and self._fits(plan, job.site, current, -delta)):
+                continue
+            self._move(plan, on_day, k, current)
+            self._move(plan, on_day, i, day)
+            return True
+        return False
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Predictive Maintenance - Columnar Sensor History
+=================================================
+
+Fixed-size sensor history per asset, stored column by column:
+
+- One float32 array per channel (health, vibration, ...) and one float64
+  array of epoch timestamps, allocated up front, so memory per asset is
+  known when the asset is added (see ``SensorHistory.nbytes``)
+- Three resolutions: raw readings, 1-minute means and 1-hour means. The
+  downsampled tiers are filled as readings arrive and cover much longer
+  spans than the raw ring in the same space
+- Ring buffers are mirrored (each value is written twice, ``capacity``
+  apart), so the latest ``n`` points of any channel are one contiguous
+  slice; ``series`` and ``times`` return memoryviews without copying
+
+Usage:
+    history = SensorHistoryStore(("healthScore", "currentVibration"))
+    history.append(equipment_id, {"healthScore": 82.5, "currentVibration": 2.9})
+    view = history.get(equipment_id).series("healthScore", "1m", count=60)
+    points = history.sparkline(equipment_id, "healthScore", 30)
+"""
+
+import time
+from array import array
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_RAW_SIZE = 1000
+# (resolution name, bucket seconds, buckets kept)
+DEFAULT_TIERS: Tuple[Tuple[str, int, int], ...] = (
+    ("1m", 60, 1440),   # one day
+    ("1h", 3600, 720),  # 30 days
+)
+RAW = "raw"
+
+
+class RingSeries:
+    """
+    Mirrored ring buffer of timestamped readings, one column per channel.
+
+    Every value is stored at ``i`` and ``i + capacity``, so the last ``n``
+    entries always sit in one contiguous range.
+    """
+
+    def __init__(self, capacity: int, channels: int):
+        self.capacity = max(1, capacity)
+        self.times = array("d", bytes(16 * self.capacity))
+        self.columns = [array("f", bytes(8 * self.capacity)) for _ in range(channels)]
+        self.head = 0  # next write slot
+        self.size = 0
+
+    def append(self, timestamp: float, values: Sequence[float]) -> None:
+        i, j = self.head, self.head + self.capacity
+        self.times[i] = self.times[j] = timestamp
+        for column, value in zip(self.columns, values):
+            column[i] = column[j] = value
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def _span(self, count: Optional[int]) -> Tuple[int, int]:
+        n = self.size if count is None else max(0, min(count, self.size))
+        end = self.head + self.capacity
+        return end - n, end
+
+    def times_view(self, count: Optional[int] = None) -> memoryview:
+        start, end = self._span(count)
+        return memoryview(self.times)[start:end]
+
+    def column_view(self, channel: int, count: Optional[int] = None) -> memoryview:
+        start, end = self._span(count)
+        return memoryview(self.columns[channel])[start:end]
+
+    def last(self, channel: int) -> Optional[float]:
+        if self.size == 0:
+            return None
+        return self.columns[channel][self.head + self.capacity - 1]
+
+    @property
+    def nbytes(self) -> int:
+        return (self.times.itemsize * len(self.times)
+                + sum(column.itemsize * len(column) for column in self.columns))
+
+
+class DownsampledSeries(RingSeries):
+    """Ring of per-bucket means; readings accumulate until their bucket closes."""
+
+    def __init__(self, capacity: int, channels: int, bucket_seconds: int):
+        super().__init__(capacity, channels)
+        self.bucket_seconds = bucket_seconds
+        self.bucket_start: Optional[float] = None
+        self.sums = [0.0] * channels
+        self.count = 0
+
+    def add(self, timestamp: float, values: Sequence[float]) -> None:
+        bucket = timestamp - timestamp % self.bucket_seconds
+        if bucket != self.bucket_start:
+            self.close_bucket()
+            self.bucket_start = bucket
+        sums = self.sums
+        for k, value in enumerate(values):
+            sums[k] += value
+        self.count += 1
+
+    def close_bucket(self) -> None:
+        if self.count:
+            self.append(self.bucket_start, [s / self.count for s in self.sums])
+            self.sums = [0.0] * len(self.sums)
+            self.count = 0
+
+
+class SensorHistory:
+    """
+    Raw and downsampled history of one asset.
+
+    Args:
+        channels: Channel names, in column order
+        raw_size: Raw readings kept
+        tiers: (resolution, bucket seconds, buckets kept) per downsampled tier
+    """
+
+    def __init__(self, channels: Sequence[str], raw_size: int = DEFAULT_RAW_SIZE,
+                 tiers: Iterable[Tuple[str, int, int]] = DEFAULT_TIERS):
+        self.channels: Dict[str, int] = {name: k for k, name in enumerate(channels)}
+        self.raw = RingSeries(raw_size, len(self.channels))
+        self.tiers: Dict[str, DownsampledSeries] = {
+            name: DownsampledSeries(size, len(self.channels), seconds)
+            for name, seconds, size in tiers
+        }
+
+    def append(self, values: Mapping[str, float], timestamp: Optional[float] = None) -> None:
+        """Record one reading; channels missing from ``values`` repeat their last value."""
+        timestamp = time.time() if timestamp is None else timestamp
+        row = []
+        for name, k in self.channels.items():
+            value = values.get(name)
+            if value is None:
+                value = self.raw.last(k) or 0.0
+            row.append(float(value))
+        self.raw.append(timestamp, row)
+        for tier in self.tiers.values():
+            tier.add(timestamp, row)
+
+    def _series(self, resolution: str) -> RingSeries:
+        if resolution == RAW:
+            return self.raw
+        try:
+            return self.tiers[resolution]
+        except KeyError:
+            raise ValueError(f"Unknown resolution: {resolution}") from None
+
+    def series(self, channel: str, resolution: str = RAW, count: Optional[int] = None) -> memoryview:
+        """Latest ``count`` values of a channel (all if None), oldest first, without copying."""
+        return self._series(resolution).column_view(self.channels[channel], count)
+
+    def times(self, resolution: str = RAW, count: Optional[int] = None) -> memoryview:
+        """Epoch timestamps matching ``series`` (bucket starts for downsampled tiers)."""
+        return self._series(resolution).times_view(count)
+
+    def __len__(self) -> int:
+        return self.raw.size
+
+    @property
+    def nbytes(self) -> int:
+        return self.raw.nbytes + sum(tier.nbytes for tier in self.tiers.values())
+
+
+class SensorHistoryStore:
+    """
+    Sensor histories for a fleet, created on first append.
+
+    Args:
+        channels: Channel names recorded for every asset
+        raw_size: Raw readings kept per asset
+        tiers: Downsampled tiers per asset (see DEFAULT_TIERS)
+    """
+
+    def __init__(self, channels: Sequence[str], raw_size: int = DEFAULT_RAW_SIZE,
+                 tiers: Iterable[Tuple[str, int, int]] = DEFAULT_TIERS):
+        self.channels = tuple(channels)
+        self.raw_size = raw_size
+        self.tiers = tuple(tiers)
+        self.assets: Dict[str, SensorHistory] = {}
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    def __contains__(self, asset_id: str) -> bool:
+        return asset_id in self.assets
+
+    def get(self, asset_id: str) -> Optional[SensorHistory]:
+        return self.assets.get(asset_id)
+
+    def append(self, asset_id: str, values: Mapping[str, float],
+               timestamp: Optional[float] = None) -> None:
+        history = self.assets.get(asset_id)
+        if history is None:
+            history = self.assets[asset_id] = SensorHistory(self.channels, self.raw_size, self.tiers)
+        history.append(values, timestamp)
+
+    def sparkline(self, asset_id: str, channel: str, points: int,
+                  resolution: str = RAW) -> List[float]:
+        """The last ``points`` values of a channel as a list (for JSON payloads)."""
+        history = self.assets.get(asset_id)
+        if history is None:
+            return []
+        return [round(v, 2) for v in history.series(channel, resolution, points)]
+
+    def discard(self, asset_id: str) -> None:
+        self.assets.pop(asset_id, None)
+
+    def bytes_per_asset(self) -> int:
+        """Memory of one asset's history (fixed at creation)."""
+        return SensorHistory(self.channels, self.raw_size, self.tiers).nbytes
+
+    @property
+    def nbytes(self) -> int:
+        return sum(history.nbytes for history in self.assets.values())
@@ -11,11 +11,23 @@ Simulates realistic equipment degradation with:
 - Failure events with cascading effects
 
 The simulation updates equipment health scores, sensor readings, and
-remaining useful life estimates in real-time.
+remaining useful life estimates in real-time. With ``--vectorized`` the
+whole fleet is simulated per tick with NumPy (see fleet_engine.py) and twin
+writes go through a write-behind buffer.
+
+The equipment list comes from the shared twin roster (see roster.py), which
+each tick only revalidates (one aggregate query) instead of re-listing the
+domain.
+
+When NumPy is available, vibration and temperature readings are also
+scored by streaming statistical detectors (EWMA, CUSUM, rolling z-score,
+seasonal baseline; see anomaly_detectors.py) and written as
+``statisticalAnomalyScore``, next to the threshold-based ``anomalyScore``.
 
 Usage:
     python simulation.py [--base-url URL] [--interval SECONDS] [--duration MINUTES]
     python simulation.py --accelerated  # Run 100x faster for demo
+    python simulation.py --vectorized   # NumPy fleet engine for large fleets
 """
 
 import sys
@@ -28,11 +40,16 @@ import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-from collections import deque
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from common import get_client, logger
+from common import get_client, logger, TwinWriteBuffer
+from predictive_maintenance.fleet_engine import FleetDegradationEngine
+from predictive_maintenance.roster import shared_roster
+from predictive_maintenance.anomaly_detectors import (
+    NUMPY_AVAILABLE as DETECTORS_AVAILABLE, StreamingAnomalyDetector,
+)
+from predictive_maintenance.sensor_history import SensorHistoryStore
 
 
 # =============================================================================
@@ -56,6 +73,28 @@ WEIBULL_PARAMS = {
     "IndustrialCompressor": WeibullParameters(shape=2.8, scale=18000, location=2500),
     "HeatExchanger": WeibullParameters(shape=1.8, scale=30000, location=5000),
 }
+DEFAULT_WEIBULL_PARAMS = WeibullParameters(2.0, 15000, 2000)
+
+FAILURE_MODES = {
+    "IndustrialPump": ["seal_failure", "impeller_damage", "bearing_seizure", "cavitation"],
+    "ElectricMotor": ["winding_burnout", "bearing_failure", "shaft_fracture"],
+    "RollingElementBearing": ["spalling", "cage_failure", "seizure"],
+    "Gearbox": ["tooth_breakage", "shaft_failure", "oil_starvation"],
+    "IndustrialCompressor": ["valve_failure", "piston_seizure", "bearing_failure"],
+    "HeatExchanger": ["tube_leak", "gasket_blowout", "severe_fouling"],
+}
+
+HISTORY_CHANNELS = ("health_score", "vibration", "temperature", "rul")
+# Readings scored by the streaming detectors (the fleet engine uses this order)
+DETECTOR_CHANNELS = ("vibration", "temperature")
+
+
+def equipment_type_of(twin_dict: Dict) -> Optional[str]:
+    """Simulated equipment type of a twin (local name of its type), or None."""
+    # SDK model uses 'type_uri' not 'type'
+    type_val = twin_dict.get("type_uri") or twin_dict.get("type") or ""
+    local_name = type_val.rsplit("#", 1)[-1].rsplit("/", 1)[-1].rsplit(":", 1)[-1]
+    return local_name if local_name in WEIBULL_PARAMS else None
 
 
 @dataclass
@@ -72,6 +111,7 @@ class DegradationState:
     failure_probability: float  # P(failure in next interval)
     anomaly_score: float  # 0-1 scale
     last_update: datetime
+    statistical_anomaly: float = 0.0  # 0-1, streaming detectors
 
 
 class DegradationSimulator:
@@ -79,13 +119,29 @@ class DegradationSimulator:
     Physics-based degradation simulator using Weibull reliability models.
     """
 
-    def __init__(self, client, time_acceleration: float = 1.0):
+    def __init__(self, client, time_acceleration: float = 1.0, vectorized: bool = False,
+                 seed: Optional[int] = None):
         self.client = client
         self.time_acceleration = time_acceleration
         self.states: Dict[str, DegradationState] = {}
-        self.history: Dict[str, deque] = {}
+        self.history = SensorHistoryStore(HISTORY_CHANNELS, raw_size=1000)
         self.failures: List[Dict] = []
         self.running = False
+        self.roster = shared_roster(client)
+        # Streaming detectors on vibration and temperature (None without NumPy)
+        self.detector: Optional[StreamingAnomalyDetector] = (
+            StreamingAnomalyDetector(DETECTOR_CHANNELS) if DETECTORS_AVAILABLE else None
+        )
+
+        # With vectorized=True, state lives in the fleet engine (not in
+        # self.states) and writes are buffered
+        self.engine: Optional[FleetDegradationEngine] = None
+        self.write_buffer: Optional[TwinWriteBuffer] = None
+        self.tick_count = 0
+        if vectorized:
+            self.engine = FleetDegradationEngine(WEIBULL_PARAMS, DEFAULT_WEIBULL_PARAMS, seed=seed,
+                                                 detector=self.detector)
+            self.write_buffer = TwinWriteBuffer(client)
 
         # Sensor noise parameters
         self.vibration_noise_std = 0.3
@@ -190,30 +246,25 @@ class DegradationSimulator:
         """
         # Random failure check based on hazard rate
         if random.random() < state.failure_probability:
-            failure_modes = {
-                "IndustrialPump": ["seal_failure", "impeller_damage", "bearing_seizure", "cavitation"],
-                "ElectricMotor": ["winding_burnout", "bearing_failure", "shaft_fracture"],
-                "RollingElementBearing": ["spalling", "cage_failure", "seizure"],
-                "Gearbox": ["tooth_breakage", "shaft_failure", "oil_starvation"],
-                "IndustrialCompressor": ["valve_failure", "piston_seizure", "bearing_failure"],
-                "HeatExchanger": ["tube_leak", "gasket_blowout", "severe_fouling"],
-            }
-
-            modes = failure_modes.get(state.equipment_type, ["general_failure"])
-            failure_mode = random.choice(modes)
-
-            return {
-                "equipment_id": state.equipment_id,
-                "equipment_type": state.equipment_type,
-                "failure_mode": failure_mode,
-                "timestamp": datetime.now().isoformat(),
-                "health_at_failure": state.health_score,
-                "operating_hours": state.operating_hours,
-                "severity": random.choice(["minor", "moderate", "major", "critical"]),
-            }
+            return self.failure_event(state.equipment_id, state.equipment_type,
+                                      state.health_score, state.operating_hours)
 
         return None
 
+    def failure_event(self, equipment_id: str, equipment_type: str,
+                      health_score: float, operating_hours: float) -> Dict:
+        """Failure details with a random failure mode for the equipment type."""
+        modes = FAILURE_MODES.get(equipment_type, ["general_failure"])
+        return {
+            "equipment_id": equipment_id,
+            "equipment_type": equipment_type,
+            "failure_mode": random.choice(modes),
+            "timestamp": datetime.now().isoformat(),
+            "health_at_failure": health_score,
+            "operating_hours": operating_hours,
+            "severity": random.choice(["minor", "moderate", "major", "critical"]),
+        }
+
     def update_equipment_state(self, equipment_id: str, equipment_type: str,
                                current_props: Dict, delta_hours: float) -> DegradationState:
         """
@@ -234,7 +285,6 @@ class DegradationSimulator:
                 anomaly_score=0.0,
                 last_update=datetime.now()
             )
-            self.history[equipment_id] = deque(maxlen=1000)
 
         state = self.states[equipment_id]
 
@@ -242,7 +292,7 @@ class DegradationSimulator:
         state.operating_hours += delta_hours
 
         # Get Weibull parameters
-        params = WEIBULL_PARAMS.get(equipment_type, WeibullParameters(2.0, 15000, 2000))
+        params = WEIBULL_PARAMS.get(equipment_type, DEFAULT_WEIBULL_PARAMS)
 
         # Calculate reliability and hazard rate
         reliability = self.weibull_reliability(state.operating_hours, params)
@@ -272,6 +322,15 @@ class DegradationSimulator:
             vib_threshold, temp_threshold
         )
 
+        # Statistical anomaly score against the asset's own recent behavior;
+        # operating hours are the detector clock (simulated time)
+        if self.detector is not None:
+            state.statistical_anomaly = self.detector.update_one(
+                equipment_id,
+                {"vibration": state.vibration_level, "temperature": state.temperature},
+                state.operating_hours * 3600.0,
+            )
+
         # Update health score
         state.health_score = self.calculate_health_score(reliability, state.anomaly_score)
 
@@ -289,13 +348,12 @@ class DegradationSimulator:
         state.last_update = datetime.now()
 
         # Store in history
-        self.history[equipment_id].append({
-            "timestamp": state.last_update.isoformat(),
+        self.history.append(equipment_id, {
             "health_score": state.health_score,
             "vibration": state.vibration_level,
             "temperature": state.temperature,
             "rul": state.remaining_useful_life,
-        })
+        }, state.last_update.timestamp())
 
         return state
 
@@ -304,6 +362,9 @@ class DegradationSimulator:
         Apply maintenance effect to equipment.
         Returns True if maintenance was successful.
         """
+        if self.engine is not None:
+            return self._apply_fleet_maintenance(equipment_id, maintenance_type)
+
         if equipment_id not in self.states:
             return False
 
@@ -330,36 +391,45 @@ class DegradationSimulator:
                    f"new health: {state.health_score:.1f}")
         return True
 
+    def _apply_fleet_maintenance(self, equipment_id: str, maintenance_type: str) -> bool:
+        """apply_maintenance for assets simulated by the fleet engine."""
+        if equipment_id not in self.engine:
+            return False
+
+        state = self.engine.state(equipment_id)
+        health, anomaly = state["health_score"], state["anomaly_score"]
+        if maintenance_type == "preventive":
+            health, anomaly = min(100, health + random.uniform(20, 40)), anomaly * 0.5
+        elif maintenance_type == "corrective":
+            health, anomaly = random.uniform(85, 95), random.uniform(0, 0.1)
+        elif maintenance_type == "predictive":
+            health, anomaly = min(100, health + random.uniform(30, 50)), anomaly * 0.3
+        self.engine.set_condition(equipment_id, health, anomaly)
+
+        logger.info(f"Maintenance applied to {equipment_id}: {maintenance_type}, "
+                   f"new health: {health:.1f}")
+        return True
+
     def run_simulation_tick(self, delta_hours: float = 1.0) -> Dict:
         """
         Run one simulation tick, updating all equipment.
         Returns summary of updates.
         """
+        if self.engine is not None:
+            return self._run_fleet_tick(delta_hours)
+
         updates = []
         new_failures = []
 
-        # Get all equipment twins
-        try:
-            all_twins = self.client.twins.list(domain="predictive_maintenance")
-        except Exception as e:
-            logger.error(f"Failed to list twins: {e}")
+        # Get all equipment twins; the properties are those the roster
+        # loaded, so readings are simulated from each asset's baseline
+        self.roster.refresh(properties=False)
+        if not self.roster.loaded:
             return {"updates": 0, "failures": 0}
 
-        equipment_types = ["IndustrialPump", "ElectricMotor", "RollingElementBearing",
-                          "Gearbox", "IndustrialCompressor", "HeatExchanger"]
-
-        for twin in all_twins:
-            twin_dict = twin.model_dump() if hasattr(twin, 'model_dump') else twin
-
+        for twin_dict in self.roster.twins():
             # Check if this is equipment we simulate
-            # SDK model uses 'type_uri' not 'type'
-            twin_type = twin_dict.get("type_uri") or twin_dict.get("type") or ""
-            equipment_type = None
-            for et in equipment_types:
-                if et in twin_type:
-                    equipment_type = et
-                    break
-
+            equipment_type = equipment_type_of(twin_dict)
             if not equipment_type:
                 continue
 
@@ -390,6 +460,8 @@ class DegradationSimulator:
                     "failureProbability": round(state.failure_probability, 6),
                     "lastSimulationUpdate": datetime.now().isoformat(),
                 }
+                if self.detector is not None:
+                    update_props["statisticalAnomalyScore"] = round(state.statistical_anomaly, 3)
 
                 if failure:
                     update_props["status"] = "failed"
@@ -408,43 +480,139 @@ class DegradationSimulator:
             "failure_details": new_failures,
         }
 
+    def refresh_roster(self) -> int:
+        """
+        Sync the fleet engine with the roster: add new equipment twins and
+        drop assets whose twins were deleted.
+
+        Returns:
+            Number of assets added
+        """
+        if not self.roster.refresh(properties=False) and len(self.engine):
+            return 0  # membership unchanged
+
+        twins = self.roster.twins()
+        if self.roster.complete:
+            # A partial roster (one twins.list page) can't tell what was deleted
+            current = {twin_dict["id"] for twin_dict in twins}
+            removed = [eq_id for eq_id in self.engine.location if eq_id not in current]
+            for equipment_id in removed:
+                self.engine.remove(equipment_id)
+            if removed:
+                logger.info(f"Fleet engine: {len(removed)} deleted assets dropped ({len(self.engine)} total)")
+
+        added = 0
+        for twin_dict in twins:
+            equipment_type = equipment_type_of(twin_dict)
+            if equipment_type and self.engine.add(
+                twin_dict["id"], equipment_type, twin_dict.get("properties", {})
+            ):
+                added += 1
+        if added:
+            logger.info(f"Fleet engine: {added} assets added ({len(self.engine)} total)")
+        return added
+
+    def _run_fleet_tick(self, delta_hours: float) -> Dict:
+        """run_simulation_tick for the whole fleet at once."""
+        self.refresh_roster()
+        self.tick_count += 1
+        self.write_buffer.start()
+
+        new_failures = []
+        failed_props: Dict[str, Dict] = {}
+        for equipment_id, equipment_type in self.engine.tick(delta_hours):
+            state = self.engine.state(equipment_id)
+            failure = self.failure_event(equipment_id, equipment_type,
+                                         state["health_score"], state["operating_hours"])
+            new_failures.append(failure)
+            self.failures.append(failure)
+            failed_props[equipment_id] = {
+                "status": "failed",
+                "lastFailure": failure["timestamp"],
+                "lastFailureMode": failure["failure_mode"],
+            }
+            logger.warning(f"FAILURE: {equipment_id} - {failure['failure_mode']}")
+
+        # Queue the writes; the buffer flushes them in batches
+        stamp = datetime.now().isoformat()
+        updates = 0
+        for equipment_id, update_props in self.engine.iter_updates():
+            update_props["lastSimulationUpdate"] = stamp
+            if equipment_id in failed_props:
+                update_props.update(failed_props[equipment_id])
+            self.write_buffer.put(equipment_id, update_props)
+            updates += 1
+
+        return {
+            "updates": updates,
+            "failures": len(new_failures),
+            "failure_details": new_failures,
+        }
+
+    def close(self) -> None:
+        """Flush buffered twin writes (fleet engine mode)."""
+        if self.write_buffer is not None:
+            self.write_buffer.close()
+
     def get_equipment_status(self) -> List[Dict]:
         """Get current status of all monitored equipment."""
         statuses = []
-        for eq_id, state in self.states.items():
+        if self.engine is not None:
+            states = ((eq_id, group.equipment_type, self.engine.state(eq_id))
+                      for eq_id, (group, _) in self.engine.location.items())
+        else:
+            states = ((eq_id, state.equipment_type, vars(state))
+                      for eq_id, state in self.states.items())
+
+        for eq_id, equipment_type, state in states:
             statuses.append({
                 "equipment_id": eq_id,
-                "equipment_type": state.equipment_type,
-                "health_score": round(state.health_score, 1),
-                "rul_hours": round(state.remaining_useful_life, 0),
-                "vibration": round(state.vibration_level, 2),
-                "temperature": round(state.temperature, 1),
-                "anomaly_score": round(state.anomaly_score, 3),
-                "failure_probability": round(state.failure_probability, 6),
-                "status": "critical" if state.health_score < 20 else
-                         "warning" if state.health_score < 50 else
-                         "degraded" if state.health_score < 75 else "healthy"
+                "equipment_type": equipment_type,
+                "health_score": round(state["health_score"], 1),
+                "rul_hours": round(state["remaining_useful_life"], 0),
+                "vibration": round(state["vibration_level"], 2),
+                "temperature": round(state["temperature"], 1),
+                "anomaly_score": round(state["anomaly_score"], 3),
+                "statistical_anomaly": round(state["statistical_anomaly"], 3),
+                "failure_probability": round(state["failure_probability"], 6),
+                "status": "critical" if state["health_score"] < 20 else
+                         "warning" if state["health_score"] < 50 else
+                         "degraded" if state["health_score"] < 75 else "healthy"
             })
         return sorted(statuses, key=lambda x: x["health_score"])
 
+    def status_counts(self) -> Dict[str, int]:
+        """Number of assets per status (critical, warning, degraded, healthy)."""
+        if self.engine is not None:
+            return self.engine.status_counts()
+        counts = {"critical": 0, "warning": 0, "degraded": 0, "healthy": 0}
+        for state in self.states.values():
+            health = state.health_score
+            status = ("critical" if health < 20 else "warning" if health < 50 else
+                      "degraded" if health < 75 else "healthy")
+            counts[status] += 1
+        return counts
+
     def get_failure_history(self) -> List[Dict]:
         """Get history of all failures."""
         return self.failures
 
 
 def run_continuous_simulation(base_url: Optional[str], interval: float,
-                               duration: Optional[float], accelerated: bool):
+                               duration: Optional[float], accelerated: bool,
+                               vectorized: bool = False):
     """
     Run continuous degradation simulation.
     """
     client = get_client(base_url)
     time_acceleration = 100.0 if accelerated else 1.0
 
-    simulator = DegradationSimulator(client, time_acceleration)
+    simulator = DegradationSimulator(client, time_acceleration, vectorized)
 
     logger.info(f"Starting degradation simulation")
     logger.info(f"  Update interval: {interval}s")
     logger.info(f"  Time acceleration: {time_acceleration}x")
+    logger.info(f"  Vectorized: {'ON' if vectorized else 'OFF'}")
     if duration:
         logger.info(f"  Duration: {duration} minutes")
 
@@ -465,13 +633,11 @@ def run_continuous_simulation(base_url: Optional[str], interval: float,
             elapsed = time.time() - start_time
 
             # Print status
-            equipment_status = simulator.get_equipment_status()
-            critical_count = sum(1 for s in equipment_status if s["status"] == "critical")
-            warning_count = sum(1 for s in equipment_status if s["status"] == "warning")
+            counts = simulator.status_counts()
 
             print(f"\r[Tick {tick_count}] Updated: {result['updates']}, "
                   f"Failures: {result['failures']}, "
-                  f"Critical: {critical_count}, Warnings: {warning_count}, "
+                  f"Critical: {counts['critical']}, Warnings: {counts['warning']}, "
                   f"Elapsed: {elapsed:.0f}s", end="", flush=True)
 
             # Print any new failures
@@ -491,6 +657,8 @@ def run_continuous_simulation(base_url: Optional[str], interval: float,
 
     except KeyboardInterrupt:
         print("\n\nSimulation stopped by user")
+    finally:
+        simulator.close()
 
     # Final summary
     print("\n" + "=" * 60)
@@ -527,6 +695,9 @@ if __name__ == "__main__":
                        help="Simulation duration in minutes")
     parser.add_argument("--accelerated", action="store_true",
                        help="Run 100x faster for demo")
+    parser.add_argument("--vectorized", action="store_true",
+                       help="Simulate the whole fleet per tick with NumPy")
     args = parser.parse_args()
 
-    run_continuous_simulation(args.base_url, args.interval, args.duration, args.accelerated)
+    run_continuous_simulation(args.base_url, args.interval, args.duration, args.accelerated,
+                              args.vectorized)
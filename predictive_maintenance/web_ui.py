@@ -31,7 +31,6 @@ from http.server import HTTPServer, SimpleHTTPRequestHandler
 import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-from collections import deque
 import random
 import math
 
@@ -42,12 +41,21 @@ except ImportError:
     sys.exit(1)
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from common import get_client, logger
+from common import get_client, logger, AsyncDTaaSClient
+from predictive_maintenance.sensor_history import SensorHistoryStore
+from predictive_maintenance.roster import TwinRoster, shared_roster
+
+# Sensor history per equipment, sized to what the UI shows: the details
+# response carries a fixed-size sparkline, and nothing reads older readings
+HISTORY_CHANNELS = ("healthScore", "currentVibration", "currentTemperature", "anomalyScore")
+SPARKLINE_POINTS = 30
 
 # Global state
 client = None
+async_client: Optional[AsyncDTaaSClient] = None
+roster: Optional[TwinRoster] = None
 equipment: Dict[str, dict] = {}
-health_history: Dict[str, deque] = {}
+health_history = SensorHistoryStore(HISTORY_CHANNELS, raw_size=SPARKLINE_POINTS, tiers=())
 connected_clients: set = set()
 simulation_running = False
 ws_port = 8091
@@ -65,17 +73,20 @@ def _normalize_properties(properties: dict) -> dict:
     return normalized
 
 
-def load_equipment():
+async def load_equipment():
     """Load equipment data from DTaaS."""
-    global equipment, health_history
-
-    equipment = {}
+    global equipment
 
     try:
-        twins = client.twins.list(domain="predictive_maintenance", page_size=200)
+        # Revalidate the shared roster on the worker pool (one aggregate
+        # query unless twins changed)
+        await async_client.run(roster.refresh)
 
-        for twin in twins:
-            twin_dict = twin.model_dump() if hasattr(twin, 'model_dump') else twin
+        # Reset only after the fetch completes so websocket handlers never
+        # see partially loaded state
+        equipment = {}
+
+        for twin_dict in roster.twins():
             raw_props = twin_dict.get("properties", {})
             props = _normalize_properties(raw_props)
 
@@ -85,10 +96,7 @@ def load_equipment():
             eq_id = twin_dict["id"]
             type_val = twin_dict.get("type_uri") or twin_dict.get("type") or ""
 
-            # Initialize history if needed
-            if eq_id not in health_history:
-                health_history[eq_id] = deque(maxlen=30)
-            health_history[eq_id].append(props.get("healthScore", 0))
+            health_history.append(eq_id, props)
 
             equipment[eq_id] = {
                 "id": eq_id,
@@ -103,7 +111,6 @@ def load_equipment():
                 "operatingHours": props.get("operatingHours", 0),
                 "criticality": props.get("criticality", "medium"),
                 "status": props.get("status", "unknown"),
-                "history": list(health_history[eq_id]),
             }
 
         logger.info(f"Loaded {len(equipment)} equipment items")
@@ -113,6 +120,14 @@ def load_equipment():
         raise
 
 
+def get_equipment_details(eq_id: str) -> dict:
+    """Equipment fields plus a health sparkline, for the details view."""
+    return {
+        **equipment[eq_id],
+        "history": health_history.sparkline(eq_id, "healthScore", SPARKLINE_POINTS),
+    }
+
+
 def get_dashboard_data() -> dict:
     """Get aggregated dashboard data."""
     if not equipment:
@@ -185,10 +200,7 @@ async def simulate_degradation():
             eq["currentVibration"] += random.uniform(-0.5, 1)
             eq["currentTemperature"] += random.uniform(-1, 2)
 
-            # Update history
-            if eq_id in health_history:
-                health_history[eq_id].append(eq["healthScore"])
-                eq["history"] = list(health_history[eq_id])
+            health_history.append(eq_id, eq)
 
         # Broadcast update
         await broadcast({
@@ -236,7 +248,7 @@ async def handle_websocket(websocket):
             elif data.get("type") == "reload":
                 simulation_running = False
                 await asyncio.sleep(0.2)
-                load_equipment()
+                await load_equipment()
                 await websocket.send(json.dumps({
                     "type": "init",
                     "data": get_dashboard_data(),
@@ -247,7 +259,7 @@ async def handle_websocket(websocket):
                 if eq_id in equipment:
                     await websocket.send(json.dumps({
                         "type": "equipment_details",
-                        "data": equipment[eq_id],
+                        "data": get_equipment_details(eq_id),
                     }))
 
     except websockets.exceptions.ConnectionClosed:
@@ -776,7 +788,7 @@ HTML_CONTENT = '''<!DOCTYPE html>
                     </div>
                     <div class="rul">${eq.remainingUsefulLife.toFixed(0)}h RUL</div>
                 `;
-                item.onclick = () => showDetails(eq);
+                item.onclick = () => ws.send(JSON.stringify({type: 'get_details', equipment_id: eq.id}));
                 list.appendChild(item);
             });
 
@@ -877,6 +889,9 @@ HTML_CONTENT = '''<!DOCTYPE html>
                 if (data.type === 'init' || data.type === 'update') {
                     updateDashboard(data.data);
                 }
+                else if (data.type === 'equipment_details') {
+                    showDetails(data.data);
+                }
                 else if (data.type === 'simulation_started') {
                     isSimulating = true;
                     document.getElementById('simStatus').textContent = 'Running';
@@ -941,13 +956,15 @@ class WebHandler(SimpleHTTPRequestHandler):
 
 
 async def main(port: int):
-    global client, ws_port
+    global client, async_client, roster, ws_port
 
     ws_port = port + 1
 
     # Initialize client and load data
     client = get_client()
-    load_equipment()
+    async_client = AsyncDTaaSClient(client)
+    roster = shared_roster(client)
+    await load_equipment()
 
     # Start HTTP server
     http_server = HTTPServer(('', port), WebHandler)
@@ -24,7 +24,7 @@ import os
 import sys
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 import threading
-from typing import Dict, Set
+from typing import Dict, Optional, Set
 from collections import defaultdict
 
 try:
@@ -34,7 +34,7 @@ except ImportError:
     sys.exit(1)
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from common import get_client, logger
+from common import get_client, logger, AsyncDTaaSClient
 
 # Configuration
 AGENT_ID = "process-manager-corp"
@@ -43,16 +43,17 @@ WS_PORT = 8125
 
 # Global state
 client = None
+async_client: Optional[AsyncDTaaSClient] = None
 connected_clients: Set = set()
 memories_cache: Dict = {}
 
 
-def load_memories():
+async def load_memories():
     """Load memories from TesseraiDB."""
     global memories_cache
 
     try:
-        result = client.memory.query(
+        result = await async_client.memory.query(
             agent_id=AGENT_ID,
             query={"limit": 500}
         )
@@ -227,7 +228,7 @@ async def websocket_handler(websocket):
             try:
                 msg = json.loads(message)
                 if msg.get("type") == "refresh":
-                    load_memories()
+                    await load_memories()
                     await websocket.send(json.dumps({
                         "type": "init",
                         "data": get_dashboard_data()
@@ -693,13 +694,14 @@ def run_http_server(port: int):
 
 
 async def main(http_port: int, ws_port: int):
-    global client, HTTP_PORT, WS_PORT
+    global client, async_client, HTTP_PORT, WS_PORT
 
     HTTP_PORT = http_port
     WS_PORT = ws_port
 
     client = get_client()
-    load_memories()
+    async_client = AsyncDTaaSClient(client)
+    await load_memories()
 
     http_thread = threading.Thread(target=run_http_server, args=(http_port,), daemon=True)
     http_thread.start()
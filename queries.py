@@ -19,7 +19,7 @@ Features:
 
 import argparse
 from collections import Counter
-from common import get_client, DOMAIN_NAMESPACES, get_all_domains
+from common import get_client, load_relationship_graph, DOMAIN_NAMESPACES, get_all_domains
 
 
 def print_section(name: str):
@@ -89,33 +89,24 @@ def query_cross_domain_relationships(client):
     twin_domains = {t.id: t.domain for t in twins if t.domain}
 
     cross_domain_rels = []
-    checked = 0
 
     print("\nScanning for cross-domain relationships...")
-    for twin in twins[:100]:  # Check first 100 twins to keep it fast
-        if not twin.domain:
-            continue
-
-        try:
-            rels = client.twins.get_relationships(twin.id)
-            for rel in rels:
-                target_id = rel.get('target', '')
-                # Look up target's domain
-                target_domain = twin_domains.get(target_id)
-
-                if target_domain and target_domain != twin.domain:
-                    cross_domain_rels.append({
-                        'source_id': twin.id,
-                        'source_domain': twin.domain,
-                        'rel_type': rel.get('type', 'unknown'),
-                        'target_id': target_id,
-                        'target_domain': target_domain
-                    })
-            checked += 1
-        except Exception:
-            pass
-
-    print(f"Checked {checked} twins, found {len(cross_domain_rels)} cross-domain relationships\n")
+    graph = load_relationship_graph(client, twin_ids=twin_domains)
+    for source_id, rel_type, target_id in graph.edges:
+        source_domain = twin_domains.get(source_id)
+        target_domain = twin_domains.get(target_id)
+
+        if source_domain and target_domain and target_domain != source_domain:
+            cross_domain_rels.append({
+                'source_id': source_id,
+                'source_domain': source_domain,
+                'rel_type': rel_type,
+                'target_id': target_id,
+                'target_domain': target_domain
+            })
+
+    print(f"Checked {len(graph)} relationships across {len(twin_domains)} twins, "
+          f"found {len(cross_domain_rels)} cross-domain relationships\n")
 
     if cross_domain_rels:
         # Group by domain pair
@@ -0,0 +1,391 @@
+# Copyright 2026 Penserai Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Streaming RDF serialization for TesseraiDB twins and relationships.
+
+Converts twin dictionaries (the same shape accepted by ``bulk_create_twins``)
+and relationship tuples into RDF, writing each twin as a single string rather
+than a list of lines. Two output formats are supported:
+
+    turtle:   Compact prefixed Turtle. The ``@prefix`` header is written once
+              per document, each twin is a single statement with a
+              predicate-object list, and numbers and booleans use Turtle's
+              bare literal shorthand. This is what the bulk helpers send.
+    ntriples: N-Triples with full IRIs and typed literals, for tools that
+              want a line-oriented dump (one triple per line, no header).
+
+Literals are scanned once for characters that need escaping and left
+untouched (no copies) when there are none.
+
+Example:
+    from rdf_serializer import serialize_twin, write_twins, NTRIPLES
+
+    payload = serialize_twin({"id": "pump-1", "name": "Pump 1"})
+
+    with open("twins.nt", "w") as f:
+        write_twins(f, twins, fmt=NTRIPLES)
+"""
+
+import json
+import re
+from json.encoder import encode_basestring
+from typing import Iterable, Iterator, Optional, TextIO
+
+TWIN_URN_PREFIX = "urn:tesserai:twin:"
+CORE_NS = "http://tesserai.io/ontology/core#"
+RDFS_NS = "http://www.w3.org/2000/01/rdf-schema#"
+XSD_NS = "http://www.w3.org/2001/XMLSchema#"
+RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+
+NTRIPLES = "ntriples"
+TURTLE = "turtle"
+FORMATS = (NTRIPLES, TURTLE)
+
+TURTLE_HEADER = (
+    f"@prefix dtaas: <{CORE_NS}> .\n"
+    f"@prefix rdfs: <{RDFS_NS}> .\n"
+)
+
+
+# Local names that can be written as ``dtaas:key`` in Turtle; anything else
+# falls back to a full IRI.
+_PNAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_\-]*$")
+
+_NT_TYPE = f"<{RDF_TYPE}>"
+_NT_LABEL = f"<{RDFS_NS}label>"
+_NT_COMMENT = f"<{RDFS_NS}comment>"
+_NT_DOMAIN = f"<{CORE_NS}domain>"
+_NT_BOOLEAN = f"^^<{XSD_NS}boolean>"
+_NT_INTEGER = f"^^<{XSD_NS}integer>"
+_NT_DECIMAL = f"^^<{XSD_NS}decimal>"
+_NT_DOUBLE = f"^^<{XSD_NS}double>"
+
+# Separator between predicate-object pairs of one Turtle statement
+_PO_SEPARATOR = " ;\n    "
+
+_SPECIAL_DOUBLES = {"inf": "INF", "-inf": "-INF", "nan": "NaN"}
+
+_predicate_cache: dict[str, dict[str, str]] = {TURTLE: {}, NTRIPLES: {}}
+
+
+def escape_literal(value: str) -> str:
+    """
+    Escape a string for use inside a double-quoted RDF literal.
+
+    Args:
+        value: The raw string
+
+    Returns:
+        str: The escaped string
+    """
+    # One pass in C. JSON's string escapes (\" \\ \n \t \uXXXX ...) are
+    # all valid ECHAR/UCHAR escapes in Turtle and N-Triples literals
+    return encode_basestring(value)[1:-1]
+
+
+def twin_iri(twin_id: str) -> str:
+    """Return the bracketed IRI for a twin ID (or pass through a full IRI)."""
+    if "://" in twin_id:
+        return f"<{twin_id}>"
+    return f"<{TWIN_URN_PREFIX}{twin_id}>"
+
+
+def predicate_iri(key: str, fmt: str = TURTLE) -> str:
+    """
+    Return the predicate for a property key in the requested format.
+
+    Keys without a scheme are placed in the core namespace.
+
+    Args:
+        key: Property name or full predicate IRI
+        fmt: Output format (``turtle`` or ``ntriples``)
+
+    Returns:
+        str: The predicate term, ready to embed in a triple
+    """
+    cache = _predicate_cache[fmt]
+    term = cache.get(key)
+    if term is None:
+        if "://" in key:
+            term = f"<{key}>"
+        elif fmt == TURTLE and _PNAME_RE.match(key):
+            term = f"dtaas:{key}"
+        else:
+            term = f"<{CORE_NS}{key}>"
+        cache[key] = term
+    return term
+
+
+def format_literal(value, fmt: str = TURTLE) -> Optional[str]:
+    """
+    Format a Python value as an RDF literal.
+
+    Strings become plain literals and dicts are stored as JSON strings.
+    Booleans and numbers use Turtle's bare shorthand (``true``, ``42``,
+    ``1.5``) or explicit xsd datatypes in N-Triples. Other types are not
+    representable and return None.
+
+    Args:
+        value: The value to format
+        fmt: Output format (``turtle`` or ``ntriples``)
+
+    Returns:
+        str: The literal term, or None if the value is skipped
+    """
+    kind = type(value)
+    if kind is str:
+        return f'"{escape_literal(value)}"'
+    if kind is bool:
+        text = "true" if value else "false"
+        return text if fmt == TURTLE else f'"{text}"{_NT_BOOLEAN}'
+    if kind is int:
+        return str(value) if fmt == TURTLE else f'"{value}"{_NT_INTEGER}'
+    if kind is float:
+        text = repr(value)
+        if "n" in text:
+            # nan and inf have no bare form in Turtle
+            return f'"{_SPECIAL_DOUBLES[text]}"{_NT_DOUBLE}'
+        if fmt == TURTLE:
+            return text
+        return f'"{text}"{_NT_DOUBLE if "e" in text else _NT_DECIMAL}'
+    if kind is dict:
+        return f'"{escape_literal(json.dumps(value))}"'
+    # Subclasses of the builtin types (IntEnum, numpy.float64, ...)
+    if isinstance(value, str):
+        return format_literal(str(value), fmt)
+    if isinstance(value, bool):
+        return format_literal(bool(value), fmt)
+    if isinstance(value, int):
+        return format_literal(int(value), fmt)
+    if isinstance(value, float):
+        return format_literal(float(value), fmt)
+    if isinstance(value, dict):
+        return format_literal(dict(value), fmt)
+    return None
+
+
+def _twin_turtle(twin_data: dict) -> str:
+    """One Turtle statement (predicate-object list) for a twin."""
+    parts = []
+    append = parts.append
+
+    twin_type = twin_data.get("type")
+    if twin_type:
+        append(f"a <{twin_type}>")
+
+    name = twin_data.get("name")
+    if name:
+        append(f'rdfs:label "{escape_literal(name)}"')
+
+    description = twin_data.get("description")
+    if description:
+        append(f'rdfs:comment "{escape_literal(description)}"')
+
+    domain = twin_data.get("domain")
+    if domain:
+        append(f'dtaas:domain "{escape_literal(domain)}"')
+
+    properties = twin_data.get("properties")
+    if properties:
+        predicates = _predicate_cache[TURTLE]
+        for key, value in properties.items():
+            predicate = predicates.get(key) or predicate_iri(key, TURTLE)
+            # Inline the common cases; format_literal handles the rest
+            kind = type(value)
+            if kind is str:
+                append(f'{predicate} "{escape_literal(value)}"')
+            elif kind is int:
+                append(f"{predicate} {value}")
+            elif kind is float and value - value == 0.0:
+                # Finite floats use the bare shorthand (nan/inf fall through)
+                append(f"{predicate} {value!r}")
+            elif kind is bool:
+                append(f"{predicate} {'true' if value else 'false'}")
+            else:
+                literal = format_literal(value, TURTLE)
+                if literal is not None:
+                    append(f"{predicate} {literal}")
+
+    if not parts:
+        return ""
+    return f"{twin_iri(twin_data['id'])} {_PO_SEPARATOR.join(parts)} .\n"
+
+
+def _twin_ntriples(twin_data: dict) -> str:
+    """One N-Triples line per triple for a twin."""
+    subject = twin_iri(twin_data["id"])
+    lines = []
+    append = lines.append
+
+    twin_type = twin_data.get("type")
+    if twin_type:
+        append(f"{subject} {_NT_TYPE} <{twin_type}> .\n")
+
+    name = twin_data.get("name")
+    if name:
+        append(f'{subject} {_NT_LABEL} "{escape_literal(name)}" .\n')
+
+    description = twin_data.get("description")
+    if description:
+        append(f'{subject} {_NT_COMMENT} "{escape_literal(description)}" .\n')
+
+    domain = twin_data.get("domain")
+    if domain:
+        append(f'{subject} {_NT_DOMAIN} "{escape_literal(domain)}" .\n')
+
+    properties = twin_data.get("properties")
+    if properties:
+        for key, value in properties.items():
+            literal = format_literal(value, NTRIPLES)
+            if literal is not None:
+                append(f"{subject} {predicate_iri(key, NTRIPLES)} {literal} .\n")
+
+    return "".join(lines)
+
+
+def serialize_twin_body(twin_data: dict, fmt: str = TURTLE) -> str:
+    """
+    Serialize a twin without any document header.
+
+    Use this when concatenating many twins into one document.
+
+    Args:
+        twin_data: Twin dictionary with 'id' and optional 'type', 'name',
+                   'description', 'domain' and 'properties'
+        fmt: Output format (``turtle`` or ``ntriples``)
+
+    Returns:
+        str: The twin's triples
+    """
+    if fmt == TURTLE:
+        return _twin_turtle(twin_data)
+    if fmt == NTRIPLES:
+        return _twin_ntriples(twin_data)
+    raise ValueError(f"Unknown RDF format: {fmt}. Valid formats: {', '.join(FORMATS)}")
+
+
+def serialize_twin(twin_data: dict, fmt: str = TURTLE) -> str:
+    """
+    Serialize a single twin as a standalone RDF document.
+
+    Args:
+        twin_data: Twin dictionary (see serialize_twin_body)
+        fmt: Output format (``turtle`` or ``ntriples``)
+
+    Returns:
+        str: The serialized document
+    """
+    body = serialize_twin_body(twin_data, fmt)
+    if fmt == TURTLE:
+        return TURTLE_HEADER + body
+    return body
+
+
+def serialize_relationship(
+    source_id: str,
+    rel_type: str,
+    target_id: str,
+    properties: Optional[dict] = None,
+    fmt: str = TURTLE,
+) -> str:
+    """
+    Serialize one relationship without any document header.
+
+    Relationship properties are attached to the source twin, matching how
+    ``bulk_add_relationships`` has always stored them. Dict-valued properties
+    are skipped.
+
+    Args:
+        source_id: Source twin ID
+        rel_type: Relationship type (local name in the core namespace or full IRI)
+        target_id: Target twin ID or full IRI
+        properties: Optional relationship properties
+        fmt: Output format (``turtle`` or ``ntriples``)
+
+    Returns:
+        str: The relationship's triples
+    """
+    subject = twin_iri(source_id)
+    line = f"{subject} {predicate_iri(rel_type, fmt)} {twin_iri(target_id)} .\n"
+    if not properties:
+        return line
+
+    lines = [line]
+    for key, value in properties.items():
+        if isinstance(value, dict):
+            continue
+        literal = format_literal(value, fmt)
+        if literal is not None:
+            lines.append(f"{subject} {predicate_iri(key, fmt)} {literal} .\n")
+    return "".join(lines)
+
+
+def serialize_relationships(
+    relationships: Iterable[tuple[str, str, str, Optional[dict]]],
+    fmt: str = TURTLE,
+) -> str:
+    """
+    Serialize relationships as a single RDF document.
+
+    Args:
+        relationships: (source_id, rel_type, target_id, properties) tuples
+        fmt: Output format (``turtle`` or ``ntriples``)
+
+    Returns:
+        str: The serialized document
+    """
+    body = "".join(
+        serialize_relationship(source_id, rel_type, target_id, properties, fmt)
+        for source_id, rel_type, target_id, properties in relationships
+    )
+    if fmt == TURTLE:
+        return TURTLE_HEADER + body
+    return body
+
+
+def iter_twins(twins: Iterable[dict], fmt: str = TURTLE) -> Iterator[str]:
+    """
+    Stream many twins as one RDF document.
+
+    Args:
+        twins: Twin dictionaries; entries without an 'id' are skipped
+        fmt: Output format (``turtle`` or ``ntriples``)
+
+    Yields:
+        str: The header (Turtle only) followed by one chunk per twin
+    """
+    if fmt == TURTLE:
+        yield TURTLE_HEADER
+    for twin_data in twins:
+        if twin_data.get("id"):
+            yield serialize_twin_body(twin_data, fmt)
+
+
+def write_twins(stream: TextIO, twins: Iterable[dict], fmt: str = TURTLE) -> int:
+    """
+    Write many twins to a text stream without materializing the document.
+
+    Args:
+        stream: Writable text stream (file, io.StringIO, ...)
+        twins: Twin dictionaries
+        fmt: Output format (``turtle`` or ``ntriples``)
+
+    Returns:
+        int: Number of characters written
+    """
+    written = 0
+    for chunk in iter_twins(twins, fmt):
+        written += stream.write(chunk)
+    return written
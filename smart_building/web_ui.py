@@ -31,7 +31,7 @@ import sys
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 import threading
 from datetime import datetime
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Optional
 from collections import defaultdict
 
 try:
@@ -41,10 +41,11 @@ except ImportError:
     sys.exit(1)
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from common import get_client, logger
+from common import get_client, logger, AsyncDTaaSClient
 
 # Global state
 client = None
+async_client: Optional[AsyncDTaaSClient] = None
 building: Dict = {}
 floors: Dict[str, dict] = {}
 rooms: Dict[str, dict] = {}
@@ -68,20 +69,22 @@ def _normalize_properties(properties: dict) -> dict:
     return normalized
 
 
-def load_building_data():
+async def load_building_data():
     """Load building data from DTaaS."""
     global building, floors, rooms, sensors, hvac_equipment, elevators, energy_data
 
-    building = {}
-    floors = {}
-    rooms = {}
-    sensors = {}
-    hvac_equipment = {}
-    elevators = {}
-    energy_data = {}
-
     try:
-        twins = client.twins.list(domain="smart_building", page_size=500)
+        twins = await async_client.twins.list(domain="smart_building", page_size=500)
+
+        # Reset only after the fetch completes so websocket handlers never
+        # see partially loaded state
+        building = {}
+        floors = {}
+        rooms = {}
+        sensors = {}
+        hvac_equipment = {}
+        elevators = {}
+        energy_data = {}
 
         for twin in twins:
             twin_dict = twin.model_dump() if hasattr(twin, 'model_dump') else twin
@@ -369,7 +372,7 @@ async def handle_websocket(websocket):
         async for message in websocket:
             data = json.loads(message)
             if data.get("type") == "refresh":
-                load_building_data()
+                await load_building_data()
                 await websocket.send(json.dumps({
                     "type": "update",
                     **get_full_state()
@@ -388,7 +391,7 @@ async def periodic_update():
         await asyncio.sleep(5)
         if connected_clients:
             try:
-                load_building_data()
+                await load_building_data()
                 await broadcast({
                     "type": "update",
                     **get_full_state()
@@ -1102,12 +1105,13 @@ class WebHandler(SimpleHTTPRequestHandler):
 
 
 async def main(port: int):
-    global client, ws_port
+    global client, async_client, ws_port
 
     ws_port = port + 1
 
     client = get_client()
-    load_building_data()
+    async_client = AsyncDTaaSClient(client)
+    await load_building_data()
 
     http_server = HTTPServer(('', port), WebHandler)
     http_thread = threading.Thread(target=http_server.serve_forever)
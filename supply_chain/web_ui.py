@@ -30,7 +30,7 @@ import sys
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 import threading
 from datetime import datetime
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Optional
 from collections import defaultdict
 
 try:
@@ -40,10 +40,11 @@ except ImportError:
     sys.exit(1)
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from common import get_client, logger
+from common import get_client, logger, AsyncDTaaSClient
 
 # Global state
 client = None
+async_client: Optional[AsyncDTaaSClient] = None
 network: Dict = {}
 warehouses: Dict[str, dict] = {}
 suppliers: Dict[str, dict] = {}
@@ -83,22 +84,24 @@ def _safe_json_parse(value, default=None):
     return default
 
 
-def load_supply_chain_data():
+async def load_supply_chain_data():
     """Load supply chain data from DTaaS."""
     global network, warehouses, suppliers, trucks, ships, containers, shipments, inventory, customers
 
-    network = {}
-    warehouses = {}
-    suppliers = {}
-    trucks = {}
-    ships = {}
-    containers = {}
-    shipments = {}
-    inventory = {}
-    customers = {}
-
     try:
-        twins = client.twins.list(domain="supply_chain", page_size=500)
+        twins = await async_client.twins.list(domain="supply_chain", page_size=500)
+
+        # Reset only after the fetch completes so websocket handlers never
+        # see partially loaded state
+        network = {}
+        warehouses = {}
+        suppliers = {}
+        trucks = {}
+        ships = {}
+        containers = {}
+        shipments = {}
+        inventory = {}
+        customers = {}
 
         for twin in twins:
             twin_dict = twin.model_dump() if hasattr(twin, 'model_dump') else twin
@@ -378,7 +381,7 @@ async def handle_websocket(websocket):
         async for message in websocket:
             data = json.loads(message)
             if data.get("type") == "refresh":
-                load_supply_chain_data()
+                await load_supply_chain_data()
                 await websocket.send(json.dumps({
                     "type": "update",
                     **get_full_state()
@@ -397,7 +400,7 @@ async def periodic_update():
         await asyncio.sleep(5)
         if connected_clients:
             try:
-                load_supply_chain_data()
+                await load_supply_chain_data()
                 await broadcast({
                     "type": "update",
                     **get_full_state()
@@ -1024,12 +1027,13 @@ class WebHandler(SimpleHTTPRequestHandler):
 
 
 async def main(port: int):
-    global client, ws_port
+    global client, async_client, ws_port
 
     ws_port = port + 1
 
     client = get_client()
-    load_supply_chain_data()
+    async_client = AsyncDTaaSClient(client)
+    await load_supply_chain_data()
 
     http_server = HTTPServer(('', port), WebHandler)
     http_thread = threading.Thread(target=http_server.serve_forever)